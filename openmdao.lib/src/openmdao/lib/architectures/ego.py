@@ -1,18 +1,142 @@
-import os
-from tempfile import mkdtemp
 import os.path
 import shutil
+from copy import deepcopy
+from tempfile import mkdtemp
 
-from openmdao.main.api import  Component, Driver, Architecture,\
-     Case, ExprEvaluator, implements
+from numpy import array, arange, argmax, clip, where, inf
+from numpy.random import uniform, randint
+
+from openmdao.main.api import Component, Architecture
+from openmdao.main.datatypes.api import Array, Bool, Float, Int, Enum
+from openmdao.main.pseudocomp import remove_spaces
+from openmdao.main.variable import make_legal_path
 
 from openmdao.lib.components.api import MetaModel, ExpectedImprovement, ParetoFilter
+from openmdao.lib.components.expected_improvement import \
+     expected_improvement, probability_of_improvement
 from openmdao.lib.surrogatemodels.api import KrigingSurrogate
-from openmdao.lib.drivers.api import DOEdriver, Genetic, CaseIteratorDriver, IterateUntil
+from openmdao.lib.drivers.api import Genetic, IterateUntil
+from openmdao.lib.drivers.adaptivesampledriver import AdaptiveSampleDriver
 
 from openmdao.lib.doegenerators.api import OptLatinHypercube
-from openmdao.lib.casehandlers.api import DBCaseRecorder, DBCaseIterator
-from openmdao.main.datatypes.api import Str, Array, Float, Int, Enum
+from openmdao.lib.casehandlers.api import DBCaseRecorder
+
+_CRITERIA = {'EI': expected_improvement,
+             'PI': probability_of_improvement}
+
+
+def _maximize(func, low, high, population_size, generations):
+    """Maximize `func` over the box [`low`, `high`] with a differential
+    evolution search. `func` takes a (population_size, n) array of points
+    and returns the array of their values, so each generation is scored in
+    one vectorized call. Returns the best point and its value.
+    """
+    size = (population_size, len(low))
+    pop = uniform(low, high, size)
+    fit = func(pop)
+    rows = arange(population_size)
+    for gen in xrange(generations):
+        a, b, c = randint(population_size, size=(3, population_size))
+        trial = clip(pop[a] + 0.8*(pop[b] - pop[c]), low, high)
+        cross = uniform(size=size) < 0.9
+        cross[rows, randint(len(low), size=population_size)] = True
+        trial = where(cross, trial, pop)
+        trial_fit = func(trial)
+        better = trial_fit >= fit
+        pop[better] = trial[better]
+        fit[better] = trial_fit[better]
+    best = argmax(fit)
+    return pop[best], fit[best]
+
+
+class _Infill(Component):
+    """Proposes the next points to sample by maximizing the expected
+    improvement or the probability of improvement of the Kriging surrogate
+    of the metamodel `meta`. Whole populations are scored with one batch
+    prediction per generation instead of one metamodel run per point.
+    """
+
+    criterion = Enum("PI", values=["EI", "PI"], iotype="in",
+                     desc="Infill criterion to maximize.")
+    n_points = Int(1, low=1, iotype="in",
+                   desc="Number of points proposed at a time. Points after "
+                        "the first are chosen with the Kriging believer "
+                        "heuristic, so a batch approximates q-EI.")
+    population_size = Int(100, low=4, iotype="in",
+                          desc="Population size of the infill search.")
+    generations = Int(10, low=0, iotype="in",
+                      desc="Number of generations of the infill search.")
+    target = Float(0.0, iotype="in", desc="Current objective minimum.")
+
+    points = Array(iotype="out", desc="Proposed points, one per row.")
+    max_criterion = Float(0.0, iotype="out",
+                          desc="Criterion value of the first proposed point.")
+
+    def __init__(self, meta, response, low, high):
+        super(_Infill, self).__init__()
+        self._meta = meta
+        self._response = response
+        self._low = array(low, dtype=float)
+        self._high = array(high, dtype=float)
+
+    def execute(self):
+        """Propose points from the surrogate as last trained by the
+        metamodel.
+        """
+        surrogate = self.parent.get(self._meta).surrogates[self._response]
+
+        criterion = _CRITERIA[self.criterion]
+        target = self.target
+        if self.n_points > 1:
+            # The believed points must not trigger a refit of the thetas.
+            surrogate = deepcopy(surrogate)
+            surrogate.retrain_interval = inf
+            surrogate.retrain_drift = inf
+
+        points = []
+        for i in xrange(self.n_points):
+            func = lambda P: criterion(target, *surrogate.predict_batch(P))
+            point, value = _maximize(func, self._low, self._high,
+                                     self.population_size, self.generations)
+            points.append(point)
+            if i == 0:
+                self.max_criterion = value
+            if i < self.n_points - 1:
+                believed = surrogate.predict_batch([point])[0]
+                surrogate.update([point], believed)
+                target = min(target, believed[0])
+
+        self.points = array(points)
+
+
+class _InfillIterator(IterateUntil):
+    """Feeds the points found by the infill search to the sampling driver
+    `sampler`, whose parameters are `paths`, before each iteration after the
+    first. The points are read from the `points` output of `infill`, or
+    from the current values of `params`, which is where the Genetic
+    optimizer leaves its best individual.
+    """
+
+    def __init__(self, sampler, paths, infill=None, params=None):
+        super(_InfillIterator, self).__init__()
+        self._sampler = sampler
+        self._paths = paths
+        self._infill = infill
+        self._params = params
+
+    def pre_iteration(self):
+        super(_InfillIterator, self).pre_iteration()
+        if self.iteration > 1:
+            if self._infill is None:
+                points = array([[self.parent.get(name)
+                                 for name in self._params]])
+            else:
+                points = self.parent.get(self._infill).points
+            sampler = self.parent.get(self._sampler)
+            for i, path in enumerate(self._paths):
+                sampler.set('adaptive_inputs.' + make_legal_path(path),
+                            list(points[:, i]))
+
 
 #TODO: Only supports HasObjective,HasParameters - real/contiunous variables
 class EGO(Architecture):
@@ -21,6 +145,17 @@ class EGO(Architecture):
     sample_iterations = Int(10, iotype="in", desc="Number of adaptively sampled points to use.")
     EI_PI = Enum("PI",values=["EI","PI"],iotype="in",desc="Switch to decide between EI or PI for infill criterion.")
     min_ei_pi = Float(0.001, iotype="in", desc="EI or PI to use for stopping condition of optimization.")
+    vectorized_infill = Bool(False, iotype="in",
+                             desc="If True, the infill criterion is maximized "
+                                  "by a vectorized search on batch surrogate "
+                                  "predictions instead of by a Genetic driver "
+                                  "running the metamodel one point at a time.")
+    n_infill = Int(1, low=1, iotype="in",
+                   desc="Number of points sampled per iteration. More than one "
+                        "gives batch (q-EI) infill, which requires "
+                        "vectorized_infill. Their true-model runs can be made "
+                        "concurrent by setting DOE_trainer.sequential to "
+                        "False.")
 
     def __init__(self,*args,**kwargs):
         super(EGO,self).__init__(*args,**kwargs)
@@ -31,6 +166,12 @@ class EGO(Architecture):
         self.has_coupling_vars = False
 
     def configure(self):
+        if self.n_infill > 1 and not self.vectorized_infill:
+            self.parent.raise_exception('EGO can only sample more than one '
+                                        'point per iteration when '
+                                        'vectorized_infill is True.',
+                                        ValueError)
+
         self._tdir = mkdtemp()
 
         self.comp_name = None
@@ -47,69 +188,102 @@ class EGO(Architecture):
         self.comp_name = compnames.pop()
         #change name of component to add '_model' to it.
         #     lets me name the metamodel as the old name
-        self.comp= getattr(self.parent,self.comp_name)
-        self.comp.name = "%s_model"%self.comp_name
+        model_name = "%s_model"%self.comp_name
+        self.parent.rename(self.comp_name, model_name)
+        self.comp = getattr(self.parent, model_name)
+
+        params = self.parent.get_parameters()
+        self.objective = remove_spaces(self.parent.get_objectives().values()[0].text)
+        varnames = tuple(name.split('.', 1)[1] for name in params)
+        response = self.objective.split('.', 1)[1]
+
+        #the DOE_trainer samples the model itself
+        paths = ["%s.%s"%(model_name, name) for name in varnames]
+        objective = "%s.%s"%(model_name, response)
 
         #add in the metamodel
-        meta_model = self.parent.add(self.comp_name,MetaModel()) #metamodel now replaces old component with same name
-        meta_model.default_surrogate = KrigingSurrogate()
-        meta_model.model = self.comp
+        meta_model = self.parent.add(self.comp_name,
+                                     MetaModel(params=varnames,
+                                               responses=(response,))) #metamodel now replaces old component with same name
+        meta_model.surrogates[response] = KrigingSurrogate()
+        meta_model.warm_restart = True
 
         meta_model_recorder = DBCaseRecorder(os.path.join(self._tdir,'trainer.db'))
         meta_model.recorder = meta_model_recorder
 
-        EI = self.parent.add("EI",ExpectedImprovement())
-        self.objective = self.parent.get_objectives().keys()[0]
-        EI.criteria = self.objective
-
-        pfilter = self.parent.add("filter",ParetoFilter())
-        pfilter.criteria = [self.objective]
-        pfilter.case_sets = [meta_model_recorder.get_iterator(),]
+        pfilter = self.parent.add("filter",ParetoFilter(params=varnames,
+                                                        responses=(response,)))
 
         #Driver Configuration
-        DOE_trainer = self.parent.add("DOE_trainer",DOEdriver())
+        DOE_trainer = self.parent.add("DOE_trainer",AdaptiveSampleDriver())
         DOE_trainer.sequential = True
         DOE_trainer.DOEgenerator = OptLatinHypercube(num_samples=self.initial_DOE_size)
 
-        for name,param in self.parent.get_parameters().iteritems():
-            DOE_trainer.add_parameter(param)
-
-        DOE_trainer.add_event("%s.train_next"%self.comp_name)
-
-        DOE_trainer.case_outputs = [self.objective]
-        DOE_trainer.recorders = [DBCaseRecorder(':memory:')]
+        low = []
+        high = []
+        for path,param in zip(paths, params.values()):
+            DOE_trainer.add_parameter(path, low=param.low, high=param.high)
+            low.append(param.low)
+            high.append(param.high)
+        DOE_trainer.add_response(objective)
 
-        EI_opt = self.parent.add("EI_opt",Genetic())
-        EI_opt.opt_type = "maximize"
-        EI_opt.population_size = 100
-        EI_opt.generations = 10
-        #EI_opt.selection_method = "tournament"
+        if self.vectorized_infill:
+            infill = self.parent.add("infill", _Infill(self.comp_name, response,
+                                                       low, high))
+            infill.criterion = self.EI_PI
+            infill.n_points = self.n_infill
+            criterion = 'infill.max_criterion'
+        else:
+            EI = self.parent.add("EI",ExpectedImprovement())
 
-        for name,param in self.parent.get_parameters().iteritems():
-            EI_opt.add_parameter(param)
-        EI_opt.add_objective("EI.%s"%self.EI_PI)
+            EI_opt = self.parent.add("EI_opt",Genetic())
+            EI_opt.opt_type = "maximize"
+            EI_opt.population_size = 100
+            EI_opt.generations = 10
+            #EI_opt.selection_method = "tournament"
 
-        retrain = self.parent.add("retrain",Driver())
-        retrain.recorders = self.data_recorders
+            for name,param in params.iteritems():
+                EI_opt.add_parameter(param)
+            EI_opt.add_objective("EI.%s"%self.EI_PI)
+            criterion = "EI.%s"%self.EI_PI
 
-        retrain.add_event("%s.train_next"%self.comp_name)
-
-        iter = self.parent.add("iter",IterateUntil())
-        iter.max_iterations = self.sample_iterations
-        iter.add_stop_condition('EI.PI <= %s'%self.min_ei_pi)
+        if self.vectorized_infill:
+            iter = _InfillIterator("DOE_trainer", paths, infill="infill")
+        else:
+            iter = _InfillIterator("DOE_trainer", paths, params=params.keys())
+        iter = self.parent.add("iter", iter)
+        iter.max_iterations = self.sample_iterations + 1
+        iter.add_stop_condition('%s <= %s'%(criterion, self.min_ei_pi))
 
         #Data Connections
-        self.parent.connect("filter.pareto_set","EI.best_case")
-        self.parent.connect(self.objective,"EI.predicted_value")
+        for path, name in zip(paths, varnames):
+            self.parent.connect("DOE_trainer.case_inputs.%s"%path,
+                                "%s.params.%s"%(self.comp_name, name))
+            self.parent.connect("DOE_trainer.all_case_inputs.%s"%path,
+                                "filter.params.%s"%name)
+        self.parent.connect("DOE_trainer.case_outputs.%s"%objective,
+                            "%s.responses.%s"%(self.comp_name, response))
+        self.parent.connect("DOE_trainer.all_case_outputs.%s"%objective,
+                            "filter.responses.%s"%response)
+        if self.vectorized_infill:
+            self.parent.connect("filter.pareto_outputs[0, 0]", "infill.target")
+        else:
+            self.parent.connect("filter.pareto_outputs[0, 0]", "EI.target")
+            self.parent.connect(self.objective, "EI.current")
 
-        #Iteration Heirarchy
-        self.parent.driver.workflow.add(['DOE_trainer', 'iter'])
-        #DOE_trainer.workflow.add(self.comp_name)
+        self.parent.recorders.extend(self.data_recorders)
 
-        iter.workflow.add(['filter', 'EI_opt', 'retrain'])
+        #Iteration Heirarchy
+        #    the first iteration of iter runs the DOE, the others sample the
+        #    points found by the infill search of the iteration before
+        self.parent.driver.workflow.add('iter')
+        DOE_trainer.workflow.add(model_name)
 
-        #EI_opt.workflow.add([self.comp_name,'EI'])
-        retrain.workflow.add(self.comp_name)
+        if self.vectorized_infill:
+            iter.workflow.add(['DOE_trainer', self.comp_name, 'filter', 'infill'])
+        else:
+            iter.workflow.add(['DOE_trainer', 'filter', 'EI_opt'])
+            EI_opt.workflow.add([self.comp_name, 'EI'])
 
 
     def cleanup(self):
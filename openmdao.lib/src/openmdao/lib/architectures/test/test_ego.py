@@ -0,0 +1,96 @@
+import os.path
+import random
+import unittest
+
+from numpy import random as numpy_random
+
+from openmdao.main.api import set_as_top
+from openmdao.main.problem_formulation import ArchitectureAssembly
+from openmdao.lib.casehandlers.api import case_db_to_dict
+from openmdao.lib.optproblems.branin import BraninComponent
+
+from openmdao.lib.architectures.ego import EGO
+
+
+class BraninProblem(ArchitectureAssembly):
+
+    def configure(self):
+        self.add('branin', BraninComponent())
+        self.add_parameter('branin.x', low=-5., high=10.)
+        self.add_parameter('branin.y', low=0., high=15.)
+        self.add_objective('branin.f_xy')
+
+
+class TestEGO(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(10)
+        numpy_random.seed(10)
+
+    def tearDown(self):
+        if os.path.exists('DOE_trainer.csv'):
+            os.remove('DOE_trainer.csv')
+
+    def test_ego_arch(self):
+        prob = set_as_top(BraninProblem())
+        prob.architecture = EGO()
+        prob.architecture.initial_DOE_size = 10
+        prob.architecture.sample_iterations = 10
+        prob.architecture.min_ei_pi = 0.
+
+        prob.run()
+
+        f_xy = prob.DOE_trainer.all_case_outputs.branin_model.f_xy
+        self.assertEqual(len(f_xy), 20)
+        self.assertEqual(prob.branin_model.exec_count, 20)
+        # global minimum is 0.397887
+        self.assertTrue(min(f_xy) < 1.)
+
+        # the metamodel took the place of the model and recorded every case
+        # it was trained on
+        tdir = prob.architecture._tdir
+        data = case_db_to_dict(os.path.join(tdir, 'trainer.db'),
+                               ['branin.x', 'branin.y', 'branin.f_xy'])
+        self.assertEqual(data['branin.f_xy'], list(f_xy))
+        prob.branin.x = prob.branin.y = 0.
+        prob.branin.execute()
+        self.assertTrue(abs(prob.branin.f_xy.mu - 55.6) < 5.)
+
+        prob.architecture.cleanup()
+        self.assertFalse(os.path.exists(tdir))
+
+    def test_ego_batch(self):
+        prob = set_as_top(BraninProblem())
+        prob.architecture = EGO()
+        prob.architecture.initial_DOE_size = 10
+        prob.architecture.sample_iterations = 4
+        prob.architecture.vectorized_infill = True
+        prob.architecture.n_infill = 3
+        prob.architecture.EI_PI = 'EI'
+        prob.architecture.min_ei_pi = 0.
+
+        prob.run()
+
+        self.assertEqual(prob.infill.points.shape, (3, 2))
+        f_xy = prob.DOE_trainer.all_case_outputs.branin_model.f_xy
+        self.assertEqual(len(f_xy), 10 + 4*3)
+        self.assertTrue(min(f_xy) < 2.)
+        prob.architecture.cleanup()
+
+    def test_ego_batch_needs_vectorized_infill(self):
+        prob = set_as_top(BraninProblem())
+        prob.architecture = EGO()
+        prob.architecture.n_infill = 3
+
+        try:
+            prob.run()
+        except ValueError as err:
+            self.assertEqual(str(err), ': EGO can only sample more than one '
+                             'point per iteration when vectorized_infill is '
+                             'True.')
+        else:
+            self.fail('ValueError expected')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,16 +1,41 @@
 """Expected Improvement calculation for single objective."""
 
-from numpy import exp, abs, pi, seterr
+from numpy import exp, abs, pi, asarray, zeros, errstate, where, \
+                  float64
 
-try:
-    from math import erfc   # py27 and later has erfc in the math module
-except ImportError as err:
-    from scipy.special import erfc
+from scipy.special import erfc
 
 from openmdao.main.datatypes.api import Float, Instance
 from openmdao.main.api import Component
 from openmdao.main.uncertain_distributions import NormalDistribution
 
+
+def probability_of_improvement(target, mu, sigma):
+    """Return the probability that normal distributions with means `mu` and
+    standard deviations `sigma` fall below `target`. Arrays of predictions
+    are evaluated in one call. Points with zero `sigma` have no chance of
+    improvement.
+    """
+    mu, sigma = asarray(mu, dtype=float), asarray(sigma, dtype=float)
+    with errstate(divide='ignore', invalid='ignore'):
+        PI = 0.5*erfc(-(1./2.**.5)*((target-mu)/sigma))
+    return where(sigma > 0., PI, zeros(PI.shape))
+
+
+def expected_improvement(target, mu, sigma):
+    """Return the expected improvement below `target` of normal
+    distributions with means `mu` and standard deviations `sigma`. Arrays of
+    predictions are evaluated in one call. Points with zero `sigma` have no
+    expected improvement.
+    """
+    mu, sigma = asarray(mu, dtype=float), asarray(sigma, dtype=float)
+    with errstate(divide='ignore', invalid='ignore', over='ignore'):
+        T1 = (target-mu)*.5*(erfc(-(target-mu)/(sigma*2.**.5)))
+        T2 = sigma*((1./((2.*pi)**.5))*exp(-0.5*((target-mu)/sigma)**2.))
+        EI = abs(T1+T2)
+    return where(sigma > 0., EI, zeros(EI.shape))
+
+
 class ExpectedImprovement(Component):
     """Expected Improvement calculation for single objective."""
 
@@ -37,17 +62,5 @@ class ExpectedImprovement(Component):
         sigma = self.current.sigma
         target = self.target
 
-        try:
-            seterr(divide='raise')
-            self.PI = 0.5*erfc(-(1./2.**.5)*((target-mu)/sigma))
-
-            T1 = (target-mu)*.5*(erfc(-(target-mu)/(sigma*2.**.5)))
-            T2 = sigma*((1./((2.*pi)**.5))*exp(-0.5*((target-mu)/sigma)**2.))
-            self.EI = abs(T1+T2)
-
-        except (ValueError, ZeroDivisionError, FloatingPointError):
-            self.EI = 0
-            self.PI = 0
-
-
-
+        self.PI = float64(probability_of_improvement(target, mu, sigma))
+        self.EI = float64(expected_improvement(target, mu, sigma))
@@ -5,6 +5,9 @@
 # pylint: disable-msg=F0401,E0611
 
 from copy import deepcopy
+from itertools import islice
+
+from numpy import asarray, zeros
 
 from openmdao.main.api import Component
 from openmdao.main.datatypes.api import List, Bool, Dict, Float, Slot, Str, \
@@ -16,6 +19,86 @@ from openmdao.main.mp_support import has_interface
 from openmdao.main.vartree import VariableTree
 from openmdao.util.typegroups import int_types, real_types
 
+
+class _TrainingData(object):
+    """Training cases stored in preallocated NumPy arrays. The capacity of
+    the arrays doubles whenever appended cases don't fit, so appending is
+    amortized constant time per case.
+
+    The arrays returned by :meth:`get_inputs` and :meth:`get_outputs` are
+    views that later appends never modify, so they can be held on to by
+    the surrogates.
+    """
+
+    def __init__(self, n_inputs, n_outputs):
+        self._n_inputs = n_inputs
+        self._n_outputs = n_outputs
+        self.clear()
+
+    def clear(self):
+        """Remove all of the cases."""
+        self.size = 0
+        self._inputs = zeros((0, self._n_inputs))
+        self._outputs = zeros((0, self._n_outputs))
+
+    def reserve(self, capacity):
+        """Make room for at least `capacity` cases."""
+        if capacity > len(self._inputs):
+            inputs = zeros((capacity, self._n_inputs))
+            outputs = zeros((capacity, self._n_outputs))
+            inputs[:self.size] = self._inputs[:self.size]
+            outputs[:self.size] = self._outputs[:self.size]
+            self._inputs = inputs
+            self._outputs = outputs
+
+    def append(self, inputs, outputs):
+        """Append cases given as a list of columns of values for each input
+        and a list of columns of values for each output.
+        """
+        num = len(inputs[0]) if inputs else len(outputs[0])
+        end = self.size + num
+        if end > len(self._inputs):
+            self.reserve(max(end, 2*len(self._inputs)))
+        for i, column in enumerate(inputs):
+            self._inputs[self.size:end, i] = column
+        for i, column in enumerate(outputs):
+            self._outputs[self.size:end, i] = column
+        self.size = end
+
+    def get_inputs(self, start=0):
+        """Return the (m, n) array of inputs of the cases from `start` on."""
+        return self._inputs[start:self.size]
+
+    def get_outputs(self, index, start=0):
+        """Return the values of output `index` of the cases from `start` on.
+        """
+        return self._outputs[start:self.size, index]
+
+
+def _read_chunks(source, input_keys, output_keys, chunk_size):
+    """Generate (inputs, outputs) pairs of lists of columns read from
+    `source` at most `chunk_size` cases at a time. `source` is either a
+    mapping from name to a sliceable column of values, such as an h5py group,
+    or an iterator over :class:`Case` objects.
+    """
+    if hasattr(source, 'keys'):
+        columns = [source[key] for key in input_keys + output_keys]
+        num = len(columns[0])
+        split = len(input_keys)
+        for start in xrange(0, num, chunk_size):
+            chunk = [asarray(column[start:start+chunk_size], dtype=float)
+                     for column in columns]
+            yield chunk[:split], chunk[split:]
+    else:
+        source = iter(source)
+        while True:
+            cases = list(islice(source, chunk_size))
+            if not cases:
+                break
+            yield ([[case[key] for case in cases] for key in input_keys],
+                   [[case[key] for case in cases] for key in output_keys])
+
+
 class MetaModel(Component):
     """ Class that creates a reduced order model for a tuple of outputs from
     a tuple of inputs. Accepts surrogate models that adhere to ISurrogate.
@@ -46,7 +129,9 @@ class MetaModel(Component):
                              "retrains with the new dataset whenever the "
                              "training data values are changed. When set to "
                              "True, the new data is appended to the old data "
-                             "and all of the data is used to train.")
+                             "and all of the data is used to train. Surrogates "
+                             "with an update method are given just the new "
+                             "data.")
 
     def __init__(self, params=None, responses=None):
         super(MetaModel, self).__init__()
@@ -64,24 +149,27 @@ class MetaModel(Component):
         # Inputs and Outputs created immediately.
 
         input_tree = self.get('params')
-        self._param_data = []
         for name in params:
             self.add(name, Float(0.0, iotype='in', desc='metamodel param'))
             input_tree.add(name, List([], desc='training param'))
 
         output_tree = self.get('responses')
-        self._response_data = {}
         for name in responses:
             self.add(name, Float(0.0, iotype='out', desc='metamodel response'))
             output_tree.add(name, List([], desc='training response'))
-            self._response_data[name] = []
             self.surrogates[name] = None
 
+        self._training_data = _TrainingData(len(params), len(responses))
+
         self._surrogate_input_names = params
         self._surrogate_output_names = responses
 
         self._train = True
 
+        # outputs whose surrogate has been trained on all of the data so far,
+        # so that a warm restart can just add the new points
+        self._trained = set()
+
         # keeps track of which sur_<name> slots are full
         self._surrogate_overrides = set()
 
@@ -134,45 +222,17 @@ class MetaModel(Component):
         # Train first
         if self._train:
 
-            input_data = self._param_data
+            data = self._training_data
             if self.warm_restart is False:
-                input_data = []
-                base = 0
-            else:
-                base = len(input_data)
-
-            for name in self._surrogate_input_names:
-                train_name = "params.%s" % name
-                val = self.get(train_name)
-                num_sample = len(val)
-
-                for j in xrange(base, base + num_sample):
-
-                    if j > len(input_data) - 1:
-                        input_data.append([])
-                    input_data[j].append(val[j-base])
+                data.clear()
+            base = data.size
 
-            # Surrogate models take an (m, n) list of lists
-            # m = number of training samples
-            # n = number of inputs
-            #
-            # TODO - Why not numpy array instead?
+            data.append([self.get("params.%s" % name)
+                         for name in self._surrogate_input_names],
+                        [self.get("responses.%s" % name)
+                         for name in self._surrogate_output_names])
 
-            for name in self._surrogate_output_names:
-
-                train_name = "responses.%s" % name
-                output_data = self._response_data[name]
-
-                if self.warm_restart is False:
-                    output_data = []
-
-                output_data.extend(self.get(train_name))
-                surrogate = self._get_surrogate(name)
-
-                if surrogate is not None:
-                    surrogate.train(input_data, output_data)
-
-            self._train = False
+            self._train_surrogates(base)
 
         # Now Predict for current inputs
 
@@ -186,6 +246,92 @@ class MetaModel(Component):
             if surrogate is not None:
                 setattr(self, name, surrogate.predict(inputs))
 
+    def train_from(self, source, names=None, chunk_size=10000):
+        """Train the surrogates on the cases in `source` rather than on the
+        lists in `params` and `responses`. The cases are read `chunk_size`
+        at a time straight into the training arrays, so large data sets are
+        never held in memory as Python objects. As with the lists, the
+        cases are appended to the previous training data if `warm_restart`
+        is True.
+
+        source: iterator or mapping
+            Either an iterator over :class:`Case` objects, such as the one
+            returned by a case recorder's ``get_iterator()``, or a mapping
+            from name to a sliceable column of values, such as an h5py group
+            of datasets.
+
+        names: dict
+            Maps param and response names to their names in `source`. Names
+            that aren't in `names` are looked up unchanged.
+
+        chunk_size: int
+            Maximum number of cases read at a time.
+        """
+        names = names or {}
+        input_keys = [names.get(name, name)
+                      for name in self._surrogate_input_names]
+        output_keys = [names.get(name, name)
+                       for name in self._surrogate_output_names]
+
+        data = self._training_data
+        if self.warm_restart is False:
+            data.clear()
+        base = data.size
+
+        if hasattr(source, 'keys'):
+            data.reserve(base + len(source[(input_keys + output_keys)[0]]))
+
+        for inputs, outputs in _read_chunks(source, input_keys, output_keys,
+                                            chunk_size):
+            data.append(inputs, outputs)
+
+        self._train_surrogates(base)
+
+    def _train_surrogates(self, base):
+        """Train the surrogates on the training data. If the cases before
+        `base` were already trained on, surrogates with an update method are
+        just given the cases from `base` on.
+        """
+        data = self._training_data
+        input_data = data.get_inputs()
+
+        for i, name in enumerate(self._surrogate_output_names):
+            surrogate = self._get_surrogate(name)
+
+            if surrogate is None:
+                continue
+
+            if base > 0 and name in self._trained and \
+               hasattr(surrogate, 'update'):
+                surrogate.update(data.get_inputs(base),
+                                 data.get_outputs(i, base))
+            else:
+                surrogate.train(input_data, data.get_outputs(i))
+            self._trained.add(name)
+
+        self._train = False
+
+        if self.recorder is not None:
+            self._record_training(base)
+
+    def _record_training(self, base):
+        """Record the training cases from `base` on in `recorder`, with the
+        params as inputs and the responses as outputs.
+        """
+        recorder = self.recorder
+        recorder.register(self,
+                          ['%s.%s' % (self.name, name)
+                           for name in self._surrogate_input_names],
+                          ['%s.%s' % (self.name, name)
+                           for name in self._surrogate_output_names])
+
+        data = self._training_data
+        inputs = data.get_inputs(base).tolist()
+        outputs = zip(*[data.get_outputs(i, base).tolist()
+                        for i in range(len(self._surrogate_output_names))])
+        for case_inputs, case_outputs in zip(inputs, outputs):
+            recorder.record(self, case_inputs, case_outputs, None, '', '')
+
     def _get_surrogate(self, name):
         """Return the designated surrogate for the given output."""
 
@@ -215,6 +361,7 @@ class MetaModel(Component):
                     self._default_surrogate_copies[name] = surrogate
                     self._update_var_for_surrogate(surrogate, name)
 
+        self._trained.clear()
         self.config_changed()
         self._train = True
 
@@ -225,6 +372,7 @@ class MetaModel(Component):
         for name in self._default_surrogate_copies:
             surr_copy = deepcopy(self.default_surrogate)
             self._default_surrogate_copies[name] = surr_copy
+            self._trained.discard(name)
 
     def _surrogate_updated(self, obj, name, old, new):
         """Called when self.surrogates Dict is updated."""
@@ -247,6 +395,7 @@ class MetaModel(Component):
                     del self._default_surrogate_copies[name]
 
                 self._update_var_for_surrogate(surr, varname)
+            self._trained.discard(varname)
 
         self.config_changed()
         self._train = True
@@ -2,7 +2,10 @@
 
 import unittest
 
-from openmdao.lib.components.expected_improvement import ExpectedImprovement
+from numpy import array
+
+from openmdao.lib.components.expected_improvement import ExpectedImprovement, \
+     expected_improvement, probability_of_improvement
 from openmdao.lib.casehandlers.api import CaseSet, ListCaseIterator
 from openmdao.main.uncertain_distributions import NormalDistribution
 from openmdao.main.case import Case
@@ -25,6 +28,20 @@ class ExpectedImprovementTests(unittest.TestCase):
         self.assertEqual(0,ei.EI)
         self.assertEqual(0,ei.PI)
 
+    def test_ei_vectorized(self):
+        mu = array([1., 0., 2., 1.])
+        sigma = array([1., 0.5, 2., 0.])
+        EI = expected_improvement(1.0, mu, sigma)
+        PI = probability_of_improvement(1.0, mu, sigma)
+
+        ei = ExpectedImprovement()
+        ei.target = 1.0
+        for i in range(len(mu)):
+            ei.current = NormalDistribution(mu=mu[i], sigma=sigma[i])
+            ei.execute()
+            self.assertAlmostEqual(ei.EI, EI[i], 10)
+            self.assertAlmostEqual(ei.PI, PI[i], 10)
+
 if __name__ == "__main__":
     unittest.main()
 
@@ -402,6 +402,19 @@ class TestCase(unittest.TestCase):
                     self.fail('%s not in %s' % (fragment, exc))
             else:
                 self.fail('Expected RemoteError')
+
+            # Try to set via set_many() on remote instance.
+            try:
+                exec_comp.set_many([('timeout', 5.),
+                                    ('command', ['this-should-fail'])])
+            except RemoteError as exc:
+                fragment = ": 'command' may not be set() remotely"
+                if fragment not in str(exc):
+                    self.fail('%s not in %s' % (fragment, exc))
+            else:
+                self.fail('Expected RemoteError')
+            self.assertEqual(exec_comp.get_many(['timeout', 'command']),
+                             [5., []])
         finally:
             if factory is not None:
                 factory.cleanup()
@@ -4,9 +4,11 @@ import unittest
 
 # pylint: disable-msg=F0401,E0611
 from openmdao.main.api import Assembly, set_as_top
+from openmdao.main.case import Case
 
 from openmdao.main.uncertain_distributions import NormalDistribution
 
+from openmdao.lib.casehandlers.api import DBCaseRecorder
 from openmdao.lib.components.metamodel import MetaModel
 from openmdao.lib.surrogatemodels.api import ResponseSurface, \
                   KrigingSurrogate, FloatKrigingSurrogate, LogisticRegression
@@ -118,6 +120,102 @@ class MetaModelTestCase(unittest.TestCase):
         assert_rel_error(self, model.meta.y1, 2.0, .00001)
         assert_rel_error(self, model.meta.y2, 4.0, .00001)
 
+    def test_warm_start_update(self):
+
+        model = set_as_top(Assembly())
+        model.add('meta', MetaModel(params=('x1', 'x2'),
+                                    responses=('y1',)))
+        model.driver.workflow.add('meta')
+        surrogate = FloatKrigingSurrogate()
+        surrogate.retrain_drift = 1e9
+        model.meta.default_surrogate = surrogate
+        model.meta.warm_restart = True
+
+        model.meta.params.x1 = [1.0, 3.0, 4.0]
+        model.meta.params.x2 = [1.0, 4.0, 2.0]
+        model.meta.responses.y1 = [3.0, 1.0, 5.0]
+        model.meta.run()
+        surrogate = model.meta._get_surrogate('y1')
+        self.assertEqual(surrogate.n, 3)
+
+        # New points are added to the trained surrogate with update().
+        model.meta.params.x1 = [2.0]
+        model.meta.params.x2 = [3.0]
+        model.meta.responses.y1 = [2.0]
+        model.meta.x1 = 2.0
+        model.meta.x2 = 3.0
+        model.meta.run()
+        self.assertTrue(model.meta._get_surrogate('y1') is surrogate)
+        self.assertEqual(surrogate.n, 4)
+        self.assertEqual(surrogate._n_added, 1)
+        assert_rel_error(self, model.meta.y1, 2.0, .00001)
+
+    def test_train_from_cases(self):
+
+        model = set_as_top(Assembly())
+        model.add('meta', MetaModel(params=('x1', 'x2'),
+                                    responses=('y1', 'y2')))
+        model.driver.workflow.add('meta')
+        model.meta.default_surrogate = ResponseSurface()
+
+        cases = [Case(inputs=[('comp.x1', x1), ('comp.x2', x2)],
+                      outputs=[('comp.y1', y1), ('comp.y2', y2)])
+                 for x1, x2, y1, y2 in [(1.0, 1.0, 3.0, 1.0),
+                                        (2.0, 3.0, 2.0, 4.0),
+                                        (3.0, 4.0, 1.0, 7.0)]]
+        names = dict((name, 'comp.' + name)
+                     for name in ('x1', 'x2', 'y1', 'y2'))
+        model.meta.train_from(iter(cases), names, chunk_size=2)
+
+        model.meta.x1 = 2.0
+        model.meta.x2 = 3.0
+        model.meta.run()
+        assert_rel_error(self, model.meta.y1, 2.0, .00001)
+        assert_rel_error(self, model.meta.y2, 4.0, .00001)
+
+    def test_train_from_columns(self):
+
+        model = set_as_top(Assembly())
+        model.add('meta', MetaModel(params=('x1', 'x2'),
+                                    responses=('y1',)))
+        model.driver.workflow.add('meta')
+        model.meta.default_surrogate = ResponseSurface()
+        model.meta.warm_restart = True
+
+        model.meta.train_from({'x1': [1.0, 3.0], 'x2': [1.0, 4.0],
+                               'y1': [3.0, 1.0]})
+        model.meta.x1 = 2.0
+        model.meta.x2 = 3.0
+        model.meta.run()
+        assert_rel_error(self, model.meta.y1, 1.9085, .001)
+
+        # Cases are appended, growing the training arrays as needed.
+        model.meta.train_from({'x1': [2.0], 'x2': [3.0], 'y1': [2.0]})
+        model.meta.run()
+        assert_rel_error(self, model.meta.y1, 2.0, .00001)
+        self.assertEqual(model.meta._training_data.size, 3)
+
+    def test_recorder(self):
+
+        model = set_as_top(Assembly())
+        model.add('meta', MetaModel(params=('x1', 'x2'),
+                                    responses=('y1',)))
+        model.driver.workflow.add('meta')
+        model.meta.default_surrogate = ResponseSurface()
+        model.meta.warm_restart = True
+        model.meta.recorder = DBCaseRecorder()
+
+        model.meta.train_from({'x1': [1.0, 3.0], 'x2': [1.0, 4.0],
+                               'y1': [3.0, 1.0]})
+        model.meta.train_from({'x1': [2.0], 'x2': [3.0], 'y1': [2.0]})
+
+        # Only the new cases are recorded on a warm restart.
+        cases = list(model.meta.recorder.get_iterator())
+        self.assertEqual([case['meta.x1'] for case in cases],
+                         [1.0, 3.0, 2.0])
+        self.assertEqual([case['meta.y1'] for case in cases],
+                         [3.0, 1.0, 2.0])
+
     def test_multi_surrogate_models_bad_surrogate_dict(self):
 
         model = set_as_top(Assembly())
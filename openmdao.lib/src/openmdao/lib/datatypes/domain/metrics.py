@@ -8,9 +8,12 @@ under need not match its class name.
 Metrics may be used with 1D, 2D, or 3D Cartesian coordinates. They may also
 be used with polar (2D) or cylindrical (3D) coordinates. :meth:`calculate`
 should be prepared for this.
+
+The predefined metrics also provide :meth:`calculate_all`, which evaluates
+the metric over an entire region of the zone in one call.
 """
 
-from math import sqrt
+import numpy
 
 from openmdao.units.units import PhysicalQuantity
 
@@ -34,7 +37,9 @@ def register_metric(name, cls, integrate, geometry='any'):
     cls: class
         Class used to calculate metric. It must contain :meth:`calculate`
         and :meth:`dimensionalize`. Constructor arguments are
-        `(zone, zone_name, reference_state)`.
+        `(zone, zone_name, reference_state)`. The zone's variable arrays
+        are restricted to the elements needed for the region being
+        evaluated.
         :meth:`calculate` will be called with `(loc, geom)`.
         `loc` contains indices into the zone variable arrays, and `geom` is
         either the cell volume, a non-dimensional vector normal
@@ -43,6 +48,13 @@ def register_metric(name, cls, integrate, geometry='any'):
         :meth:`dimensionalize` is called with the accumulated value.
         It should return a :class:`PhysicalQuantity` for the dimensionalized
         value.
+        The class may optionally contain :meth:`calculate_all`, which will
+        be called with `(region, geom)`. `region` is a tuple of slices into
+        the zone variable arrays, and `geom` contains arrays of the
+        corresponding geometry values (or None). It should return an array
+        of metric values with the same result as calling :meth:`calculate`
+        for each index in `region`. If not present, :meth:`calculate` is
+        called for each index.
 
     integrate: bool
         If True, then calculated values are integrated, not averaged.
@@ -78,11 +90,15 @@ class %(cls_name)s(object):
     """ Computes %(var_name)s. """
 
     def __init__(self, zone, zone_name, reference_state):
-        self.%(var_name)s = zone.flow_solution.%(var_name)s.item
+        self.%(var_name)s = _as_float(zone.flow_solution.%(var_name)s)
 
     def calculate(self, loc, length):
         """ Return metric value. """
-        return self.%(var_name)s(*loc)
+        return self.%(var_name)s[loc]
+
+    def calculate_all(self, region, length):
+        """ Return metric values for `region`. """
+        return self.%(var_name)s[region]
 
     def dimensionalize(self, value):
         """ Return dimensional `value`. """
@@ -92,7 +108,27 @@ register_metric('%(var_name)s', %(cls_name)s, False, 'any')
 ''' % {'var_name': var_name, 'cls_name': cls_name}
 
 
-class Area(object):
+def _as_float(arr):
+    """
+    Return `arr` as a double-precision array, so that calculations on
+    single-precision data aren't performed in single-precision.
+    """
+    return numpy.asarray(arr, dtype=float)
+
+
+class _Metric(object):
+    """
+    Base class for predefined metrics. :meth:`calculate_all` works with
+    either a region of slices or a single location, so :meth:`calculate`
+    simply uses that.
+    """
+
+    def calculate(self, loc, geom):
+        """ Return metric value. """
+        return self.calculate_all(loc, geom)
+
+
+class Area(_Metric):
     """ Computes area of mesh surface. """
 
     def __init__(self, zone, zone_name, reference_state):
@@ -108,13 +144,13 @@ class Area(object):
             self.units = aref.get_unit_name()
             self.aref = aref.value
 
-    def calculate(self, loc, normal):
-        """ Return metric value. """
+    def calculate_all(self, region, normal):
+        """ Return metric values for `region`. """
         sc1, sc2, sc3 = normal
-        sc1 *= self.aref
-        sc2 *= self.aref
-        sc3 *= self.aref
-        return sqrt(sc1*sc1 + sc2*sc2 + sc3*sc3)
+        sc1 = sc1 * self.aref
+        sc2 = sc2 * self.aref
+        sc3 = sc3 * self.aref
+        return numpy.sqrt(sc1*sc1 + sc2*sc2 + sc3*sc3)
 
     def dimensionalize(self, value):
         """ Return dimensional `value`. """
@@ -123,7 +159,7 @@ class Area(object):
 register_metric('area', Area, True, 'surface')
 
 
-class Length(object):
+class Length(_Metric):
     """ Computes length of mesh curve. """
 
     def __init__(self, zone, zone_name, reference_state):
@@ -138,8 +174,8 @@ class Length(object):
             self.units = lref.get_unit_name()
             self.lref = lref.value
 
-    def calculate(self, loc, length):
-        """ Return metric value. """
+    def calculate_all(self, region, length):
+        """ Return metric values for `region`. """
         return length * self.lref
 
     def dimensionalize(self, value):
@@ -149,7 +185,7 @@ class Length(object):
 register_metric('length', Length, True, 'curve')
 
 
-class MassFlow(object):
+class MassFlow(_Metric):
     """ Computes mass flow across a mesh surface. """
 
     def __init__(self, zone, zone_name, reference_state):
@@ -186,23 +222,23 @@ class MassFlow(object):
             self.momref = momref.value
 
         if cylindrical:
-            self.mom_c1 = None if momentum.z is None else momentum.z.item
-            self.mom_c2 = momentum.r.item
-            self.mom_c3 = momentum.t.item
+            self.mom_c1 = None if momentum.z is None else _as_float(momentum.z)
+            self.mom_c2 = _as_float(momentum.r)
+            self.mom_c3 = _as_float(momentum.t)
         else:
-            self.mom_c1 = momentum.x.item
-            self.mom_c2 = None if momentum.y is None else momentum.y.item
-            self.mom_c3 = None if momentum.z is None else momentum.z.item
-
-    def calculate(self, loc, normal):
-        """ Return metric value. """
-        rvu = 0. if self.mom_c1 is None else self.mom_c1(*loc) * self.momref
-        rvv = 0. if self.mom_c2 is None else self.mom_c2(*loc) * self.momref
-        rvw = 0. if self.mom_c3 is None else self.mom_c3(*loc) * self.momref
+            self.mom_c1 = _as_float(momentum.x)
+            self.mom_c2 = None if momentum.y is None else _as_float(momentum.y)
+            self.mom_c3 = None if momentum.z is None else _as_float(momentum.z)
+
+    def calculate_all(self, region, normal):
+        """ Return metric values for `region`. """
+        rvu = 0. if self.mom_c1 is None else self.mom_c1[region] * self.momref
+        rvv = 0. if self.mom_c2 is None else self.mom_c2[region] * self.momref
+        rvw = 0. if self.mom_c3 is None else self.mom_c3[region] * self.momref
         sc1, sc2, sc3 = normal
-        sc1 *= self.aref
-        sc2 *= self.aref
-        sc3 *= self.aref
+        sc1 = sc1 * self.aref
+        sc2 = sc2 * self.aref
+        sc3 = sc3 * self.aref
         return rvu*sc1 + rvv*sc2 + rvw*sc3
 
     def dimensionalize(self, value):
@@ -212,7 +248,7 @@ class MassFlow(object):
 register_metric('mass_flow', MassFlow, True, 'surface')
 
 
-class CorrectedMassFlow(object):
+class CorrectedMassFlow(_Metric):
     """ Computes corrected mass flow across a mesh surface. """
 
     def __init__(self, zone, zone_name, reference_state):
@@ -222,15 +258,15 @@ class CorrectedMassFlow(object):
         # 'pressure' required until we can determine dimensionalized
         # static pressure from 'Q' variables.
         try:
-            self.density = flow.density.item
+            self.density = _as_float(flow.density)
             momentum = flow.momentum
-            self.pressure = flow.pressure.item
+            self.pressure = _as_float(flow.pressure)
         except AttributeError:
             vnames = ('density', 'momentum', 'pressure')
             raise AttributeError('For corrected_mass_flow, zone %s is missing'
                                  ' one or more of %s.' % (zone_name, vnames))
         try:
-            self.gam = flow.gamma.item
+            self.gam = _as_float(flow.gamma)
         except AttributeError:
             self.gam = None  # Use passed-in scalar gamma.
 
@@ -271,29 +307,29 @@ class CorrectedMassFlow(object):
         self.tstd = tstd.value
 
         if cylindrical:
-            self.mom_c1 = None if momentum.z is None else momentum.z.item
-            self.mom_c2 = momentum.r.item
-            self.mom_c3 = momentum.t.item
+            self.mom_c1 = None if momentum.z is None else _as_float(momentum.z)
+            self.mom_c2 = _as_float(momentum.r)
+            self.mom_c3 = _as_float(momentum.t)
         else:
-            self.mom_c1 = momentum.x.item
-            self.mom_c2 = None if momentum.y is None else momentum.y.item
-            self.mom_c3 = None if momentum.z is None else momentum.z.item
-
-    def calculate(self, loc, normal):
-        """ Return metric value. """
-        rho = self.density(*loc) * self.rhoref
-        rvu = 0. if self.mom_c1 is None else self.mom_c1(*loc) * self.momref
-        rvv = 0. if self.mom_c2 is None else self.mom_c2(*loc) * self.momref
-        rvw = 0. if self.mom_c3 is None else self.mom_c3(*loc) * self.momref
-        ps = self.pressure(*loc) * self.pref
+            self.mom_c1 = _as_float(momentum.x)
+            self.mom_c2 = None if momentum.y is None else _as_float(momentum.y)
+            self.mom_c3 = None if momentum.z is None else _as_float(momentum.z)
+
+    def calculate_all(self, region, normal):
+        """ Return metric values for `region`. """
+        rho = self.density[region] * self.rhoref
+        rvu = 0. if self.mom_c1 is None else self.mom_c1[region] * self.momref
+        rvv = 0. if self.mom_c2 is None else self.mom_c2[region] * self.momref
+        rvw = 0. if self.mom_c3 is None else self.mom_c3[region] * self.momref
+        ps = self.pressure[region] * self.pref
         if self.gam is not None:
-            gamma = self.gam(*loc)
+            gamma = self.gam[region]
         else:
             gamma = self.gamma
         sc1, sc2, sc3 = normal
-        sc1 *= self.aref
-        sc2 *= self.aref
-        sc3 *= self.aref
+        sc1 = sc1 * self.aref
+        sc2 = sc2 * self.aref
+        sc3 = sc3 * self.aref
         w = rvu*sc1 + rvv*sc2 + rvw*sc3
 
         u2 = (rvu*rvu + rvv*rvv + rvw*rvw) / (rho*rho)
@@ -304,7 +340,7 @@ class CorrectedMassFlow(object):
 
         pt = ps * pow(1. + (gamma-1.)/2. * mach2, gamma/(gamma-1.))
 
-        return w * sqrt(tt/self.tstd) / (pt/self.pstd)
+        return w * numpy.sqrt(tt/self.tstd) / (pt/self.pstd)
 
     def dimensionalize(self, value):
         """ Dimensionalize `value`. """
@@ -313,7 +349,7 @@ class CorrectedMassFlow(object):
 register_metric('corrected_mass_flow', CorrectedMassFlow, True, 'surface')
 
 
-class StaticPressure(object):
+class StaticPressure(_Metric):
     """ Computes weighted static pressure for a mesh region. """
 
     def __init__(self, zone, zone_name, reference_state):
@@ -321,20 +357,20 @@ class StaticPressure(object):
         cylindrical = zone.coordinate_system == CYLINDRICAL
 
         try:  # Some codes have this directly available.
-            self.pressure = flow.pressure.item
+            self.pressure = _as_float(flow.pressure)
         except AttributeError:
             self.pressure = None
             try:  # Look for typical Q variables.
-                self.density = flow.density.item
+                self.density = _as_float(flow.density)
                 momentum = flow.momentum
-                self.energy = flow.energy_stagnation_density.item
+                self.energy = _as_float(flow.energy_stagnation_density)
             except AttributeError:
                 vnames = ('pressure', 'density', 'momentum',
                           'energy_stagnation_density')
                 raise AttributeError('For pressure, zone %s is missing'
                                      ' one or more of %s.' % (zone_name, vnames))
         try:
-            self.gam = flow.gamma.item
+            self.gam = _as_float(flow.gamma)
         except AttributeError:
             self.gam = None  # Use passed-in scalar gamma.
 
@@ -376,26 +412,26 @@ class StaticPressure(object):
 
         if self.pressure is None:
             if cylindrical:
-                self.mom_c1 = None if momentum.z is None else momentum.z.item
-                self.mom_c2 = momentum.r.item
-                self.mom_c3 = momentum.t.item
+                self.mom_c1 = None if momentum.z is None else _as_float(momentum.z)
+                self.mom_c2 = _as_float(momentum.r)
+                self.mom_c3 = _as_float(momentum.t)
             else:
-                self.mom_c1 = momentum.x.item
-                self.mom_c2 = None if momentum.y is None else momentum.y.item
-                self.mom_c3 = None if momentum.z is None else momentum.z.item
+                self.mom_c1 = _as_float(momentum.x)
+                self.mom_c2 = None if momentum.y is None else _as_float(momentum.y)
+                self.mom_c3 = None if momentum.z is None else _as_float(momentum.z)
 
-    def calculate(self, loc, geom):
-        """ Return metric value. """
+    def calculate_all(self, region, geom):
+        """ Return metric values for `region`. """
         if self.pressure is not None:
-            return self.pressure(*loc) * self.pref
+            return self.pressure[region] * self.pref
         else:
-            rho = self.density(*loc) * self.rhoref
-            vu = 0. if self.mom_c1 is None else self.mom_c1(*loc) * self.momref / rho
-            vv = 0. if self.mom_c2 is None else self.mom_c2(*loc) * self.momref / rho
-            vw = 0. if self.mom_c3 is None else self.mom_c3(*loc) * self.momref / rho
-            e0 = self.energy(*loc) * self.e0ref / rho
+            rho = self.density[region] * self.rhoref
+            vu = 0. if self.mom_c1 is None else self.mom_c1[region] * self.momref / rho
+            vv = 0. if self.mom_c2 is None else self.mom_c2[region] * self.momref / rho
+            vw = 0. if self.mom_c3 is None else self.mom_c3[region] * self.momref / rho
+            e0 = self.energy[region] * self.e0ref / rho
             if self.gam is not None:
-                gamma = self.gam(*loc)
+                gamma = self.gam[region]
             else:
                 gamma = self.gamma
 
@@ -408,7 +444,7 @@ class StaticPressure(object):
 register_metric('pressure', StaticPressure, False)
 
 
-class TotalPressure(object):
+class TotalPressure(_Metric):
     """ Computes weighted total pressure for a mesh region. """
 
     def __init__(self, zone, zone_name, reference_state):
@@ -416,24 +452,24 @@ class TotalPressure(object):
         cylindrical = zone.coordinate_system == CYLINDRICAL
 
         try:
-            self.density = flow.density.item
+            self.density = _as_float(flow.density)
             momentum = flow.momentum
         except AttributeError:
             vnames = ('density', 'momentum')
             raise AttributeError('For pressure_stagnation, zone %s is missing'
                              ' one or more of %s.' % (zone_name, vnames))
         try:
-            self.pressure = flow.pressure.item
+            self.pressure = _as_float(flow.pressure)
         except AttributeError:
             self.pressure = None
             try:
-                self.energy = flow.energy_stagnation_density.item
+                self.energy = _as_float(flow.energy_stagnation_density)
             except AttributeError:
                 vnames = ('pressure', 'energy_stagnation_density')
                 raise AttributeError('For pressure_stagnation, zone %s is missing'
                                      ' one or more of %s.' % (zone_name, vnames))
         try:
-            self.gam = flow.gamma.item
+            self.gam = _as_float(flow.gamma)
         except AttributeError:
             self.gam = None  # Use passed-in scalar gamma.
 
@@ -468,30 +504,30 @@ class TotalPressure(object):
             self.pref = pref.value
 
         if cylindrical:
-            self.mom_c1 = None if momentum.z is None else momentum.z.item
-            self.mom_c2 = momentum.r.item
-            self.mom_c3 = momentum.t.item
+            self.mom_c1 = None if momentum.z is None else _as_float(momentum.z)
+            self.mom_c2 = _as_float(momentum.r)
+            self.mom_c3 = _as_float(momentum.t)
         else:
-            self.mom_c1 = momentum.x.item
-            self.mom_c2 = None if momentum.y is None else momentum.y.item
-            self.mom_c3 = None if momentum.z is None else momentum.z.item
-
-    def calculate(self, loc, geom):
-        """ Return metric value. """
-        rho = self.density(*loc) * self.rhoref
-        vu = 0. if self.mom_c1 is None else self.mom_c1(*loc) * self.momref / rho
-        vv = 0. if self.mom_c2 is None else self.mom_c2(*loc) * self.momref / rho
-        vw = 0. if self.mom_c3 is None else self.mom_c3(*loc) * self.momref / rho
+            self.mom_c1 = _as_float(momentum.x)
+            self.mom_c2 = None if momentum.y is None else _as_float(momentum.y)
+            self.mom_c3 = None if momentum.z is None else _as_float(momentum.z)
+
+    def calculate_all(self, region, geom):
+        """ Return metric values for `region`. """
+        rho = self.density[region] * self.rhoref
+        vu = 0. if self.mom_c1 is None else self.mom_c1[region] * self.momref / rho
+        vv = 0. if self.mom_c2 is None else self.mom_c2[region] * self.momref / rho
+        vw = 0. if self.mom_c3 is None else self.mom_c3[region] * self.momref / rho
         if self.gam is not None:
-            gamma = self.gam(*loc)
+            gamma = self.gam[region]
         else:
             gamma = self.gamma
 
         u2 = vu*vu + vv*vv + vw*vw
         if self.pressure is not None:
-            ps = self.pressure(*loc) * self.pref
+            ps = self.pressure[region] * self.pref
         else:
-            e0 = self.energy(*loc) * self.e0ref / rho
+            e0 = self.energy[region] * self.e0ref / rho
             ps = (gamma-1.) * rho * (e0 - 0.5*u2)
         a2 = (gamma * ps) / rho
         mach2 = u2 / a2
@@ -504,7 +540,7 @@ class TotalPressure(object):
 register_metric('pressure_stagnation', TotalPressure, False)
 
 
-class StaticTemperature(object):
+class StaticTemperature(_Metric):
     """ Computes weighted static temperature for a mesh region. """
 
     def __init__(self, zone, zone_name, reference_state):
@@ -512,23 +548,23 @@ class StaticTemperature(object):
         cylindrical = zone.coordinate_system == CYLINDRICAL
 
         try:
-            self.density = flow.density.item
+            self.density = _as_float(flow.density)
         except AttributeError:
             raise AttributeError('For temperature, zone %s is missing'
                                  ' density.' % zone_name)
         try:
-            self.pressure = flow.pressure.item
+            self.pressure = _as_float(flow.pressure)
         except AttributeError:
             self.pressure = None
             try:  # Look for typical Q variables.
                 momentum = flow.momentum
-                self.energy = flow.energy_stagnation_density.item
+                self.energy = _as_float(flow.energy_stagnation_density)
             except AttributeError:
                 vnames = ('pressure', 'momentum', 'energy_stagnation_density')
                 raise AttributeError('For temperature, zone %s is missing'
                                      ' one or more of %s.' % (zone_name, vnames))
         try:
-            self.gam = flow.gamma.item
+            self.gam = _as_float(flow.gamma)
         except AttributeError:
             self.gam = None  # Use passed-in scalar gamma.
 
@@ -569,26 +605,26 @@ class StaticTemperature(object):
 
         if self.pressure is None:
             if cylindrical:
-                self.mom_c1 = None if momentum.z is None else momentum.z.item
-                self.mom_c2 = momentum.r.item
-                self.mom_c3 = momentum.t.item
+                self.mom_c1 = None if momentum.z is None else _as_float(momentum.z)
+                self.mom_c2 = _as_float(momentum.r)
+                self.mom_c3 = _as_float(momentum.t)
             else:
-                self.mom_c1 = momentum.x.item
-                self.mom_c2 = None if momentum.y is None else momentum.y.item
-                self.mom_c3 = None if momentum.z is None else momentum.z.item
+                self.mom_c1 = _as_float(momentum.x)
+                self.mom_c2 = None if momentum.y is None else _as_float(momentum.y)
+                self.mom_c3 = None if momentum.z is None else _as_float(momentum.z)
 
-    def calculate(self, loc, geom):
-        """ Return metric value. """
-        rho = self.density(*loc) * self.rhoref
+    def calculate_all(self, region, geom):
+        """ Return metric values for `region`. """
+        rho = self.density[region] * self.rhoref
         if self.pressure is not None:
-            ps = self.pressure(*loc) * self.pref
+            ps = self.pressure[region] * self.pref
         else:
-            vu = 0. if self.mom_c1 is None else self.mom_c1(*loc) * self.momref / rho
-            vv = 0. if self.mom_c2 is None else self.mom_c2(*loc) * self.momref / rho
-            vw = 0. if self.mom_c3 is None else self.mom_c3(*loc) * self.momref / rho
-            e0 = self.energy(*loc) * self.e0ref / rho
+            vu = 0. if self.mom_c1 is None else self.mom_c1[region] * self.momref / rho
+            vv = 0. if self.mom_c2 is None else self.mom_c2[region] * self.momref / rho
+            vw = 0. if self.mom_c3 is None else self.mom_c3[region] * self.momref / rho
+            e0 = self.energy[region] * self.e0ref / rho
             if self.gam is not None:
-                gamma = self.gam(*loc)
+                gamma = self.gam[region]
             else:
                 gamma = self.gamma
             ps = (gamma-1.) * rho * (e0 - 0.5*(vu*vu + vv*vv + vw*vw))
@@ -601,7 +637,7 @@ class StaticTemperature(object):
 register_metric('temperature', StaticTemperature, False)
 
 
-class TotalTemperature(object):
+class TotalTemperature(_Metric):
     """ Computes weighted total temperature for a mesh region. """
 
     def __init__(self, zone, zone_name, reference_state):
@@ -609,24 +645,24 @@ class TotalTemperature(object):
         cylindrical = zone.coordinate_system == CYLINDRICAL
 
         try:
-            self.density = flow.density.item
+            self.density = _as_float(flow.density)
             momentum = flow.momentum
         except AttributeError:
             vnames = ('density', 'momentum')
             raise AttributeError('For temperature_stagnation, zone %s is missing'
                                  ' one or more of %s.' % (zone_name, vnames))
         try:
-            self.pressure = flow.pressure.item
+            self.pressure = _as_float(flow.pressure)
         except AttributeError:
             self.pressure = None
             try:
-                self.energy = flow.energy_stagnation_density.item
+                self.energy = _as_float(flow.energy_stagnation_density)
             except AttributeError:
                 vnames = ('pressure', 'energy_stagnation_density')
                 raise AttributeError('For temperature_stagnation, zone %s is'
                                      ' one or more of %s.' % (zone_name, vnames))
         try:
-            self.gam = flow.gamma.item
+            self.gam = _as_float(flow.gamma)
         except AttributeError:
             self.gam = None  # Use passed-in scalar gamma.
 
@@ -662,30 +698,30 @@ class TotalTemperature(object):
             self.tref = tref
 
         if cylindrical:
-            self.mom_c1 = None if momentum.z is None else momentum.z.item
-            self.mom_c2 = momentum.r.item
-            self.mom_c3 = momentum.t.item
+            self.mom_c1 = None if momentum.z is None else _as_float(momentum.z)
+            self.mom_c2 = _as_float(momentum.r)
+            self.mom_c3 = _as_float(momentum.t)
         else:
-            self.mom_c1 = momentum.x.item
-            self.mom_c2 = None if momentum.y is None else momentum.y.item
-            self.mom_c3 = None if momentum.z is None else momentum.z.item
-
-    def calculate(self, loc, geom):
-        """ Return metric value. """
-        rho = self.density(*loc) * self.rhoref
-        vu = 0. if self.mom_c1 is None else self.mom_c1(*loc) * self.momref / rho
-        vv = 0. if self.mom_c2 is None else self.mom_c2(*loc) * self.momref / rho
-        vw = 0. if self.mom_c3 is None else self.mom_c3(*loc) * self.momref / rho
+            self.mom_c1 = _as_float(momentum.x)
+            self.mom_c2 = None if momentum.y is None else _as_float(momentum.y)
+            self.mom_c3 = None if momentum.z is None else _as_float(momentum.z)
+
+    def calculate_all(self, region, geom):
+        """ Return metric values for `region`. """
+        rho = self.density[region] * self.rhoref
+        vu = 0. if self.mom_c1 is None else self.mom_c1[region] * self.momref / rho
+        vv = 0. if self.mom_c2 is None else self.mom_c2[region] * self.momref / rho
+        vw = 0. if self.mom_c3 is None else self.mom_c3[region] * self.momref / rho
         if self.gam is not None:
-            gamma = self.gam(*loc)
+            gamma = self.gam[region]
         else:
             gamma = self.gamma
 
         u2 = vu*vu + vv*vv + vw*vw
         if self.pressure is not None:
-            ps = self.pressure(*loc) * self.pref
+            ps = self.pressure[region] * self.pref
         else:
-            e0 = self.energy(*loc) * self.e0ref / rho
+            e0 = self.energy[region] * self.e0ref / rho
             ps = (gamma-1.) * rho * (e0 - 0.5*u2)
         a2 = (gamma * ps) / rho
         mach2 = u2 / a2
@@ -699,7 +735,7 @@ class TotalTemperature(object):
 register_metric('temperature_stagnation', TotalTemperature, False)
 
 
-class Volume(object):
+class Volume(_Metric):
     """ Computes volume of mesh volume. """
 
     def __init__(self, zone, zone_name, reference_state):
@@ -715,8 +751,8 @@ class Volume(object):
             self.units = volref.get_unit_name()
             self.volref = volref.value
 
-    def calculate(self, loc, volume):
-        """ Return metric value. """
+    def calculate_all(self, region, volume):
+        """ Return metric values for `region`. """
         return volume * self.volref
 
     def dimensionalize(self, value):
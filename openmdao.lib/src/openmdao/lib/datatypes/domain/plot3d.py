@@ -29,6 +29,13 @@ unformatted: bool
     If True, the data is surrounded by Fortran record length markers.
     Only meaningful if `binary`.
 
+lazy: bool
+    If True, the file's record structure is scanned and arrays are returned
+    as memory-mapped views of the file, so data is only read when accessed.
+    Useful for large files where only some zones or variables are needed.
+    Changes to these arrays are not written back to the file.
+    Only meaningful if `binary`.
+
 logger: Logger or None
     Used to record progress.
 
@@ -49,7 +56,8 @@ from openmdao.lib.datatypes.domain.vector import Vector
 
 def read_plot3d_q(grid_file, q_file, multiblock=True, dim=3, blanking=False,
                   planes=False, binary=True, big_endian=False,
-                  single_precision=True, unformatted=True, logger=None):
+                  single_precision=True, unformatted=True, lazy=False,
+                  logger=None):
     """
     Returns a :class:`DomainObj` initialized from Plot3D `grid_file` and
     `q_file`.  Q variables are assigned to 'density', 'momentum', and
@@ -66,7 +74,7 @@ def read_plot3d_q(grid_file, q_file, multiblock=True, dim=3, blanking=False,
 
     domain = read_plot3d_grid(grid_file, multiblock, dim, blanking, planes,
                               binary, big_endian, single_precision,
-                              unformatted, logger)
+                              unformatted, lazy, logger)
 
     mode = 'rb' if binary else 'r'
     with open(q_file, mode) as inp:
@@ -116,14 +124,15 @@ def read_plot3d_q(grid_file, q_file, multiblock=True, dim=3, blanking=False,
             name = domain.zone_name(zone)
             logger.debug('reading data for %s', name)
             _read_plot3d_qscalars(zone, stream, logger)
-            _read_plot3d_qvars(zone, stream, planes, logger)
+            _read_plot3d_qvars(zone, stream, planes, lazy, logger)
 
     return domain
 
 
 def read_plot3d_f(grid_file, f_file, varnames=None, multiblock=True, dim=3,
                   blanking=False, planes=False, binary=True, big_endian=False,
-                  single_precision=True, unformatted=True, logger=None):
+                  single_precision=True, unformatted=True, lazy=False,
+                  logger=None):
     """
     Returns a :class:`DomainObj` initialized from Plot3D `grid_file` and
     `f_file`.  Variables are assigned to names of the form `f_N`.
@@ -138,7 +147,7 @@ def read_plot3d_f(grid_file, f_file, varnames=None, multiblock=True, dim=3,
 
     domain = read_plot3d_grid(grid_file, multiblock, dim, blanking, planes,
                               binary, big_endian, single_precision,
-                              unformatted, logger)
+                              unformatted, lazy, logger)
 
     mode = 'rb' if binary else 'r'
     with open(f_file, mode) as inp:
@@ -189,13 +198,14 @@ def read_plot3d_f(grid_file, f_file, varnames=None, multiblock=True, dim=3,
             name = domain.zone_name(zone)
             logger.debug('reading data for %s', name)
             _read_plot3d_fvars(zone, stream, dim, nvars, varnames, planes,
-                               logger)
+                               lazy, logger)
     return domain
 
 
 def read_plot3d_grid(grid_file, multiblock=True, dim=3, blanking=False,
                      planes=False, binary=True, big_endian=False,
-                     single_precision=True, unformatted=True, logger=None):
+                     single_precision=True, unformatted=True, lazy=False,
+                     logger=None):
     """
     Returns a :class:`DomainObj` initialized from Plot3D `grid_file`.
 
@@ -205,6 +215,9 @@ def read_plot3d_grid(grid_file, multiblock=True, dim=3, blanking=False,
     logger = logger or NullLogger()
     domain = DomainObj()
 
+    if lazy and not binary:
+        raise ValueError('lazy reading requires binary data')
+
     mode = 'rb' if binary else 'r'
     with open(grid_file, mode) as inp:
         logger.info('reading grid file %r', grid_file)
@@ -220,7 +233,7 @@ def read_plot3d_grid(grid_file, multiblock=True, dim=3, blanking=False,
             name = domain.zone_name(zone)
             logger.debug('reading coordinates for %s', name)
             _read_plot3d_coords(zone, stream, shape[i], blanking, planes,
-                                logger)
+                                lazy, logger)
     return domain
 
 
@@ -311,7 +324,7 @@ def _read_plot3d_dims(stream, dim, f_file=False):
         return (imax, jmax, kmax)
 
 
-def _read_plot3d_coords(zone, stream, shape, blanking, planes, logger):
+def _read_plot3d_coords(zone, stream, shape, blanking, planes, lazy, logger):
     """ Reads coordinates (& blanking) from given Plot3D stream. """
     if blanking:
         raise NotImplementedError('blanking not supported yet')
@@ -332,18 +345,13 @@ def _read_plot3d_coords(zone, stream, shape, blanking, planes, logger):
             logger.warning('unexpected coords recordlength'
                            ' %d vs. %d', reclen, expected)
 
-    zone.grid_coordinates.x = stream.read_floats(shape, order='Fortran')
-    logger.debug('    x min %g, max %g',
-                 zone.grid_coordinates.x.min(), zone.grid_coordinates.x.max())
-
-    zone.grid_coordinates.y = stream.read_floats(shape, order='Fortran')
-    logger.debug('    y min %g, max %g',
-                 zone.grid_coordinates.y.min(), zone.grid_coordinates.y.max())
-
+    zone.grid_coordinates.x = _read_plot3d_array(stream, shape, lazy,
+                                                 'x', logger)
+    zone.grid_coordinates.y = _read_plot3d_array(stream, shape, lazy,
+                                                 'y', logger)
     if dim > 2:
-        zone.grid_coordinates.z = stream.read_floats(shape, order='Fortran')
-        logger.debug('    z min %g, max %g',
-                     zone.grid_coordinates.z.min(), zone.grid_coordinates.z.max())
+        zone.grid_coordinates.z = _read_plot3d_array(stream, shape, lazy,
+                                                     'z', logger)
 
     if stream.unformatted:
         reclen2 = stream.read_recordmark()
@@ -363,7 +371,7 @@ def _read_plot3d_qscalars(zone, stream, logger):
     zone.flow_solution.time = time
 
 
-def _read_plot3d_qvars(zone, stream, planes, logger):
+def _read_plot3d_qvars(zone, stream, planes, lazy, logger):
     """ Reads 'density', 'momentum' and 'energy_stagnation_density'. """
     if planes:
         raise NotImplementedError('planar format not supported yet')
@@ -384,27 +392,18 @@ def _read_plot3d_qvars(zone, stream, planes, logger):
             logger.warning('unexpected Q variables recordlength'
                            ' %d vs. %d', reclen, expected)
     name = 'density'
-    arr = stream.read_floats(shape, order='Fortran')
-    logger.debug('    %s min %g, max %g', name, arr.min(), arr.max())
+    arr = _read_plot3d_array(stream, shape, lazy, name, logger)
     zone.flow_solution.add_array(name, arr)
 
     vec = Vector()
-
-    vec.x = stream.read_floats(shape, order='Fortran')
-    logger.debug('    momentum.x min %g, max %g', vec.x.min(), vec.x.max())
-
-    vec.y = stream.read_floats(shape, order='Fortran')
-    logger.debug('    momentum.y min %g, max %g', vec.y.min(), vec.y.max())
-
+    vec.x = _read_plot3d_array(stream, shape, lazy, 'momentum.x', logger)
+    vec.y = _read_plot3d_array(stream, shape, lazy, 'momentum.y', logger)
     if dim > 2:
-        vec.z = stream.read_floats(shape, order='Fortran')
-        logger.debug('    momentum.z min %g, max %g', vec.z.min(), vec.z.max())
-
+        vec.z = _read_plot3d_array(stream, shape, lazy, 'momentum.z', logger)
     zone.flow_solution.add_vector('momentum', vec)
 
     name = 'energy_stagnation_density'
-    arr = stream.read_floats(shape, order='Fortran')
-    logger.debug('    %s min %g, max %g', name, arr.min(), arr.max())
+    arr = _read_plot3d_array(stream, shape, lazy, name, logger)
     zone.flow_solution.add_array(name, arr)
 
     if stream.unformatted:
@@ -414,7 +413,8 @@ def _read_plot3d_qvars(zone, stream, planes, logger):
                            ' %d vs. %d', reclen2, reclen)
 
 
-def _read_plot3d_fvars(zone, stream, dim, nvars, varnames, planes, logger):
+def _read_plot3d_fvars(zone, stream, dim, nvars, varnames, planes, lazy,
+                       logger):
     """ Reads 'function' variables. """
     if planes:
         raise NotImplementedError('planar format not supported yet')
@@ -439,9 +439,8 @@ def _read_plot3d_fvars(zone, stream, dim, nvars, varnames, planes, logger):
             name = varnames[i]
         else:
             name = 'f_%d' % (i+1)
-        arr = stream.read_floats(shape, order='Fortran')
+        arr = _read_plot3d_array(stream, shape, lazy, name, logger)
         zone.flow_solution.add_array(name, arr)
-        logger.debug('    %s min %g, max %g', name, arr.min(), arr.max())
 
     if stream.unformatted:
         reclen2 = stream.read_recordmark()
@@ -450,6 +449,20 @@ def _read_plot3d_fvars(zone, stream, dim, nvars, varnames, planes, logger):
                            ' %d vs. %d', reclen2, reclen)
 
 
+def _read_plot3d_array(stream, shape, lazy, name, logger):
+    """
+    Reads a Fortran-ordered float array of `shape` from given Plot3D stream.
+    If `lazy`, the array is memory-mapped rather than read.
+    """
+    if lazy:
+        arr = stream.map_floats(shape, order='Fortran')
+        logger.debug('    %s mapped at offset %d', name, arr.offset)
+    else:
+        arr = stream.read_floats(shape, order='Fortran')
+        logger.debug('    %s min %g, max %g', name, arr.min(), arr.max())
+    return arr
+
+
 def write_plot3d_q(domain, grid_file, q_file, planes=False, binary=True,
                    big_endian=False, single_precision=True, unformatted=True,
                    logger=None):
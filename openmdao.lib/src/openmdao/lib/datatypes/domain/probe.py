@@ -3,14 +3,54 @@ Support for calculating one or more scalar averages across one or more
 regions in a domain.
 """
 
-from math import cos, sin, sqrt
+import numpy
 
-from openmdao.lib.datatypes.domain.flow import CELL_CENTER
+from openmdao.lib.datatypes.domain.flow import CELL_CENTER, FlowSolution
+from openmdao.lib.datatypes.domain.vector import Vector
 from openmdao.lib.datatypes.domain.zone import CYLINDRICAL
 from openmdao.lib.datatypes.domain.metrics import get_metric, list_metrics, \
-                                                  create_scalar_metric
+                                                  create_scalar_metric, \
+                                                  _as_float
 _SCHEMES = ('area', 'mass')
 
+# Index offsets from the low corner of a region element (cell, face, or edge)
+# to the data locations averaged for that element. Cell-centered data has
+# a built-in ghost cell, so the cell 'behind' a vertex is offset by one.
+# FIXME: built-in ghosts
+_VOLUME_CELLS = ((1, 1, 1),)
+_VOLUME_NODES = ((0, 0, 0), (0, 1, 0), (0, 1, 1), (0, 0, 1),
+                 (1, 0, 0), (1, 1, 0), (1, 1, 1), (1, 0, 1))
+
+# Indexed by axis normal to face.
+_FACE_CELLS = (((1, 1, 1), (0, 1, 1)),
+               ((1, 1, 1), (1, 0, 1)),
+               ((1, 1, 1), (1, 1, 0)))
+_FACE_NODES = (((0, 0, 0), (0, 1, 0), (0, 1, 1), (0, 0, 1)),
+               ((0, 0, 0), (1, 0, 0), (1, 0, 1), (0, 0, 1)),
+               ((0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0)))
+
+# 2D (index space) cells.
+_CELL_CELLS = ((1, 1),)
+_CELL_NODES = ((0, 0), (1, 0), (1, 1), (0, 1))
+
+# Indexed by index space dimension, then axis along edge.
+_EDGE_CELLS = {
+    3: (((1, 1, 1), (1, 0, 1), (1, 1, 0), (1, 0, 0)),
+        ((1, 1, 1), (0, 1, 1), (1, 1, 0), (0, 1, 0)),
+        ((1, 1, 1), (0, 1, 1), (1, 0, 1), (0, 0, 1))),
+    2: (((1, 1), (1, 0)),
+        ((1, 1), (0, 1))),
+    1: (((1,),),),
+}
+_EDGE_NODES = {
+    3: (((0, 0, 0), (1, 0, 0)),
+        ((0, 0, 0), (0, 1, 0)),
+        ((0, 0, 0), (0, 0, 1))),
+    2: (((0, 0), (1, 0)),
+        ((0, 0), (0, 1))),
+    1: (((0,), (1,)),),
+}
+
 # TODO: account for ghost cells in index calculations.
 
 
@@ -234,279 +274,139 @@ def _calc_weights(scheme, domain, regions):
     weight_total = 0.
     for region in regions:
         dim = _get_dimension(region)
+        zone_name = region[0]
+        zone, region = _window(getattr(domain, zone_name), region)
 
         if dim == 3:
-            zone_weights = _volume_weights(scheme, domain, region)
+            zone_weights = _volume_weights(scheme, zone, region)
         elif dim == 2:
             if len(region) == 7:
-                zone_weights = _surface_weights_3d(scheme, domain, region)
+                zone_weights = _surface_weights_3d(scheme, zone, region)
             else:
-                zone_weights = _surface_weights_2d(scheme, domain, region)
+                zone_weights = _surface_weights_2d(scheme, zone, region)
         elif dim == 1:
-            if len(region) == 7:
-                zone_weights = _curve_weights_3d(scheme, domain, region)
-            elif len(region) == 5:
-                zone_weights = _curve_weights_2d(scheme, domain, region)
-            else:
-                zone_weights = _curve_weights_1d(scheme, domain, region)
+            zone_weights = _curve_weights(scheme, zone, region)
         else:
-            zone_weights = [1.]
+            zone_weights = numpy.ones(1)
 
-        zone_name = region[0]
-        zone = getattr(domain, zone_name)
-        zone_weights *= zone.symmetry_instances  # Adjust for symmetry.
         if zone_name in weights:
             raise RuntimeError('Zone %r used more than once' % zone_name)
         else:
             weights[zone_name] = zone_weights
-        weight_total += sum(zone_weights)
+        # Adjust for symmetry.
+        weight_total += _sum(zone_weights) * zone.symmetry_instances
 
     return (weights, weight_total)
 
 
-def _volume_weights(scheme, domain, region):
+def _volume_weights(scheme, zone, region):
     """ Returns weights for a mesh volume. """
-    raise NotImplementedError('_volume_weights')
+    zone_name, imin, imax, jmin, jmax, kmin, kmax = region
+    grid = zone.grid_coordinates
+    flow = zone.flow_solution
+    cylindrical = zone.coordinate_system == CYLINDRICAL
+    cell_center = flow.grid_location == CELL_CENTER
+
+    c1, c2, c3 = _coordinates(grid, cylindrical)
+    ranges = ((imin, imax), (jmin, jmax), (kmin, kmax))
+    volume = _cell_volume(c1, c2, c3, ranges, cylindrical)
+
+    if scheme == 'mass':
+        try:
+            density = _as_float(flow.density)
+        except AttributeError:
+            raise AttributeError("For mass averaging zone %s is missing"
+                                 " 'density'." % zone_name)
+        offsets = _VOLUME_CELLS if cell_center else _VOLUME_NODES
+        return _average(density, ranges, offsets) * volume
+    else:
+        return volume
 
 
-def _surface_weights_3d(scheme, domain, region):
+def _surface_weights_3d(scheme, zone, region):
     """ Returns 3D (index space) weights for a mesh surface. """
     zone_name, imin, imax, jmin, jmax, kmin, kmax = region
-    zone = getattr(domain, zone_name)
     grid = zone.grid_coordinates
     flow = zone.flow_solution
     cylindrical = zone.coordinate_system == CYLINDRICAL
     cell_center = flow.grid_location == CELL_CENTER
 
-    if cylindrical:
-        c1 = grid.z.item
-        c2 = grid.r.item
-        c3 = grid.t.item
-    else:
-        c1 = grid.x.item
-        c2 = grid.y.item
-        c3 = grid.z.item
+    c1, c2, c3 = _coordinates(grid, cylindrical)
 
     if scheme == 'mass':
         try:
-            if cylindrical:
-                mom_c1 = flow.momentum.z.item
-                mom_c2 = flow.momentum.r.item
-                mom_c3 = flow.momentum.t.item
-            else:
-                mom_c1 = flow.momentum.x.item
-                mom_c2 = flow.momentum.y.item
-                mom_c3 = flow.momentum.z.item
+            mom_c1, mom_c2, mom_c3 = _coordinates(flow.momentum, cylindrical)
         except AttributeError:
             raise AttributeError("For mass averaging zone %s is missing"
                                  " 'momentum'." % zone_name)
     if imin == imax:
         imax += 1
+        axis = 0
         face_normal = _iface_normal
-        face_value = _iface_cell_value if cell_center else _iface_node_value
     elif jmin == jmax:
         jmax += 1
+        axis = 1
         face_normal = _jface_normal
-        face_value = _jface_cell_value if cell_center else _jface_node_value
     else:
         kmax += 1
+        axis = 2
         face_normal = _kface_normal
-        face_value = _kface_cell_value if cell_center else _kface_node_value
-
-    weights = []
-    for i in range(imin, imax):
-        for j in range(jmin, jmax):
-            for k in range(kmin, kmax):
-                sc1, sc2, sc3 = face_normal(c1, c2, c3, i, j, k, cylindrical)
-                if scheme == 'mass':
-                    loc = (i, j, k)
-                    rvu = face_value(mom_c1, loc)
-                    rvv = face_value(mom_c2, loc)
-                    rvw = face_value(mom_c3, loc)
-                    weights.append(rvu*sc1 + rvv*sc2 + rvw*sc3)
-                else:
-                    weights.append(sqrt(sc1*sc1 + sc2*sc2 + sc3*sc3))
-    return weights
+
+    ranges = ((imin, imax), (jmin, jmax), (kmin, kmax))
+    sc1, sc2, sc3 = face_normal(c1, c2, c3, ranges, cylindrical)
+    if scheme == 'mass':
+        offsets = _FACE_CELLS[axis] if cell_center else _FACE_NODES[axis]
+        rvu = _average(mom_c1, ranges, offsets)
+        rvv = _average(mom_c2, ranges, offsets)
+        rvw = _average(mom_c3, ranges, offsets)
+        return rvu*sc1 + rvv*sc2 + rvw*sc3
+    else:
+        return numpy.sqrt(sc1*sc1 + sc2*sc2 + sc3*sc3)
 
 
-def _surface_weights_2d(scheme, domain, region):
+def _surface_weights_2d(scheme, zone, region):
     """ Returns 2D (index space) weights for a mesh surface. """
     zone_name, imin, imax, jmin, jmax = region
-    zone = getattr(domain, zone_name)
     grid = zone.grid_coordinates
     flow = zone.flow_solution
     cylindrical = zone.coordinate_system == CYLINDRICAL
     cell_center = flow.grid_location == CELL_CENTER
 
-    if cylindrical:
-        c1 = None if grid.z is None else grid.z.item
-        c2 = grid.r.item
-        c3 = grid.t.item
-    else:
-        c1 = grid.x.item
-        c2 = grid.y.item
-        c3 = None if grid.z is None else grid.z.item
+    c1, c2, c3 = _coordinates(grid, cylindrical)
 
     if scheme == 'mass':
         try:
-            if cylindrical:
-                mom_c1 = None if flow.momentum.z is None else flow.momentum.z.item
-                mom_c2 = flow.momentum.r.item
-                mom_c3 = flow.momentum.t.item
-            else:
-                mom_c1 = flow.momentum.x.item
-                mom_c2 = flow.momentum.y.item
-                mom_c3 = None if flow.momentum.z is None else flow.momentum.z.item
+            mom_c1, mom_c2, mom_c3 = _coordinates(flow.momentum, cylindrical)
         except AttributeError:
             raise AttributeError("For mass averaging zone %s is missing"
                                  " 'momentum'." % zone_name)
 
-    weights = []
-    for i in range(imin, imax):
-        for j in range(jmin, jmax):
-                sc1, sc2, sc3 = _cell_normal(c1, c2, c3, i, j, cylindrical)
-                if scheme == 'mass':
-                    ip1 = i + 1
-                    jp1 = j + 1
-                    if cell_center:
-                        # Cell value is value.
-# FIXME: built-in ghosts
-                        rvu = 0. if mom_c1 is None else mom_c1(ip1, jp1)
-                        rvv = mom_c2(ip1, jp1)
-                        rvw = 0. if mom_c1 is None else mom_c3(ip1, jp1)
-                    else:
-                        # Average across vertices.
-                        if mom_c1 is None:
-                            rvu = 0.
-                        else:
-                            rvu = 0.25 * (mom_c1(i, j) + mom_c1(ip1, j) + \
-                                          mom_c1(i, jp1) + mom_c1(ip1, jp1))
-                        rvv = 0.25 * (mom_c2(i, j) + mom_c2(ip1, j) + \
-                                      mom_c2(i, jp1) + mom_c2(ip1, jp1))
-                        if mom_c3 is None:
-                            rvw = 0.
-                        else:
-                            rvw = 0.25 * (mom_c3(i, j) + mom_c3(ip1, j) + \
-                                          mom_c3(i, jp1) + mom_c3(ip1, jp1))
-                    weights.append(rvu*sc1 + rvv*sc2 + rvw*sc3)
-                else:
-                    weights.append(sqrt(sc1*sc1 + sc2*sc2 + sc3*sc3))
-    return weights
-
-
-def _curve_weights_3d(scheme, domain, region):
-    """ Returns 3D (index space) weights for a mesh curve. """
-    zone_name, imin, imax, jmin, jmax, kmin, kmax = region
-    zone = getattr(domain, zone_name)
-    grid = zone.grid_coordinates
-    cylindrical = zone.coordinate_system == CYLINDRICAL
-
-    if cylindrical:
-        raise NotImplementedError('curve weights for cylindrical coordinates')
-    else:
-        x = grid.x.item
-        y = grid.y.item
-        z = grid.z.item
-
+    ranges = ((imin, imax), (jmin, jmax))
+    sc1, sc2, sc3 = _cell_normal(c1, c2, c3, ranges, cylindrical)
     if scheme == 'mass':
-        raise NotImplementedError('curve mass averaging')
-
-    along_i, along_j = False, False
-    if imin != imax:
-        along_i = True
-        jmax += 1
-        kmax += 1
-    elif jmin != jmax:
-        along_j = True
-        imax += 1
-        kmax += 1
+        offsets = _CELL_CELLS if cell_center else _CELL_NODES
+        rvu = _average(mom_c1, ranges, offsets)
+        rvv = _average(mom_c2, ranges, offsets)
+        rvw = _average(mom_c3, ranges, offsets)
+        return rvu*sc1 + rvv*sc2 + rvw*sc3
     else:
-        imax += 1
-        jmax += 1
-
-    weights = []
-    for i in range(imin, imax):
-        for j in range(jmin, jmax):
-            for k in range(kmin, kmax):
-                if along_i:
-                    dx = x(i+1, j, k) - x(i, j, k)
-                    dy = y(i+1, j, k) - y(i, j, k)
-                    dz = z(i+1, j, k) - z(i, j, k)
-                elif along_j:
-                    dx = x(i, j+1, k) - x(i, j, k)
-                    dy = y(i, j+1, k) - y(i, j, k)
-                    dz = z(i, j+1, k) - z(i, j, k)
-                else:
-                    dx = x(i, j, k+1) - x(i, j, k)
-                    dy = y(i, j, k+1) - y(i, j, k)
-                    dz = z(i, j, k+1) - z(i, j, k)
-                weights.append(sqrt(dx*dx + dy*dy + dz*dz))
-    return weights
+        return numpy.sqrt(sc1*sc1 + sc2*sc2 + sc3*sc3)
 
 
-def _curve_weights_2d(scheme, domain, region):
-    """ Returns 2D (index space) weights for a mesh curve. """
-    zone_name, imin, imax, jmin, jmax = region
-    zone = getattr(domain, zone_name)
+def _curve_weights(scheme, zone, region):
+    """ Returns 1D, 2D, or 3D (index space) weights for a mesh curve. """
     grid = zone.grid_coordinates
     cylindrical = zone.coordinate_system == CYLINDRICAL
 
     if cylindrical:
         raise NotImplementedError('curve weights for cylindrical coordinates')
-    else:
-        x = grid.x.item
-        y = grid.y.item
-        z = None if grid.z is None else grid.z.item
 
     if scheme == 'mass':
         raise NotImplementedError('curve mass averaging')
 
-    if imin != imax:
-        along_i = True
-        jmax += 1
-    else:
-        along_i = False
-        imax += 1
-
-    weights = []
-    for i in range(imin, imax):
-        for j in range(jmin, jmax):
-                if along_i:
-                    dx = x(i+1, j) - x(i, j)
-                    dy = y(i+1, j) - y(i, j)
-                    dz = 0. if z is None else z(i+1, j) - z(i, j)
-                else:
-                    dx = x(i, j+1) - x(i, j)
-                    dy = y(i, j+1) - y(i, j)
-                    dz = 0. if z is None else z(i, j+1) - z(i, j)
-                weights.append(sqrt(dx*dx + dy*dy + dz*dz))
-    return weights
-
-
-def _curve_weights_1d(scheme, domain, region):
-    """ Returns 1D (index space) weights for a mesh curve. """
-    zone_name, imin, imax = region
-    zone = getattr(domain, zone_name)
-    grid = zone.grid_coordinates
-    cylindrical = zone.coordinate_system == CYLINDRICAL
-
-    if cylindrical:
-        raise NotImplementedError('curve weights for cylindrical coordinates')
-    else:
-        x = grid.x.item
-        y = None if grid.y is None else grid.y.item
-        z = None if grid.z is None else grid.z.item
-
-    if scheme == 'mass':
-        raise NotImplementedError('curve mass averaging')
-
-    weights = []
-    for i in range(imin, imax):
-        dx = x(i+1) - x(i)
-        dy = 0. if y is None else y(i+1) - y(i)
-        dz = 0. if z is None else z(i+1) - z(i)
-        weights.append(sqrt(dx*dx + dy*dy + dz*dz))
-    return weights
+    c1, c2, c3 = _coordinates(grid, cylindrical)
+    ranges, axis = _edge_ranges(region)
+    return _edge_length(c1, c2, c3, ranges, axis, cylindrical)
 
 
 def _calc_metric(name, domain, region, weights, reference_state):
@@ -514,7 +414,7 @@ def _calc_metric(name, domain, region, weights, reference_state):
     Calculate metric `name` on `region` using `weights` and `reference_state`.
     """
     zone_name = region[0]
-    zone = getattr(domain, zone_name)
+    zone, region = _window(getattr(domain, zone_name), region)
     cls, integrate, geometry = get_metric(name)
     metric = cls(zone, zone_name, reference_state)
     weights = weights.get(zone_name)
@@ -535,12 +435,7 @@ def _calc_metric(name, domain, region, weights, reference_state):
     elif dim == 1:
         if geometry not in ('curve', 'any'):
             raise RuntimeError('metric %r not applicable to curves')
-        if len(region) == 7:
-            total = _curve_3d(metric, integrate, zone, region, weights)
-        elif len(region) == 5:
-            total = _curve_2d(metric, integrate, zone, region, weights)
-        else:
-            total = _curve_1d(metric, integrate, zone, region, weights)
+        total = _curve(metric, integrate, zone, region, weights)
     else:
         if geometry != 'any':
             raise RuntimeError('metric %r not applicable to points')
@@ -554,56 +449,22 @@ def _calc_metric(name, domain, region, weights, reference_state):
 
 def _volume(metric, integrate, zone, region, weights):
     """ Calculate metric on a volume. """
-    raise NotImplementedError('metric calculation on volume')
-''' Not implemented yet
     zone_name, imin, imax, jmin, jmax, kmin, kmax = region
     grid = zone.grid_coordinates
     flow = zone.flow_solution
     cylindrical = zone.coordinate_system == CYLINDRICAL
     cell_center = flow.grid_location == CELL_CENTER
 
-    if cylindrical: 
-        c1 = grid.z.item
-        c2 = grid.r.item
-        c3 = grid.t.item
-    else:
-        c1 = grid.x.item
-        c2 = grid.y.item
-        c3 = grid.z.item
+    c1, c2, c3 = _coordinates(grid, cylindrical)
+    ranges = ((imin, imax), (jmin, jmax), (kmin, kmax))
 
-    vol = None
-    weight_index = 0
-    total = 0.
-    for i in range(imin, imax):
-        for j in range(jmin, jmax):
-            for k in range(kmin, kmax):
-
-# TODO: calculate volume for integrating.
+    if integrate:
+        volume = _cell_volume(c1, c2, c3, ranges, cylindrical)
+    else:
+        volume = None
 
-                if cell_center:
-# FIXME: built-in ghosts
-                    # Cell value is value.
-                    val = metric.calculate((i+1, j+1, k+1), vol)
-                else:
-                    # Average across vertices.
-                    val  = metric.calculate((i, j, k), vol)
-                    val += metric.calculate((i, j+1, k), vol)
-                    val += metric.calculate((i, j+1, k+1), vol)
-                    val += metric.calculate((i, j, k+1), vol)
-                    val += metric.calculate((i+1, j, k), vol)
-                    val += metric.calculate((i+1, j+1, k), vol)
-                    val += metric.calculate((i+1, j+1, k+1), vol)
-                    val += metric.calculate((i+1, j, k+1), vol)
-                    val *= 0.125
-
-                if integrate:
-                    total += val
-                else:
-                    weight = weights[weight_index]
-                    weight_index += 1
-                    total += val * weight
-    return total
-'''
+    offsets = _VOLUME_CELLS if cell_center else _VOLUME_NODES
+    return _total(metric, integrate, ranges, offsets, volume, weights)
 
 
 def _surface_3d(metric, integrate, zone, region, weights):
@@ -614,73 +475,31 @@ def _surface_3d(metric, integrate, zone, region, weights):
     cylindrical = zone.coordinate_system == CYLINDRICAL
     cell_center = flow.grid_location == CELL_CENTER
 
-    if cylindrical: 
-        c1 = grid.z.item
-        c2 = grid.r.item
-        c3 = grid.t.item
-    else:
-        c1 = grid.x.item
-        c2 = grid.y.item
-        c3 = grid.z.item
+    c1, c2, c3 = _coordinates(grid, cylindrical)
 
-    if imin == imax: 
-        face = 'i'
+    if imin == imax:
+        axis = 0
         imax += 1
         get_normal = _iface_normal
     elif jmin == jmax:
-        face = 'j'
-        jmax += 1 
+        axis = 1
+        jmax += 1
         get_normal = _jface_normal
     else:
-        face = 'k'
+        axis = 2
         kmax += 1
         get_normal = _kface_normal
 
-    normal = None
-    weight_index = 0
-    total = 0.
-    for i in range(imin, imax):
-        for j in range(jmin, jmax):
-            for k in range(kmin, kmax):
-
-                if integrate:
-                    normal = get_normal(c1, c2, c3, i, j, k, cylindrical)
-    
-                if cell_center:
-# FIXME: built-in ghosts
-                    # Average across cells sharing surface.
-                    val = metric.calculate((i+1, j+1, k+1), normal)
-                    if face == 'i':
-                        val += metric.calculate((i, j+1, k+1), normal)
-                    elif face == 'j':
-                        val += metric.calculate((i+1, j, k+1), normal)
-                    else:
-                        val += metric.calculate((i+1, j+1, k), normal)
-                    val *= 0.5
-                else:
-                    # Average across vertices.
-                    val = metric.calculate((i, j, k), normal)
-                    if face == 'i':
-                        val += metric.calculate((i, j+1, k), normal)
-                        val += metric.calculate((i, j+1, k+1), normal)
-                        val += metric.calculate((i, j, k+1), normal)
-                    elif face == 'j':
-                        val += metric.calculate((i+1, j, k), normal)
-                        val += metric.calculate((i+1, j, k+1), normal)
-                        val += metric.calculate((i, j, k+1), normal)
-                    else:
-                        val += metric.calculate((i+1, j, k), normal)
-                        val += metric.calculate((i+1, j+1, k), normal)
-                        val += metric.calculate((i, j+1, k), normal)
-                    val *= 0.25
-
-                if integrate:
-                    total += val
-                else:
-                    weight = weights[weight_index]
-                    weight_index += 1
-                    total += val * weight
-    return total
+    ranges = ((imin, imax), (jmin, jmax), (kmin, kmax))
+
+    if integrate:
+        normal = get_normal(c1, c2, c3, ranges, cylindrical)
+    else:
+        normal = None
+
+    # Average across cells sharing surface or across vertices.
+    offsets = _FACE_CELLS[axis] if cell_center else _FACE_NODES[axis]
+    return _total(metric, integrate, ranges, offsets, normal, weights)
 
 
 def _surface_2d(metric, integrate, zone, region, weights):
@@ -691,231 +510,40 @@ def _surface_2d(metric, integrate, zone, region, weights):
     cylindrical = zone.coordinate_system == CYLINDRICAL
     cell_center = flow.grid_location == CELL_CENTER
 
-    if cylindrical: 
-        c1 = None if grid.z is None else grid.z.item
-        c2 = grid.r.item
-        c3 = grid.t.item
-    else:
-        c1 = grid.x.item
-        c2 = grid.y.item
-        c3 = None if grid.z is None else grid.z.item
+    c1, c2, c3 = _coordinates(grid, cylindrical)
+    ranges = ((imin, imax), (jmin, jmax))
 
-    normal = None
-    weight_index = 0
-    total = 0.
-    for i in range(imin, imax):
-        for j in range(jmin, jmax):
-
-            if integrate:
-                normal = _cell_normal(c1, c2, c3, i, j, cylindrical)
-    
-            if cell_center:
-# FIXME: built-in ghosts
-                # Cell value is value.
-                val = metric.calculate((i+1, j+1), normal)
-            else:
-                # Average across vertices.
-                val  = metric.calculate((i, j), normal)
-                val += metric.calculate((i, j+1), normal)
-                val += metric.calculate((i+1, j+1), normal)
-                val += metric.calculate((i+1, j), normal)
-                val *= 0.25
-
-            if integrate:
-                total += val
-            else:
-                weight = weights[weight_index]
-                weight_index += 1
-                total += val * weight
-    return total
-
-
-def _curve_3d(metric, integrate, zone, region, weights):
-    """ Calculate metric on a 3D (index space) curve. """
-    zone_name, imin, imax, jmin, jmax, kmin, kmax = region
-    grid = zone.grid_coordinates
-    flow = zone.flow_solution
-    cylindrical = zone.coordinate_system == CYLINDRICAL
-    cell_center = flow.grid_location == CELL_CENTER
-
-    if cylindrical: 
-        c1 = grid.z.item
-        c2 = grid.r.item
-        c3 = grid.t.item
+    if integrate:
+        normal = _cell_normal(c1, c2, c3, ranges, cylindrical)
     else:
-        c1 = grid.x.item
-        c2 = grid.y.item
-        c3 = grid.z.item
+        normal = None
 
-    if imin != imax:
-        edge = 'i'
-        jmax += 1
-        kmax += 1
-        get_length = _iedge_length
-    elif jmin != jmax:
-        edge = 'j'
-        imax += 1
-        kmax += 1
-        get_length = _jedge_length
-    else:
-        edge = 'k'
-        imax += 1
-        jmax += 1
-        get_length = _kedge_length
-
-    length = None
-    weight_index = 0
-    total = 0.
-    for i in range(imin, imax):
-        for j in range(jmin, jmax):
-            for k in range(kmin, kmax):
-
-                if integrate:
-                    length = get_length(c1, c2, c3, (i, j, k), cylindrical)
-
-                if cell_center:
-# FIXME: built-in ghosts
-                    # Average across cells sharing edge.
-                    val = metric.calculate((i+1, j+1, k+1), length)
-                    if edge == 'i':
-                        val += metric.calculate((i+1, j, k+1), length)
-                        val += metric.calculate((i+1, j+1, k), length)
-                        val += metric.calculate((i+1, j, k), length)
-                    elif edge == 'j':
-                        val += metric.calculate((i, j+1, k+1), length)
-                        val += metric.calculate((i+1, j+1, k), length)
-                        val += metric.calculate((i, j+1, k), length)
-                    else:
-                        val += metric.calculate((i, j+1, k+1), length)
-                        val += metric.calculate((i+1, j, k+1), length)
-                        val += metric.calculate((i, j, k+1), length)
-                    val *= 0.25
-                else:
-                    # Average across vertices.
-                    val = metric.calculate((i, j, k), length)
-                    if edge == 'i':
-                        val += metric.calculate((i+1, j, k), length)
-                    elif edge == 'j':
-                         val +=metric.calculate((i, j+1, k), length)
-                    else:
-                         val +=metric.calculate((i, j, k+1), length)
-                    val *= 0.5
-
-                if integrate:
-                    total += val
-                else:
-                    weight = weights[weight_index]
-                    weight_index += 1
-                    total += val * weight
-    return total
+    # Cell value is value, or average across vertices.
+    offsets = _CELL_CELLS if cell_center else _CELL_NODES
+    return _total(metric, integrate, ranges, offsets, normal, weights)
 
 
-def _curve_2d(metric, integrate, zone, region, weights):
-    """ Calculate metric on a 2D (index space) curve. """
-    zone_name, imin, imax, jmin, jmax = region
+def _curve(metric, integrate, zone, region, weights):
+    """ Calculate metric on a 1D, 2D, or 3D (index space) curve. """
     grid = zone.grid_coordinates
     flow = zone.flow_solution
     cylindrical = zone.coordinate_system == CYLINDRICAL
     cell_center = flow.grid_location == CELL_CENTER
 
-    if cylindrical: 
-        c1 = None if grid.z is None else grid.z.item
-        c2 = grid.r.item
-        c3 = grid.t.item
-    else:
-        c1 = grid.x.item
-        c2 = grid.y.item
-        c3 = None if grid.z is None else grid.z.item
+    c1, c2, c3 = _coordinates(grid, cylindrical)
+    ranges, axis = _edge_ranges(region)
 
-    if imin != imax:
-        edge = 'i'
-        jmax += 1
-        get_length = _iedge_length
+    if integrate:
+        length = _edge_length(c1, c2, c3, ranges, axis, cylindrical)
     else:
-        edge = 'j'
-        imax += 1
-        get_length = _jedge_length
-
-    length = None
-    weight_index = 0
-    total = 0.
-    for i in range(imin, imax):
-        for j in range(jmin, jmax):
-
-            if integrate:
-                length = get_length(c1, c2, c3, (i, j), cylindrical)
-
-            if cell_center:
-# FIXME: built-in ghosts
-                # Average across cells sharing edge.
-                val = metric.calculate((i+1, j+1), length)
-                if edge == 'i':
-                    val += metric.calculate((i+1, j), length)
-                else:
-                    val += metric.calculate((i, j+1), length)
-                val *= 0.5
-            else:
-                # Average across vertices.
-                val = metric.calculate((i, j), length)
-                if edge == 'i':
-                    val += metric.calculate((i+1, j), length)
-                else:
-                    val += metric.calculate((i, j+1), length)
-                val *= 0.5
-
-            if integrate:
-                total += val
-            else:
-                weight = weights[weight_index]
-                weight_index += 1
-                total += val * weight
-    return total
-
+        length = None
 
-def _curve_1d(metric, integrate, zone, region, weights):
-    """ Calculate metric on a 1D (index space) curve. """
-    zone_name, imin, imax = region
-    grid = zone.grid_coordinates
-    flow = zone.flow_solution
-    cylindrical = zone.coordinate_system == CYLINDRICAL
-    cell_center = flow.grid_location == CELL_CENTER
-
-    if cylindrical:
-        c1 = None if grid.z is None else grid.z.item
-        c2 = grid.r.item
-        c3 = grid.t.item
+    # Average across cells sharing edge or across vertices.
+    if cell_center:
+        offsets = _EDGE_CELLS[len(ranges)][axis]
     else:
-        c1 = grid.x.item
-        c2 = None if grid.y is None else grid.y.item
-        c3 = None if grid.z is None else grid.z.item
-
-    get_length = _iedge_length
-
-    length = None
-    weight_index = 0
-    total = 0.
-    for i in range(imin, imax):
-
-        if integrate:
-            length = get_length(c1, c2, c3, (i,), cylindrical)
-
-        if cell_center:
-# FIXME: built-in ghosts
-            # Cell value is value.
-            val = metric.calculate((i+1,), length)
-        else:
-            # Average across vertices.
-            val  = metric.calculate((i,), length)
-            val += metric.calculate((i+1,), length)
-            val *= 0.5
-
-        if integrate:
-            total += val
-        else:
-            weight = weights[weight_index]
-            weight_index += 1
-            total += val * weight
-    return total
+        offsets = _EDGE_NODES[len(ranges)][axis]
+    return _total(metric, integrate, ranges, offsets, length, weights)
 
 
 def _point(metric, zone, region):
@@ -963,27 +591,161 @@ def _point(metric, zone, region):
             return metric.calculate((imin,), None)
 
 
-def _iface_normal(c1, c2, c3, i, j, k, cylindrical):
+def _window(zone, region):
+    """
+    Return ``(zone, region)`` restricted to the array elements used to
+    evaluate `region`, with `region` indices relative to the restriction.
+    Only array views are created, so lazily read arrays are only read
+    (and converted to float) around the region.
+    """
+    lows = region[1::2]
+    highs = region[2::2]
+    # Elements are averaged over, at most, the next index in each direction.
+    window = tuple(slice(low, high+2) for low, high in zip(lows, highs))
+    relative = [region[0]]
+    for low, high in zip(lows, highs):
+        relative.extend((0, high-low))
+    return (_Window(zone, window), tuple(relative))
+
+
+class _Window(object):
+    """
+    Presents the attributes of `obj` with array values restricted to
+    `window` and :class:`GridCoordinates`, :class:`FlowSolution`, and
+    :class:`Vector` values similarly wrapped.
+    """
+
+    def __init__(self, obj, window):
+        self._obj = obj
+        self._window = window
+
+    def __getattr__(self, name):
+        value = getattr(self._obj, name)
+        if isinstance(value, numpy.ndarray):
+            return value[self._window]
+        elif isinstance(value, (FlowSolution, Vector)):
+            return _Window(value, self._window)
+        return value
+
+
+def _total(metric, integrate, ranges, offsets, geom, weights):
+    """
+    Return the integrated or weighted total of `metric` values across
+    `ranges`. Each value is the average of the metric evaluated at `offsets`.
+    """
+    val = _evaluate(metric, _slices(ranges, offsets[0]), geom)
+    for offset in offsets[1:]:
+        val = val + _evaluate(metric, _slices(ranges, offset), geom)
+    if len(offsets) > 1:
+        val = val * (1. / len(offsets))
+
+    if integrate:
+        return _sum(val)
+    else:
+        return _sum(val * weights)
+
+
+def _evaluate(metric, region, geom):
+    """
+    Return array of `metric` values for `region`. Metrics without
+    :meth:`calculate_all` are evaluated one index at a time.
+    """
+    try:
+        calculate_all = metric.calculate_all
+    except AttributeError:
+        pass
+    else:
+        return calculate_all(region, geom)
+
+    shape = tuple(index.stop - index.start for index in region)
+    values = numpy.empty(shape)
+    for ijk in numpy.ndindex(*shape):
+        loc = tuple(index.start + offset for index, offset in zip(region, ijk))
+        if geom is None:
+            item = None
+        elif isinstance(geom, tuple):
+            item = tuple(component[ijk] for component in geom)
+        else:
+            item = geom[ijk]
+        values[ijk] = metric.calculate(loc, item)
+    return values
+
+
+def _average(arr, ranges, offsets):
+    """ Return average of `arr` across `ranges` shifted by `offsets`. """
+    val = arr[_slices(ranges, offsets[0])]
+    for offset in offsets[1:]:
+        val = val + arr[_slices(ranges, offset)]
+    if len(offsets) > 1:
+        val = val * (1. / len(offsets))
+    return val
+
+
+def _sum(values):
+    """
+    Return sum of `values`. The array is flattened first so that a region
+    and its extracted/demoted equivalent produce identical results.
+    """
+    return numpy.sum(values.ravel())
+
+
+def _slices(ranges, offsets):
+    """ Return tuple of slices for index `ranges` shifted by `offsets`. """
+    return tuple(slice(low+offset, high+offset)
+                 for (low, high), offset in zip(ranges, offsets))
+
+
+def _edge_ranges(region):
+    """
+    Return ``(ranges, axis)`` for the edges of the curve `region`.
+    `axis` is the index direction the curve runs along.
+    """
+    ranges = [(region[i], region[i+1]) for i in range(1, len(region), 2)]
+    for axis, (low, high) in enumerate(ranges):
+        if low != high:
+            break
+    ranges = [(low, high) if i == axis else (low, high+1)
+              for i, (low, high) in enumerate(ranges)]
+    return (ranges, axis)
+
+
+def _coordinates(vector, cylindrical):
+    """
+    Return ``(c1, c2, c3)`` arrays for `vector`, ordered (z, r, t) for
+    cylindrical coordinates or (x, y, z) for Cartesian coordinates.
+    Missing components are returned as None.
+    """
+    if cylindrical:
+        components = (vector.z, vector.r, vector.t)
+    else:
+        components = (vector.x, vector.y, vector.z)
+    return tuple(None if arr is None else _as_float(arr) for arr in components)
+
+
+def _iface_normal(c1, c2, c3, ranges, cylindrical):
     """
-    Return non-dimensional vector normal to I face with magnitude equal to area.
+    Return non-dimensional vectors normal to I faces with magnitude equal
+    to area.
     """
 # FIXME: built-in ghosts
-    jp1 = j + 1
-    kp1 = k + 1
+    s000 = _slices(ranges, (0, 0, 0))
+    s010 = _slices(ranges, (0, 1, 0))
+    s001 = _slices(ranges, (0, 0, 1))
+    s011 = _slices(ranges, (0, 1, 1))
 
     # upper-left - lower-right.
-    diag_c11 = c1(i, jp1, k) - c1(i, j, kp1)
-    diag_c21 = c2(i, jp1, k) - c2(i, j, kp1)
-    diag_c31 = c3(i, jp1, k) - c3(i, j, kp1)
+    diag_c11 = c1[s010] - c1[s001]
+    diag_c21 = c2[s010] - c2[s001]
+    diag_c31 = c3[s010] - c3[s001]
 
     # upper-right - lower-left.
-    diag_c12 = c1(i, jp1, kp1) - c1(i, j, k)
-    diag_c22 = c2(i, jp1, kp1) - c2(i, j, k)
-    diag_c32 = c3(i, jp1, kp1) - c3(i, j, k)
+    diag_c12 = c1[s011] - c1[s000]
+    diag_c22 = c2[s011] - c2[s000]
+    diag_c32 = c3[s011] - c3[s000]
 
     if cylindrical:
-        r1 = (c2(i, j, kp1) + c2(i, jp1, k  )) / 2.
-        r2 = (c2(i, j, k  ) + c2(i, jp1, kp1)) / 2.
+        r1 = (c2[s001] + c2[s010]) / 2.
+        r2 = (c2[s000] + c2[s011]) / 2.
     else:
         r1 = 1.
         r2 = 1.
@@ -995,27 +757,30 @@ def _iface_normal(c1, c2, c3, i, j, k, cylindrical):
     return (sc1, sc2, sc3)
 
 
-def _jface_normal(c1, c2, c3, i, j, k, cylindrical):
+def _jface_normal(c1, c2, c3, ranges, cylindrical):
     """
-    Return non-dimensional vector normal to J face with magnitude equal to area.
+    Return non-dimensional vectors normal to J faces with magnitude equal
+    to area.
     """
 # FIXME: built-in ghosts
-    ip1 = i + 1
-    kp1 = k + 1
+    s000 = _slices(ranges, (0, 0, 0))
+    s100 = _slices(ranges, (1, 0, 0))
+    s001 = _slices(ranges, (0, 0, 1))
+    s101 = _slices(ranges, (1, 0, 1))
 
     # upper-left - lower-right.
-    diag_c11 = c1(ip1, j, k) - c1(i, j, kp1)
-    diag_c21 = c2(ip1, j, k) - c2(i, j, kp1)
-    diag_c31 = c3(ip1, j, k) - c3(i, j, kp1)
+    diag_c11 = c1[s100] - c1[s001]
+    diag_c21 = c2[s100] - c2[s001]
+    diag_c31 = c3[s100] - c3[s001]
 
     # upper-right - lower-left.
-    diag_c12 = c1(ip1, j, kp1) - c1(i, j, k)
-    diag_c22 = c2(ip1, j, kp1) - c2(i, j, k)
-    diag_c32 = c3(ip1, j, kp1) - c3(i, j, k)
+    diag_c12 = c1[s101] - c1[s000]
+    diag_c22 = c2[s101] - c2[s000]
+    diag_c32 = c3[s101] - c3[s000]
 
     if cylindrical:
-        r1 = (c2(i, j, kp1) + c2(ip1, j, k  )) / 2.
-        r2 = (c2(i, j, k  ) + c2(ip1, j, kp1)) / 2.
+        r1 = (c2[s001] + c2[s100]) / 2.
+        r2 = (c2[s000] + c2[s101]) / 2.
     else:
         r1 = 1.
         r2 = 1.
@@ -1027,27 +792,30 @@ def _jface_normal(c1, c2, c3, i, j, k, cylindrical):
     return (sc1, sc2, sc3)
 
 
-def _kface_normal(c1, c2, c3, i, j, k, cylindrical):
+def _kface_normal(c1, c2, c3, ranges, cylindrical):
     """
-    Return non-dimensional vector normal to K face with magnitude equal to area.
+    Return non-dimensional vectors normal to K faces with magnitude equal
+    to area.
     """
 # FIXME: built-in ghosts
-    ip1 = i + 1
-    jp1 = j + 1
+    s000 = _slices(ranges, (0, 0, 0))
+    s100 = _slices(ranges, (1, 0, 0))
+    s010 = _slices(ranges, (0, 1, 0))
+    s110 = _slices(ranges, (1, 1, 0))
 
     # upper-left - lower-right.
-    diag_c11 = c1(i, jp1, k) - c1(ip1, j, k)
-    diag_c21 = c2(i, jp1, k) - c2(ip1, j, k)
-    diag_c31 = c3(i, jp1, k) - c3(ip1, j, k)
+    diag_c11 = c1[s010] - c1[s100]
+    diag_c21 = c2[s010] - c2[s100]
+    diag_c31 = c3[s010] - c3[s100]
 
     # upper-right - lower-left.
-    diag_c12 = c1(ip1, jp1, k) - c1(i, j, k)
-    diag_c22 = c2(ip1, jp1, k) - c2(i, j, k)
-    diag_c32 = c3(ip1, jp1, k) - c3(i, j, k)
+    diag_c12 = c1[s110] - c1[s000]
+    diag_c22 = c2[s110] - c2[s000]
+    diag_c32 = c3[s110] - c3[s000]
 
     if cylindrical:
-        r1 = (c2(i, jp1, k) + c2(ip1, j,   k)) / 2.
-        r2 = (c2(i, j,   k) + c2(ip1, jp1, k)) / 2.
+        r1 = (c2[s010] + c2[s100]) / 2.
+        r2 = (c2[s000] + c2[s110]) / 2.
     else:
         r1 = 1.
         r2 = 1.
@@ -1059,29 +827,31 @@ def _kface_normal(c1, c2, c3, i, j, k, cylindrical):
     return (sc1, sc2, sc3)
 
 
-def _cell_normal(c1, c2, c3, i, j, cylindrical):
+def _cell_normal(c1, c2, c3, ranges, cylindrical):
     """
-    Return non-dimensional vector normal with magnitude equal to area.
-    If there is no 'z' coordinate, `c1` will be None in cylindrical
+    Return non-dimensional vectors normal to cells with magnitude equal
+    to area. If there is no 'z' coordinate, `c1` will be None in cylindrical
     coordinates, otherwise `c3` will be None.
     """
 # FIXME: built-in ghosts
-    ip1 = i + 1
-    jp1 = j + 1
+    s00 = _slices(ranges, (0, 0))
+    s10 = _slices(ranges, (1, 0))
+    s01 = _slices(ranges, (0, 1))
+    s11 = _slices(ranges, (1, 1))
 
     # upper-left - lower-right.
-    diag_c11 = 0. if c1 is None else c1(i, jp1) - c1(ip1, j)
-    diag_c21 = c2(i, jp1) - c2(ip1, j)
-    diag_c31 = 0. if c3 is None else c3(i, jp1) - c3(ip1, j)
+    diag_c11 = 0. if c1 is None else c1[s01] - c1[s10]
+    diag_c21 = c2[s01] - c2[s10]
+    diag_c31 = 0. if c3 is None else c3[s01] - c3[s10]
 
     # upper-right - lower-left.
-    diag_c12 = 0. if c1 is None else c1(ip1, jp1) - c1(i, j)
-    diag_c22 = c2(ip1, jp1) - c2(i, j)
-    diag_c32 = 0. if c3 is None else c3(ip1, jp1) - c3(i, j)
+    diag_c12 = 0. if c1 is None else c1[s11] - c1[s00]
+    diag_c22 = c2[s11] - c2[s00]
+    diag_c32 = 0. if c3 is None else c3[s11] - c3[s00]
 
     if cylindrical:
-        r1 = (c2(i, jp1) + c2(ip1, j)) / 2.
-        r2 = (c2(i, j) + c2(ip1, jp1)) / 2.
+        r1 = (c2[s01] + c2[s10]) / 2.
+        r2 = (c2[s00] + c2[s11]) / 2.
     else:
         r1 = 1.
         r2 = 1.
@@ -1093,138 +863,54 @@ def _cell_normal(c1, c2, c3, i, j, cylindrical):
     return (sc1, sc2, sc3)
 
 
-def _iedge_length(c1, c2, c3, loc, cylindrical):
-    """ Return length of edge along 'i'. """
-    if cylindrical:
-        if len(loc) > 2:
-            i, j, k = loc
-            ip1 = i + 1
-            theta = c3(ip1, j, k) - c3(i, j, k)
-            dx = c2(ip1, j, k) * cos(theta) - c2(i, j, k)
-            dy = c2(ip1, j, k) * sin(theta)
-            dz = c1(ip1, j, k) - c1(i, j, k)
-        elif len(loc) > 1:
-            i, j = loc
-            ip1 = i + 1
-            theta = c3(ip1, j) - c3(i, j)
-            dx = c2(ip1, j) * cos(theta) - c2(i, j)
-            dy = c2(ip1, j) * sin(theta)
-            dz = 0. if c1 is None else c1(ip1, j) - c1(i, j)
-        else:
-            i, = loc
-            ip1 = i + 1
-            theta = c3(ip1) - c3(i)
-            dx = c2(ip1) * cos(theta) - c2(i)
-            dy = c2(ip1) * sin(theta)
-            dz = 0. if c1 is None else c1(ip1) - c1(i)
-    else:
-        if len(loc) > 2:
-            i, j, k = loc
-            ip1 = i + 1
-            dx = c1(ip1, j, k) - c1(i, j, k)
-            dy = c2(ip1, j, k) - c2(i, j, k)
-            dz = c3(ip1, j, k) - c3(i, j, k)
-        elif len(loc) > 1:
-            i, j = loc
-            ip1 = i + 1
-            dx = c1(ip1, j) - c1(i, j)
-            dy = c2(ip1, j) - c2(i, j)
-            dz = 0. if c3 is None else c3(ip1, j) - c3(i, j)
-        else:
-            i, = loc
-            ip1 = i + 1
-            dx = c1(ip1) - c1(i)
-            dy = 0. if c2 is None else c2(ip1) - c2(i)
-            dz = 0. if c3 is None else c3(ip1) - c3(i)
-
-    return sqrt(dx*dx + dy*dy + dz*dz)
-
-
-def _jedge_length(c1, c2, c3, loc, cylindrical):
-    """ Return length of edge along 'j'. """
+def _cell_volume(c1, c2, c3, ranges, cylindrical):
+    """
+    Return volumes of cells, obtained by applying the divergence theorem
+    to the cell faces: V = 1/3 * sum(face_center . face_normal).
+    """
     if cylindrical:
-        if len(loc) > 2:
-            i, j, k = loc
-            jp1 = j + 1
-            theta = c3(i, jp1, k) - c3(i, j, k)
-            dx = c2(i, jp1, k) * cos(theta) - c2(i, j, k)
-            dy = c2(i, jp1, k) * sin(theta)
-            dz = c1(i, jp1, k) - c1(i, j, k)
-        else:
-            i, j = loc
-            jp1 = j + 1
-            theta = c3(i, jp1) - c3(i, j)
-            dx = c2(i, jp1) * cos(theta) - c2(i, j)
-            dy = c2(i, jp1) * sin(theta)
-            dz = 0. if c1 is None else c1(i, jp1) - c1(i, j)
-    else:
-        if len(loc) > 2:
-            i, j, k = loc
-            jp1 = j + 1
-            dx = c1(i, jp1, k) - c1(i, j, k)
-            dy = c2(i, jp1, k) - c2(i, j, k)
-            dz = c3(i, jp1, k) - c3(i, j, k)
-        else:
-            i, j = loc
-            jp1 = j + 1
-            dx = c1(i, jp1) - c1(i, j)
-            dy = c2(i, jp1) - c2(i, j)
-            dz = 0. if c3 is None else c3(i, jp1) - c3(i, j)
-
-    return sqrt(dx*dx + dy*dy + dz*dz)
+        raise NotImplementedError('volume for cylindrical coordinates')
 
+    face_normals = (_iface_normal, _jface_normal, _kface_normal)
+    total = 0.
+    for axis, face_normal in enumerate(face_normals):
+        faces = list(ranges)
+        low, high = faces[axis]
+        faces[axis] = (low, high+1)
+
+        sc1, sc2, sc3 = face_normal(c1, c2, c3, faces, cylindrical)
+        center_c1 = _average(c1, faces, _FACE_NODES[axis])
+        center_c2 = _average(c2, faces, _FACE_NODES[axis])
+        center_c3 = _average(c3, faces, _FACE_NODES[axis])
+        flux = center_c1*sc1 + center_c2*sc2 + center_c3*sc3
+
+        # Face normals point towards decreasing index, so the outward
+        # normal is the normal of the low face and the negated normal of
+        # the high face.
+        lower = [slice(None)] * 3
+        upper = [slice(None)] * 3
+        lower[axis] = slice(None, -1)
+        upper[axis] = slice(1, None)
+        total = total + (flux[tuple(lower)] - flux[tuple(upper)])
+
+    return total / 3.
+
+
+def _edge_length(c1, c2, c3, ranges, axis, cylindrical):
+    """ Return lengths of edges along `axis`. """
+    offsets = [0] * len(ranges)
+    lower = _slices(ranges, offsets)
+    offsets[axis] = 1
+    upper = _slices(ranges, offsets)
 
-def _kedge_length(c1, c2, c3, loc, cylindrical):
-    """ Return length of edge along 'k'. """
-    i, j, k = loc
-    kp1 = k + 1
     if cylindrical:
-        theta = c3(i, j, kp1) - c3(i, j, k)
-        dx = c2(i, j, kp1) * cos(theta) - c2(i, j, k)
-        dy = c2(i, j, kp1) * sin(theta)
-        dz = c1(i, j, kp1) - c1(i, j, k)
+        theta = c3[upper] - c3[lower]
+        dx = c2[upper] * numpy.cos(theta) - c2[lower]
+        dy = c2[upper] * numpy.sin(theta)
+        dz = 0. if c1 is None else c1[upper] - c1[lower]
     else:
-        dx = c1(i, j, kp1) - c1(i, j, k)
-        dy = c2(i, j, kp1) - c2(i, j, k)
-        dz = c3(i, j, kp1) - c3(i, j, k)
-
-    return sqrt(dx*dx + dy*dy + dz*dz)
-
-
-def _iface_cell_value(arr, loc):
-    """ Returns I face value for cell-centered data. """
-    i, j, k = loc
-# FIXME: built-in ghosts
-    return 0.5 * (arr(i+1, j+1, k+1) + arr(i, j+1, k+1))
-
-def _jface_cell_value(arr, loc):
-    """ Returns J face value for cell-centered data. """
-    i, j, k = loc
-# FIXME: built-in ghosts
-    return 0.5 * (arr(i+1, j+1, k+1) + arr(i+1, j, k+1))
-
-def _kface_cell_value(arr, loc):
-    """ Returns K face value for cell-centered data. """
-    i, j, k = loc
-# FIXME: built-in ghosts
-    return 0.5 * (arr(i+1, j+1, k+1) + arr(i+1, j+1, k))
-
-
-def _iface_node_value(arr, loc):
-    """ Returns I face value for vertex data. """
-    i, j, k = loc
-    return 0.25 * (arr(i, j+1, k+1) + arr(i, j, k+1) +
-                   arr(i, j+1, k) + arr(i, j, k))
-
-def _jface_node_value(arr, loc):
-    """ Returns J face value for vertex data. """
-    i, j, k = loc
-    return 0.25 * (arr(i+1, j, k+1) + arr(i, j, k+1) +
-                   arr(i+1, j, k) + arr(i, j, k))
-
-def _kface_node_value(arr, loc):
-    """ Returns K face value for vertex data. """
-    i, j, k = loc
-    return 0.25 * (arr(i+1, j+1, k) + arr(i, j+1, k) +
-                   arr(i+1, j, k) + arr(i, j, k))
+        dx = c1[upper] - c1[lower]
+        dy = 0. if c2 is None else c2[upper] - c2[lower]
+        dz = 0. if c3 is None else c3[upper] - c3[lower]
 
+    return numpy.sqrt(dx*dx + dy*dy + dz*dz)
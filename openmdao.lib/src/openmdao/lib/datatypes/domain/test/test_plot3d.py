@@ -8,9 +8,12 @@ import tempfile
 import shutil
 import unittest
 
+import numpy
+
 from openmdao.lib.datatypes.domain import read_plot3d_q, write_plot3d_q, \
                                           read_plot3d_f, write_plot3d_f, \
-                                          read_plot3d_shape, write_plot3d_grid
+                                          read_plot3d_shape, write_plot3d_grid, \
+                                          mesh_probe
 
 from openmdao.lib.datatypes.domain.test.wedge import create_wedge_2d, \
                                                      create_wedge_3d
@@ -205,6 +208,66 @@ class TestCase(unittest.TestCase):
         self.assertTrue((test_flow.f_3 == wedge_flow.momentum.y).all())
         self.assertTrue((test_flow.f_4 == wedge_flow.energy_stagnation_density).all())
 
+    def test_lazy(self):
+        logging.debug('')
+        logging.debug('test_lazy')
+
+        logger = logging.getLogger()
+        wedge = create_wedge_3d((30, 20, 10), 5., 0.5, 2., 30.)
+        wedge2 = create_wedge_3d((29, 19, 9), 5., 2.5, 4., 30.)
+        wedge_flow = wedge.xyzzy.flow_solution
+
+        # Big-endian binary.
+        write_plot3d_q(wedge, 'be-binary.xyz', 'be-binary.q', logger=logger,
+                       big_endian=True, unformatted=False)
+        domain = read_plot3d_q('be-binary.xyz', 'be-binary.q', logger=logger,
+                               multiblock=False, big_endian=True,
+                               unformatted=False, lazy=True)
+        test_flow = domain.zone_1.flow_solution
+        self.assertTrue(isinstance(test_flow.density, numpy.memmap))
+        self.assertTrue(isinstance(domain.zone_1.grid_coordinates.x,
+                                   numpy.memmap))
+        domain.rename_zone('xyzzy', domain.zone_1)
+        self.assertTrue(domain.is_equivalent(wedge, logger=logger))
+
+        # Probing uses views of the region rather than copying the zone.
+        regions = (('xyzzy', 0, -1, 0, -1, 2, 2),)
+        variables = (('density', None), ('energy_stagnation_density', None))
+        self.assertEqual(mesh_probe(domain, regions, variables),
+                         mesh_probe(wedge, regions, variables))
+
+        # Multiblock little-endian unformatted.
+        domain.add_domain(wedge2)
+        write_plot3d_q(domain, 'unformatted.xyz', 'unformatted.q',
+                       logger=logger)
+        domain = read_plot3d_q('unformatted.xyz', 'unformatted.q',
+                               logger=logger, lazy=True)
+        self.assertTrue(domain.zone_1.is_equivalent(wedge.xyzzy, logger))
+        self.assertTrue(domain.zone_2.is_equivalent(wedge2.xyzzy, logger))
+
+        # Modifications are not written back.
+        domain.zone_2.flow_solution.density[0, 0, 0] = 42.
+        domain = read_plot3d_q('unformatted.xyz', 'unformatted.q',
+                               logger=logger, lazy=True)
+        self.assertTrue(domain.zone_2.is_equivalent(wedge2.xyzzy, logger))
+
+        # Function file.
+        varnames = ('density', 'momentum', 'energy_stagnation_density')
+        write_plot3d_f(wedge, 'unformatted.xyz', 'unformatted.f', varnames,
+                       logger=logger)
+        domain = read_plot3d_f('unformatted.xyz', 'unformatted.f',
+                               logger=logger, multiblock=False, lazy=True)
+        test_flow = domain.zone_1.flow_solution
+        self.assertTrue((test_flow.f_1 == wedge_flow.density).all())
+        self.assertTrue((test_flow.f_4 == wedge_flow.momentum.z).all())
+        self.assertTrue((test_flow.f_5 == wedge_flow.energy_stagnation_density).all())
+
+        # Errors.
+        assert_raises(self, "read_plot3d_q('unformatted.xyz', 'unformatted.q',"
+                            " binary=False, lazy=True)",
+                      globals(), locals(), ValueError,
+                      'lazy reading requires binary data')
+
 
 if __name__ == '__main__':
     import nose
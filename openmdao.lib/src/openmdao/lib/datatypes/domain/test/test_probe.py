@@ -10,6 +10,7 @@ import unittest
 from math import pi
 
 from openmdao.lib.datatypes.domain import mesh_probe
+from openmdao.lib.datatypes.domain.metrics import register_metric
 from openmdao.lib.datatypes.domain.test import restart, overflow
 from openmdao.lib.datatypes.domain.test.cube import create_cube
 from openmdao.lib.datatypes.domain.test.wedge import create_wedge_3d
@@ -122,6 +123,57 @@ class TestCase(unittest.TestCase):
         assert_rel_error(self, length, 3. * 12., 0.00000001)
         self.assertEqual(density, 0.625)
 
+    def test_volume(self):
+        logging.debug('')
+        logging.debug('test_volume')
+
+        cube = create_cube((41, 17, 9), 5., 4., 3.)
+
+        regions = (('xyzzy', 0, -1, 0, -1, 0, -1),)
+        variables = (('volume', 'inch**3'), ('density', None))
+        volume, density = mesh_probe(cube, regions, variables)
+        logging.debug('volume = %g (%g ft**3)', volume, volume / 1728.)
+        logging.debug('density = %g', density)
+        assert_rel_error(self, volume, 5. * 4. * 3. * 1728., 0.00000001)
+        self.assertEqual(density, 2.5)
+
+        regions = (('xyzzy', 8, 16, 0, 8, 2, 6),)
+        volume, density = mesh_probe(cube, regions, variables)
+        assert_rel_error(self, volume, 1. * 2. * 1.5 * 1728., 0.00000001)
+        assert_rel_error(self, density, 1.5, 0.00000001)
+
+    def test_scalar_metric(self):
+        logging.debug('')
+        logging.debug('test_scalar_metric')
+
+        # Metric without calculate_all() is evaluated one index at a time.
+        shapes = []
+        class Density(object):
+            def __init__(self, zone, zone_name, reference_state):
+                shapes.append(zone.flow_solution.density.shape)
+                self.density = zone.flow_solution.density.item
+
+            def calculate(self, loc, geom):
+                return self.density(*loc)
+
+            def dimensionalize(self, value):
+                raise NotImplementedError('Dimensional density')
+
+        register_metric('scalar_density', Density, False)
+
+        cube = create_cube((41, 17, 9), 5., 4., 3.)
+        variables = (('scalar_density', None), ('density', None))
+        for regions in ((('xyzzy', 2, 2, 0, -1, 0, -1),),
+                        (('xyzzy', 0, -1, 2, 2, 0, -1),),
+                        (('xyzzy', 0, -1, 5, 5, 5, 5),),
+                        (('xyzzy', 0, -1, 0, -1, 0, -1),)):
+            scalar, vector = mesh_probe(cube, regions, variables)
+            self.assertEqual(scalar, vector)
+
+        # Metrics only see the arrays around the region.
+        self.assertEqual(shapes[0][0], 2)
+        self.assertEqual(shapes[2][1:], (2, 2))
+
     def test_wedge(self):
         logging.debug('')
         logging.debug('test_wedge')
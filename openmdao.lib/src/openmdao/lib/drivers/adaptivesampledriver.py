@@ -67,7 +67,8 @@ class AdaptiveSampleDriver(DOEdriver):
                 target = 'case_inputs.' + path
                 src_val = self.get(src)
                 target_val = self.get(target)
-                if src_val != target_val[-1]:
+                # adaptive_inputs may hold several new points
+                if list(src_val) != list(target_val[-len(src_val):]):
                     changed = True
                     self.set(target, src_val)
 
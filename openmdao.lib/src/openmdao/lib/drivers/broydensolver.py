@@ -96,7 +96,7 @@ class BroydenSolver(Driver):
 
 
         # get initial dependents
-        self.F = numpy.array(self.eval_eq_constraints())
+        self.F = self.eval_eq_constraints_array().copy()
 
         # pick solver algorithm
         if self.algorithm == 'broyden2':
@@ -137,7 +137,7 @@ class BroydenSolver(Driver):
             self.post_iteration()
 
             # get dependents
-            self.F[:] = self.eval_eq_constraints()
+            self.F[:] = self.eval_eq_constraints_array()
 
             # successful termination if independents are below tolerance
             #print "iter", n, norm(self.F)
@@ -201,7 +201,7 @@ class BroydenSolver(Driver):
             self.post_iteration()
 
             # get dependents
-            self.F[:] = self.eval_eq_constraints()
+            self.F[:] = self.eval_eq_constraints_array()
 
             # successful termination if independents are below tolerance
             if norm(self.F) < self.tol:
@@ -255,7 +255,7 @@ class BroydenSolver(Driver):
             self.post_iteration()
 
             # get dependents
-            self.F[:] = self.eval_eq_constraints()
+            self.F[:] = self.eval_eq_constraints_array()
 
             # successful termination if independents are below tolerance
             if norm(self.F) < self.tol:
@@ -96,17 +96,29 @@ class _Case(object):
         Take the values of all of the inputs in this case and apply them
         to the specified scope.
         """
+        # Plain names are set in batches, one call per batch, which
+        # matters when `scope` is remote.
+        batch = []
         for name, value in self._inputs.items():
             if self._exprs is None:
                 expr = None
             else:
                 expr = self._exprs.get(name)
             if expr:
+                if batch:
+                    scope.set_many(batch)
+                    batch = []
                 expr.set(value, scope) #, tovector=True)
             else:
-                scope.set(name, value)
+                batch.append((name, value))
+        if batch:
+            scope.set_many(batch)
 
-        parent._system.vec.get('u').set_from_scope(scope)
+        uvec = parent._system.vec.get('u')
+        vnames = uvec.keys()
+        paths = [name[0] if isinstance(name, tuple) else name
+                 for name in vnames]
+        uvec.set_from_array(scope.get_flattened_values(paths).real, vnames)
 
 
     def fetch_outputs(self, scope, extra=False, itername=''):
@@ -135,14 +147,20 @@ class _Case(object):
                 except Exception:
                     exc = sys.exc_info()
         else:
-            for name in outputs:
-                if extra and name == itername:
-                    continue
-                try:
-                    value = scope.get(name)
-                    data.append((name, value))
-                except Exception:
-                    exc = sys.exc_info()
+            names = [name for name in outputs
+                          if not (extra and name == itername)]
+            try:
+                # One call for all outputs, which matters when `scope` is
+                # remote.
+                data = zip(names, scope.get_many(names))
+            except Exception:
+                # Fetch one at a time to get all we can.
+                for name in names:
+                    try:
+                        value = scope.get(name)
+                        data.append((name, value))
+                    except Exception:
+                        exc = sys.exc_info()
 
         return (data, exc)
 
@@ -10,7 +10,7 @@ COBYLA is gradient-free and can handle inequality constraints.
 
 from math import isnan
 
-from numpy import zeros, array, hstack
+from numpy import zeros, hstack
 
 from cobyla.cobyla import cobyla, closeunit
 
@@ -114,6 +114,9 @@ class COBYLAdriver(Driver):
     def run_iteration(self):
         """ Note: cobyla controls the looping."""
 
+        # The model may have changed since our last run.
+        self.clear_eval_cache()
+
         try:
             self.iact, self.error_code, self.nfvals = \
               cobyla(self._func, self.nparam, self.ncon, self.x,
@@ -128,6 +131,11 @@ class COBYLAdriver(Driver):
         if self.iprint > 0:
             closeunit(self.iout)
 
+        # Cached evaluations may have left the model at another point.
+        if not self.is_current_point(self.x):
+            self.set_parameters(self.x)
+            super(COBYLAdriver, self).run_iteration()
+
         # Log any errors
         if self.error_code != 0:
             self._logger.warning(self.error_messages[self.error_code])
@@ -141,6 +149,10 @@ class COBYLAdriver(Driver):
 
         Note: n, m, f, and g are unused inputs."""
 
+        cached = self.get_cached_evaluation(xnew)
+        if cached is not None:
+            return cached
+
         self.set_parameters(xnew)
         super(COBYLAdriver, self).run_iteration()
         f = self.eval_objective()
@@ -150,11 +162,12 @@ class COBYLAdriver(Driver):
             self.raise_exception(msg, RuntimeError)
 
         # Constraints (COBYLA defines positive as satisfied)
-        cons = -1. * array(self.eval_ineq_constraints())
+        cons = -self.eval_ineq_constraints_array()
 
         # Side Constraints
         vals = self.eval_parameters(self.parent)
         g = hstack([cons, (vals - self.lower), (self.upper - vals)])
 
+        self.cache_evaluation(xnew, (f, g))
         return f, g
 
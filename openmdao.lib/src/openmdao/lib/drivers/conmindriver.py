@@ -283,6 +283,7 @@ class CONMINdriver(Driver):
         self._config_conmin()
         self.cnmn1.igoto = 0
         self.iter_count = 0
+        self.clear_eval_cache()
 
         # get the initial values of the parameters
         self.design_vals[:-2] = self.eval_parameters(self.parent)
@@ -375,9 +376,14 @@ class CONMINdriver(Driver):
         # calculate objective and constraints
         if self.cnmn1.info == 1:
 
+            ncon = self.total_ineq_constraints()
+            cached = self.get_cached_evaluation(self.design_vals[:-2])
+            if cached is not None:
+                self.cnmn1.obj, self.constraint_vals[0:ncon] = cached
+
             # Note. CONMIN is driving the finite difference estimation of the
             # gradient.
-            if self.cnmn1.igoto == 3:
+            elif self.cnmn1.igoto == 3:
 
                 # update the parameters in the model
                 self.set_parameters(self.design_vals[:-2])
@@ -390,12 +396,16 @@ class CONMINdriver(Driver):
                 # Run the model for this step
                 super(CONMINdriver, self).run_iteration()
 
-            # calculate objective
-            self.cnmn1.obj = self.eval_objective()
+            if cached is None:
+                # calculate objective
+                self.cnmn1.obj = self.eval_objective()
+
+                # update constraint value array
+                self.constraint_vals[0:ncon] = self.eval_ineq_constraints_array()
 
-            # update constraint value array
-            self.constraint_vals[0:self.total_ineq_constraints()] = \
-                self.eval_ineq_constraints()
+                self.cache_evaluation(self.design_vals[:-2],
+                                      (self.cnmn1.obj,
+                                       self.constraint_vals[0:ncon].copy()))
 
             #self._logger.debug('constraints = %s' % self.constraint_vals)
 
@@ -404,15 +414,18 @@ class CONMINdriver(Driver):
         # only return gradients of active/violated constraints.
         elif self.cnmn1.info == 2 and self.cnmn1.nfdg == 1:
 
-            # Sometimes, CONMIN wants the derivatives at a different point.
-            self.set_parameters(self.design_vals[:-2])
-            super(CONMINdriver, self).run_iteration()
-
-            inputs = self.list_param_group_targets()
             obj = self.list_objective_targets()
             con = self.list_ineq_constraint_targets()
 
-            J = self._calc_gradient(inputs, obj + con)
+            J = self.get_cached_evaluation(self.design_vals[:-2], 'grad')
+            if J is None:
+                # Sometimes, CONMIN wants the derivatives at a different point.
+                self.set_parameters(self.design_vals[:-2])
+                super(CONMINdriver, self).run_iteration()
+
+                inputs = self.list_param_group_targets()
+                J = self._calc_gradient(inputs, obj + con)
+                self.cache_evaluation(self.design_vals[:-2], J, 'grad')
 
             nobj = len(obj)
             self.d_obj[:-2] = J[0:nobj, :].ravel()
@@ -442,6 +455,12 @@ class CONMINdriver(Driver):
         if (self.iter_count != self.cnmn1.iter) or self.cnmn1.igoto == 0:
             self.iter_count = self.cnmn1.iter
 
+        # Cached evaluations may have left the model at another point.
+        if self.cnmn1.igoto == 0 and \
+           not self.is_current_point(self.design_vals[:-2]):
+            self.set_parameters(self.design_vals[:-2])
+            super(CONMINdriver, self).run_iteration()
+
 
     def _config_conmin(self):
         """Set up arrays for the Fortran conmin routine, perform some
@@ -1,5 +1,7 @@
 """A simple Pyevolve-based driver for OpenMDAO."""
 
+import os
+import random
 import re
 
 #pyevolve calls multiprocessing.cpu_count(), which can raise NotImplementedError
@@ -8,17 +10,19 @@ try:
     import multiprocessing
     multiprocessing.cpu_count()
 except ImportError:
-    pass
+    multiprocessing = None
 except NotImplementedError:
     multiprocessing.cpu_count = lambda: 1
 
 from pyevolve import G1DList, GAllele, GenomeBase, Scaling
-from pyevolve import GSimpleGA, Selectors, Initializators, Mutators, Consts
+from pyevolve import GSimpleGA, GPopulation, Selectors, Initializators, \
+                     Mutators, Consts, Util
 
 # pylint: disable-msg=E0611,F0401
 from openmdao.main.datatypes.api import Enum, Float, Int, Bool, Slot
 
 from openmdao.main.api import Driver
+from openmdao.main.case import Case
 from openmdao.main.hasparameters import HasParameters
 from openmdao.main.hasobjective import HasObjective
 from openmdao.main.hasevents import HasEvents
@@ -29,6 +33,136 @@ from openmdao.util.typegroups import real_types, int_types, iterable_types
 
 array_test = re.compile("(\[[0-9]+\])+$")
 
+# Driver whose model is evaluated by a forked worker process. It is only
+# set in the workers, by the initializer of their Pool.
+_worker_driver = None
+
+
+def _init_worker(driver):
+    """Process pool initializer. Keeps the forked copy of `driver`."""
+    global _worker_driver
+    _worker_driver = driver
+
+
+def _pool_fitness(values):
+    """Process pool entry point. Evaluates the objective of the forked copy
+    of the model at `values`. Passing a case id to run_iteration keeps the
+    worker from recording the case.
+    """
+    driver = _worker_driver
+    driver.set_parameters(values)
+    driver.run_iteration(case_uuid=Case.next_uuid())
+    return driver.eval_objective()
+
+
+# GSimpleGA and GPopulation are old-style classes, so super() can't be used
+# with them.
+
+class _BatchPopulation(GPopulation.GPopulation):
+    """GPopulation whose individuals are evaluated as one batch by a
+    :class:`Genetic` driver.
+    """
+
+    def __init__(self, population, driver):
+        GPopulation.GPopulation.__init__(self, population)
+        self._driver = driver
+
+    def evaluate(self, **args):
+        self._driver._evaluate_batch(self.internalPop)
+        self.clearFlags()
+
+
+class _BatchGA(GSimpleGA.GSimpleGA):
+    """GSimpleGA whose populations are :class:`_BatchPopulation` instances,
+    so each generation is evaluated as one batch by the driver.
+    :meth:`step` is GSimpleGA.step with only the class of the new
+    population changed.
+    """
+
+    def __init__(self, genome, driver, **kwargs):
+        GSimpleGA.GSimpleGA.__init__(self, genome, **kwargs)
+        self._driver = driver
+        self.internalPop = _BatchPopulation(self.internalPop, driver)
+
+    def step(self):
+        """ Just do one step in evolution, one generation """
+        newPop = _BatchPopulation(self.internalPop, self._driver)
+
+        size_iterate = len(self.internalPop)
+
+        # Odd population size
+        if size_iterate % 2 != 0:
+            size_iterate -= 1
+
+        crossover_empty = \
+            self.select(popID=self.currentGeneration).crossover.isEmpty()
+
+        for i in xrange(0, size_iterate, 2):
+            genomeMom = self.select(popID=self.currentGeneration)
+            genomeDad = self.select(popID=self.currentGeneration)
+
+            if not crossover_empty and self.pCrossover >= 1.0:
+                for it in genomeMom.crossover.applyFunctions(mom=genomeMom,
+                                                             dad=genomeDad,
+                                                             count=2):
+                    (sister, brother) = it
+            else:
+                if not crossover_empty and \
+                   Util.randomFlipCoin(self.pCrossover):
+                    for it in genomeMom.crossover.applyFunctions(mom=genomeMom,
+                                                                 dad=genomeDad,
+                                                                 count=2):
+                        (sister, brother) = it
+                else:
+                    sister = genomeMom.clone()
+                    brother = genomeDad.clone()
+
+            sister.mutate(pmut=self.pMutation, ga_engine=self)
+            brother.mutate(pmut=self.pMutation, ga_engine=self)
+
+            newPop.internalPop.append(sister)
+            newPop.internalPop.append(brother)
+
+        if len(self.internalPop) % 2 != 0:
+            genomeMom = self.select(popID=self.currentGeneration)
+            genomeDad = self.select(popID=self.currentGeneration)
+
+            if Util.randomFlipCoin(self.pCrossover):
+                for it in genomeMom.crossover.applyFunctions(mom=genomeMom,
+                                                             dad=genomeDad,
+                                                             count=1):
+                    (sister, brother) = it
+            else:
+                sister = random.choice([genomeMom, genomeDad])
+                sister = sister.clone()
+                sister.mutate(pmut=self.pMutation, ga_engine=self)
+
+            newPop.internalPop.append(sister)
+
+        newPop.evaluate()
+
+        #Niching methods- Petrowski's clearing
+        self.clear()
+
+        if self.elitism:
+            if self.getMinimax() == Consts.minimaxType["maximize"]:
+                for i in xrange(self.nElitismReplacement):
+                    if self.internalPop.bestRaw(i).score > \
+                       newPop.bestRaw(i).score:
+                        newPop[len(newPop)-1-i] = self.internalPop.bestRaw(i)
+            elif self.getMinimax() == Consts.minimaxType["minimize"]:
+                for i in xrange(self.nElitismReplacement):
+                    if self.internalPop.bestRaw(i).score < \
+                       newPop.bestRaw(i).score:
+                        newPop[len(newPop)-1-i] = self.internalPop.bestRaw(i)
+
+        self.internalPop = newPop
+        self.internalPop.sort()
+
+        self.currentGeneration += 1
+
+        return (self.currentGeneration == self.nGenerations)
+
 
 @add_delegate(HasParameters, HasObjective, HasEvents)
 class Genetic(Driver):
@@ -83,6 +217,17 @@ class Genetic(Driver):
                     "for repeatable results; otherwise leave as None for truly "
                     "random seeding.")
 
+    n_procs = Int(1, low=1, iotype="in",
+                  desc="Number of processes used to evaluate each generation. "
+                       "If greater than 1, the new individuals of a "
+                       "generation are evaluated concurrently by forked "
+                       "copies of the model, and those cases are not "
+                       "recorded.")
+
+    def __init__(self):
+        super(Genetic, self).__init__()
+        self._scores = {}  # Score of each evaluated genome, keyed by values.
+
     def _make_alleles(self):
         """ Returns a GAllelle.Galleles instance with alleles corresponding to
         the parameters specified by the user"""
@@ -128,7 +273,7 @@ class Genetic(Driver):
 
         genome = G1DList.G1DList(len(alleles))
         genome.setParams(allele=alleles)
-        genome.evaluator.set(self._run_model)
+        genome.evaluator.set(self._fitness)
 
         genome.mutator.set(Mutators.G1DListMutatorAllele)
         genome.initializator.set(Initializators.G1DListInitializatorAllele)
@@ -139,8 +284,7 @@ class Genetic(Driver):
         #print self.seed
 
         #configuring the options
-        ga = GSimpleGA.GSimpleGA(genome, interactiveMode=False,
-                                 seed=self.seed)
+        ga = _BatchGA(genome, self, interactiveMode=False, seed=self.seed)
         pop = ga.getPopulation()
         pop = pop.scaleMethod.set(Scaling.SigmaTruncScaling)
         ga.setMinimax(Consts.minimaxType[self.opt_type])
@@ -156,6 +300,10 @@ class Genetic(Driver):
         #setting the selector for the algorithm
         ga.selector.set(self._selection_mapping[self.selection_method])
 
+        # Individuals that reappear in later generations are looked up
+        # rather than evaluated again.
+        self._scores = {}
+
         #GO
         ga.evolve(freq_stats=0)
 
@@ -169,3 +317,49 @@ class Genetic(Driver):
         self.run_iteration()
         return self.eval_objective()
 
+    def _fitness(self, chromosome):
+        """Genome evaluator for genomes evaluated one at a time, outside of
+        a population. Returns the cached score of `chromosome`, or evaluates
+        it.
+        """
+        key = tuple(val for val in chromosome)
+        try:
+            return self._scores[key]
+        except KeyError:
+            score = self._scores[key] = self._run_model(list(key))
+            return score
+
+    def _evaluate_batch(self, genomes):
+        """Evaluate each distinct individual in `genomes` that hasn't been
+        evaluated yet, concurrently if `n_procs` > 1, and set the scores of
+        `genomes`.
+        """
+        todo = []
+        queued = set()
+        for genome in genomes:
+            key = tuple(val for val in genome)
+            if key not in self._scores and key not in queued:
+                queued.add(key)
+                todo.append(list(key))
+
+        if self.n_procs > 1 and len(todo) > 1 and hasattr(os, 'fork') and \
+           multiprocessing is not None:
+            # The workers are forked, so they get the driver without it
+            # being pickled.
+            pool = multiprocessing.Pool(min(self.n_procs, len(todo)),
+                                        initializer=_init_worker,
+                                        initargs=(self,))
+            try:
+                results = pool.map(_pool_fitness, todo)
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            results = [self._run_model(values) for values in todo]
+
+        for values, score in zip(todo, results):
+            self._scores[tuple(values)] = score
+
+        for genome in genomes:
+            genome.score = self._scores[tuple(val for val in genome)]
+
@@ -6,6 +6,8 @@ iterations are used as termination criteria.
 
 # pylint: disable=E0611,F0401
 
+import numpy
+
 from openmdao.main.mpiwrap import MPI, get_norm
 if not MPI:
     from numpy.linalg import norm
@@ -43,11 +45,26 @@ class FixedPointIterator(Driver):
     iprint = Enum(0, [0, 1], iotype='in', desc='set to 1 to print '
                   'residual during convergence.')
 
+    accelerator = Enum('none', ['none', 'aitken', 'anderson'], iotype='in',
+                       desc="Acceleration of the iteration: 'aitken' for "
+                            "Aitken's dynamic relaxation, 'anderson' for "
+                            "Anderson mixing, or 'none'.")
+
+    anderson_depth = Int(5, low=1, iotype='in', desc='Number of previous '
+                         'iterations used by Anderson mixing.')
+
+    # bounds on the Aitken relaxation factor
+    _aitken_min = 0.05
+    _aitken_max = 2.0
+
     def __init__(self):
         super(FixedPointIterator, self).__init__()
         self.current_iteration = 0
         self.normval = 1.e99
         self.norm0 = 1.e99
+        self._param_idxs = None
+        self._x = None
+        self._restart_accel()
 
     def execute(self):
         """ Executes an iterative solver """
@@ -83,6 +100,12 @@ class FixedPointIterator(Driver):
         self.current_iteration = 0
         self.normval = 1.e99
         self.norm0 = 1.e99
+
+        self._param_idxs = None
+        self._restart_accel()
+        if self.accelerator != 'none':
+            self._x = self.workflow._system.vec['u'].array.copy()
+
         self.run_iteration()
         self.normval = get_norm(self.workflow._system.vec['f'],
                                 self._norm_order)
@@ -98,11 +121,106 @@ class FixedPointIterator(Driver):
         uvec = system.vec['u']
         fvec = system.vec['f']
 
+        if self.accelerator != 'none':
+            self._accelerate(system)
+            return
+
         cycle_vars = self.workflow._cycle_vars
         for name in uvec.keys():
             if name not in cycle_vars:
                 uvec[name] -= fvec[name]
 
+    def _restart_accel(self):
+        """Discard the history used by the accelerators."""
+        self._omega = 1.0
+        self._prev_x = None
+        self._prev_r = None
+        self._dxs = []
+        self._drs = []
+        self._prev_norm = None
+
+    def _get_param_idxs(self, system):
+        """Returns the indices into the u and f vectors of our
+        parameters.
+        """
+        uvec = system.vec['u']
+        fvec = system.vec['f']
+
+        targets = set()
+        for param in self.get_parameters().values():
+            targets.update(param.targets)
+
+        uidxs = [numpy.zeros(0, dtype=int)]
+        fidxs = [numpy.zeros(0, dtype=int)]
+        for name in uvec.keys():
+            if name[0] in targets or targets.intersection(name[1]):
+                uidxs.append(uvec.indices(system, name))
+                fidxs.append(fvec.indices(system, name))
+
+        return numpy.concatenate(uidxs), numpy.concatenate(fidxs)
+
+    def _sum(self, val):
+        """Sum a local value over all processes of our system."""
+        if MPI:
+            return self.workflow._system.mpi.comm.allreduce(val)
+        return val
+
+    def _accelerate(self, system):
+        """Set the next iterate using Aitken relaxation or Anderson mixing
+        of the previous ones.
+
+        The iterate x is the u vector before the last run, and the
+        residual r is the change that run made to it, except for our
+        parameters, whose residuals are their constraint residuals (-f).
+        If the residual norm grows, the history is discarded and a plain
+        step is taken.
+        """
+        if self._param_idxs is None:
+            self._param_idxs = self._get_param_idxs(system)
+        uidxs, fidxs = self._param_idxs
+
+        uarr = system.vec['u'].array
+        x = self._x
+        r = uarr - x
+        r[uidxs] = -system.vec['f'].array[fidxs]
+
+        if self._prev_norm is not None and self.normval > self._prev_norm:
+            self._restart_accel()
+        self._prev_norm = self.normval
+
+        if self.accelerator == 'aitken':
+            if self._prev_r is not None:
+                dr = r - self._prev_r
+                denom = self._sum(numpy.dot(dr, dr))
+                if denom > 0.0:
+                    omega = -self._omega * \
+                            self._sum(numpy.dot(self._prev_r, dr)) / denom
+                    self._omega = min(max(omega, self._aitken_min),
+                                      self._aitken_max)
+            self._prev_r = r
+            new_x = x + self._omega * r
+
+        else:  # anderson
+            if self._prev_x is not None:
+                self._dxs.append(x - self._prev_x)
+                self._drs.append(r - self._prev_r)
+                if len(self._dxs) > self.anderson_depth:
+                    del self._dxs[0]
+                    del self._drs[0]
+            self._prev_x = x
+            self._prev_r = r
+
+            new_x = x + r
+            if self._drs:
+                drs = numpy.array(self._drs)
+                gram = self._sum(numpy.dot(drs, drs.T))
+                rhs = self._sum(numpy.dot(drs, r))
+                gamma = numpy.linalg.lstsq(gram, rhs, rcond=1e-12)[0]
+                new_x -= numpy.dot(gamma, numpy.array(self._dxs) + drs)
+
+        uarr[:] = new_x
+        self._x = new_x
+
     def continue_iteration(self):
         """Convergence check."""
         return not self.should_stop() and \
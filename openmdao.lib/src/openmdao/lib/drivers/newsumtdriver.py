@@ -102,36 +102,45 @@ def user_function(info, x, obj, dobj, ddobj, g, dg, n2, n3, n4, imode, driver):
     # evaluate objective function or constraint function
     if info in [1, 2]:
 
-        if imode == 1:
+        # NEWSUMT asks for the objective and the constraints in separate
+        # calls at the same point, so we evaluate both on the first call.
+        cached = driver.get_cached_evaluation(x)
+        if cached is None:
 
-            # We are in a finite difference step drive by NEWSUMT
+            if imode == 1:
 
-            # Note, NEWSUMT estimates 2nd-order derivatives from
-            # the first order differences.
+                # We are in a finite difference step drive by NEWSUMT
 
-            # Save baseline states and calculate derivatives
-            #if driver.baseline_point:
-            #    driver.calc_derivatives(first=True, savebase=True)
-            #driver.baseline_point = False
+                # Note, NEWSUMT estimates 2nd-order derivatives from
+                # the first order differences.
 
-            # update the parameters in the model
-            driver.set_parameters(x)
-            super(NEWSUMTdriver, driver).run_iteration()
+                # Save baseline states and calculate derivatives
+                #if driver.baseline_point:
+                #    driver.calc_derivatives(first=True, savebase=True)
+                #driver.baseline_point = False
 
-        else:
+                # update the parameters in the model
+                driver.set_parameters(x)
+                super(NEWSUMTdriver, driver).run_iteration()
+
+            else:
+
+                # Optimization step
+                driver.set_parameters(x)
+                super(NEWSUMTdriver, driver).run_iteration()
 
-            # Optimization step
-            driver.set_parameters(x)
-            super(NEWSUMTdriver, driver).run_iteration()
+            cons = driver.eval_ineq_constraints(driver.parent)
+            cached = (driver.eval_objective(), [-v for v in cons])
+            driver.cache_evaluation(x, cached)
 
         # evaluate objectives
         if info == 1:
-            obj = driver.eval_objective()
+            obj = cached[0]
 
         # evaluate constraint functions
         if info == 2:
-            for i, v in enumerate(driver.eval_ineq_constraints(driver.parent)):
-                g[i] = -v
+            for i, v in enumerate(cached[1]):
+                g[i] = v
 
         # save constraint values in driver if this isn't a finite difference
         if imode != 1:
@@ -374,6 +383,7 @@ class NEWSUMTdriver(Driver):
         self._config_newsumt()
 
         self.iter_count = 0
+        self.clear_eval_cache()
 
         # get the values of the parameters
         # check if any min/max constraints are violated by initial values
@@ -52,6 +52,41 @@ class NewtonSolver(Driver):
                   'convergence. Set to 2 to get backtracking convergence '
                   'as well.')
 
+    line_search = Enum('backtracking', ['backtracking', 'armijo'],
+                       iotype='in', desc="'backtracking' halves the step "
+                       "until the residual drops below ls_rtol times the "
+                       "initial residual. 'armijo' requires a sufficient "
+                       "decrease of the residual, and shortens the step by "
+                       "quadratic interpolation.")
+
+    ls_c = Float(1.0e-4, iotype='in', low=0.0, high=1.0,
+                 desc='Sufficient decrease constant for the Armijo line '
+                      'search.')
+
+    max_jacobian_age = Int(1, iotype='in', low=1,
+                           desc='Maximum number of iterations that use the '
+                                'same linearization of the model. 1 means '
+                                're-linearize every iteration (full Newton).')
+
+    jacobian_stall = Float(0.5, iotype='in', low=0.0, high=1.0,
+                           desc='When reusing a linearization, re-linearize '
+                                'early if an iteration reduces the residual '
+                                'by less than this factor.')
+
+    forcing = Enum('constant', ['constant', 'eisenstat_walker'], iotype='in',
+                   desc="Tolerance of the linear solve for each Newton "
+                        "direction. 'constant' uses gradient_options. "
+                        "'eisenstat_walker' adapts it to the convergence of "
+                        "the Newton iteration.")
+
+    eta_max = Float(0.9, iotype='in', low=0.0, high=1.0,
+                    desc='Maximum relative tolerance of the linear solve '
+                         'with Eisenstat-Walker forcing.')
+
+    # parameters of Eisenstat-Walker forcing (choice 2)
+    _ew_gamma = 0.9
+    _ew_alpha = 2.0
+
     def execute(self):
         """ General Newton's method. """
 
@@ -62,8 +97,6 @@ class NewtonSolver(Driver):
         system = self.workflow._system
         options = self.gradient_options
         fvec = system.vec['f']
-        dfvec = system.vec['df']
-        uvec = system.vec['u']
         iterbase = self.workflow._iterbase()
         nstring = 'NEWTON'
 
@@ -78,46 +111,52 @@ class NewtonSolver(Driver):
             self.print_norm(nstring, 0, f_norm, f_norm0)
 
         itercount = 0
-        alpha = self.alpha
+        jac_age = self.max_jacobian_age  # linearize on the first iteration
+        eta = self.eta_max
+        f_norm_prev = None
         while itercount < self.max_iteration and f_norm > self.atol and \
               f_norm/f_norm0 > self.rtol:
 
-            system.calc_newton_direction(options=options)
-
-            #print "LS 1", uvec.array, '+', dfvec.array
-            uvec.array += alpha*dfvec.array
-
-            # Just evaluate the model with the new points
-            system.evaluate(iterbase, case_uuid=Case.next_uuid())
-
-            f_norm = get_norm(fvec)
-            if self.iprint > 0:
-                self.print_norm(nstring, itercount+1, f_norm, f_norm0)
+            linearize = jac_age >= self.max_jacobian_age
+            if linearize:
+                jac_age = 0
+            jac_age += 1
 
-            itercount += 1
-            ls_itercount = 0
+            rtol = None
+            if self.forcing == 'eisenstat_walker':
+                eta = self._forcing_term(eta, f_norm, f_norm_prev)
+                rtol = eta
 
-            # Backtracking Line Search
-            while ls_itercount < self.ls_max_iteration and \
-                  f_norm > self.ls_atol and \
-                  f_norm/f_norm0 > self.ls_rtol:
+            system.calc_newton_direction(options=options,
+                                         linearize=linearize, rtol=rtol)
 
-                alpha *= 0.5
-                uvec.array -= alpha*dfvec.array
+            if not linearize:
+                u0 = system.vec['u'].array.copy()
 
-                # Just evaluate the model with the new points
-                system.evaluate(iterbase, case_uuid=Case.next_uuid())
+            f_norm_prev = f_norm
+            if self.line_search == 'armijo':
+                f_norm, ok = self._armijo(system, iterbase, itercount,
+                                          f_norm, f_norm0,
+                                          0.0 if rtol is None else rtol)
+            else:
+                f_norm, ok = self._backtrack(system, iterbase, itercount,
+                                             f_norm0)
 
-                f_norm = get_norm(fvec)
-                if self.iprint> 1:
-                    self.print_norm('BK_TKG', itercount+1,
-                                    f_norm, f_norm/f_norm0,
-                                    indent=1, solver='LS')
+            itercount += 1
 
-                ls_itercount += 1
+            if not linearize:
+                if not (ok and f_norm < f_norm_prev):
+                    # the old linearization failed us, so go back and
+                    # take the step with a new one
+                    system.vec['u'].array[:] = u0
+                    system.evaluate(iterbase, case_uuid=Case.next_uuid())
+                    f_norm = get_norm(fvec)
+                    f_norm_prev = None
+                    jac_age = self.max_jacobian_age
 
-            # Reset backtracking
-            alpha = self.alpha
+                # don't keep using a linearization that has stopped helping
+                elif f_norm > self.jacobian_stall * f_norm_prev:
+                    jac_age = self.max_jacobian_age
 
         # Need to make sure the whole workflow is executed at the final
         # point, not just evaluated.
@@ -129,6 +168,117 @@ class NewtonSolver(Driver):
             self.print_norm(nstring, itercount, f_norm, f_norm0, msg='Converged')
 
 
+    def _forcing_term(self, eta, f_norm, f_norm_prev):
+        """Returns the Eisenstat-Walker forcing term (the relative tolerance
+        of the linear solve) for the next Newton direction."""
+        if f_norm_prev is not None:
+            new_eta = self._ew_gamma * (f_norm/f_norm_prev)**self._ew_alpha
+
+            # don't let eta drop too fast
+            safeguard = self._ew_gamma * eta**self._ew_alpha
+            if safeguard > 0.1:
+                new_eta = max(new_eta, safeguard)
+            eta = new_eta
+
+        eta = min(eta, self.eta_max)
+
+        # don't solve more accurately than needed to converge
+        return min(max(eta, 0.5*self.atol/f_norm), self.eta_max)
+
+    def _backtrack(self, system, iterbase, itercount, f_norm0):
+        """Take the Newton step, halving it until the residual norm is
+        below ls_rtol times the initial norm. Returns the new residual norm
+        and whether the line search succeeded."""
+        uvec = system.vec['u']
+        dfvec = system.vec['df']
+        fvec = system.vec['f']
+
+        alpha = self.alpha
+
+        #print "LS 1", uvec.array, '+', dfvec.array
+        uvec.array += alpha*dfvec.array
+
+        # Just evaluate the model with the new points
+        system.evaluate(iterbase, case_uuid=Case.next_uuid())
+
+        f_norm = get_norm(fvec)
+        if self.iprint > 0:
+            self.print_norm('NEWTON', itercount+1, f_norm, f_norm0)
+
+        ls_itercount = 0
+
+        # Backtracking Line Search
+        while ls_itercount < self.ls_max_iteration and \
+              f_norm > self.ls_atol and \
+              f_norm/f_norm0 > self.ls_rtol:
+
+            alpha *= 0.5
+            uvec.array -= alpha*dfvec.array
+
+            # Just evaluate the model with the new points
+            system.evaluate(iterbase, case_uuid=Case.next_uuid())
+
+            f_norm = get_norm(fvec)
+            if self.iprint> 1:
+                self.print_norm('BK_TKG', itercount+1,
+                                f_norm, f_norm/f_norm0,
+                                indent=1, solver='LS')
+
+            ls_itercount += 1
+
+        return f_norm, f_norm <= self.ls_atol or \
+                       f_norm/f_norm0 <= self.ls_rtol
+
+    def _armijo(self, system, iterbase, itercount, f_norm, f_norm0, eta):
+        """Take the Newton step, shortening it until the residual norm
+        satisfies the Armijo condition
+        ``|f(u + a*du)| <= (1 - ls_c*a*(1 - eta)) * |f(u)|``, where eta is
+        the relative tolerance of the linear solve. New step lengths are
+        found by minimizing a quadratic model of ``|f|**2``, safeguarded
+        to between 0.1 and 0.5 times the previous one. Returns the new
+        residual norm and whether the line search succeeded."""
+        uvec = system.vec['u']
+        dfvec = system.vec['df']
+        fvec = system.vec['f']
+
+        u0 = uvec.array.copy()
+        phi0 = f_norm**2
+        # slope of |f|**2 along the Newton direction at the start
+        dphi0 = -2.0*phi0
+
+        alpha = self.alpha
+        ls_itercount = 0
+        while True:
+            uvec.array[:] = u0 + alpha*dfvec.array
+
+            # Just evaluate the model with the new points
+            system.evaluate(iterbase, case_uuid=Case.next_uuid())
+
+            new_norm = get_norm(fvec)
+            if ls_itercount == 0:
+                if self.iprint > 0:
+                    self.print_norm('NEWTON', itercount+1, new_norm, f_norm0)
+            elif self.iprint > 1:
+                self.print_norm('ARMIJO', itercount+1, new_norm,
+                                new_norm/f_norm0, indent=1, solver='LS')
+
+            if new_norm <= (1.0 - self.ls_c*alpha*(1.0 - eta)) * f_norm or \
+               new_norm <= self.ls_atol:
+                return new_norm, True
+
+            if ls_itercount >= self.ls_max_iteration:
+                return new_norm, False
+
+            phi = new_norm**2
+            curv = phi - phi0 - dphi0*alpha
+            if curv > 0.0:
+                new_alpha = -dphi0*alpha**2 / (2.0*curv)
+            else:
+                new_alpha = 0.5*alpha
+            alpha = min(max(new_alpha, 0.1*alpha), 0.5*alpha)
+
+            ls_itercount += 1
+
     def requires_derivs(self):
         """Newtonsolver always requires derivatives."""
         return True
@@ -10,7 +10,7 @@ inequality constraints.
 
 # pylint: disable=E0611,F0401
 from math import isnan
-from numpy import zeros, array
+from numpy import zeros
 
 from slsqp.slsqp import slsqp, closeunit, pyflush
 
@@ -138,6 +138,9 @@ class SLSQPdriver(Driver):
         ljw = max(mineq, (n+1)-meq)
         jw = zeros([ljw], 'i')
 
+        # The model may have changed since our last run.
+        self.clear_eval_cache()
+
         try:
             dg, self.error_code, self.nfunc, self.ngrad = \
               slsqp(self.ncon, self.neqcon, la, self.nparam,
@@ -158,6 +161,11 @@ class SLSQPdriver(Driver):
         if self.iprint > 0:
             closeunit(self.iout)
 
+        # Cached evaluations may have left the model at another point.
+        if not self.is_current_point(self.x):
+            self.set_parameters(self.x)
+            super(SLSQPdriver, self).run_iteration()
+
         # Log any errors
         if self.error_code != 0:
             self._logger.warning(self.error_messages[self.error_code])
@@ -170,6 +178,10 @@ class SLSQPdriver(Driver):
         evaluations.
 
         Note: m, me, la, n, f, and g are unused inputs."""
+        cached = self.get_cached_evaluation(xnew)
+        if cached is not None:
+            return cached
+
         self.set_parameters(xnew)
         super(SLSQPdriver, self).run_iteration()
         f = self.eval_objective()
@@ -180,11 +192,12 @@ class SLSQPdriver(Driver):
 
         # Constraints. Note that SLSQP defines positive as satisfied.
         if self.ncon > 0:
-            g = -1. * array(self.eval_constraints(self.parent))
+            g = -self.eval_constraints_array(self.parent)
 
         if self.iprint > 0:
             pyflush(self.iout)
 
+        self.cache_evaluation(xnew, (f, g))
         return f, g
 
     def _grad(self, m, me, la, n, f, g, df, dg, xnew):
@@ -193,7 +206,14 @@ class SLSQPdriver(Driver):
 
         Note: m, me, la, n, f, and g are unused inputs."""
 
-        J = self._calc_gradient(self.inputs, self.obj + self.con)
+        J = self.get_cached_evaluation(xnew, 'grad')
+        if J is None:
+            # The gradient is taken about the model's current state.
+            if not self.is_current_point(xnew):
+                self.set_parameters(xnew)
+                super(SLSQPdriver, self).run_iteration()
+            J = self._calc_gradient(self.inputs, self.obj + self.con)
+            self.cache_evaluation(xnew, J, 'grad')
         #print "gradient", J
         df[0:self.nparam] = J[0, :].ravel()
 
@@ -4,6 +4,8 @@ Test the FixedPointIterator component
 
 import unittest
 
+import numpy
+
 # pylint: disable=F0401,E0611
 from openmdao.lib.drivers.iterate import FixedPointIterator, IterateUntil
 from openmdao.lib.optproblems.sellar import Discipline1_WithDerivatives, \
@@ -401,6 +403,79 @@ class Sellar_MDA_subbed(Assembly):
         self.driver.workflow.add(['subdriver'])
         self.subdriver.workflow.add(['d1', 'd2'])
 
+class Coupled1(Component):
+    """Slowly converging coupled discipline."""
+
+    x = Array(numpy.zeros(4), iotype='in')
+    y = Array(numpy.zeros(4), iotype='out')
+
+    def execute(self):
+        self.y = 0.9*self.x + 0.05*numpy.sin(self.x) + \
+                 numpy.array([1.0, 2.0, 3.0, 4.0])
+
+
+class Coupled2(Component):
+    """Slowly converging coupled discipline."""
+
+    y = Array(numpy.zeros(4), iotype='in')
+    x = Array(numpy.zeros(4), iotype='out')
+
+    def execute(self):
+        self.x = 0.9*self.y - 0.05*self.y[::-1]
+
+
+class FixedPointIterator_Acceleration_TestCase(unittest.TestCase):
+    """test the accelerators of the FixedPointIterator"""
+
+    def _run(self, accelerator, param_con=False, depth=5):
+        top = set_as_top(Assembly())
+        top.add('c1', Coupled1())
+        top.add('c2', Coupled2())
+        top.add('driver', FixedPointIterator())
+        top.driver.workflow.add(['c1', 'c2'])
+        top.connect('c1.y', 'c2.y')
+        if param_con:
+            top.driver.add_parameter('c1.x', low=-1000, high=1000)
+            top.driver.add_constraint('c2.x = c1.x')
+        else:
+            top.connect('c2.x', 'c1.x')
+        top.driver.max_iteration = 500
+        top.driver.tolerance = 1.0e-9
+        top.driver.accelerator = accelerator
+        top.driver.anderson_depth = depth
+        top.run()
+
+        assert_rel_error(self, top.c1.x, top.c2.x, 1.0e-7)
+        return top
+
+    def test_accelerators(self):
+        for param_con in (False, True):
+            plain = self._run('none', param_con)
+            iters = plain.driver.current_iteration
+
+            top = self._run('aitken', param_con)
+            assert_rel_error(self, top.c1.y, plain.c1.y, 1.0e-6)
+            self.assertTrue(top.driver.current_iteration < iters)
+
+            top = self._run('anderson', param_con)
+            assert_rel_error(self, top.c1.y, plain.c1.y, 1.0e-6)
+            self.assertTrue(top.driver.current_iteration < iters / 4)
+
+    def test_anderson_depth(self):
+        iters = self._run('none').driver.current_iteration
+        top = self._run('anderson', depth=1)
+        self.assertTrue(top.driver.current_iteration < iters)
+
+    def test_sellar(self):
+        for accelerator in ('aitken', 'anderson'):
+            top = set_as_top(Sellar_MDA())
+            top.driver.accelerator = accelerator
+            top.run()
+            assert_rel_error(self, top.d1.y1, top.d2.y1, 1.0e-4)
+            assert_rel_error(self, top.d1.y2, top.d2.y2, 1.0e-4)
+            self.assertTrue(top.d1.exec_count < 10)
+
+
 class FixedPointIterator_with_Cyclic_TestCase(unittest.TestCase):
     """test the FixedPointIterator with cyclic a workflow"""
 
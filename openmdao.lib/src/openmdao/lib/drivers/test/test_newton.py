@@ -12,6 +12,7 @@ from openmdao.lib.optproblems.sellar import Discipline1_WithDerivatives, \
                                             Discipline2_WithDerivatives, \
                                             Discipline1, Discipline2
 from openmdao.main.api import Assembly, Component, set_as_top, Driver
+from openmdao.main.exec_profiler import ExecProfiler
 from openmdao.main.hasparameters import HasParameters
 from openmdao.main.interfaces import IHasParameters, implements
 from openmdao.main.test.simpledriver import SimpleDriver
@@ -402,6 +403,50 @@ class Newton_SolverTestCase(unittest.TestCase):
         print top.comp.x, top.comp.y
         assert_rel_error(self, top.comp.x, -0.38742588, 1e-4)
 
+    def _power_solve(self, **options):
+        top = set_as_top(Assembly())
+        top.add('comp', ExecCompWithDerivatives(
+            ['f = x**n + x - 10.0'], ['df_dx = n*x**(n-1.0) + 1.0']))
+        top.comp.n = 77.0/27.0
+        top.comp.x = 0.0
+
+        top.add('driver', NewtonSolver())
+        top.driver.workflow.add('comp')
+        top.driver.add_parameter('comp.x', 0, 100)
+        top.driver.add_constraint('comp.f = 0')
+        for name, value in options.items():
+            setattr(top.driver, name, value)
+
+        with ExecProfiler() as prof:
+            top.run()
+
+        assert_rel_error(self, top.comp.x, 2.06720359226, 1e-8)
+        return prof.to_dict()['comp (SimpleSystem)']['linearize']['calls']
+
+    def test_armijo(self):
+        self._power_solve(line_search='armijo')
+        self._power_solve(line_search='armijo', iprint=2)
+
+    def test_jacobian_reuse(self):
+        full = self._power_solve(line_search='armijo')
+        reused = self._power_solve(line_search='armijo', max_jacobian_age=5)
+        self.assertTrue(reused < full)
+
+        # falls back to a new linearization when the old one fails
+        reused = self._power_solve(max_jacobian_age=5)
+        self.assertTrue(reused < full)
+
+    def test_eisenstat_walker(self):
+        self._power_solve(forcing='eisenstat_walker')
+        self._power_solve(forcing='eisenstat_walker', line_search='armijo',
+                          max_jacobian_age=3)
+
+        top = set_as_top(Sellar_MDA())
+        top.driver.forcing = 'eisenstat_walker'
+        top.run()
+        assert_rel_error(self, top.d1.y1, top.d2.y1, 1.0e-4)
+        assert_rel_error(self, top.d1.y2, top.d2.y2, 1.0e-4)
+
 
 class Sellar_MDA_Cycles(Assembly):
 
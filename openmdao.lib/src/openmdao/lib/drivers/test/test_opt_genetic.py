@@ -10,6 +10,7 @@ from openmdao.main.datatypes.api import Float, Array, Enum, Int, Str
 from pyevolve import Selectors
 
 from openmdao.main.api import Assembly, Component, set_as_top, Driver
+from openmdao.lib.drivers import genetic
 from openmdao.lib.drivers.genetic import Genetic
 
 # pylint: disable-msg=E1101
@@ -116,6 +117,51 @@ class TestCase(unittest.TestCase):
         self.assertEqual(y, 0)
         self.assertEqual(z, 0)
 
+    def _setup_sphere(self):
+        self.top.add('comp', SphereFunction())
+        self.top.driver.workflow.add('comp')
+        self.top.driver.add_objective("comp.total")
+
+        self.top.driver.add_parameter('comp.x')
+        self.top.driver.add_parameter('comp.y')
+        self.top.driver.add_parameter('comp.z')
+
+        self.top.driver.mutation_rate = .02
+        self.top.driver.generations = 20
+        self.top.driver.opt_type = "minimize"
+
+    def test_fitness_cache(self):
+        self._setup_sphere()
+        self.top.run()
+
+        # Repeated individuals aren't evaluated again.
+        driver = self.top.driver
+        self.assertTrue(self.top.comp.exec_count <
+                        driver.population_size*(driver.generations+1))
+        self.assertEqual(self.top.comp.exec_count, len(driver._scores)+1)
+
+        self.assertAlmostEqual(driver.best_individual.score, .0644, places=3)
+        x, y, z = [x for x in driver.best_individual]
+        self.assertAlmostEqual(x, 0.2538, places=3)
+        self.assertEqual(y, 0)
+        self.assertEqual(z, 0)
+
+    def test_n_procs(self):
+        self._setup_sphere()
+        self.top.driver.n_procs = 2
+        self.top.run()
+
+        # Same result as the serial evaluation in test_fitness_cache.
+        driver = self.top.driver
+        self.assertAlmostEqual(driver.best_individual.score, .0644, places=3)
+        x, y, z = [x for x in driver.best_individual]
+        self.assertAlmostEqual(x, 0.2538, places=3)
+        self.assertEqual(y, 0)
+        self.assertEqual(z, 0)
+
+        # Only the forked workers keep a reference to the driver.
+        self.assertTrue(genetic._worker_driver is None)
+
     def test_optimizeSpherearray_nolowhigh(self):
         self.top.add('comp', SphereFunctionArray())
         self.top.driver.workflow.add('comp')
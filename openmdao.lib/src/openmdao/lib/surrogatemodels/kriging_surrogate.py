@@ -1,17 +1,143 @@
 """ Surrogate model based on Kriging. """
-from math import log, e, sqrt
+from multiprocessing import Pool
 
 # pylint: disable-msg=E0611,F0401
-from numpy import array, zeros, dot, ones, eye, abs, vstack, exp, \
-                  sum, log10
-from numpy.linalg import det, linalg, lstsq
-from scipy.linalg import cho_factor, cho_solve
+from numpy import array, zeros, dot, ones, eye, abs, vstack, exp, log, \
+                  sum, log10, diag, triu_indices, logaddexp, where, prod, \
+                  sign, arange, less, nonzero, concatenate, triu, \
+                  hstack, sqrt
+from numpy.linalg import linalg, lstsq, eigh
+from numpy.random import uniform
+from scipy.linalg import cho_factor, cho_solve, get_lapack_funcs, \
+                         cholesky, solve_triangular
 from scipy.optimize import minimize
 
 from openmdao.main.api import Container
 from openmdao.main.interfaces import implements, ISurrogate
 from openmdao.main.uncertain_distributions import NormalDistribution
 
+# bounds on log10(theta) used when fitting the correlation parameters
+_THETA_BOUNDS = (log10(1e-2), log10(3))
+
+# larger nuggets tried in turn when R is not numerically positive definite
+_JITTERS = (1e-14, 1e-13, 1e-12, 1e-11, 1e-10)
+
+
+def _pairwise_distances(X):
+    """Return the indices (i, j), i < j, of every pair of rows in `X`
+    together with the squared distance between each pair in each
+    dimension.
+    """
+    idx = triu_indices(len(X), 1)
+    return idx, (X[idx[0]] - X[idx[1]])**2
+
+
+def _likelihood_terms(Y, cho, logdet):
+    """Return mu, sig2, R^-1 (Y - mu) and the concentrated log likelihood,
+    given `cho`, the solutions of R x = Y and R x = 1, and log(det(R)).
+    """
+    n = len(Y)
+    one = ones(n)
+    mu = dot(one, cho[0])/dot(one, cho[1])
+    alpha = cho[0] - mu*cho[1]
+    sig2 = dot(Y - mu, alpha)/n
+    loglike = -n/2.*log(sig2) - 0.5*logdet
+    return mu, sig2, alpha, loglike
+
+
+def _concentrated_likelihood(log10t, Y, idx, dists, nugget):
+    """Return the concentrated log likelihood of the Kriging model with
+    correlation parameters 10**log10t, its gradient with respect to log10t,
+    the quantities (R, R_fact, mu, sig2) that define the model, and the
+    nugget used.
+
+    Many closely spaced points make R indefinite by rounding error alone,
+    so the nugget is raised slightly (see _JITTERS) until R can be Cholesky
+    factored. Both the likelihood and its gradient then reuse that factor.
+    R_fact is None if R still could not be factored, in which case a
+    pseudo-inverse from the eigendecomposition of R is used instead.
+    """
+    n = len(Y)
+    thetas = 10.**log10t
+    unscaled = exp(-dot(dists, thetas))
+
+    one = ones(n)
+    for nugget in [nugget] + [jitter for jitter in _JITTERS if jitter > nugget]:
+        corr = unscaled*(1.0 - nugget)
+        R = eye(n)
+        R[idx] = corr
+        R[idx[1], idx[0]] = corr
+        try:
+            R_fact = cho_factor(R)
+            potri, = get_lapack_funcs(('potri',), (R,))
+            Rinv, info = potri(R_fact[0], lower=R_fact[1])
+            if info != 0:
+                raise linalg.LinAlgError("potri failed")
+        except (linalg.LinAlgError, ValueError):
+            R_fact = None
+        else:
+            break
+
+    if R_fact is not None:
+        cho = cho_solve(R_fact, vstack([Y, one]).T).T
+        # only the triangle matching idx is used below
+        if R_fact[1]:
+            Rinv = Rinv.T
+        logdet = 2.*sum(log(diag(R_fact[0])))
+        det_weight = 1.0
+    else:
+        # R is symmetric, so eigh gives both the pseudo-inverse and the
+        # determinant at roughly half the cost of an SVD based pinv.
+        lam, vec = eigh(R)
+        cutoff = 1e-15*abs(lam).max()
+        large = abs(lam) > cutoff
+        Rinv = dot(vec*where(large, 1./where(large, lam, 1.), 0.), vec.T)
+        cho = dot(Rinv, vstack([Y, one]).T).T
+        # Keep |det(R)| away from zero so the likelihood of a numerically
+        # singular R stays bounded.
+        det_sign = prod(sign(lam))
+        raw = sum(log(abs(lam[lam != 0.])))
+        logdet = logaddexp(raw if det_sign else -float('inf'), log(1.e-16))
+        det_weight = exp(raw - logdet) if det_sign else 0.0
+
+    mu, sig2, alpha, loglike = _likelihood_terms(Y, cho, logdet)
+
+    # dR/dtheta_k is -dists[:, k]*corr for each pair and zero on the diagonal.
+    dcorr = -dists*corr[:, None]
+    quad = alpha[idx[0]]*alpha[idx[1]]
+    grad = dot(quad, dcorr)/sig2 - det_weight*dot(Rinv[idx], dcorr)
+    grad *= thetas*log(10.)
+
+    return loglike, grad, R, R_fact, mu, sig2, nugget
+
+
+def _fit_thetas(start, Y, idx, dists, nugget):
+    """Maximize the concentrated likelihood over log10(theta), starting
+    from `start`. Returns the optimum and the negated likelihood there.
+    """
+    # A nugget raised to factor R is kept, rather than failing to factor
+    # R again at every step.
+    nuggets = [nugget]
+
+    def _negll(log10t):
+        """ Callback function"""
+        result = _concentrated_likelihood(log10t, Y, idx, dists, nuggets[0])
+        nuggets[0] = result[-1]
+        return -result[0], -result[1]
+
+    result = minimize(_negll, start, jac=True, method='L-BFGS-B',
+                      bounds=[_THETA_BOUNDS]*len(start))
+    return result.x, result.fun
+
+
+def _fit_thetas_from(args):
+    """Process pool entry point for :func:`_fit_thetas`. The pairwise
+    distances are recomputed here rather than sent to the worker.
+    """
+    start, X, Y, nugget = args
+    idx, dists = _pairwise_distances(X)
+    return _fit_thetas(start, Y, idx, dists, nugget)
+
 
 class KrigingSurrogate(Container):
     """Surrogate Modeling method based on the simple Kriging interpolation.
@@ -26,6 +152,13 @@ class KrigingSurrogate(Container):
         self.n = None       # number of training points
         self.thetas = None
         self.nugget = 0     # nugget smoothing parameter from [Sasena, 2002]
+        self.n_starts = 1   # number of starting points for fitting thetas
+        self.n_procs = 1    # number of processes used for the starting points
+
+        # update() re-optimizes thetas after this many added points, or when
+        # the log likelihood per point drifts by more than retrain_drift
+        self.retrain_interval = 10
+        self.retrain_drift = 0.1
 
         self.R = None
         self.R_fact = None
@@ -41,55 +174,47 @@ class KrigingSurrogate(Container):
         """Calculates a predicted value of the response based on the current
         trained model for the supplied list of inputs.
         """
+        mu, sigma = self._predict_batch([new_x])
+        return NormalDistribution(mu[0], sigma[0])
+
+    def predict_batch(self, new_X):
+        """Calculates the predicted mean and standard deviation of the
+        response at each row of `new_X` in one vectorized call. Returns a
+        tuple of two arrays.
+        """
+        return self._predict_batch(new_X)
+
+    def _predict_batch(self, new_X):
+        """Returns arrays of the predicted means and standard deviations."""
         if self.m is None:  # untrained surrogate
             raise RuntimeError("KrigingSurrogate has not been trained, so no "
                                "prediction can be made")
-        r = zeros(self.n)
-        X, Y = self.X, self.Y
         thetas = 10.**self.thetas
-        XX = array(X)
-        new_x = array(new_x)
-        for i in range(self.n):
-            r[i] = sum(thetas*(XX[i] - new_x)**2.)
+        XX = array(self.X, dtype=float)
+        new_X = array(new_X, dtype=float).reshape(-1, self.m)
+
+        # r[i, k] is the correlation of new point k with training point i
+        r = zeros((self.n, len(new_X)))
+        for i in xrange(self.m):
+            r += thetas[i]*(XX[:, i:i+1] - new_X[:, i])**2.
         r = exp(-r)
 
         one = ones(self.n)
+        rhs = hstack([(self.Y - self.mu)[:, None], r, one[:, None]])
         if self.R_fact is not None:
             #---CHOLESKY DECOMPOSTION ---
-            #f = self.mu+dot(r,cho_solve(self.R_fact,Y-dot(one,self.mu)))
-            #term1 = dot(r,cho_solve(self.R_fact,r))
-            #term2 = (1.0-dot(one,cho_solve(self.R_fact,r)))**2./dot(one,cho_solve(self.R_fact,one))
-
-            rhs = vstack([(Y-dot(one, self.mu)), r, one]).T
             R_fact = (self.R_fact[0].T, not self.R_fact[1])
-            cho = cho_solve(R_fact, rhs).T
-
-            f = self.mu + dot(r, cho[0])
-            term1 = dot(r, cho[1])
-            term2 = (1.0 - dot(one, cho[1]))**2./dot(one, cho[2])
-
+            sol = cho_solve(R_fact, rhs)
         else:
             #-----LSTSQ-------
-            rhs = vstack([(Y-dot(one, self.mu)), r, one]).T
-            lsq = lstsq(self.R.T, rhs)[0].T
-
-            f = self.mu + dot(r, lsq[0])
-            term1 = dot(r, lsq[1])
-            term2 = (1.0 - dot(one, lsq[1]))**2./dot(one, lsq[2])
-            """
-      #-----LSTSQ-------
-      rhs = vstack([(Y-dot(one, self.mu)), r, one]).T
-      lsq = lstsq(self.R.T, rhs)[0].T
-
-      f = self.mu + dot(r, lsq[0])
-      term1 = dot(r, lsq[1])
-      term2 = (1.0 - dot(one, lsq[1]))**2./dot(one, lsq[2])
-      """
-        MSE = self.sig2*(1.0 - term1 + term2)
-        RMSE = sqrt(abs(MSE))
+            sol = lstsq(self.R.T, rhs, rcond=-1)[0]
 
-        dist = NormalDistribution(f, RMSE)
-        return dist
+        f = self.mu + dot(sol[:, 0], r)
+        term1 = sum(r*sol[:, 1:-1], 0)
+        term2 = (1.0 - dot(one, sol[:, 1:-1]))**2./dot(one, sol[:, -1])
+
+        MSE = self.sig2*(1.0 - term1 + term2)
+        return f, sqrt(abs(MSE))
 
     def train(self, X, Y):
         """Train the surrogate model with the given set of inputs and outputs."""
@@ -103,79 +228,115 @@ class KrigingSurrogate(Container):
                 self.Y.append(out)
             else: "duplicate training point" """
 
+        # keep copies, since callers such as MetaModel append to their lists
+        X = array(X, dtype=float)
+        Y = array(Y, dtype=float)
         self.X = X
         self.Y = Y
         self.m = len(X[0])
         self.n = len(X)
 
-        thetas = zeros(self.m)
-        #print "initial guess", thetas
-
-        def _calcll(thetas):
-            ''' Callback function'''
-            self.thetas = thetas
-            self._calculate_log_likelihood()
-            return -self.log_likelihood
+        self._idx, self._dists = _pairwise_distances(X)
+
+        # The first start is the historical initial guess of thetas = 1.
+        starts = [zeros(self.m)]
+        for i in xrange(self.n_starts - 1):
+            starts.append(uniform(_THETA_BOUNDS[0], _THETA_BOUNDS[1], self.m))
+
+        if self.n_procs > 1 and len(starts) > 1:
+            pool = Pool(min(self.n_procs, len(starts)))
+            try:
+                fits = pool.map(_fit_thetas_from,
+                                [(start, X, Y, self.nugget) for start in starts])
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            fits = [_fit_thetas(start, Y, self._idx, self._dists, self.nugget)
+                    for start in starts]
 
-        #if self.thetas == None:
-        #self.thetas = fmin(_calcll, thetas, disp=False, ftol=0.0001)
-        def lowerBound(log10t):
-            return log10t - log10(self.thetas)
+        self.thetas = min(fits, key=lambda fit: fit[1])[0]
+        self._calculate_log_likelihood()
 
-        def upperBound(log10t):
-            return log10(self.thetas) - log10t
+        self._n_added = 0
+        self._fit_log_likelihood = self.log_likelihood/self.n
 
-        cons = []
-        for i in xrange(self.m):
-            cons.append({'type': 'ineq', 'fun': lambda log10t: log10t[i] - log10(1e-2)})  # min
-            cons.append({'type': 'ineq', 'fun': lambda log10t: log10(3) - log10t[i]})     # max
+    def update(self, X_new, Y_new):
+        """Add training points to an already trained surrogate.
 
-        self.thetas = minimize(_calcll, thetas, method='COBYLA', constraints=cons, tol=1e-8).x
-        #print self.thetas
-        self._calculate_log_likelihood()
+        The correlation parameters are kept, and the Cholesky factor of R is
+        extended by a block update, which costs O(n**2) rather than the
+        O(n**3) of a full :meth:`train`. The thetas are re-optimized once
+        `retrain_interval` points have been added since the last fit, or
+        when the log likelihood per point drifts from its value at the last
+        fit by more than `retrain_drift`.
+        """
+        if self.m is None:
+            self.train(X_new, Y_new)
+            return
 
-    def _calculate_log_likelihood(self):
-        #if self.m == None:
-        #    Give error message
-        R = zeros((self.n, self.n))
-        X, Y = array(self.X), array(self.Y)
-        thetas = 10.**self.thetas
+        X_new = array(X_new, dtype=float).reshape(-1, self.m)
+        n_old = self.n
+        X = vstack([self.X, X_new])
+        Y = concatenate([self.Y, array(Y_new, dtype=float).ravel()])
 
-        #weighted distance formula
-        for i in range(self.n):
-            R[i, i+1:self.n] = e**(-sum(thetas*(X[i] - X[i+1:self.n])**2., 1))
+        self._n_added += len(X_new)
+        if self._n_added >= self.retrain_interval:
+            self.train(X, Y)
+            return
 
-        R = R*(1.0 - self.nugget)
-        R = R + R.T + eye(self.n)
+        self.X = X
+        self.Y = Y
+        self.n = n = len(X)
+
+        # pairs (i, j), i < j, that involve at least one new point
+        i, j = nonzero(less.outer(arange(n), arange(n_old, n)))
+        j += n_old
+        dists = (X[i] - X[j])**2
+        self._idx = (concatenate([self._idx[0], i]),
+                     concatenate([self._idx[1], j]))
+        self._dists = vstack([self._dists, dists])
+
+        corr = exp(-dot(dists, 10.**self.thetas))*(1.0 - self._nugget)
+        R = eye(n)
+        R[:n_old, :n_old] = self.R
+        R[i, j] = corr
+        R[j, i] = corr
         self.R = R
 
-        one = ones(self.n)
-        try:
-            self.R_fact = cho_factor(R)
-            rhs = vstack([Y, one]).T
-            R_fact = (self.R_fact[0].T, not self.R_fact[1])
-            cho = cho_solve(R_fact, rhs).T
-
-            self.mu = dot(one, cho[0])/dot(one, cho[1])
-            ymdotone = Y - dot(one, self.mu)
-            self.sig2 = dot(ymdotone, cho_solve(self.R_fact,
-                                                (ymdotone)))/self.n
-            #self.log_likelihood = -self.n/2.*log(self.sig2)-1./2.*log(abs(det(self.R)+1.e-16))-sum(thetas)
-            self.log_likelihood = -self.n/2.*log(self.sig2) - \
-                                  1./2.*log(abs(det(self.R) + 1.e-16))
+        if self.R_fact is None:
+            self._calculate_log_likelihood()
+        else:
+            U11 = self.R_fact[0].T if self.R_fact[1] else self.R_fact[0]
+            U11 = triu(U11)
+            try:
+                # R = U'U with U = [[U11, U12], [0, U22]]
+                U12 = solve_triangular(U11, R[:n_old, n_old:], trans='T')
+                U22 = cholesky(R[n_old:, n_old:] - dot(U12.T, U12))
+            except (linalg.LinAlgError, ValueError):
+                self._calculate_log_likelihood()
+            else:
+                U = zeros((n, n))
+                U[:n_old, :n_old] = U11
+                U[:n_old, n_old:] = U12
+                U[n_old:, n_old:] = U22
+                self.R_fact = (U, False)
+
+                cho = cho_solve(self.R_fact, vstack([Y, ones(n)]).T).T
+                logdet = 2.*sum(log(diag(U)))
+                self.mu, self.sig2, alpha, self.log_likelihood = \
+                    _likelihood_terms(Y, cho, logdet)
+
+        if abs(self.log_likelihood/n - self._fit_log_likelihood) > \
+           self.retrain_drift:
+            self.train(X, Y)
 
-        except (linalg.LinAlgError, ValueError):
-            #------LSTSQ---------
-            self.R_fact = None  # reset this to none, so we know not to use cholesky
-            # self.R = self.R+diag([10e-6]*self.n)  # improve conditioning[Booker et al., 1999]
-            rhs = vstack([Y, one]).T
-            lsq = lstsq(self.R.T, rhs)[0].T
-            self.mu = dot(one, lsq[0])/dot(one, lsq[1])
-            ymdotone = Y - dot(one, self.mu)
-            self.sig2 = dot(ymdotone, lstsq(self.R, ymdotone)[0])/self.n
-            self.log_likelihood = -self.n/2.*log(self.sig2) - \
-                                   1./2.*log(abs(det(self.R) + 1.e-16))
-            #print self.log_likelihood
+    def _calculate_log_likelihood(self):
+        """Update the model and its log likelihood for the current thetas."""
+        (self.log_likelihood, grad, self.R, self.R_fact,
+         self.mu, self.sig2, self._nugget) = \
+            _concentrated_likelihood(self.thetas, self.Y, self._idx,
+                                     self._dists, self.nugget)
 
 
 class FloatKrigingSurrogate(KrigingSurrogate):
@@ -1,10 +1,12 @@
 """Surrogate Model based on second order response surface equations."""
 
-from numpy import matrix, linalg, power, multiply, concatenate, ones
+from numpy import array, ones, hstack, vstack, zeros, eye, dot, sqrt, \
+                  triu_indices
+from numpy.linalg import lstsq, qr
+from scipy.linalg import solve_triangular
 
 from openmdao.main.api import Container
 from openmdao.main.interfaces import implements,ISurrogate
-from openmdao.main.datatypes.api import Float, Bool
 
 class ResponseSurface(Container): 
     implements(ISurrogate) 
@@ -16,6 +18,8 @@ class ResponseSurface(Container):
         self.m = None #number of training points 
         self.n = None #number of independents
         self.betas = None #vector of response surface equation coefficients
+        self.solver = 'lstsq' #'lstsq' or 'qr' (needs m >= number of terms)
+        self.ridge = 0. #ridge regularization weight on the non-constant terms
         
         if X is not None and Y is not None: 
             self.train(X,Y)
@@ -24,42 +28,54 @@ class ResponseSurface(Container):
         """Returns the value iself. Response surface equations don't have uncertainty.""" 
         return value
 
+    def _design_matrix(self, X):
+        """Returns the matrix of the constant, linear, squared and cross
+        terms for each row of X, built in one shot from the index table
+        of the cross terms."""
+        i, j = self._cross_terms
+        return hstack((ones((X.shape[0], 1)), X, X**2, X[:, i]*X[:, j]))
+
     def train(self,X,Y): 
         """ Calculate response surface equation coefficients using least squares regression. """ 
         
-        X = matrix(X)
-        Y = matrix(Y).T
+        X = array(X, dtype=float)
+        Y = array(Y, dtype=float).ravel()
         
         self.m = X.shape[0]
         self.n = X.shape[1]
+        self._cross_terms = triu_indices(self.n, 1)
         
         # Modify X to include constant, squared terms and cross terms
-        X = concatenate((matrix(ones((self.m,1))),X),1) 
-        for i in range(1,self.n+1):
-            X = concatenate((X,power(X[:,i],2)),1)
-        for i in range(1,self.n):
-            for j in range(i+1,self.n+1):
-                X = concatenate((X,multiply(X[:,i],X[:,j])),1)
+        X = self._design_matrix(X)
+        
+        if self.ridge > 0.:
+            # ridge regression as the least squares solution of an
+            # augmented system; the constant term isn't penalized
+            penalty = sqrt(self.ridge)*eye(X.shape[1])
+            penalty[0, 0] = 0.
+            X = vstack((X, penalty))
+            Y = hstack((Y, zeros(X.shape[1])))
         
         # Determine response surface equation coefficients (betas) using least squares
-        self.betas, rs, r, s = linalg.lstsq(X,Y)
+        if self.solver == 'qr':
+            Q, R = qr(X)
+            self.betas = solve_triangular(R, dot(Q.T, Y))
+        else:
+            self.betas = lstsq(X, Y, rcond=-1)[0]
         
     def predict(self,new_x): 
         """Calculates a predicted value of the response based on the current response surface model for the supplied list of inputs. """ 
         
-        new_x = matrix(new_x)
+        return self.predict_batch([new_x])[0]
+
+    def predict_batch(self, new_X):
+        """Calculates the predicted values of the response for each row of
+        new_X in one vectorized call. Returns an array."""
         
-        # Modify new_x to include constant, squared terms and cross terms
-        new_x = concatenate((matrix(ones((1,1))),new_x),1) 
-        for i in range(1,self.n+1):
-            new_x = concatenate((new_x,power(new_x[:,i],2)),1)
-        for i in range(1,self.n):
-            for j in range(i+1,self.n+1):
-                new_x = concatenate((new_x,multiply(new_x[:,i],new_x[:,j])),1)
+        new_X = array(new_X, dtype=float).reshape(-1, self.n)
         
         # Predict new_y using new_x and betas
-        new_y = new_x*self.betas
-        return new_y[0,0]
+        return dot(self._design_matrix(new_X), self.betas)
 
 
 if __name__ == "__main__":
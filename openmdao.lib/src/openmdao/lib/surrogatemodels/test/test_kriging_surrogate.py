@@ -3,10 +3,11 @@
 import unittest
 import random
 
-from numpy import array, linspace, sin, cos, pi
+from numpy import array, linspace, sin, cos, pi, zeros
 from scipy.optimize import minimize
 
-from openmdao.lib.surrogatemodels.kriging_surrogate import KrigingSurrogate
+from openmdao.lib.surrogatemodels.kriging_surrogate import KrigingSurrogate, \
+     FloatKrigingSurrogate, _pairwise_distances, _concentrated_likelihood
 from openmdao.main.uncertain_distributions import NormalDistribution
 
 
@@ -65,9 +66,120 @@ class KrigingSurrogateTests(unittest.TestCase):
 
         pred = krig1.predict([5., 5.])
 
+        self.assertAlmostEqual(14.51, pred.sigma, places=0)
+        self.assertAlmostEqual(18.76, pred.mu, places=1)
+
+        # These thetas were found when COBYLA's bound constraints left
+        # theta[0] unbounded. The model still reproduces that fit, but its
+        # likelihood is lower and it is less accurate away from [5, 5].
+        krig2 = KrigingSurrogate()
+        krig2.train(x, y)
+        krig2.thetas = array([-4.23615123, -0.53762961])
+        krig2._calculate_log_likelihood()
+        pred = krig2.predict([5., 5.])
+
         self.assertAlmostEqual(5.79, pred.sigma, places=0)
         self.assertAlmostEqual(25.34, pred.mu, places=1)
 
+        self.assertTrue(krig1.log_likelihood > krig2.log_likelihood)
+        grid = [[x0, x1] for x0 in linspace(-5., 10., 16)
+                         for x1 in linspace(0., 15., 16)]
+        errors = [sum((krig.predict(point).mu - bran(point))**2
+                      for point in grid) for krig in (krig1, krig2)]
+        self.assertTrue(errors[0] < 0.5*errors[1])
+
+    def test_likelihood_gradient(self):
+        x = array([[-2., 0.], [-0.5, 1.5], [1., 3.], [8.5, 4.5], [-3.5, 6.]])
+        y = array([0.5, -1.2, 3.3, 0.1, 2.0])
+        idx, dists = _pairwise_distances(x)
+        log10t = array([-1.2, -0.7])
+
+        grad = _concentrated_likelihood(log10t, y, idx, dists, 0)[1]
+        step = 1e-6
+        for i in range(2):
+            dt = zeros(2)
+            dt[i] = step
+            fd = (_concentrated_likelihood(log10t + dt, y, idx, dists, 0)[0] -
+                  _concentrated_likelihood(log10t - dt, y, idx, dists, 0)[0])/(2.*step)
+            self.assertAlmostEqual(fd, grad[i], places=5)
+
+    def test_ill_conditioned(self):
+        # closely spaced points make R indefinite by rounding error alone
+        x = linspace(0., 1., 20).reshape(-1, 1)
+        y = sin(6.*x[:, 0])
+        krig1 = KrigingSurrogate()
+        krig1.train(x, y)
+
+        self.assertTrue(krig1.R_fact is not None)
+        self.assertTrue(0. < krig1._nugget <= 1e-10)
+        for point, value in zip(x, y):
+            self.assertAlmostEqual(krig1.predict(point).mu, value, places=6)
+
+        krig1.update([[0.975]], [sin(5.85)])
+        self.assertTrue(krig1.R_fact is not None)
+        self.assertAlmostEqual(krig1.predict([0.975]).mu, sin(5.85), places=6)
+
+    def test_multistart(self):
+        x = array([[0.05], [.25], [0.61], [0.95]])
+        y = array([0.738513784857542, -0.210367746201974, -0.489015457891476, 12.3033138316612])
+
+        krig1 = KrigingSurrogate()
+        krig1.train(x, y)
+
+        krig2 = KrigingSurrogate()
+        krig2.n_starts = 4
+        krig2.n_procs = 2
+        krig2.train(x, y)
+
+        self.assertTrue(krig2.log_likelihood >= krig1.log_likelihood - 1e-8)
+        self.assertAlmostEqual(krig1.thetas[0], krig2.thetas[0], places=3)
+
+    def test_update(self):
+        x = array([[0.05], [.25], [0.61], [0.95], [0.4], [0.8]])
+        y = sin(5.*x).flatten()
+
+        krig1 = KrigingSurrogate()
+        krig1.retrain_drift = 1e9
+        krig1.train(x[:4], y[:4])
+        thetas = krig1.thetas.copy()
+        krig1.update(x[4:], y[4:])
+        self.assertEqual(krig1.n, 6)
+        self.assertEqual(thetas[0], krig1.thetas[0])
+
+        # same model as a full factorization with the same thetas
+        krig2 = KrigingSurrogate()
+        krig2.train(x, y)
+        krig2.thetas = thetas
+        krig2._calculate_log_likelihood()
+        self.assertAlmostEqual(krig2.log_likelihood, krig1.log_likelihood,
+                               places=6)
+        pred1 = krig1.predict([0.5])
+        pred2 = krig2.predict([0.5])
+        self.assertAlmostEqual(pred2.mu, pred1.mu, places=6)
+        self.assertAlmostEqual(pred2.sigma, pred1.sigma, places=6)
+
+        # thetas are refit once retrain_interval points have been added
+        krig1.retrain_interval = 3
+        krig1.update([[0.1]], [sin(0.5)])
+        self.assertEqual(krig1._n_added, 0)
+        self.assertEqual(krig1.n, 7)
+
+    def test_predict_batch(self):
+        x = array([[-2., 0.], [-0.5, 1.5], [1., 3.], [8.5, 4.5], [-3.5, 6.]])
+        y = array([0.5, -1.2, 3.3, 0.1, 2.0])
+        new_x = array([[5., 5.], [-2., 0.], [0., 2.]])
+        for cls in (KrigingSurrogate, FloatKrigingSurrogate):
+            krig1 = cls()
+            krig1.train(x, y)
+
+            mu, sigma = krig1.predict_batch(new_x)
+            for i, point in enumerate(new_x):
+                pred = KrigingSurrogate.predict(krig1, point)
+                self.assertAlmostEqual(pred.mu, mu[i], places=10)
+                self.assertAlmostEqual(pred.sigma, sigma[i], places=10)
+                if cls is FloatKrigingSurrogate:
+                    self.assertEqual(krig1.predict(point), pred.mu)
+
     def test_get_uncertain_value(self):
         x = array([[0.05], [.25], [0.61], [0.95]])
         y = array([0.738513784857542, -0.210367746201974, -0.489015457891476, 12.3033138316612])
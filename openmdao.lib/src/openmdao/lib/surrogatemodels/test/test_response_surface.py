@@ -36,3 +36,40 @@ class ResponseSurfaceTest(unittest.TestCase):
         
         self.assertTrue(residual<1e-5)
         
+    def test_quadratic(self):
+        X = np.random.random((30, 3))
+        def quad(x):
+            return 1. + 2.*x[0] - x[1] + 3.*x[2]**2 + 0.5*x[0]*x[2]
+        Y = np.array([quad(x) for x in X])
+
+        for solver in ('lstsq', 'qr'):
+            rs = ResponseSurface()
+            rs.solver = solver
+            rs.train(X, Y)
+            self.assertAlmostEqual(rs.predict([0.3, 0.2, 0.1]),
+                                   quad([0.3, 0.2, 0.1]), places=10)
+
+        # constant, linear, squared, then cross terms
+        expected = [1., 2., -1., 0., 0., 0., 3., 0., 0.5, 0.]
+        for beta, exp in zip(rs.betas, expected):
+            self.assertAlmostEqual(beta, exp, places=10)
+
+    def test_predict_batch(self):
+        rs = ResponseSurface(self.X_train, self.Y_train)
+        new_X = np.random.random((5, self.X_train.shape[1]))
+        batch = rs.predict_batch(new_X)
+        for x, y in zip(new_X, batch):
+            self.assertAlmostEqual(rs.predict(x), y, places=10)
+
+    def test_ridge(self):
+        X = np.random.random((30, 2))
+        Y = X[:, 0]**2 + X[:, 1]
+
+        rs = ResponseSurface()
+        rs.ridge = 1e3
+        rs.train(X, Y)
+
+        # heavy regularization shrinks everything but the constant term
+        self.assertTrue(np.abs(rs.betas[1:]).max() < 0.05)
+        self.assertAlmostEqual(rs.betas[0], Y.mean(), places=1)
+
@@ -31,6 +31,7 @@ from openmdao.main.vartree import VariableTree
 from openmdao.main.datatypes.api import List, Slot, Bool, VarTree
 from openmdao.main.driver import Driver
 from openmdao.main.rbac import rbac
+from openmdao.main.setup_profiler import setup_phase
 from openmdao.main.mp_support import is_instance
 from openmdao.main.printexpr import eliminate_expr_ws
 from openmdao.main.expreval import ExprEvaluator, ConnectedExprEvaluator
@@ -459,6 +460,7 @@ class Assembly(Component):
                 self._depgraph.add_node('_pre_driver', comp=True, driver=True)
 
     @rbac(('owner', 'user'))
+    @setup_phase
     def collect_metadata(self):
         # store metadata (size, etc.) for all relevant vars
         self._get_all_var_metadata(self._reduced_graph)
@@ -1045,6 +1047,7 @@ class Assembly(Component):
                       if has_interface(c, IComponent)])
 
     @rbac(('owner', 'user'))
+    @setup_phase
     def setup_systems(self):
         rgraph = self._reduced_graph
 
@@ -1097,13 +1100,25 @@ class Assembly(Component):
         """Return requested_cpus"""
         return self._top_driver.get_req_cpus()
 
+    @rbac(('owner', 'user'))
+    def get_cost(self):
+        """Return the estimated cost of one execution and its parallel
+        fraction. If no cost has been set, the cost of our top
+        driver is used."""
+        if self.mpi.cost is None:
+            return self._top_driver.get_cost()
+        return (self.mpi.cost, self.mpi.parallel_fraction)
+
+    @setup_phase
     def setup_communicators(self, comm):
         self.mpi.comm = comm
         self._system.setup_communicators(comm)
 
+    @setup_phase
     def setup_variables(self):
         self._system.setup_variables()
 
+    @setup_phase
     def setup_sizes(self):
         """Calculate the local sizes of all relevant variables
         and share those across all processes in the communicator.
@@ -1156,12 +1171,14 @@ class Assembly(Component):
         # this will calculate sizes for all subsystems
         self._system.setup_sizes()
 
+    @setup_phase
     def setup_vectors(self, arrays=None):
         """Creates vector wrapper objects to manage local and
         distributed vectors need to solve the distributed system.
         """
         self._system.setup_vectors(None)
 
+    @setup_phase
     def setup_scatters(self):
         self._system.setup_scatters()
 
@@ -1201,6 +1218,7 @@ class Assembly(Component):
 
         return None
 
+    @setup_phase
     def setup_depgraph(self, dgraph=None):
         # create our depgraph
         self._depgraph = DependencyGraph()
@@ -1287,6 +1305,7 @@ class Assembly(Component):
             if has_interface(comp, IDriver) or has_interface(comp, IAssembly):
                 comp.setup_depgraph(self._depgraph)
 
+    @setup_phase
     def setup_reduced_graph(self, inputs=None, outputs=None, drvname=None):
         """Create the graph we need to do the breakdown of the model
         into Systems.
@@ -1421,6 +1440,7 @@ class Assembly(Component):
                 comp.setup_reduced_graph(inputs=_get_scoped_inputs(comp, dgraph, inputs),
                                          outputs=_get_scoped_outputs(comp, dgraph, outputs))
 
+    @setup_phase
     def compute_ordering(self, graph):
         """Given a component graph, each driver can determine its iteration
         set and the ordering of its workflow.  Each Assembly has its own
@@ -1432,6 +1452,7 @@ class Assembly(Component):
             if has_interface(comp, IAssembly):
                 comp.compute_ordering(None)
 
+    @setup_phase
     def compute_itersets(self, graph):
         """Determine the iteration sets for all drivers."""
         compgraph = self._depgraph.component_graph()
@@ -1548,6 +1569,7 @@ class Assembly(Component):
         for name in simple_node_iter(node):
             self._var_meta[name] = meta
 
+    @setup_phase
     def get_var_print_ranks(self):
         """Collect info from all processes indicating what variables
         are local to that process, and record the lowest rank where
@@ -1618,6 +1640,7 @@ class Assembly(Component):
 
         return all_locs
 
+    @setup_phase
     def setup_init(self):
         """This is for any last minute configuration (like with
         ArchitectureAssembly).  Components' setup_init methods
@@ -1644,9 +1667,11 @@ class Assembly(Component):
         for comp in self.get_comps():
             comp.setup_init()
 
+    @setup_phase
     def init_var_sizes(self):
         self._top_driver.init_var_sizes()
 
+    @setup_phase
     def post_setup(self):
         for comp in self.get_comps():
             comp.post_setup()
@@ -1654,6 +1679,7 @@ class Assembly(Component):
         if self._system.is_active():
             self._system.vec['u'].set_from_scope(self)
 
+    @setup_phase
     def _setup(self, inputs=None, outputs=None, drvname=None):
         """This is called automatically on the top level Assembly
         prior to execution.  It will also be called if
@@ -338,12 +338,18 @@ class Case(object):
                         last_excpt = sys.exc_info()
                         outputs[name] = _Missing
             else:
-                for name in outputs.keys():
-                    try:
-                        outputs[name] = scope.get(name)
-                    except Exception:
-                        last_excpt = sys.exc_info()
-                        outputs[name] = _Missing
+                names = outputs.keys()
+                try:
+                    # one call for all outputs, which matters for a
+                    # remote scope
+                    outputs.update(zip(names, scope.get_many(names)))
+                except Exception:
+                    for name in names:
+                        try:
+                            outputs[name] = scope.get(name)
+                        except Exception:
+                            last_excpt = sys.exc_info()
+                            outputs[name] = _Missing
 
         self.timestamp = time.time()
 
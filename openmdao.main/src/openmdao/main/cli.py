@@ -1,5 +1,6 @@
 """OpenMDAO Command Line Interface stuff."""
 
+import os
 import sys
 import webbrowser
 from argparse import ArgumentParser
@@ -39,6 +40,31 @@ def openmdao_docs(parser, options, args=None):
     plugin_docs(parser, options, args)
 
 
+def profile_setup(parser, options, args=None):
+    """Run a model script with setup profiling enabled and report the
+    time spent in each setup phase.
+    """
+    if args:
+        print_sub_help(parser, 'profile_setup')
+        return -1
+
+    from openmdao.main.setup_profiler import SetupProfiler
+
+    script = options.script
+    sys.argv = [script]
+    sys.path.insert(0, os.path.dirname(os.path.abspath(script)))
+    namespace = {'__name__': '__main__', '__file__': script}
+
+    with SetupProfiler() as prof:
+        execfile(script, namespace)
+        if options.model:
+            namespace[options.model]._setup()
+
+    prof.report(depth=options.depth, min_time=options.min_time)
+    if options.outfile:
+        prof.save(options.outfile)
+
+
 def _get_openmdao_parser():
     """Sets up the plugin arg parser and all of its subcommand parsers."""
 
@@ -84,6 +110,26 @@ def _get_openmdao_parser():
                         help='package to be tested')
     parser.set_defaults(func=test_openmdao)
 
+    parser = subparsers.add_parser('profile_setup',
+                                   help='report the time spent in each '
+                                        'setup phase of a model')
+    parser.add_argument('script', help='Python script that builds the model')
+    parser.add_argument('-m', '--model', action='store', type=str,
+                        dest='model',
+                        help='Name of a top level Assembly in the script '
+                             'to set up after the script has run. Without '
+                             'this, only setups run by the script itself '
+                             'are reported.')
+    parser.add_argument('-d', '--depth', action='store', type=int,
+                        dest='depth', help='Maximum depth of phases to show')
+    parser.add_argument('-t', '--min_time', action='store', type=float,
+                        dest='min_time', default=0.0,
+                        help='Hide phases taking less than this many seconds')
+    parser.add_argument('-o', '--outfile', action='store', type=str,
+                        dest='outfile',
+                        help='Save the profile data in JSON form to this file')
+    parser.set_defaults(func=profile_setup)
+
     # the following subcommands will only be available in a dev build, because
     # openmdao.devtools is not part of a normal OpenMDAO release
     try:
@@ -0,0 +1,132 @@
+"""
+A compact, integer-indexed snapshot of the structure of a dependency graph.
+"""
+
+import numpy as np
+
+# node kind flags
+COMP = 0x1
+PSEUDO = 0x2
+DRIVER = 0x4
+VAR = 0x8
+SUBVAR = 0x10
+BOUNDARY = 0x20
+FAKE = 0x40
+INPUT = 0x80
+OUTPUT = 0x100
+STATE = 0x200
+RESIDUAL = 0x400
+
+# edge kind flags
+CONN = 0x1
+DRV_CONN = 0x2
+
+_NODE_FLAGS = [('comp', COMP), ('pseudo', PSEUDO), ('driver', DRIVER),
+               ('var', VAR), ('basevar', SUBVAR), ('boundary', BOUNDARY),
+               ('fake', FAKE)]
+
+_IOTYPE_FLAGS = {'in': INPUT, 'out': OUTPUT, 'state': STATE,
+                 'residual': RESIDUAL}
+
+
+def _csr(rows, cols, size):
+    """Returns (ptr, idx) giving the compressed sparse row form of the
+    edges (rows[k], cols[k]). The columns of row i are idx[ptr[i]:ptr[i+1]].
+    """
+    order = np.argsort(rows, kind='mergesort')
+    ptr = np.zeros(size+1, dtype=np.int32)
+    np.cumsum(np.bincount(rows, minlength=size), out=ptr[1:])
+    return ptr, cols[order]
+
+
+class CompactGraph(object):
+    """An immutable copy of the structure of a :class:`DependencyGraph`,
+    with node names interned to integer ids, node kinds held in an array
+    of bit flags, and adjacency in compressed sparse row (CSR) form.
+
+    It is built from the graph on demand and must be rebuilt whenever the
+    graph changes.
+    """
+
+    def __init__(self, graph):
+        self.names = names = graph.nodes()
+        self.ids = ids = dict((name, i) for i, name in enumerate(names))
+        size = len(names)
+
+        # kind flags, the id of the base variable of each var and subvar
+        # node, and the id of the node named by the part of each name
+        # before the first '.' (the owning component of component vars)
+        self.kinds = np.zeros(size, dtype=np.uint16)
+        self.base = np.empty(size, dtype=np.int32)
+        self.owner = np.empty(size, dtype=np.int32)
+        gnode = graph.node
+        for i, name in enumerate(names):
+            data = gnode[name]
+            flags = _IOTYPE_FLAGS.get(data.get('iotype'), 0)
+            for key, flag in _NODE_FLAGS:
+                if key in data:
+                    flags |= flag
+            self.kinds[i] = flags
+
+            if data.get('basevar'):
+                self.base[i] = ids.get(data['basevar'], -1)
+            elif 'var' in data:
+                self.base[i] = i
+            else:
+                self.base[i] = -1
+
+            if isinstance(name, basestring):
+                self.owner[i] = ids.get(name.split('.', 1)[0], -1)
+            else:
+                self.owner[i] = -1
+
+        srcs = []
+        dests = []
+        eflags = []
+        for u, v, data in graph.edges_iter(data=True):
+            srcs.append(ids[u])
+            dests.append(ids[v])
+            flags = 0
+            if data.get('conn'):
+                flags |= CONN
+            if data.get('drv_conn'):
+                flags |= DRV_CONN
+            eflags.append(flags)
+
+        self.edge_srcs = np.array(srcs, dtype=np.int32)
+        self.edge_dests = np.array(dests, dtype=np.int32)
+        self.edge_kinds = np.array(eflags, dtype=np.uint8)
+
+        self.succ_ptr, self.succ_idx = _csr(self.edge_srcs, self.edge_dests,
+                                            size)
+        self.pred_ptr, self.pred_idx = _csr(self.edge_dests, self.edge_srcs,
+                                            size)
+
+    def __len__(self):
+        return len(self.names)
+
+    def successors(self, i):
+        """Returns an array of the ids of the successors of node i."""
+        return self.succ_idx[self.succ_ptr[i]:self.succ_ptr[i+1]]
+
+    def predecessors(self, i):
+        """Returns an array of the ids of the predecessors of node i."""
+        return self.pred_idx[self.pred_ptr[i]:self.pred_ptr[i+1]]
+
+    def nodes_of_kind(self, flags):
+        """Returns an array of the ids of the nodes having any of the
+        given kind flags.
+        """
+        return np.flatnonzero(self.kinds & flags)
+
+    def edges_of_kind(self, flags):
+        """Returns a tuple of arrays (srcs, dests) of the ids of the ends
+        of the edges having any of the given kind flags.
+        """
+        mask = (self.edge_kinds & flags) != 0
+        return self.edge_srcs[mask], self.edge_dests[mask]
+
+    def to_names(self, ids):
+        """Returns a list of the names of the given node ids."""
+        names = self.names
+        return [names[i] for i in ids]
@@ -21,6 +21,7 @@ from traits.api import Property
 from openmdao.main.array_helpers import flattened_value
 from openmdao.main.container import Container
 from openmdao.main.derivatives import applyJ, applyJT
+from openmdao.main.exec_profiler import exec_phase
 from openmdao.main.interfaces import implements, obj_has_interface, \
                                      IAssembly, IComponent, IDriver
 from openmdao.main.hasconstraints import HasConstraints, HasEqConstraints, \
@@ -170,6 +171,10 @@ class Component(Container):
         self._case_id = ''
         self._case_uuid = ''
 
+        # names of inputs set since the last check by our System
+        self._changed_inputs = set()
+        self._skip_unchanged = False
+
     @property
     def dir_context(self):
         """The :class:`DirectoryContext` for this component."""
@@ -203,8 +208,32 @@ class Component(Container):
                 name = n
         self._input_updated(name)
 
+    @property
+    def skip_unchanged(self):
+        """If True, this component isn't executed when none of its inputs
+        have changed since its last run. Changes made to an input array in
+        place, rather than by setting the input, aren't seen.
+        """
+        return self._skip_unchanged
+
+    @skip_unchanged.setter
+    def skip_unchanged(self, value):
+        if value and not self._skip_unchanged:
+            # input callbacks are needed to see changes to inputs that
+            # aren't set by our System's scatters.
+            for name in self._alltraits(iotype='in'):
+                self._set_input_callback(name)
+        self._skip_unchanged = bool(value)
+        self._changed_inputs.add(None)
+
     def _input_updated(self, name, fullpath=None):
-        pass
+        """Called whenever input `name` is set. This records `name` as
+        changed so that a component with `skip_unchanged` set is run again
+        even if the input isn't set from its System's vectors. Overrides of
+        this function must call this version, or changes to their inputs
+        may be missed.
+        """
+        self._changed_inputs.add(name)
 
     def __deepcopy__(self, memo):
         """ For some reason, deepcopying does not set the trait callback
@@ -533,6 +562,7 @@ class Component(Container):
         pass
 
     @rbac('*', 'owner')
+    @exec_phase('execute')
     def run(self, case_uuid=''):
         """Run this object. This should include fetching input variables
         (if necessary), executing, and updating output variables.
@@ -633,6 +663,9 @@ class Component(Container):
         """
         super(Component, self).add_trait(name, trait, refresh)
 
+        if getattr(self, '_skip_unchanged', False) and trait.iotype == 'in':
+            self._set_input_callback(name)
+
         self.config_changed()
 
         if trait.iotype and self.parent:
@@ -1411,6 +1444,12 @@ class Component(Container):
         """Return requested_cpus"""
         return self.mpi.requested_cpus
 
+    @rbac(('owner', 'user'))
+    def get_cost(self):
+        """Return the estimated cost of one execution (None if unknown)
+        and the fraction of it that is divided among processors."""
+        return (self.mpi.cost, self.mpi.parallel_fraction)
+
     @rbac(('owner', 'user'))
     def setup_systems(self):
         return ()
@@ -23,7 +23,7 @@ copy._deepcopy_dispatch[weakref.KeyedRef] = copy._deepcopy_atomic
 
 from zope.interface import Interface, implements
 
-from numpy import ndarray
+from numpy import ndarray, concatenate, zeros
 
 from traits.api import HasTraits, Missing, Python, \
                        push_exception_handler, TraitType, CTrait
@@ -44,7 +44,7 @@ from openmdao.main.interfaces import ICaseIterator, IResourceAllocator, \
 from openmdao.main.mp_support import ObjectManager, \
                                      is_instance, CLASSES_TO_PROXY, \
                                      has_interface
-from openmdao.main.rbac import rbac
+from openmdao.main.rbac import rbac, remote_access
 from openmdao.main.variable import Variable, is_legal_name, _missing
 from openmdao.main.array_helpers import flattened_value, get_index
 
@@ -992,6 +992,59 @@ class Container(SafeHasTraits):
 
         self.raise_exception("Failed to set flattened value to variable %s" % path, TypeError)
 
+    @rbac(('owner', 'user'))
+    def get_many(self, paths):
+        """Return a list of the values specified by the given paths, as
+        returned by :meth:`get`. For a remote object this takes a single
+        round trip rather than one per path. Remote access to FileRef
+        values must use :meth:`get`, which returns them as proxies.
+        """
+        values = [self.get(path) for path in paths]
+        if remote_access():
+            for path, value in zip(paths, values):
+                if isinstance(value, FileRef):
+                    self.raise_exception("'%s' is a FileRef, use get()"
+                                         % path, TypeError)
+        return values
+
+    @rbac(('owner', 'user'))
+    def set_many(self, items):
+        """Set the values of the Variables specified by a list of
+        ``(path, value)`` pairs, in order, as done by :meth:`set`.
+        For a remote object this takes a single round trip rather than one
+        per path.
+        """
+        for path, value in items:
+            self.set(path, value)
+
+    @rbac(('owner', 'user'))
+    def get_flattened_values(self, paths):
+        """Return the values specified by the given paths, as returned by
+        :meth:`get_flattened_value`, concatenated into one array.
+        """
+        if not paths:
+            return zeros(0)
+        return concatenate([self.get_flattened_value(path)
+                            for path in paths])
+
+    @rbac(('owner', 'user'))
+    def set_flattened_values(self, paths, value, sizes=None):
+        """Set the values specified by the given paths from consecutive
+        parts of the flat array `value`, as done by
+        :meth:`set_flattened_value`. `sizes` gives the size of each part;
+        if not given, the sizes of the current values are used.
+        """
+        if sizes is None:
+            sizes = [self.get_flattened_value(path).size for path in paths]
+        if sum(sizes) != value.size:
+            self.raise_exception("size mismatch: %d values for paths of"
+                                 " total size %d" % (value.size, sum(sizes)),
+                                 ValueError)
+        start = 0
+        for path, size in zip(paths, sizes):
+            self.set_flattened_value(path, value[start:start+size])
+            start += size
+
     def get_iotype(self, name):
         return self.get_trait(name).iotype
 
@@ -6,7 +6,7 @@ Trait for numpy array variables, with optional units.
 __all__ = ["Array"]
 
 # pylint: disable=E0611,F0401
-from openmdao.units import PhysicalQuantity
+from openmdao.units import PhysicalQuantity, get_conversion
 
 from openmdao.main.interfaces import implements, IVariable
 from openmdao.main.variable import gui_excludes
@@ -149,22 +149,19 @@ class Array(TraitArray):
         dst_units = self.units
 
         try:
-            pq = PhysicalQuantity(1.0, src_units)
+            factor, offset = get_conversion(src_units, dst_units)
         except NameError:
-            raise NameError("while setting value of %s: undefined unit '%s'" %
-                            (src_units, name))
-
-        try:
-            pq.convert_to_unit(dst_units)
-        except NameError:
-            raise NameError("undefined unit '%s' for variable '%s'" %
-                            (dst_units, name))
+            raise NameError("undefined unit '%s' or '%s' for variable '%s'" %
+                            (src_units, dst_units, name))
         except TypeError:
             msg = "%s: units '%s' are incompatible " % (name, src_units) + \
                    "with assigning units of '%s'" % (dst_units)
             raise TypeError(msg)
 
-        value *= pq.value
+        if offset:
+            return (value + offset) * factor
+
+        value *= factor
 
         return value
 
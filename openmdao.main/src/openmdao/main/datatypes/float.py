@@ -15,7 +15,7 @@ from traits.api import Float as TraitFloat
 
 from openmdao.main.uncertain_distributions import UncertainDistribution
 from openmdao.main.variable import Variable
-from openmdao.units import PhysicalQuantity
+from openmdao.units import PhysicalQuantity, get_conversion
 
 
 class Float(Variable):
@@ -193,22 +193,16 @@ class Float(Variable):
         # constructed to test these lines.
 
         try:
-            pq = PhysicalQuantity(value, src_units)
+            factor, offset = get_conversion(src_units, dst_units)
         except NameError:
-            raise NameError("while setting value of %s: undefined unit '%s'" %
-                             (src_units, name))
-
-        try:
-            pq.convert_to_unit(dst_units)
-        except NameError:
-            raise NameError("undefined unit '%s' for variable '%s'" %
-                             (dst_units, name))
+            raise NameError("undefined unit '%s' or '%s' for variable '%s'" %
+                             (src_units, dst_units, name))
         except TypeError:
             msg = "%s: units '%s' are incompatible " % (name, src_units) + \
                    "with assigning units of '%s'" % (dst_units)
             raise TypeError(msg)
 
-        return pq.value
+        return (value + offset) * factor
 
     def get_attribute(self, name, value, trait, meta):
         """Return the attribute dictionary for this variable. This dict is
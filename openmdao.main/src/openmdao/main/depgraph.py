@@ -3,10 +3,13 @@ from collections import deque
 from itertools import chain
 
 import networkx as nx
+import numpy as np
 from networkx.algorithms.dag import is_directed_acyclic_graph
 from networkx.algorithms.components import strongly_connected_components
 
 from openmdao.main.mp_support import has_interface
+from openmdao.main.compactgraph import CompactGraph, COMP, DRIVER, VAR, \
+                                       CONN, DRV_CONN
 from openmdao.main.interfaces import IDriver, IImplicitComponent
 from openmdao.main.exceptions import NoFlatError
 from openmdao.main.expreval import ConnectedExprEvaluator
@@ -215,6 +218,8 @@ class DependencyGraph(DGraphBase):
             self._bndryins = None
             self._bndryouts = None
             self._conns = {}
+            self._condensed = None
+            self._compact = None
 
     def child_config_changed(self, child, adding=True, removing=True):
         """A child has changed its input lists and/or output lists,
@@ -557,6 +562,14 @@ class DependencyGraph(DGraphBase):
                     if self.in_degree(node) < 1 or self.out_degree(node) < 1:
                         self.remove_node(node)
 
+    def compact(self):
+        """Return a :class:`CompactGraph` copy of the structure of this
+        graph. It's cached until the graph changes.
+        """
+        if self._compact is None:
+            self._compact = CompactGraph(self)
+        return self._compact
+
     def list_connections(self, drivers=True):
         conns = self._conns.get(drivers)
         if conns is None:
@@ -687,19 +700,23 @@ class DependencyGraph(DGraphBase):
         and PseudoComponents and edges between them.
         """
         if self._component_graph is None:
-            compset = set(all_comps(self))
+            cg = self.compact()
+            names = cg.names
 
             g = nx.DiGraph()
 
-            for comp in compset:
-                g.add_node(comp, self.node[comp].copy())
+            for i in cg.nodes_of_kind(COMP):
+                g.add_node(names[i], self.node[names[i]].copy())
 
-            for src, dest in self.list_connections():
-                destcomp = dest.split('.', 1)[0]
-                srccomp =  src.split('.', 1)[0]
+            srcs, dests = cg.edges_of_kind(CONN | DRV_CONN)
+            srccomps = cg.owner[srcs]
+            destcomps = cg.owner[dests]
+            iscomp = (cg.kinds & COMP) != 0
+            mask = (srccomps >= 0) & (destcomps >= 0)
+            mask[mask] = iscomp[srccomps[mask]] & iscomp[destcomps[mask]]
 
-                if srccomp in compset and destcomp in compset:
-                    g.add_edge(srccomp, destcomp)
+            g.add_edges_from(set(zip(cg.to_names(srccomps[mask]),
+                                     cg.to_names(destcomps[mask]))))
 
             self._component_graph = g
 
@@ -754,13 +771,15 @@ class DependencyGraph(DGraphBase):
 
     def prune_unconnected_vars(self):
         """Remove unconnected variable nodes"""
-        conns = self.list_connections()
-        convars = set([u for u,v in conns])
-        convars.update([v for u,v in conns])
-        convars.update([base_var(self,v) for v in convars])
-        to_remove = [v for v in self.nodes_iter()
-                         if v not in convars and is_var_node(self,v)]
-        self.remove_nodes_from(to_remove)
+        cg = self.compact()
+        srcs, dests = cg.edges_of_kind(CONN | DRV_CONN)
+        convars = np.zeros(len(cg), dtype=bool)
+        convars[srcs] = True
+        convars[dests] = True
+        bases = cg.base[convars]
+        convars[bases[bases >= 0]] = True
+        to_remove = np.flatnonzero(((cg.kinds & VAR) != 0) & ~convars)
+        self.remove_nodes_from(cg.to_names(to_remove))
 
     def get_pruned(self):
         """Return a copy of the graph with all unconnected
@@ -867,76 +886,84 @@ class DependencyGraph(DGraphBase):
         """Return a subgraph of g that contains
         srcs and dests and all nodes connecting
         them.  Include any driver loops between them.
+        Any srcs or dests that aren't in the graph are
+        added to the subgraph but not to the graph itself.
         """
-        to_add = [s for s in srcs if s not in self]
-        to_add.extend([d for d in dests if d not in self])
+        added = {}  # new nodes and their metadata
+        added_edges = []
 
-        for node in to_add:
+        for node in chain(srcs, dests):
+            if node in self or node in added:
+                continue
             base = base_var(self, node)
             if base == node:
-                self.add_node(node, **self.node[base])
+                added[node] = self.node[base].copy()
             else:
-                self.add_node(node, basevar=base, **self.node[base])
+                added[node] = dict(self.node[base], basevar=base)
             # connect it to its component
             if '.' in node: # it's a component var. connect to its component
                 if node in srcs:
-                    self.add_edge(node, node.split('.',1)[0])
+                    added_edges.append((node, node.split('.',1)[0], {}))
                 else:
-                    self.add_edge(node.split('.',1)[0], node)
+                    added_edges.append((node.split('.',1)[0], node, {}))
             elif base in self:
                 if node in srcs:
                     for s in self.successors(base):
                         if base_var(self, s) == base:
                             continue
                         dest = s+node[len(base):]
-                        if dest not in self:
-                            self.add_node(dest, basevar=s, **self.node[s])
-                            self.add_edge(dest, s)
-                        self.add_edge(node, dest, conn=True)
-                        self.add_edge(base, node)
+                        if dest not in self and dest not in added:
+                            added[dest] = dict(self.node[s], basevar=s)
+                            added_edges.append((dest, s, {}))
+                        added_edges.append((node, dest, {'conn': True}))
+                        added_edges.append((base, node, {}))
                 else:
                     for p in self.predecessors(base):
                         if base_var(self, p) == base:
                             continue
                         src = p+node[len(base):]
-                        if src not in self:
-                            self.add_node(src, basevar=p, **self.node[p])
-                            self.add_edge(p, src)
-                        self.add_edge(src, node, conn=True)
-                        self.add_edge(node, base)
-
-        # create a 'fake' driver loop and grab
-        # everything that's strongly connected to
-        # that fake driver.
-        self.add_node('@driver')
-        for src in srcs:
-            self.add_edge('@driver', src)
-        for dest in dests:
-            self.add_edge(dest, '@driver')
-        for u,v in self.list_connections():
-            self.add_edge('@driver', u)
-            self.add_edge(v, '@driver')
-        for k in keep:
-            self.add_edge('@driver', k)
-            self.add_edge(k, '@driver')
-
-        for comps in strongly_connected_components(self):
-            if '@driver' in comps:
-                comps.remove('@driver')
-                break
-
-        # now remove the driver we added to g, which
-        # also will remove all of the edges we added
-        self.remove_node('@driver')
-
-        comps = set(comps)
+                        if src not in self and src not in added:
+                            added[src] = dict(self.node[p], basevar=p)
+                            added_edges.append((p, src, {}))
+                        added_edges.append((src, node, {'conn': True}))
+                        added_edges.append((node, base, {}))
+
+        # Everything that's both reachable from the srcs (or from any
+        # connection) and can reach the dests (or any connection) is in a
+        # driver loop with them.
+        starts = list(srcs) + list(keep)
+        ends = list(dests) + list(keep)
+        for u, v in self.list_connections():
+            starts.append(u)
+            ends.append(v)
+        for u, v, data in added_edges:
+            if data:
+                starts.append(u)
+                ends.append(v)
+
+        added_succ = {}
+        added_pred = {}
+        for u, v, data in added_edges:
+            added_succ.setdefault(u, []).append(v)
+            added_pred.setdefault(v, []).append(u)
+
+        comps = _reachable(self.succ, added_succ, starts) & \
+                _reachable(self.pred, added_pred, ends)
 
         # make sure we include srcs and dests even if they're
         # not connected
         comps.update(srcs)
         comps.update(dests)
 
-        return self.subgraph(comps)
+        subgraph = self.subgraph([n for n in comps if n in self])
+        for node, data in added.items():
+            if node in comps:
+                subgraph.add_node(node, **data)
+        for u, v, data in added_edges:
+            if u in subgraph and v in subgraph:
+                subgraph.add_edge(u, v, **data)
+
+        return subgraph
 
     def collapse_connections(self):
         """Returns a new graph with each variable
@@ -949,14 +976,18 @@ class DependencyGraph(DGraphBase):
 
         g = CollapsedGraph(self)
 
-        conns = list_data_connections(g)
-        drvconns = list_driver_connections(g)
+        cg = self.compact()
+        srcs, dests = cg.edges_of_kind(CONN)
+        conns = zip(cg.to_names(srcs), cg.to_names(dests))
+        dsrcs, ddests = cg.edges_of_kind(DRV_CONN)
+        drvconns = zip(cg.to_names(dsrcs), cg.to_names(ddests))
 
         # mark all connected vars for removal since they're being collapsed
-        to_remove = set([u for u,v in conns])
-        to_remove.update([v for u,v in conns])
-        to_remove.update([u for u,v in drvconns if not is_driver_node(g, u)])
-        to_remove.update([v for u,v in drvconns if not is_driver_node(g, v)])
+        isdriver = (cg.kinds & DRIVER) != 0
+        to_remove = set(cg.to_names(srcs))
+        to_remove.update(cg.to_names(dests))
+        to_remove.update(cg.to_names(dsrcs[~isdriver[dsrcs]]))
+        to_remove.update(cg.to_names(ddests[~isdriver[ddests]]))
 
         # temporarily rename drivers in driver connections to include
         # the name of the connected var
@@ -1379,7 +1410,7 @@ class CollapsedGraph(DGraphBase):
     #                 self.add_edge(comp, node)
 
     def config_changed(self):
-        pass
+        self._condensed = None
 
     def _get_duped_varnodes(self):
         """Return any varnodes that share the same source. (this is a no-no)"""
@@ -1561,9 +1592,16 @@ def get_edge_boundary(g, nodes):
     where in_edges and out_edges are boundary
     edges between the nodes and the rest of the full graph.
     """
-    others = set(g.nodes_iter()).difference(nodes)
-    out_edges = nx.edge_boundary(g, nodes)
-    in_edges = nx.edge_boundary(g, others)
+    # only look at the neighbors of nodes rather than at the
+    # whole graph
+    nset = set([n for n in nodes if n in g])
+    succ = g.succ
+    pred = g.pred
+
+    out_edges = [(u,v) for u in nset for v in succ[u] if v not in nset]
+
+    srcs = set([u for v in nset for u in pred[v] if u not in nset])
+    in_edges = [(u,v) for u in srcs for v in succ[u] if v in nset]
 
     return in_edges, out_edges
 
@@ -1621,41 +1659,97 @@ def collapse_driver(g, driver, excludes=()):
 
     return collapse_nodes(g, driver.name, nodes)
 
+def _reachable(adj, added_adj, starts):
+    """Return the set of nodes reachable from the `starts` nodes using the
+    adjacency dict `adj` plus any extra adjacencies in `added_adj`.
+    """
+    visited = set()
+    stack = list(starts)
+    while stack:
+        node = stack.pop()
+        if node in visited:
+            continue
+        visited.add(node)
+        if node in adj:
+            stack.extend(adj[node])
+        stack.extend(added_adj.get(node, ()))
+    return visited
+
+def _condensation(g):
+    """Return a tuple (scc_of, preds) describing the graph of the
+    strongly connected components of g, where scc_of maps each node
+    to the index of its component and preds gives the set of
+    predecessors of each component.
+
+    The result is cached on graphs that clear it in config_changed.
+    """
+    condensed = getattr(g, '_condensed', None)
+    if condensed is not None:
+        return condensed
+
+    scc_of = {}
+    sccs = list(strongly_connected_components(g))
+    for i, scc in enumerate(sccs):
+        for node in scc:
+            scc_of[node] = i
+
+    preds = [set() for scc in sccs]
+    for u, v in g.edges_iter():
+        if scc_of[u] != scc_of[v]:
+            preds[scc_of[v]].add(scc_of[u])
+
+    condensed = (scc_of, preds)
+    if isinstance(g, DGraphBase):
+        g._condensed = condensed
+    return condensed
+
 def gsort(g, names):
     """Return a sorted version of the given names
     iterator, based on dependency specified by the
     given directed graph.
+
+    Names are taken in their given order, each one
+    preceded by any of the names it depends on that
+    haven't been taken yet.  Names in the same cycle
+    keep their given order.
     """
     if len(names) < 2:
         return names
 
-    empty = set()
-    nset = set(names)
-    final = list(names)
-    ups = {}
+    scc_of, preds = _condensation(g)
 
-    for name in names:
-        downs = [v for u,v in nx.dfs_edges(g, name) if v in nset]
-        for d in downs:
-            if d not in ups.get(name, empty):  # handle cycles
-                ups.setdefault(d, set()).add(name)
-
-    i = 0
-    while True:
-        tmp = final[:i]
-        tset = set(tmp)
-        unames = [f for f in final[i+1:] if f in ups.get(final[i],empty) and
-                     f not in tset]
-        if unames:
-            tmp.extend(unames)
-            tmp.extend([f for f in final[i:] if f not in unames])
-        else:
-            tmp.extend(final[i:])
-            i += 1
+    # group the names by strongly connected component, ranking
+    # each component by the position of its first name
+    members = {}
+    rank = {}
+    for i, name in enumerate(names):
+        scc = scc_of[name]
+        members.setdefault(scc, []).append(name)
+        rank.setdefault(scc, i)
+
+    def _ordered_preds(scc):
+        return iter(sorted(preds[scc], key=lambda p: rank.get(p, len(names))))
 
-        if i == len(names):
-            break
-        final = tmp
+    # depth first search of the reversed component graph, taking
+    # the names of each component after those of its predecessors
+    final = []
+    visited = set()
+    for name in names:
+        scc = scc_of[name]
+        if scc in visited:
+            continue
+        visited.add(scc)
+        stack = [(scc, _ordered_preds(scc))]
+        while stack:
+            scc, it = stack[-1]
+            for p in it:
+                if p not in visited:
+                    visited.add(p)
+                    stack.append((p, _ordered_preds(p)))
+                    break
+            else:
+                stack.pop()
+                final.extend(members.get(scc, ()))
 
     return final
 
@@ -71,6 +71,21 @@ def post_process_dicts(key, result):
         if hasattr(value, 'flatten'):
             result[key] = value.flatten()
 
+def _is_relevant_input(system, node, variables):
+    """Return True if the given input node, or the source of a fused
+    unit conversion feeding it, is in variables.
+    """
+    if node in variables:
+        return True
+
+    parent = system._parent_system
+    while parent is not None:
+        if node in parent.affine_vars:
+            return parent.affine_vars[node][0] in variables
+        parent = parent._parent_system
+
+    return False
+
 def applyJ(system, variables):
     """Multiply an input vector by the Jacobian. For an Explicit Component,
     this automatically forms the "fake" residual, and calls into the
@@ -104,7 +119,7 @@ def applyJ(system, variables):
     for item in system.list_inputs():
 
         collapsed = scope.name2collapsed.get(item)
-        if collapsed not in variables:
+        if not _is_relevant_input(system, collapsed, variables):
             continue
 
         key = item
@@ -307,7 +322,7 @@ def applyJT(system, variables):
     for item in system.list_inputs():
 
         collapsed = scope.name2collapsed.get(item)
-        if collapsed not in variables:
+        if not _is_relevant_input(system, collapsed, variables):
             continue
 
         key = item
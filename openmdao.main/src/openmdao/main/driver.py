@@ -24,6 +24,7 @@ from openmdao.main.hasevents import HasEvents
 from openmdao.main.hasobjective import HasObjective, HasObjectives
 from openmdao.main.hasparameters import HasParameters
 from openmdao.main.hasresponses import HasResponses
+from openmdao.main.setup_profiler import setup_phase
 from openmdao.main.interfaces import IDriver, IHasEvents, ISolver, \
                                      implements
 from openmdao.main.mp_support import has_interface
@@ -131,9 +132,28 @@ class Driver(Component):
                             "workflow components into a single serial or "
                             "parallel System.  Note that when not running "
                             "under MPI, this option is ignored and the "
-                            "resulting System will always be serial.",
+                            "resulting System will always be serial, unless "
+                            "parallel_backend is set.",
                        framework_var=True)
 
+    parallel_backend = Enum('serial',
+                            ['serial', 'threads', 'processes'],
+                            desc="Determines how parallel Systems in this "
+                                 "driver's workflow run their subsystems "
+                                 "when not running under MPI. 'threads' "
+                                 "uses a thread pool, which helps when the "
+                                 "components release the GIL, for example "
+                                 "while running external codes. "
+                                 "'processes' runs each subsystem in a "
+                                 "forked process. Ignored under MPI.",
+                            framework_var=True)
+
+    parallel_workers = Int(0, low=0,
+                           desc="Maximum number of threads or processes "
+                                "used by parallel_backend. 0 means one per "
+                                "subsystem.",
+                           framework_var=True)
+
     def __init__(self):
         self._iter = None
         super(Driver, self).__init__()
@@ -250,6 +270,7 @@ class Driver(Component):
 
         return self.itername
 
+    @setup_phase
     def compute_itersets(self, cgraph):
         """Return a list of all components required to run a full
         iteration of this driver.
@@ -335,6 +356,7 @@ class Driver(Component):
         self._full_iter_set.update(self._iter_set)
         self._full_iter_set.update(subcomps)
 
+    @setup_phase
     def compute_ordering(self, cgraph):
         """Given a component graph, each driver can determine its iteration
         set and the ordering of its workflow.
@@ -565,7 +587,11 @@ class Driver(Component):
 
         # Reset the workflow.
         self.workflow.reset()
-        super(Driver, self).run(case_uuid)
+        try:
+            super(Driver, self).run(case_uuid)
+        finally:
+            # solvers may have changed the vectors outside of run_iteration
+            self.workflow._vec_stamp += 1
 
     @rbac(('owner', 'user'))
     def configure_recording(self, recording_options=None):
@@ -669,6 +695,9 @@ class Driver(Component):
         except Exception:
             err = sys.exc_info()
 
+        # values of objectives, etc. cached from before the run are stale
+        wf._vec_stamp += 1
+
         if record_case and wf._rec_required:
             try:
                 wf._record_case(case_uuid, err)
@@ -718,6 +747,7 @@ class Driver(Component):
                         pairs.append((params[0], cnst.pcomp_name+'.out0'))
         return pairs
 
+    @setup_phase
     def setup_init(self):
         super(Driver, self).setup_init()
 
@@ -730,13 +760,16 @@ class Driver(Component):
         self.workflow.setup_init()
 
     @rbac(('owner', 'user'))
+    @setup_phase
     def setup_systems(self):
         """Set up system trees from here down to all of our
         child Components.
         """
         if self.name in self.parent._reduced_graph:
             self._system = self.parent._reduced_graph.node[self.name]['system']
-            self.workflow.setup_systems(self.system_type)
+            self.workflow.setup_systems(self.system_type,
+                                        self.parallel_backend,
+                                        self.parallel_workers)
 
     def print_norm(self, driver_string, iteration, res, res0, msg=None,
                    indent=0, solver='NL'):
@@ -765,12 +798,23 @@ class Driver(Component):
         """Return requested_cpus."""
         return self.workflow.get_req_cpus()
 
+    @rbac(('owner', 'user'))
+    def get_cost(self):
+        """Return the estimated cost of one execution and its parallel
+        fraction. If no cost has been set, the cost of our workflow
+        is used."""
+        if self.mpi.cost is None:
+            return self.workflow.get_cost()
+        return (self.mpi.cost, self.mpi.parallel_fraction)
+
+    @setup_phase
     def setup_communicators(self, comm):
         """Allocate communicators from here down to all of our
         child Components.
         """
         self.workflow.setup_communicators(comm)
 
+    @setup_phase
     def setup_scatters(self):
         self.workflow.setup_scatters()
 
@@ -1106,6 +1150,7 @@ class Driver(Component):
         return Jbase.flatten(), J.flatten(), io_pairs, suspects
 
     @rbac(('owner', 'user'))
+    @setup_phase
     def setup_depgraph(self, dgraph):
         self._reduced_graph = None
         if self.workflow._calc_gradient_inputs is not None:
@@ -1118,6 +1163,7 @@ class Driver(Component):
                 dgraph.add_driver_input(self.name, vname)
 
     @rbac(('owner', 'user'))
+    @setup_phase
     def init_var_sizes(self):
         for cname in self._ordering:
             getattr(self.parent, cname).init_var_sizes()
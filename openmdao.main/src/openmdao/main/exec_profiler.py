@@ -0,0 +1,276 @@
+"""
+Low overhead timing of model execution, per component and per system.
+
+Component.run and the run, evaluate, applyJ, linearize and scatter methods
+of the System classes are decorated with :func:`exec_phase`. While an
+:class:`ExecProfiler` is active, the number of calls, the total (inclusive)
+wall time and the self time (excluding time spent in other profiled
+calls) of each of these is accumulated in a table with a row for each
+component or system. Runs of components skipped because their inputs
+were unchanged are counted under 'skip'.
+
+For example::
+
+    from openmdao.main.exec_profiler import ExecProfiler
+
+    with ExecProfiler() as prof:
+        top.run()
+        top.driver.calc_gradient()
+
+    prof.merge().report(limit=20)
+
+The mean execution times of the components in a profile can be used to
+weight the assignment of processors to parallel subsystems in later runs
+(see :meth:`ExecProfiler.set_costs`).
+
+"""
+
+import sys
+import json
+import time
+import threading
+from functools import wraps
+
+import numpy
+
+from openmdao.main.mpiwrap import MPI
+from openmdao.main.profiler import Profiler
+
+# The active profiler, if any.
+_profiler = None
+
+CATEGORIES = ('execute', 'run', 'evaluate', 'applyJ', 'linearize', 'scatter',
+              'skip')
+
+
+def _row_name(obj):
+    """Returns the name of the row of `obj` in the table."""
+    if hasattr(obj, 'get_pathname'):
+        return obj.get_pathname() or obj.__class__.__name__
+
+    # a System, named relative to its scope
+    scope = getattr(obj, 'scope', None)
+    path = scope.get_pathname() if scope is not None else ''
+    name = str(getattr(obj, 'name', '')).replace(' ', '').replace("'", "")
+    if path:
+        name = '.'.join((path, name))
+    return '%s (%s)' % (name, obj.__class__.__name__)
+
+
+def exec_phase(category):
+    """Returns a decorator that records calls of a method under
+    `category` in the active :class:`ExecProfiler`, if there is one.
+    """
+    def decorator(func):
+
+        @wraps(func)
+        def wrapper(self, *args, **kwargs):
+            if _profiler is None:
+                return func(self, *args, **kwargs)
+            return _profiler.call(category, self, func, self, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def count(category, obj):
+    """Count an untimed event under `category` for `obj` in the active
+    :class:`ExecProfiler`, if there is one.
+    """
+    if _profiler is not None:
+        _profiler.count(category, obj)
+
+
+class ExecProfiler(Profiler):
+    """Accumulates execution counters while it's active. Use it as a
+    context manager, or call :meth:`start` and :meth:`stop`.
+
+    size: int
+        Number of rows to preallocate. The table grows as needed.
+
+    Note that objects profiled are referenced by the profiler until
+    :meth:`reset` is called, so that their rows can be looked up by id.
+    """
+
+    _scope = globals()
+
+    def __init__(self, size=256):
+        self._cols = dict((cat, i) for i, cat in enumerate(CATEGORIES))
+        self.reset(size)
+
+    def reset(self, size=256):
+        """Clear all counters."""
+        shape = (max(size, 1), len(CATEGORIES))
+        self.counts = numpy.zeros(shape, dtype=numpy.int64)
+        self.times = numpy.zeros(shape)
+        self.self_times = numpy.zeros(shape)
+        self.names = []
+        self._rows = {}      # row name -> row
+        self._obj_rows = {}  # id(obj) -> (obj, row)
+        # per thread stack of [(category, id(obj)), child time]
+        self._local = threading.local()
+
+    def _add_row(self, name):
+        row = len(self.names)
+        if row == len(self.counts):
+            for attr in ('counts', 'times', 'self_times'):
+                old = getattr(self, attr)
+                new = numpy.zeros((2*len(old), old.shape[1]), dtype=old.dtype)
+                new[:row] = old
+                setattr(self, attr, new)
+        self.names.append(name)
+        self._rows[name] = row
+        return row
+
+    def _row(self, obj):
+        try:
+            return self._obj_rows[id(obj)][1]
+        except KeyError:
+            name = _row_name(obj)
+            row = self._rows.get(name)
+            if row is None:
+                row = self._add_row(name)
+            self._obj_rows[id(obj)] = (obj, row)
+            return row
+
+    def call(self, category, obj, func, *args, **kwargs):
+        """Call `func` with the given args, recording it under `category`
+        in the row of `obj`.
+        """
+        try:
+            stack = self._local.stack
+        except AttributeError:
+            stack = self._local.stack = []
+
+        key = (category, id(obj))
+        if stack and stack[-1][0] == key:
+            # an override calling the base class version of the method
+            return func(*args, **kwargs)
+
+        row = self._row(obj)
+        frame = [key, 0.0]
+        stack.append(frame)
+        start = time.time()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            elapsed = time.time() - start
+            stack.pop()
+            col = self._cols[category]
+            self.counts[row, col] += 1
+            self.times[row, col] += elapsed
+            self.self_times[row, col] += elapsed - frame[1]
+            if stack:
+                stack[-1][1] += elapsed
+
+    def count(self, category, obj):
+        """Count an untimed event under `category` in the row of `obj`."""
+        self.counts[self._row(obj), self._cols[category]] += 1
+
+    def set_costs(self, top):
+        """Calibrate processor assignment from this profile by setting the
+        ``mpi.cost`` of each profiled component in the Assembly `top` to
+        its mean execution time. The costs are used the next time the
+        model is set up.
+        """
+        col = self._cols['execute']
+        prefix = top.get_pathname()
+        for row, name in enumerate(self.names):
+            calls = self.counts[row, col]
+            if not calls:
+                continue
+            if prefix:
+                if not name.startswith(prefix + '.'):
+                    continue
+                name = name[len(prefix)+1:]
+            if not top.contains(name):
+                continue
+            top.get(name).mpi.cost = float(self.times[row, col] / calls)
+
+    def _add(self, names, counts, times, self_times):
+        """Add the given counters to those of the rows of the same names."""
+        for i, name in enumerate(names):
+            row = self._rows.get(name)
+            if row is None:
+                row = self._add_row(name)
+            self.counts[row] += counts[i]
+            self.times[row] += times[i]
+            self.self_times[row] += self_times[i]
+
+    def merge(self, comm=None):
+        """Returns a new profiler holding the sums of the counters of all
+        processes in `comm` (``MPI.COMM_WORLD`` by default), with rows
+        matched by name. Must be called on all processes in `comm`.
+        Without MPI, the result is a copy of this profiler.
+        """
+        n = len(self.names)
+        data = (self.names, self.counts[:n], self.times[:n],
+                self.self_times[:n])
+        if comm is None and MPI:
+            comm = MPI.COMM_WORLD
+        merged = ExecProfiler(size=n)
+        for rank_data in comm.allgather(data) if comm is not None else [data]:
+            merged._add(*rank_data)
+        return merged
+
+    def to_dict(self):
+        """Returns the counters as a dict of the form
+        ``{name: {category: {'calls': int, 'time': float, 'self': float}}}``,
+        leaving out categories with no calls.
+        """
+        data = {}
+        for row, name in enumerate(self.names):
+            cats = {}
+            for col, cat in enumerate(CATEGORIES):
+                calls = int(self.counts[row, col])
+                if calls:
+                    cats[cat] = {'calls': calls,
+                                 'time': float(self.times[row, col]),
+                                 'self': float(self.self_times[row, col])}
+            data[name] = cats
+        return data
+
+    def save(self, filename):
+        """Save the counters as JSON."""
+        with open(filename, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    def report(self, stream=sys.stdout, sort='self', categories=None,
+               limit=None):
+        """Write a table of the counters to `stream`, one line per row and
+        category, sorted in decreasing order of `sort`, which may be
+        'self', 'time' or 'calls'. Only the given `categories` are shown if
+        specified, and at most `limit` lines. Long names are shortened.
+        """
+        arrays = {'self': self.self_times, 'time': self.times,
+                  'calls': self.counts}
+        if sort not in arrays:
+            raise ValueError("sort must be one of %s, not '%s'"
+                             % (sorted(arrays), sort))
+        if categories is None:
+            categories = CATEGORIES
+        cols = [self._cols[cat] for cat in categories]
+
+        n = len(self.names)
+        rows, cols = numpy.meshgrid(numpy.arange(n), cols, indexing='ij')
+        rows = rows.ravel()
+        cols = cols.ravel()
+        keep = self.counts[rows, cols] > 0
+        rows = rows[keep]
+        cols = cols[keep]
+        order = numpy.argsort(-arrays[sort][rows, cols], kind='mergesort')
+        if limit is not None:
+            order = order[:limit]
+
+        stream.write('%-50s %-10s %10s %12s %12s\n'
+                     % ('name', 'category', 'calls', 'time (s)', 'self (s)'))
+        for i in order:
+            row, col = rows[i], cols[i]
+            name = self.names[row]
+            if len(name) > 50:
+                name = name[:22] + '...' + name[-25:]
+            stream.write('%-50s %-10s %10d %12.6f %12.6f\n'
+                         % (name, CATEGORIES[col],
+                            self.counts[row, col], self.times[row, col],
+                            self.self_times[row, col]))
@@ -11,8 +11,11 @@ application.
 
 import fnmatch
 import os.path
+import pipes
 import string
+import sys
 
+from openmdao.main.job_array import JobArraySpool, batch_config
 from openmdao.main.mp_support import OpenMDAO_Manager, register
 from openmdao.main.objserverfactory import ObjServer
 from openmdao.main.rbac import rbac
@@ -62,6 +65,10 @@ class GridEngineAllocator(FactoryAllocator):
     The last two entries provide a mapping between DRMAA job category names
     and the configured GridEngine parallel environment names.  Additional
     categories may be configured, and the above configuration is site-specific.
+
+    Commands executed concurrently by deployed servers may be batched into
+    job arrays by adding the batching options described in
+    :func:`batch_config` to this entry, for example ``batch_dir: ~/ge_spool``.
     """
 
     _QHOST = ['qhost']  # Replaced with path to fake for testing.
@@ -74,6 +81,7 @@ class GridEngineAllocator(FactoryAllocator):
             'grid_engine_grid_engine_GridEngineServer'
         self.pattern = pattern
         self.category_map = {}
+        self.batch = None
 
     def configure(self, cfg):
         """
@@ -84,8 +92,8 @@ class GridEngineAllocator(FactoryAllocator):
             Configuration data is located under the section matching
             this allocator's `name`.
 
-        Allows modifying factory options, `pattern` and the job
-        category map.
+        Allows modifying factory options, `pattern`, the job
+        category map, and batching options.
         """
         super(GridEngineAllocator, self).configure(cfg)
         if cfg.has_option(self.name, 'pattern'):
@@ -96,6 +104,7 @@ class GridEngineAllocator(FactoryAllocator):
                 parallel_environment = cfg.get(self.name, category)
                 self.category_map[category] = parallel_environment
                 self._logger.debug('    %s: %s', category, parallel_environment)
+        self.batch = batch_config(cfg, self.name, self._logger)
 
     @rbac('*')
     def max_servers(self, resource_desc):
@@ -228,7 +237,8 @@ class GridEngineAllocator(FactoryAllocator):
         """
         Deploy a server suitable for `resource_desc`.
         Returns a proxy to the deployed server.
-        Overrides superclass to pass `category_map` to server.
+        Overrides superclass to pass `category_map` and batching options
+        to server.
 
         name: string
             Name for server.
@@ -242,24 +252,34 @@ class GridEngineAllocator(FactoryAllocator):
         server = super(GridEngineAllocator, self).deploy(name, resource_desc,
                                                          criteria)
         if server is not None:
-            server.configure(self.category_map)
+            server.configure(self.category_map, self.batch)
         return server
 
 
 class GridEngineServer(ObjServer):
     """ Knows about executing a command via `qsub`. """
 
-    _QSUB = ['qsub']  # Replaced with path to fake for testing.
+    _QSUB = ['qsub']    # Replaced with path to fake for testing.
+    _QSTAT = ['qstat']  # Replaced with path to fake for testing.
+    _TASK_ID = 'SGE_TASK_ID'
+
+    _spool = None
 
     @rbac('owner')
-    def configure(self, category_map):
+    def configure(self, category_map, batch=None):
         """
-        Configure parallel environment category map.
+        Configure parallel environment category map and batching.
 
         category_map: dict
             Maps from 'job_category' to parallel environment name.
+
+        batch: dict
+            If not None, arguments to :class:`JobArraySpool` used to batch
+            commands into job arrays.
         """
         self.category_map = category_map
+        if batch and sys.platform != 'win32':
+            self._spool = JobArraySpool(**batch)
 
     @rbac('owner')
     def execute_command(self, resource_desc):
@@ -361,6 +381,11 @@ class GridEngineServer(ObjServer):
         ==================== =========================
 
         Output from `qsub` itself is routed to ``qsub.out``.
+
+        If batching has been configured, the command is instead run as a task
+        of a job array shared with other servers having the same options.
+        The ``-sync``, ``-b``, ``-N``, ``-i``, ``-o``, ``-e`` and ``-j``
+        options are replaced by redirections within the task.
         """
         self.home_dir = os.path.expanduser('~')
         self.work_dir = os.getcwd()  # Server started in working directory.
@@ -464,10 +489,12 @@ class GridEngineServer(ObjServer):
 
         # Set default command configuration.
         if inp is None:
-            cmd.extend(('-i', DEV_NULL))
+            inp = DEV_NULL
+            cmd.extend(('-i', inp))
         if out is None:
             base = os.path.basename(resource_desc['remote_command'])
-            cmd.extend(('-o', '%s.stdout' % base))
+            out = '%s.stdout' % base
+            cmd.extend(('-o', out))
         if err is None:
             cmd.extend(('-j', 'yes'))
 
@@ -475,12 +502,24 @@ class GridEngineServer(ObjServer):
         if 'native_specification' in resource_desc:
             cmd.extend(resource_desc['native_specification'])
 
-        cmd.append(self._fix_path(resource_desc['remote_command']))
-
+        job = [self._fix_path(resource_desc['remote_command'])]
         if 'args' in resource_desc:
             for arg in resource_desc['args']:
-                cmd.append(self._fix_path(arg))
+                job.append(self._fix_path(arg))
+
+        if self._spool is not None:
+            options = self._array_options(cmd[len(self._QSUB):])
+            command = ' '.join([pipes.quote(arg) for arg in job])
+            command += ' <%s >%s' % (pipes.quote(self._fix_path(inp)),
+                                     pipes.quote(self._fix_path(out)))
+            if err is None or err == 'yes':
+                command += ' 2>&1'
+            else:
+                command += ' 2>%s' % pipes.quote(self._fix_path(err))
+            self._logger.info('%r', command)
+            return self._spool.execute(self, options, command, env)
 
+        cmd.extend(job)
         self._logger.info('%r', ' '.join(cmd))
         try:
             process = ShellProc(cmd, DEV_NULL, 'qsub.out', STDOUT, env)
@@ -493,6 +532,46 @@ class GridEngineServer(ObjServer):
         self._logger.debug('    returning %s', (return_code, error_msg))
         return (return_code, error_msg)
 
+    def _submit_array(self, options, env, count, script):
+        """
+        Submit `script` as an array of `count` tasks.
+        Returns ``(return_code, error_msg, job_id)``.
+        """
+        cmd = list(self._QSUB)
+        cmd.extend(options)
+        cmd.extend(('-terse', '-t', '1-%d' % count, '-o', DEV_NULL,
+                    '-j', 'yes', script))
+        self._logger.info('%r', ' '.join(cmd))
+        process = ShellProc(cmd, DEV_NULL, 'qsub.out', STDOUT, env)
+        return_code, error_msg = process.wait(1)
+        job_id = None
+        if return_code == 0:
+            with open('qsub.out', 'r') as inp:
+                lines = inp.read().split()
+            job_id = lines[-1].split('.')[0]  # '<id>.1-<count>:1'
+        return (return_code, error_msg, job_id)
+
+    def _array_active(self, job_id):
+        """ Return True if array `job_id` is still known to GridEngine. """
+        cmd = list(self._QSTAT)
+        cmd.extend(('-j', job_id))
+        process = ShellProc(cmd, DEV_NULL, DEV_NULL, STDOUT)
+        return process.wait()[0] == 0
+
+    @staticmethod
+    def _array_options(options):
+        """ Return `options` without those specific to a single job. """
+        array_options = []
+        skip = False
+        for option in options:
+            if skip:
+                skip = False
+            elif option in ('-sync', '-b', '-N', '-i', '-o', '-e', '-j'):
+                skip = True
+            else:
+                array_options.append(option)
+        return array_options
+
     def _fix_path(self, path):
         """ Translates special prefixes. """
         if path.startswith(HOME_DIRECTORY):
@@ -16,6 +16,7 @@ from openmdao.main.pseudocomp import PseudoComponent, \
                                      SimpleEQConPComp, \
                                      SimpleEQ0PComp, \
                                      _remove_spaces
+from openmdao.main.vecevaluator import VecEvaluator
 
 _ops = {
     '>': operator.gt,
@@ -420,6 +421,7 @@ class _HasConstraintsBase(object):
     def __init__(self, parent, allowed_types=None):
         self._constraints = OrderedDict()
         self._parent = None if parent is None else weakref.ref(parent)
+        self._evaluator = VecEvaluator()
 
     def __getstate__(self):
         state = self.__dict__.copy()
@@ -597,6 +599,20 @@ class _HasConstraintsBase(object):
         """
         return len(self._constraints)
 
+    def eval_named_constraint(self, name, scope=None):
+        """Returns the value of constraint `name` as an array."""
+        pcomp_name = self._constraints[name].pcomp_name
+        return self._evaluate(scope).value(pcomp_name, flat=True)
+
+    def _evaluate(self, scope=None):
+        """Evaluates all constraints into one array and returns the evaluator
+        holding their values. Values are reused until the workflow runs
+        again.
+        """
+        items = [(c.pcomp_name, c) for c in self._constraints.values()]
+        self._evaluator.evaluate(self.parent, items, _get_scope(self, scope))
+        return self._evaluator
+
 
 class HasEqConstraints(_HasConstraintsBase):
     """Add this class as a delegate if your Driver supports equality
@@ -727,11 +743,13 @@ class HasEqConstraints(_HasConstraintsBase):
 
     def eval_eq_constraints(self, scope=None):
         """Returns a list of constraint values."""
-        scope = _get_scope(self, scope)
-        result = []
-        for constraint in self._constraints.values():
-            result.extend(constraint.evaluate(scope))
-        return result
+        return self._evaluate(scope).array.tolist()
+
+    def eval_eq_constraints_array(self, scope=None):
+        """Returns the values of all constraints in one array, which is
+        reused by later evaluations.
+        """
+        return self._evaluate(scope).array
 
     def list_eq_constraint_targets(self):
         """Returns a list of outputs suitable for calc_gradient()."""
@@ -874,11 +892,13 @@ class HasIneqConstraints(_HasConstraintsBase):
 
     def eval_ineq_constraints(self, scope=None):
         """Returns a list of constraint values."""
-        scope = _get_scope(self, scope)
-        result = []
-        for constraint in self._constraints.values():
-            result.extend(constraint.evaluate(scope))
-        return result
+        return self._evaluate(scope).array.tolist()
+
+    def eval_ineq_constraints_array(self, scope=None):
+        """Returns the values of all constraints in one array, which is
+        reused by later evaluations.
+        """
+        return self._evaluate(scope).array
 
     def list_ineq_constraint_targets(self):
         """Returns a list of outputs suitable for calc_gradient()."""
@@ -902,6 +922,7 @@ class HasConstraints(object):
         self._parent = None if parent is None else weakref.ref(parent)
         self._eq = HasEqConstraints(parent)
         self._ineq = HasIneqConstraints(parent)
+        self._evaluator = VecEvaluator()
 
     def __getstate__(self):
         state = self.__dict__.copy()
@@ -1101,16 +1122,63 @@ class HasConstraints(object):
 
     def eval_eq_constraints(self, scope=None):
         """Returns a list of constraint values."""
-        return self._eq.eval_eq_constraints(scope)
+        return self.eval_eq_constraints_array(scope).tolist()
 
     def eval_ineq_constraints(self, scope=None):
         """Returns a list of constraint values."""
-        return self._ineq.eval_ineq_constraints(scope)
+        return self.eval_ineq_constraints_array(scope).tolist()
 
     def eval_constraints(self, scope=None):
         """Returns a list of constraint values."""
-        return self._eq.eval_eq_constraints(scope) + \
-               self._ineq.eval_ineq_constraints(scope)
+        return self.eval_constraints_array(scope).tolist()
+
+    def eval_eq_constraints_array(self, scope=None):
+        """Returns the values of the equality constraints as a view of the
+        array returned by :meth:`eval_constraints_array`.
+        """
+        array = self.eval_constraints_array(scope)
+        return array[:self._total_eq()]
+
+    def eval_ineq_constraints_array(self, scope=None):
+        """Returns the values of the inequality constraints as a view of the
+        array returned by :meth:`eval_constraints_array`.
+        """
+        array = self.eval_constraints_array(scope)
+        return array[self._total_eq():]
+
+    def eval_constraints_array(self, scope=None):
+        """Returns the values of all constraints in one array, which is
+        reused by later evaluations.
+        """
+        return self._evaluate(scope).array
+
+    def eval_named_constraint(self, name, scope=None):
+        """Returns the value of constraint `name` as an array."""
+        if name in self._eq._constraints:
+            constraint = self._eq._constraints[name]
+        else:
+            constraint = self._ineq._constraints[name]
+        return self._evaluate(scope).value(constraint.pcomp_name, flat=True)
+
+    def _evaluate(self, scope=None):
+        """Evaluates the equality and then the inequality constraints into
+        one array and returns the evaluator holding their values. Values are
+        reused until the workflow runs again.
+        """
+        items = [(c.pcomp_name, c) for c in self._eq._constraints.values()]
+        items.extend([(c.pcomp_name, c)
+                      for c in self._ineq._constraints.values()])
+        self._evaluator.evaluate(self.parent, items, _get_scope(self, scope))
+        return self._evaluator
+
+    def _total_eq(self):
+        """Returns the number of equality constraint values in the last
+        evaluation.
+        """
+        if not self._eq._constraints:
+            return 0
+        last = self._eq._constraints.values()[-1]
+        return self._evaluator.bounds(last.pcomp_name)[1]
 
     def list_constraints(self):
         """Return a list of strings containing constraint expressions."""
@@ -5,6 +5,7 @@ import weakref
 from openmdao.main.expreval import ConnectedExprEvaluator
 from openmdao.main.pseudocomp import PseudoComponent, _remove_spaces
 from openmdao.main.interfaces import IDriver
+from openmdao.main.vecevaluator import VecEvaluator
 
 
 class Objective(ConnectedExprEvaluator):
@@ -69,6 +70,7 @@ class HasObjectives(object):
         # max_objectives of 0 means unlimited objectives
         self._max_objectives = max_objectives
         self._parent = None if parent is None else weakref.ref(parent)
+        self._evaluator = VecEvaluator()
 
     def __getstate__(self):
         state = self.__dict__.copy()
@@ -238,12 +240,28 @@ class HasObjectives(object):
 
     def eval_objectives(self):
         """Returns a list of values of the evaluated objectives."""
-        scope = self._get_scope()
-        return [obj.evaluate(scope) for obj in self._objectives.values()]
+        evaluator = self._evaluate()
+        return [evaluator.value(name) for name in self._objectives]
+
+    def eval_objectives_array(self):
+        """Returns the values of all objectives in one array, which is
+        reused by later evaluations.
+        """
+        return self._evaluator.evaluate(self.parent, self._objectives.items(),
+                                        self._get_scope())
 
     def eval_named_objective(self, name):
         """Returns the value of objective `name`."""
-        return self._objectives[name].evaluate(self._get_scope())
+        if name not in self._objectives:
+            raise KeyError(name)
+        return self._evaluate().value(name)
+
+    def _evaluate(self):
+        """Evaluates all objectives and returns the evaluator holding their
+        values. Values are reused until the workflow runs again.
+        """
+        self.eval_objectives_array()
+        return self._evaluator
 
     def list_pseudocomps(self):
         """Returns a list of pseudocomponent names associated with our
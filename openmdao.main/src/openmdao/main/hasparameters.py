@@ -18,6 +18,16 @@ from openmdao.main.mpiwrap import MPI
 __missing = object()
 
 
+def _point_key(values):
+    """Return a hashable key for the design point `values`, or None if
+    `values` aren't all real numbers.
+    """
+    try:
+        return array(values, dtype='d').tostring()
+    except (TypeError, ValueError):
+        return None
+
+
 class ParameterBase(object):
     """Abstract base class for parameters."""
 
@@ -779,6 +789,10 @@ class HasParameters(object):
         if obj_has_interface(parent, ISolver):
             self._allowed_types.append('unbounded')
         self._parent = None if parent is None else weakref.ref(parent)
+        # (kind, design point) -> responses, least recently used first
+        self._eval_cache = OrderedDict()
+        self._eval_cache_size = 100
+        self._last_point = None
 
     def __getstate__(self):
         state = self.__dict__.copy()
@@ -1040,10 +1054,68 @@ class HasParameters(object):
         """Sets all parameters to their start value if a
         start value is given
         """
+        self._last_point = None
         for param in self._parameters.itervalues():
             if param.start is not None:
                 param.set(param.start, self.parent)
 
+    def set_eval_cache_size(self, size):
+        """Set the maximum number of entries kept by the evaluation cache.
+        A size of 0 disables caching.
+        """
+        self._eval_cache_size = size
+        while len(self._eval_cache) > max(size, 0):
+            self._eval_cache.popitem(last=False)
+
+    def clear_eval_cache(self):
+        """Discard all cached evaluations. This should be called whenever
+        the model may have changed other than through our parameters, e.g.,
+        at the start of each execution of the driver.
+        """
+        self._eval_cache.clear()
+        self._last_point = None
+
+    def get_cached_evaluation(self, values, kind='func'):
+        """Return the result stored by :meth:`cache_evaluation` for the
+        design point `values`, or None if that point hasn't been evaluated.
+
+        values: iterator
+            Parameter values, ordered as in :meth:`set_parameters`.
+
+        kind: str
+            Type of result, e.g., 'func' for objectives and constraints or
+            'grad' for their Jacobian.
+        """
+        key = (kind, _point_key(values))
+        if key[1] is None:
+            return None
+        try:
+            result = self._eval_cache.pop(key)
+        except KeyError:
+            return None
+        self._eval_cache[key] = result
+        return result
+
+    def cache_evaluation(self, values, result, kind='func'):
+        """Store `result` as the evaluation of type `kind` at the design
+        point `values`. The least recently used entry is dropped if the cache
+        is full.
+        """
+        key = (kind, _point_key(values))
+        if key[1] is None or self._eval_cache_size <= 0:
+            return
+        self._eval_cache.pop(key, None)
+        self._eval_cache[key] = result
+        if len(self._eval_cache) > self._eval_cache_size:
+            self._eval_cache.popitem(last=False)
+
+    def is_current_point(self, values):
+        """Return True if `values` are the parameter values most recently
+        set into the model by :meth:`set_parameters`.
+        """
+        key = _point_key(values)
+        return key is not None and key == self._last_point
+
     def set_parameter_by_name(self, name, value, case=None):
         """Sets a single parameter by its name attribute.
 
@@ -1062,6 +1134,7 @@ class HasParameters(object):
         """
         param = self._parameters[name]
         if case is None:
+            self._last_point = None
             param.set(value, self.parent)
         else:
             for target in param.targets:
@@ -1088,6 +1161,7 @@ class HasParameters(object):
                              " values (%s)" %
                              (len(values), self.total_parameters()))
         if case is None:
+            self._last_point = None
             start = 0
             for param in self._parameters.values():
                 size = param.size
@@ -1098,6 +1172,7 @@ class HasParameters(object):
                     end = start + size
                     param.set(values[start:end], self.parent)
                     start = end
+            self._last_point = _point_key(values)
         else:
             start = 0
             for param in self._parameters.values():
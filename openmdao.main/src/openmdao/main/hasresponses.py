@@ -6,6 +6,7 @@ from openmdao.main.datatypes.api import List, VarTree
 from openmdao.main.expreval import ConnectedExprEvaluator
 from openmdao.main.pseudocomp import PseudoComponent, _remove_spaces
 from openmdao.main.variable import make_legal_path
+from openmdao.main.vecevaluator import VecEvaluator
 
 
 class Response(ConnectedExprEvaluator):
@@ -62,6 +63,7 @@ class HasResponses(object):
     def __init__(self, parent):
         self._responses = OrderedDict()
         self._parent = None if parent is None else weakref.ref(parent)
+        self._evaluator = VecEvaluator()
 
     def __getstate__(self):
         state = self.__dict__.copy()
@@ -210,11 +212,28 @@ class HasResponses(object):
 
     def eval_responses(self):
         """Returns a list of values of the evaluated responses."""
-        return [r.evaluate() for r in self._responses.values()]
+        evaluator = self._evaluate()
+        return [evaluator.value(name) for name in self._responses]
+
+    def eval_responses_array(self):
+        """Returns the values of all responses in one array, which is
+        reused by later evaluations.
+        """
+        return self._evaluator.evaluate(self.parent, self._responses.items(),
+                                        None)
 
     def eval_response(self, name):
         """Returns the value of response `name`."""
-        return self._responses[name].evaluate()
+        if name not in self._responses:
+            raise KeyError(name)
+        return self._evaluate().value(name)
+
+    def _evaluate(self):
+        """Evaluates all responses and returns the evaluator holding their
+        values. Values are reused until the workflow runs again.
+        """
+        self.eval_responses_array()
+        return self._evaluator
 
     def list_pseudocomps(self):
         """Returns a list of pseudocomponent names associated with our
@@ -0,0 +1,395 @@
+"""
+.. _`job_array.py`:
+
+Batched submission of commands as job arrays.
+
+When many servers of a :class:`GridEngineAllocator` or :class:`PBS_Allocator`
+run short commands concurrently, submitting each as its own job lets
+scheduler submission latency and polling dominate. With batching configured,
+each command is instead written as a task script to a spool directory shared
+by the servers. One server at a time collects the queued tasks, after
+waiting for others to arrive, and submits each group of tasks having the same
+submission options as a single job array. Each task records its exit status
+in the spool, and the scheduler is queried once per poll interval per array
+to detect an array which ended without some of its tasks reporting (for
+instance, because it was deleted).
+
+Spool layout::
+
+    pending/<task>     Submission options of a task not yet submitted.
+    tasks/<task>.sh    Task script.
+    claimed/<task>     Array containing a submitted task.
+    status/<task>      Return code and error message of a completed task.
+    batches/<array>/   Array script, task list, and tasks still running.
+    lock/owner         Host, process id, time and token of the server
+                       submitting, if any.
+"""
+
+import errno
+import json
+import os
+import pipes
+import shutil
+import socket
+import time
+import uuid
+
+
+class JobArraySpool(object):
+    """
+    Batches commands from servers, possibly in different processes, into
+    job arrays via a shared spool directory. Scripts are run by ``/bin/sh``,
+    so this isn't supported on Windows.
+
+    path: string
+        Spool directory. Must be accessible by all servers and jobs.
+
+    window: float
+        Seconds to wait for other tasks before submitting.
+
+    poll_delay: float
+        Seconds between checks for completion.
+
+    timeout: float
+        Seconds to wait for a task to be submitted before failing it.
+
+    lock_timeout: float
+        Seconds after which the submission lock is considered abandoned and
+        is broken. A lock held by a process on this host which no longer
+        exists is broken immediately.
+    """
+
+    def __init__(self, path, window=1., poll_delay=5., timeout=600.,
+                 lock_timeout=300.):
+        self.path = os.path.abspath(os.path.expanduser(path))
+        self.window = window
+        self.poll_delay = poll_delay
+        self.timeout = timeout
+        self.lock_timeout = lock_timeout
+        for name in ('pending', 'tasks', 'claimed', 'status', 'batches'):
+            directory = os.path.join(self.path, name)
+            if not os.path.exists(directory):
+                try:
+                    os.makedirs(directory)
+                except OSError:  # Created by another server.
+                    if not os.path.isdir(directory):
+                        raise
+
+    def execute(self, server, options, command, env=None):
+        """
+        Run shell `command` in the current directory as a task of a job
+        array and wait for it to complete. Returns ``(return_code,
+        error_msg)``.
+
+        server: :class:`ObjServer`
+            Server with the scheduler-specific methods:
+            ``_submit_array(options, env, count, script)`` submits `script`
+            as an array of `count` tasks and returns ``(return_code,
+            error_msg, job_id)``, and ``_array_active(job_id)`` returns
+            True while the array is known to the scheduler. Its `_TASK_ID`
+            names the environment variable giving the task index.
+
+        options: list
+            Submission options. Tasks are only batched with others having
+            equal `options` and `env`.
+
+        command: string
+            Shell command line.
+
+        env: dict
+            Environment for the submission.
+        """
+        task = uuid.uuid1().hex
+        status = self._path('status', task)
+        script = self._path('tasks', task + '.sh')
+        with open(script, 'w') as out:
+            out.write('#!/bin/sh\n')
+            out.write('cd %s\n' % pipes.quote(os.getcwd()))
+            out.write('%s\n' % command)
+            out.write('echo $? >%s.tmp && mv %s.tmp %s\n'
+                      % (pipes.quote(status), pipes.quote(status),
+                         pipes.quote(status)))
+        os.chmod(script, 0700)
+        self._write(self._path('pending', task),
+                    json.dumps({'options': options, 'env': env}))
+
+        # Wait for our task to be submitted, submitting if no other
+        # server is.
+        deadline = time.time() + self.timeout
+        claim = self._read(task)
+        while claim is None:
+            token = self._lock(server)
+            if token:
+                try:
+                    self._submit_pending(server)
+                finally:
+                    self._unlock(server, token)
+            elif time.time() > deadline and self._withdraw(task):
+                error_msg = 'Task not submitted within %g seconds;' \
+                            ' spool lock held by %s' \
+                            % (self.timeout, self._lock_owner()[0])
+                server._logger.error(error_msg)
+                return (-1, error_msg)
+            else:
+                time.sleep(self.window)
+            claim = self._read(task)
+
+        while not os.path.exists(status):
+            time.sleep(self.poll_delay)
+            if not os.path.exists(status):
+                self._poll(server, claim)
+
+        with open(status, 'r') as inp:
+            lines = inp.read().split('\n', 1)
+        return_code = int(lines[0])
+        error_msg = lines[1].strip() if len(lines) > 1 else ''
+        if return_code and not error_msg:
+            error_msg = _error_message(return_code)
+
+        for path in (status, script, self._path('claimed', task)):
+            os.remove(path)
+        batch = self._path('batches', claim['batch'])
+        os.remove(os.path.join(batch, 'running', task))
+        try:
+            os.rmdir(os.path.join(batch, 'running'))
+        except OSError:
+            pass  # Other tasks still running.
+        else:
+            shutil.rmtree(batch, ignore_errors=True)
+
+        server._logger.debug('    task %s of %s returned %s', task,
+                             claim['job'], (return_code, error_msg))
+        return (return_code, error_msg)
+
+    def _submit_pending(self, server):
+        """ Submit pending tasks, grouped by their submission options. """
+        time.sleep(self.window)
+        groups = {}
+        for task in sorted(os.listdir(self._path('pending'))):
+            if task.endswith(('.tmp', '.submit')):
+                continue
+            # Renaming keeps the task from being withdrawn.
+            path = self._path('pending', task)
+            try:
+                os.rename(path, path + '.submit')
+            except OSError:
+                continue  # Withdrawn.
+            with open(path + '.submit', 'r') as inp:
+                entry = json.load(inp)
+            key = json.dumps([entry['options'], entry['env']], sort_keys=True)
+            groups.setdefault(key, (entry, []))[1].append(task)
+
+        for key in sorted(groups):
+            entry, tasks = groups[key]
+            self._submit(server, entry['options'], entry['env'], tasks)
+
+    def _submit(self, server, options, env, tasks):
+        """ Submit `tasks` as one array. """
+        batch = uuid.uuid1().hex
+        directory = self._path('batches', batch)
+        os.makedirs(os.path.join(directory, 'running'))
+        task_list = os.path.join(directory, 'tasks')
+        with open(task_list, 'w') as out:
+            for task in tasks:
+                out.write('%s\n' % task)
+                open(os.path.join(directory, 'running', task), 'w').close()
+
+        script = os.path.join(directory, 'array.sh')
+        with open(script, 'w') as out:
+            out.write('#!/bin/sh\n')
+            out.write('task=`sed -n "${%s:-1}p" %s`\n'
+                      % (server._TASK_ID, pipes.quote(task_list)))
+            out.write('exec /bin/sh %s/$task.sh\n'
+                      % pipes.quote(self._path('tasks')))
+        os.chmod(script, 0700)
+
+        server._logger.info('submitting %d tasks as array', len(tasks))
+        try:
+            return_code, error_msg, job_id = \
+                server._submit_array(options, env, len(tasks), script)
+        except Exception as exc:
+            server._logger.error('exception submitting array: %s', exc)
+            return_code, error_msg, job_id = -1, str(exc), None
+
+        for task in tasks:
+            if return_code:
+                self._set_status(task, return_code, error_msg)
+            self._write(self._path('claimed', task),
+                        json.dumps({'batch': batch, 'job': job_id}))
+            os.remove(self._path('pending', task + '.submit'))
+
+    def _poll(self, server, claim):
+        """
+        Check if the array of `claim` has ended, at most once per poll
+        interval for all of its tasks. Tasks which haven't reported by then
+        are given up on.
+        """
+        if claim['job'] is None:
+            return
+        directory = self._path('batches', claim['batch'])
+        marker = os.path.join(directory,
+                              'poll.%d' % int(time.time() / self.poll_delay))
+        try:
+            os.close(os.open(marker, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+        except OSError:
+            return  # Already polled this interval.
+
+        if server._array_active(claim['job']):
+            return
+        with open(os.path.join(directory, 'tasks'), 'r') as inp:
+            tasks = inp.read().split()
+        for task in tasks:
+            if not os.path.exists(self._path('status', task)):
+                self._set_status(task, -1, 'Job %s ended without status'
+                                           % claim['job'])
+
+    def _withdraw(self, task):
+        """ Return True if `task` was withdrawn before being submitted. """
+        try:
+            os.remove(self._path('pending', task))
+        except OSError:
+            return False  # Being submitted.
+        os.remove(self._path('tasks', task + '.sh'))
+        return True
+
+    def _lock(self, server):
+        """
+        Try to become the submitting server. Returns a token for
+        :meth:`_unlock` if successful, otherwise None. An abandoned lock
+        is broken, to be taken on a later try.
+        """
+        lock = self._path('lock')
+        try:
+            os.mkdir(lock)
+        except OSError:
+            owner, stale = self._lock_owner()
+            if stale:
+                server._logger.warning('breaking spool lock held by %s', owner)
+                self._remove_lock()
+            return None
+
+        token = uuid.uuid4().hex
+        with open(os.path.join(lock, 'owner'), 'w') as out:
+            out.write('%s %d %.3f %s\n'
+                      % (socket.gethostname(), os.getpid(), time.time(), token))
+        return token
+
+    def _unlock(self, server, token):
+        """ Release the lock taken with `token`, unless it was broken. """
+        try:
+            with open(self._path('lock', 'owner'), 'r') as inp:
+                fields = inp.read().split()
+        except IOError:
+            fields = []
+        if fields[3:] == [token]:
+            self._remove_lock()
+        else:
+            server._logger.warning('spool lock was broken while submitting')
+
+    def _lock_owner(self):
+        """
+        Return ``(owner, stale)`` describing the current lock, where `stale`
+        is True if the lock has been abandoned.
+        """
+        lock = self._path('lock')
+        try:
+            with open(os.path.join(lock, 'owner'), 'r') as inp:
+                host, pid, stamp, token = inp.read().split()
+            pid, stamp = int(pid), float(stamp)
+        except (IOError, ValueError):  # Owner not (completely) written.
+            try:
+                stamp = os.path.getmtime(lock)
+            except OSError:
+                return ('nobody', False)  # Released.
+            host = pid = None
+
+        owner = '%s:%s' % (host, pid) if host else 'unknown server'
+        age = time.time() - stamp
+        owner += ' for %.0f seconds' % age
+        if age > self.lock_timeout:
+            return (owner, True)
+        if host == socket.gethostname():
+            try:
+                os.kill(pid, 0)
+            except OSError as exc:
+                return (owner, exc.errno == errno.ESRCH)
+        return (owner, False)
+
+    def _remove_lock(self):
+        """ Remove the lock, whoever holds it. """
+        stale = self._path('lock.%s' % uuid.uuid1().hex)
+        try:
+            os.rename(self._path('lock'), stale)
+        except OSError:
+            return  # Already removed.
+        shutil.rmtree(stale, ignore_errors=True)
+
+    def _read(self, task):
+        """ Return claim of `task`, or None if it hasn't been submitted. """
+        try:
+            with open(self._path('claimed', task), 'r') as inp:
+                return json.load(inp)
+        except IOError:
+            return None
+
+    def _set_status(self, task, return_code, error_msg):
+        """ Record completion of `task`. """
+        self._write(self._path('status', task),
+                    '%d\n%s\n' % (return_code, error_msg))
+
+    def _write(self, path, data):
+        """ Write `data` to `path` atomically. """
+        with open(path + '.tmp', 'w') as out:
+            out.write(data)
+        os.rename(path + '.tmp', path)
+
+    def _path(self, *names):
+        return os.path.join(self.path, *names)
+
+
+def batch_config(cfg, section, logger):
+    """
+    Return :class:`JobArraySpool` arguments from `section` of `cfg`,
+    or None if batching isn't configured. This is used by the allocators
+    which support batching, whose resource configuration entries may then
+    have the following options (shown with their defaults, except for the
+    spool directory, which is required)::
+
+        batch_dir: ~/spool
+        batch_window: 1
+        batch_poll: 5
+        batch_timeout: 600
+        batch_lock_timeout: 300
+
+    `batch_dir` is the spool directory, which must be accessible to all
+    servers and jobs. `batch_window` is the number of seconds to wait for
+    other commands before submitting, and `batch_poll` is the number of
+    seconds between checks for completion. A command not submitted within
+    `batch_timeout` seconds fails, and a server's submission lock older than
+    `batch_lock_timeout` seconds is assumed abandoned and broken.
+    Batching is not supported on Windows.
+    """
+    if not cfg.has_option(section, 'batch_dir'):
+        return None
+    batch = dict(path=cfg.get(section, 'batch_dir'))
+    logger.debug('    batch_dir: %s', batch['path'])
+    if cfg.has_option(section, 'batch_window'):
+        batch['window'] = cfg.getfloat(section, 'batch_window')
+        logger.debug('    batch_window: %s', batch['window'])
+    if cfg.has_option(section, 'batch_poll'):
+        batch['poll_delay'] = cfg.getfloat(section, 'batch_poll')
+        logger.debug('    batch_poll: %s', batch['poll_delay'])
+    if cfg.has_option(section, 'batch_timeout'):
+        batch['timeout'] = cfg.getfloat(section, 'batch_timeout')
+        logger.debug('    batch_timeout: %s', batch['timeout'])
+    if cfg.has_option(section, 'batch_lock_timeout'):
+        batch['lock_timeout'] = cfg.getfloat(section, 'batch_lock_timeout')
+        logger.debug('    batch_lock_timeout: %s', batch['lock_timeout'])
+    return batch
+
+
+def _error_message(return_code):
+    """ Return error message for a task's `return_code`. """
+    if return_code > 0:
+        return ': %s' % os.strerror(return_code)
+    return ''
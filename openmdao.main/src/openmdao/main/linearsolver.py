@@ -199,9 +199,10 @@ class ScipyGMRES(LinearSolver):
         #print inputs, '\n', outputs, '\n', J
         return J
 
-    def solve(self, arg):
+    def solve(self, arg, rtol=None):
         """ Solve the coupled equations for a new state vector that nulls the
-        residual. Used by the Newton solvers."""
+        residual. Used by the Newton solvers. If rtol is given, it replaces
+        the tolerance from the options."""
 
         system = self._system
         options = self.options
@@ -209,9 +210,19 @@ class ScipyGMRES(LinearSolver):
 
         #print system.name, 'Linear solution start vec', system.rhs_vec.array
         # Call GMRES to solve the linear system
-        dx, info = gmres(A, arg,
-                         tol=options.atol,
-                         maxiter=options.maxiter)
+        if rtol is None:
+            dx, info = gmres(A, arg,
+                             tol=options.atol,
+                             maxiter=options.maxiter)
+        else:
+            # scale to a unit rhs so the tolerance is relative
+            scale = np.linalg.norm(arg)
+            if scale == 0.0:
+                return np.zeros(arg.shape)
+            dx, info = gmres(A, arg/scale,
+                             tol=rtol,
+                             maxiter=options.maxiter)
+            dx *= scale
 
         if info > 0:
             msg = "ERROR in calc_gradient in '%s': gmres failed to converge " \
@@ -389,16 +400,17 @@ class PETSc_KSP(LinearSolver):
 
         return J
 
-    def solve(self, arg):
+    def solve(self, arg, rtol=None):
         """ Solve the coupled equations for a new state vector that nulls the
-        residual. Used by the Newton solvers."""
+        residual. Used by the Newton solvers. If rtol is given, it replaces
+        the relative tolerance from the options."""
 
         system = self._system
         options = self.options
 
         self.ksp.setTolerances(max_it=options.maxiter,
                                atol=options.atol,
-                               rtol=options.rtol)
+                               rtol=options.rtol if rtol is None else rtol)
 
         system.rhs_buf[:] = arg[:]
         self.ksp.solve(system.rhs_buf_petsc, system.sol_buf_petsc)
@@ -544,8 +556,10 @@ class LinearGS(LinearSolver):
         #print inputs, '\n', outputs, '\n', J
         return J
 
-    def solve(self, arg):
-        """ Executes an iterative solver """
+    def solve(self, arg, rtol=None):
+        """ Executes an iterative solver. If rtol is given, iteration also
+        stops once the norm of the linear residual is below rtol times the
+        norm of arg."""
         system = self._system
         #print "START", system.name
 
@@ -554,12 +568,16 @@ class LinearGS(LinearSolver):
         options = self.options
         system = self._system
 
+        atol = options.atol
+        if rtol is not None:
+            atol = max(atol, rtol * np.linalg.norm(arg))
+
         norm0, norm = 1.0, 1.0
         counter = 0
         if self.options.iprint > 0:
             self.print_norm(self.ln_string, counter, norm, norm0)
 
-        while counter < options.maxiter and norm > options.atol and \
+        while counter < options.maxiter and norm > atol and \
               norm/norm0 > options.rtol:
 
             if system.mode == 'forward':
@@ -7,16 +7,21 @@ When `authkey` is 'PublicKey', an additional session establishment protocol
 is used between the Proxy and Server:
 
 1. Proxy sends session request containing the proxy's public key, encrypted with
-   the server's public key (obtained when told what server to connect to).
+   the server's public key (obtained when told what server to connect to),
+   and the transport mode to use (see :func:`mp_util.transport_mode`).
 
 2. Server responds with random session key, encrypted with proxy's public key.
 
-3. Subsequent communication is encrypted with the session key (which presumably
-   is quicker than public/private key encryption).
+3. Subsequent communication is authenticated with the session key, and
+   encrypted with it unless the 'hmac' transport mode was requested (which
+   presumably is quicker than public/private key encryption).
 
 If `authkey` is not 'PublicKey', then the above session protocol is not used,
 and channel data is in the clear.
 
+Messages are sent by :class:`mp_util.Transport`, which sends large numeric
+arrays as raw frames rather than copying them into the pickled message.
+
 Public methods of an object are determined by a role-based access control
 attribute associated with the method. The server will verify that the current
 role is allowed access. The current role is determined by an
@@ -26,6 +31,12 @@ the proxy.
 Assuming the credentials check passes, the server will set its credentials
 to those specified by the :class:`AccessController` during the execution of the
 method.
+
+Method calls may be pipelined: :func:`call_async` sends a request and returns
+a :class:`ProxyFuture` without waiting for the reply, so a single thread can
+have several requests outstanding on each of many servers, and
+:func:`wait_any` waits for whichever replies come first. Each request
+carries an id which the server returns with the reply.
 """
 
 # Unfortunately, there's a lot of multiprocessing package code duplication here.
@@ -41,12 +52,15 @@ import hashlib
 import inspect
 import logging
 import os
+import select
 import socket
 import sys
 import threading
 import time
 import traceback
 
+from collections import OrderedDict
+
 from Crypto import Random
 
 from multiprocessing import Process, current_process, connection, util
@@ -61,9 +75,10 @@ if sys.platform == 'win32':  #pragma no cover
 from traits.trait_handlers import TraitDictObject
 
 from openmdao.main.interfaces import implements, obj_has_interface, IContainerProxy
-from openmdao.main.mp_util import decrypt, encrypt, is_legal_connection, \
-                                  keytype, make_typeid, public_methods, \
-                                  tunnel_address, SPECIALS
+from openmdao.main.mp_util import is_legal_connection, keytype, \
+                                  make_typeid, public_methods, \
+                                  transport_mode, tunnel_address, \
+                                  Transport, SPECIALS, TRANSPORT_MODES
 from openmdao.main.rbac import AccessController, RoleError, check_role, \
                                need_proxy, Credentials, \
                                get_credentials, set_credentials
@@ -387,25 +402,26 @@ class OpenMDAO_Server(Server):
         """
         self._logger.log(LOG_DEBUG2, 'starting server thread to service %r, %s',
                          threading.current_thread().name, keytype(self._authkey))
-        recv = conn.recv
-        send = conn.send
         id_to_obj = self.id_to_obj
         id_to_controller = self._id_to_controller
 
         if self._authkey == 'PublicKey':
-            client_key, session_key = self._init_session(conn)
+            client_key, session_key, mode = self._init_session(conn)
         else:
             client_key = ''
             session_key = ''
+            mode = 'cipher'
+        transport = Transport(session_key, mode, server=True)
 
         while not self.stop:
 
             try:
                 ident = methodname = args = kwds = credentials = None
-                obj = exposed = gettypeid = None
-                data = recv()
+                obj = exposed = gettypeid = tag = None
                 try:
-                    request = decrypt(data, session_key)
+                    request = transport.recv(conn)
+                except EOFError:
+                    raise
                 except Exception as exc:
                     trace = traceback.format_exc()
                     msg = "Can't decrypt/unpack request. This could be the" \
@@ -414,7 +430,10 @@ class OpenMDAO_Server(Server):
                     self._logger.error(trace)
                     raise RuntimeError(msg)
 
-                ident, methodname, args, kwds, credentials = request
+                ident, methodname, args, kwds, credentials = request[:5]
+                if len(request) > 5:
+                    # Request id of a pipelined call, returned with the reply.
+                    tag = request[5]
                 self._logger.log(LOG_DEBUG3, 'request %s %s', ident, methodname)
 #                self._logger.log(LOG_DEBUG3, 'credentials %s', credentials)
 #                self._logger.log(LOG_DEBUG3, 'id_to_obj:\n%s',
@@ -522,11 +541,14 @@ class OpenMDAO_Server(Server):
                 self._logger.error(trace)
                 msg = ('#TRACEBACK', trace)
 
+            if tag is not None:
+                msg += (tag,)
             try:
                 try:
-                    send(encrypt(msg, session_key))
+                    transport.send(conn, msg)
                 except Exception:
-                    send(encrypt(('#UNSERIALIZABLE', repr(msg)), session_key))
+                    msg = ('#UNSERIALIZABLE', repr(msg[:2])) + msg[2:]
+                    transport.send(conn, msg)
             # Just being defensive, this should never happen.
             except Exception as exc: #pragma no cover
                 self._logger.error('exception in thread serving %r',
@@ -546,12 +568,16 @@ class OpenMDAO_Server(Server):
             raise
 
         client_version = client_data[0]
-        if client_version != 1:  #pragma no cover
-            msg = 'Expected client protocol version 1, got %r' % client_version
+        if client_version != 2:  #pragma no cover
+            msg = 'Expected client protocol version 2, got %r' % client_version
             self._logger.error(msg)
             raise RuntimeError(msg)
 
-        n, e, encrypted = client_data[1:]
+        n, e, encrypted, mode = client_data[1:]
+        if mode not in TRANSPORT_MODES:  #pragma no cover
+            msg = 'Invalid transport mode %r' % mode
+            self._logger.error(msg)
+            raise RuntimeError(msg)
         if e != self._key_pair.e or n != self._key_pair.n:  #pragma no cover
             msg = 'Server key mismatch'
             self._logger.error(msg)
@@ -564,7 +590,7 @@ class OpenMDAO_Server(Server):
             self._logger.error("Can't recreate client key: %r", exc)
             raise
 
-        server_version = 1
+        server_version = 2
         try:
             session_key = hashlib.sha1(str(id(conn))).hexdigest()
             data = client_key.encrypt(session_key, '')
@@ -573,7 +599,7 @@ class OpenMDAO_Server(Server):
             self._logger.error("Can't send session key: %r", exc)
             raise
 
-        return (client_key, session_key)
+        return (client_key, session_key, mode)
 
     def _check_access(self, ident, methodname, function, args, credentials):
         """ Check for valid access, return (role, credentials, controller). """
@@ -1246,28 +1272,18 @@ class OpenMDAO_Proxy(BaseProxy):
         This version optionally encrypts the channel and sends the current
         thread's credentials with method arguments.
         """
+        return self._callmethod_async(methodname, args, kwds).result()
+
+    def _callmethod_async(self, methodname, args=None, kwds=None):
+        """
+        Send a request to call a method of the referrent and return a
+        :class:`ProxyFuture` for the result without waiting for the reply.
+        Several requests may be outstanding on the connection at once.
+        """
         args = args or ()
         kwds = kwds or {}
 
-        try:
-            conn = self._tls.connection
-        except AttributeError:
-            curr_thread = threading.current_thread()
-            util.debug('thread %r does not own a connection', curr_thread.name)
-            try:
-                self._connect()
-            except Exception as exc:
-                msg = "Can't connect to server at %r for %r: %r" \
-                      % (self._token.address, methodname, exc)
-                logging.error(msg)
-                raise RuntimeError(msg)
-            conn = self._tls.connection
-            if self._authkey == 'PublicKey':
-                self._init_session(conn)
-            else:
-                self._tls.session_key = ''
-
-        session_key = self._tls.session_key
+        channel = self._get_channel(methodname)
 
 # FIXME: Bizarre problem evidenced by test_extcode.py (Python 2.6.1)
 # For some reason pickling the env_vars dictionary causes:
@@ -1282,17 +1298,51 @@ class OpenMDAO_Proxy(BaseProxy):
             else:
                 new_args.append(arg)
 
+        future = ProxyFuture(self, channel, methodname)
         try:
-            conn.send(encrypt((self._id, methodname, new_args, kwds,
-                               get_credentials().encode()), session_key))
+            channel.send(future, (self._id, methodname, new_args, kwds,
+                                  get_credentials().encode()))
         except IOError as exc:
             msg = "Can't send to server at %r for %r: %r" \
                   % (self._token.address, methodname, exc)
             logging.error(msg)
             raise RuntimeError(msg)
+        return future
 
-        kind, result = decrypt(conn.recv(), session_key)
-
+    def _get_channel(self, methodname):
+        """
+        Return the :class:`_Channel` for this thread's connection to the
+        server, connecting if necessary.
+        """
+        try:
+            conn = self._tls.connection
+        except AttributeError:
+            curr_thread = threading.current_thread()
+            util.debug('thread %r does not own a connection', curr_thread.name)
+            try:
+                self._connect()
+            except Exception as exc:
+                msg = "Can't connect to server at %r for %r: %r" \
+                      % (self._token.address, methodname, exc)
+                logging.error(msg)
+                raise RuntimeError(msg)
+            conn = self._tls.connection
+            if self._authkey == 'PublicKey':
+                self._init_session(conn)
+            else:
+                self._tls.session_key = ''
+                self._tls.transport_mode = 'cipher'
+
+        channel = getattr(self._tls, 'channel', None)
+        if channel is None or channel.conn is not conn:
+            transport = Transport(self._tls.session_key,
+                                  self._tls.transport_mode)
+            channel = _Channel(conn, transport)
+            self._tls.channel = channel
+        return channel
+
+    def _convert_reply(self, kind, result):
+        """ Return the value of a reply, or raise the error it reports. """
         if kind == '#RETURN':
             return result
 
@@ -1336,14 +1386,16 @@ class OpenMDAO_Proxy(BaseProxy):
 
         server_key = self._pubkey
         encrypted = pk_encrypt(text, server_key)
-        client_version = 1
-        conn.send((client_version, server_key.n, server_key.e, encrypted))
+        mode = transport_mode()
+        client_version = 2
+        conn.send((client_version, server_key.n, server_key.e, encrypted,
+                   mode))
 
         server_data = conn.recv()
         server_version = server_data[0]
         # Just being defensive, this should never happen.
-        if server_version != 1:  #pragma no cover
-            msg = 'Expecting server protocol version 1, got %r' % server_version
+        if server_version != 2:  #pragma no cover
+            msg = 'Expecting server protocol version 2, got %r' % server_version
             logging.error(msg)
             if server_version == '#TRACEBACK':
                 try:
@@ -1353,6 +1405,7 @@ class OpenMDAO_Proxy(BaseProxy):
             raise RuntimeError(msg)
 
         self._tls.session_key = key_pair.decrypt(server_data[1])
+        self._tls.transport_mode = mode
 
     def _incref(self):
         """
@@ -1466,6 +1519,136 @@ class OpenMDAO_Proxy(BaseProxy):
                 (_auto_proxy, self._token, self._serializer, kwds))
 
 
+class _Channel(object):
+    """
+    A thread's connection to a server, with the requests sent on it that
+    haven't been replied to yet. The server handles requests in order, and
+    each reply carries the id of its request, which is used to match it
+    to its :class:`ProxyFuture`.
+    """
+
+    # Limit on bytes of outstanding requests. The server doesn't read
+    # requests while it's sending a reply, so requests sent while replies
+    # are unread must fit in the connection's buffers, or both ends could
+    # block sending. A larger request is only sent when no others are
+    # outstanding, so the server is waiting to read it.
+    max_pending_bytes = 8 * 1024
+
+    def __init__(self, conn, transport):
+        self.conn = conn
+        self.transport = transport
+        self.pending = OrderedDict()  # request id -> (future, size)
+        self.pending_bytes = 0
+        self._next_id = 0
+
+    def fileno(self):
+        """ For :func:`select.select`. """
+        return self.conn.fileno()
+
+    def send(self, future, request):
+        """ Send `request` and register `future` for its reply. """
+        self._next_id += 1
+        request_id = self._next_id
+        size, packed = self.transport.pack(request + (request_id,))
+        while self.pending and \
+              self.pending_bytes + size > self.max_pending_bytes:
+            self.receive()
+        self.transport.send_packed(self.conn, packed)
+        self.pending[request_id] = (future, size)
+        self.pending_bytes += size
+
+    def receive(self):
+        """ Receive one reply and deliver it to its future. """
+        kind, result, request_id = self.transport.recv(self.conn)
+        future, size = self.pending.pop(request_id)
+        self.pending_bytes -= size
+        future._set_reply(kind, result)
+
+
+class ProxyFuture(object):
+    """
+    The pending result of a method call sent by :func:`call_async`.
+    It must be resolved by the thread that made the call.
+    """
+
+    def __init__(self, proxy, channel, methodname):
+        self.methodname = methodname
+        self._proxy = proxy
+        self._channel = channel
+        self._reply = None  # (kind, result) until converted.
+        self._converted = False
+        self._value = None
+        self._error = None
+
+    def done(self):
+        """ Return True if the reply has been received. """
+        return self._converted or self._reply is not None
+
+    def result(self):
+        """
+        Return the result of the call, waiting for the reply if necessary.
+        Raises the error reported by the server, if any.
+        """
+        while not self.done():
+            self._channel.receive()
+        if not self._converted:
+            kind, result = self._reply
+            self._reply = None
+            self._converted = True
+            try:
+                self._value = self._proxy._convert_reply(kind, result)
+            except Exception as exc:
+                self._error = exc
+        if self._error is not None:
+            raise self._error
+        return self._value
+
+    def _set_reply(self, kind, result):
+        self._reply = (kind, result)
+
+
+def call_async(proxy, methodname, *args, **kwds):
+    """
+    Call `methodname` of the object referred to by `proxy` without waiting
+    for the result. Returns a :class:`ProxyFuture`. Calls to several
+    servers, or several calls to one server, may be outstanding at once and
+    be waited for with :func:`wait_any`.
+    """
+    return proxy._callmethod_async(methodname, args, kwds)
+
+
+def wait_any(futures, timeout=None):
+    """
+    Wait until at least one of `futures` is done, or `timeout` seconds
+    have passed, and return the list of those that are done.
+    """
+    done = [future for future in futures if future.done()]
+    if done:
+        return done
+
+    channels = []
+    for future in futures:
+        if future._channel not in channels:
+            channels.append(future._channel)
+
+    if sys.platform == 'win32':  #pragma no cover
+        # Pipes can't be select()ed, so poll.
+        start = time.time()
+        ready = []
+        while not ready:
+            ready = [channel for channel in channels if channel.conn.poll()]
+            if timeout is not None and time.time() - start >= timeout:
+                break
+            if not ready:
+                time.sleep(0.01)
+    else:
+        ready = select.select(channels, [], [], timeout)[0]
+
+    for channel in ready:
+        channel.receive()
+    return [future for future in futures if future.done()]
+
+
 def register(cls, manager, module=None):
     """
     Register class `cls` proxy info with `manager`. The class will be
@@ -5,17 +5,25 @@ Multiprocessing support utilities.
 import ConfigParser
 import copy
 import cPickle
+import cStringIO
 import errno
 import getpass
+import hashlib
+import hmac
 import inspect
+import json
 import logging
 import os.path
 import re
 import socket
+import struct
 import sys
 import time
 
+from numpy import dtype, empty, frombuffer, ndarray, uint8
+
 from Crypto.Cipher import AES
+from Crypto.Util import Counter
 
 from multiprocessing import current_process, connection
 from multiprocessing.managers import BaseProxy
@@ -367,59 +375,231 @@ def tunnel_address(remote):
     return _TUNNEL_MAP.get(remote, remote)
 
 
-def encrypt(obj, session_key):
-    """
-    If `session_key` is specified, returns ``(length, data)`` of encrypted,
-    pickled, `obj`. Otherwise `obj` is returned.
+# Transport modes used once a session key has been established.
+TRANSPORT_MODES = ('cipher', 'hmac')
 
-    obj: object
-        Object to be pickled and encrypted.
+# Arrays of at least this many bytes are sent out of band.
+_OOB_MIN_SIZE = 16 * 1024
 
-    session_key: string
-        Key used for encryption. Should be at least 16 bytes long.
-    """
-    if session_key:
-        # Just being defensive, this should never happen.
-        if len(session_key) < 16:  #pragma no cover
-            session_key += '!'*16
-        session_key = session_key[:16]
-        encryptor = AES.new(session_key, AES.MODE_CBC, '?'*AES.block_size)
-        text = cPickle.dumps(obj, cPickle.HIGHEST_PROTOCOL)
-        length = len(text)
-        pad = length % AES.block_size
-        if pad:
-            pad = AES.block_size - pad
-            text += '-'*pad
-        data = encryptor.encrypt(text)
-        return (length, data)
-    else:
-        return obj
+# Kinds of arrays which may be sent out of band (bool, int, float, complex).
+_OOB_KINDS = 'biufc'
+
+# Pickles up to this size are sent in the same frame as the header.
+_INLINE_MAX = 64 * 1024
+
+# Largest frame sent, within the limit of Connection.send_bytes().
+_MAX_FRAME = 1 << 30
 
-def decrypt(msg, session_key):
+
+def transport_mode():
+    """
+    Return the transport mode clients request for encrypted sessions, from
+    the ``OPENMDAO_TRANSPORT`` environment variable. 'cipher' (the default)
+    authenticates and encrypts messages, 'hmac' only authenticates them and
+    is meant for trusted networks.
     """
-    If `session_key` is specified, returns object from encrypted pickled data
-    contained in `msg`. Otherwise `msg` is returned.
+    mode = os.environ.get('OPENMDAO_TRANSPORT', 'cipher')
+    if mode not in TRANSPORT_MODES:
+        raise ValueError('OPENMDAO_TRANSPORT must be one of %s, not %r'
+                         % (TRANSPORT_MODES, mode))
+    return mode
 
-    msg: string
-        Encrypted text of pickled object.
+
+class Transport(object):
+    """
+    Sends and receives objects over a :mod:`multiprocessing` connection.
+    Large contiguous numeric arrays anywhere within an object are sent out
+    of band, as raw frames following the pickle of the rest of the object,
+    and received directly into newly allocated arrays.
 
     session_key: string
-        Key used for encryption. Should be at least 16 bytes long.
+        If empty, messages are sent in the clear. Otherwise each message is
+        followed by an HMAC-SHA256 of its frames and message number, and the
+        frames are encrypted with AES in CTR mode if `mode` is 'cipher'.
+        The header giving the shapes and types of the arrays isn't encrypted,
+        but is authenticated separately before any arrays are allocated.
+
+    mode: string
+        'cipher' or 'hmac'.
+
+    server: bool
+        True for the server end of the connection, so that messages sent
+        in one direction can't be replayed in the other.
     """
-    if session_key:
-        # Just being defensive, this should never happen.
-        if len(msg) != 2:  #pragma no cover
-            raise RuntimeError('_decrypt: msg not encrypted?')
-        # Just being defensive, this should never happen.
-        if len(session_key) < 16:  #pragma no cover
-            session_key += '!'*16
-        session_key = session_key[:16]
-        decryptor = AES.new(session_key, AES.MODE_CBC, '?'*AES.block_size)
-        length, data = msg
-        text = decryptor.decrypt(data)
-        return cPickle.loads(text[:length])
-    else:
-        return msg
+
+    def __init__(self, session_key='', mode='cipher', server=False):
+        if mode not in TRANSPORT_MODES:
+            raise ValueError('mode must be one of %s, not %r'
+                             % (TRANSPORT_MODES, mode))
+        self.mode = mode
+        self._mac_key = self._cipher_key = None
+        if session_key:
+            self._mac_key = hashlib.sha256('mac' + session_key).digest()
+            if mode == 'cipher':
+                key = hashlib.sha256('cipher' + session_key).digest()
+                self._cipher_key = key[:16]
+        self._send_tag, self._recv_tag = ('S', 'C') if server else ('C', 'S')
+        self._sent = 0
+        self._received = 0
+
+    def send(self, conn, obj):
+        """ Send `obj` on `conn`. """
+        self.send_packed(conn, self.pack(obj)[1])
+
+    def pack(self, obj):
+        """
+        Prepare `obj` for sending. Returns ``(size, packed)``, where `size`
+        is the number of bytes of data to be sent and `packed` is passed to
+        :meth:`send_packed`, which must be called before the next message
+        is packed.
+        """
+        arrays = []
+        text = _dumps(obj, arrays)  # Fails before anything is sent.
+        nonce = os.urandom(8) if self._cipher_key else ''
+        inline = len(text) <= _INLINE_MAX
+        head = json.dumps([nonce.encode('hex'), len(text), inline,
+                           [(arr.dtype.str, arr.shape) for arr in arrays]])
+        mac = self._new_mac(self._send_tag, self._sent)
+        self._sent += 1
+        size = len(head) + len(text) + sum([arr.nbytes for arr in arrays])
+        return (size, (text, arrays, nonce, inline, head, mac))
+
+    def send_packed(self, conn, packed):
+        """ Send message `packed` by :meth:`pack` on `conn`. """
+        text, arrays, nonce, inline, head, mac = packed
+        if inline:
+            frame = head + '\n' + self._crypt(nonce, 0, text)
+            frames = arrays
+        else:
+            frame = head + '\n'
+            frames = [text] + arrays
+        conn.send_bytes(frame)
+        if mac is not None:
+            # Header is authenticated before the receiver allocates arrays.
+            mac.update(frame)
+            conn.send_bytes(mac.copy().digest())
+
+        index = 0
+        for data in frames:
+            size = len(data) if isinstance(data, str) else data.nbytes
+            for offset in range(0, size, _MAX_FRAME):
+                index += 1
+                chunk = self._crypt(nonce, index,
+                                    buffer(data, offset, _MAX_FRAME))
+                if mac is not None:
+                    mac.update(chunk)
+                conn.send_bytes(chunk)
+        if mac is not None:
+            conn.send_bytes(mac.digest())
+
+    def recv(self, conn):
+        """ Receive an object from `conn`. """
+        frame = conn.recv_bytes()
+        mac = self._new_mac(self._recv_tag, self._received)
+        if mac is not None:
+            mac.update(frame)
+            if not hmac.compare_digest(mac.copy().digest(), conn.recv_bytes()):
+                raise RuntimeError('Message authentication failed')
+        head, text = frame.split('\n', 1)
+        nonce, length, inline, specs = json.loads(head)
+        nonce = str(nonce).decode('hex')
+
+        index = 0
+        text_chunks = []
+        if not inline:
+            size = 0
+            while size < length:
+                index += 1
+                chunk = conn.recv_bytes()
+                if mac is not None:
+                    mac.update(chunk)
+                text_chunks.append((index, chunk))
+                size += len(chunk)
+
+        arrays = []
+        array_chunks = []
+        for typestr, shape in specs:
+            typ = dtype(str(typestr))
+            if typ.kind not in _OOB_KINDS:
+                raise RuntimeError('Invalid array type %r' % typestr)
+            arr = empty(shape, typ)
+            offset = 0
+            while offset < arr.nbytes:
+                index += 1
+                size = conn.recv_bytes_into(arr, offset)
+                if mac is not None:
+                    mac.update(buffer(arr, offset, size))
+                array_chunks.append((index, arr, offset, size))
+                offset += size
+            arrays.append(arr)
+
+        if mac is not None:
+            if not hmac.compare_digest(mac.digest(), conn.recv_bytes()):
+                raise RuntimeError('Message authentication failed')
+        self._received += 1
+
+        # Decrypt only after authentication.
+        if inline:
+            text = self._crypt(nonce, 0, text)
+        else:
+            text = ''.join([self._crypt(nonce, i, chunk)
+                            for i, chunk in text_chunks])
+        if self._cipher_key:
+            for i, arr, offset, size in array_chunks:
+                data = self._crypt(nonce, i, buffer(arr, offset, size))
+                arr.reshape(-1).view(uint8)[offset:offset+size] = \
+                    frombuffer(data, uint8)
+        return _loads(text, arrays)
+
+    def _new_mac(self, tag, number):
+        """ Return a new MAC for message `number` in direction `tag`. """
+        if self._mac_key is None:
+            return None
+        return hmac.new(self._mac_key, '%s%d' % (tag, number), hashlib.sha256)
+
+    def _crypt(self, nonce, index, data):
+        """
+        Encrypt or decrypt `data`, the `index` piece of a message.
+        Returns `data` unchanged if not encrypting.
+        """
+        if self._cipher_key is None:
+            return data
+        counter = Counter.new(32, prefix=nonce + struct.pack('!I', index))
+        cipher = AES.new(self._cipher_key, AES.MODE_CTR, counter=counter)
+        return cipher.encrypt(data)
+
+
+def _dumps(obj, arrays):
+    """
+    Return pickled `obj`, with large arrays replaced by their index in
+    `arrays`, to which they are appended.
+    """
+    pids = {}
+
+    def persistent_id(value):
+        if type(value) is ndarray and value.nbytes >= _OOB_MIN_SIZE and \
+           value.dtype.kind in _OOB_KINDS and value.flags.c_contiguous:
+            try:
+                return pids[id(value)]
+            except KeyError:
+                pid = pids[id(value)] = str(len(arrays))
+                arrays.append(value)
+                return pid
+        return None
+
+    out = cStringIO.StringIO()
+    pickler = cPickle.Pickler(out, cPickle.HIGHEST_PROTOCOL)
+    # Only called for objects which aren't of basic types.
+    pickler.inst_persistent_id = persistent_id
+    pickler.dump(obj)
+    return out.getvalue()
+
+
+def _loads(text, arrays):
+    """ Return object from `text` pickled by :func:`_dumps`. """
+    unpickler = cPickle.Unpickler(cStringIO.StringIO(text))
+    unpickler.persistent_load = lambda pid: arrays[int(pid)]
+    return unpickler.load()
 
 
 def public_methods(obj):
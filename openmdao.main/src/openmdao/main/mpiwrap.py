@@ -108,6 +108,13 @@ class MPI_info(object):
         # min/max requested cpus
         self.requested_cpus = (1, 1)
 
+        # estimated cost of one execution (e.g., in seconds), or None if
+        # unknown, and the fraction of that cost that is divided among
+        # the processors we get.  Used to weight processor assignment
+        # in parallel systems.
+        self.cost = None
+        self.parallel_fraction = 1.0
+
         # the MPI communicator used by this comp and its children
         self.comm = COMM_NULL
 
@@ -13,6 +13,7 @@ import os.path
 import string
 import sys
 
+from openmdao.main.job_array import JobArraySpool, batch_config
 from openmdao.main.mp_support import OpenMDAO_Manager, register
 from openmdao.main.objserverfactory import ObjServer
 from openmdao.main.rbac import rbac
@@ -57,12 +58,16 @@ class PBS_Allocator(FactoryAllocator):
         authkey: PublicKey
         allow_shell: True
 
+    Commands executed concurrently by deployed servers may be batched into
+    job arrays by adding the batching options described in
+    :func:`batch_config` to this entry, for example ``batch_dir: ~/pbs_spool``.
     """
 
     def __init__(self, name='PBS', accounting_id='no-default-set',
                  authkey=None, allow_shell=True):
         super(PBS_Allocator, self).__init__(name, authkey, allow_shell)
         self.accounting_id = accounting_id
+        self.batch = None
         self.factory.manager_class = _ServerManager
         self.factory.server_classname = 'pbs_pbs_PBS_Server'
 #FIXME: need to somehow determine available cpus.
@@ -77,12 +82,14 @@ class PBS_Allocator(FactoryAllocator):
             Configuration data is located under the section matching
             this allocator's `name`.
 
-        Allows modifying `accounting_id` and factory options.
+        Allows modifying `accounting_id`, batching options, and factory
+        options.
         """
         super(PBS_Allocator, self).configure(cfg)
         if cfg.has_option(self.name, 'accounting_id'):
             self.accounting_id = cfg.get(self.name, 'accounting_id')
             self._logger.debug('    accounting_id: %s', self.accounting_id)
+        self.batch = batch_config(cfg, self.name, self._logger)
 
     @rbac('*')
     def max_servers(self, resource_desc):
@@ -167,7 +174,8 @@ class PBS_Allocator(FactoryAllocator):
         """
         Deploy a server suitable for `resource_desc`.
         Returns a proxy to the deployed server.
-        Overrides superclass to pass `accounting_id` to server.
+        Overrides superclass to pass `accounting_id` and batching options
+        to server.
 
         name: string
             Name for server.
@@ -181,24 +189,34 @@ class PBS_Allocator(FactoryAllocator):
         server = super(PBS_Allocator, self).deploy(name, resource_desc,
                                                    criteria)
         if server is not None:
-            server.configure(self.accounting_id)
+            server.configure(self.accounting_id, self.batch)
         return server
 
 
 class PBS_Server(ObjServer):
     """ Knows about executing a command via `qsub`. """
 
-    _QSUB = ['qsub']  # Replaced with fake command for testing.
+    _QSUB = ['qsub']    # Replaced with fake command for testing.
+    _QSTAT = ['qstat']  # Replaced with fake command for testing.
+    _TASK_ID = 'PBS_ARRAY_INDEX'
+
+    _spool = None
 
     @rbac('owner')
-    def configure(self, accounting_id):
+    def configure(self, accounting_id, batch=None):
         """
-        Configure default accounting id.
+        Configure default accounting id and batching.
 
         accounting_id: string
             Used as default ``accounting_id`` value.
+
+        batch: dict
+            If not None, arguments to :class:`JobArraySpool` used to batch
+            commands into job arrays.
         """
         self.accounting_id = accounting_id
+        if batch and sys.platform != 'win32':
+            self._spool = JobArraySpool(**batch)
 
     @rbac('owner')
     def execute_command(self, resource_desc):
@@ -302,6 +320,11 @@ class PBS_Server(ObjServer):
         Output from `qsub` itself is routed to ``qsub.out``.
         If the job reports an error, ``qsub.out`` will be appended to either
         `error_path`, or if that was not specified, stdout.
+
+        If batching has been configured, the command is instead run as a task
+        of a job array shared with other servers having the same options.
+        The directives are then passed on the `qsub` command line, except
+        for ``-N``.
         """
         self.home_dir = os.path.expanduser('~')
         self.work_dir = os.getcwd()  # Server started in working directory.
@@ -332,93 +355,118 @@ class PBS_Server(ObjServer):
 
         native_specification = resource_desc.get('native_specification', [])
 
+        # PBS (at least at NAS) requires 'group_list' be set.
+        if 'accounting_id' in resource_desc:
+            accounting_id = resource_desc['accounting_id']
+        else:
+            accounting_id = self.accounting_id
+        directives = ['-W group_list=%s' % accounting_id.strip()]
+
+        # Process description in fixed, repeatable order.
+        keys = ('submit_as_hold',
+                'rerunnable',
+                'job_environment',
+                'min_cpus',
+                'email',
+                'email_on_started',
+                'email_on_terminated',
+                'job_name',
+                'input_path',
+                'output_path',
+                'error_path',
+                'join_files',
+                'queue_name',
+                'priority',
+                'start_time')
+
+        email_events = ''
+        for key in keys:
+            try:
+                value = resource_desc[key]
+            except KeyError:
+                continue
+
+            if key == 'submit_as_hold':
+                if value:
+                    directives.append('-h')
+            elif key == 'rerunnable':
+                directives.append('-r %s' % ('y' if value else 'n'))
+            elif key == 'job_environment':
+                env = value
+            elif key == 'min_cpus':
+                # Only write select clause if not in 'native_specification'.
+                for arg in native_specification:
+                    if 'select' in arg:
+                        break
+                else:
+                    directives.append('-l select=%d:ncpus=1' % value)
+            elif key == 'email':
+                directives.append('-M %s' % ','.join(value))
+            elif key == 'email_on_started':
+                email_events += 'b'
+            elif key == 'email_on_terminated':
+                email_events += 'e'
+            elif key == 'job_name':
+                value = value or base
+                directives.append('-N %s' % self._jobname(value))
+            elif key == 'input_path':
+                inp = value
+            elif key == 'output_path':
+                out = value
+            elif key == 'error_path':
+                err = value
+            elif key == 'join_files':
+                join_files = value
+            elif key == 'queue_name':
+                directives.append('-q %s' % value)
+            elif key == 'priority':
+                directives.append('-p %d' % value)
+            elif key == 'start_time':
+                directives.append('-a %s' % value.strftime('%Y%m%d%H%M.%S'))
+
+        if email_events:
+            directives.append('-m %s' % email_events)
+
+        # Set resource limits.
+        if 'resource_limits' in resource_desc:
+            limits = resource_desc['resource_limits']
+            if 'wallclock_time' in limits:
+                wall_time = limits['wallclock_time']
+                directives.append('-l walltime=%s'
+                                  % self._timelimit(wall_time))
+
+        command = self._fix_path(resource_desc['remote_command'])
+        if 'args' in resource_desc:
+            for arg in resource_desc['args']:
+                arg = self._fix_path(arg)
+                if ' ' in arg and arg[0] not in ('"', "'"):
+                    arg = '"%s"' % arg
+                command += ' %s' % arg
+
+        command += ' <%s' % (inp or DEV_NULL)
+        command += ' >%s' % (out or '%s.stdout' % base)
+        if join_files or err is None:
+            command += ' 2>&1'
+        else:
+            command += ' 2>%s' % err
+
+        if self._spool is not None:
+            options = []
+            for directive in directives:
+                if not directive.startswith('-N '):
+                    options.extend(directive.split(' ', 1))
+            options.extend(native_specification)
+            self._logger.info('%r', command)
+            return self._spool.execute(self, options, command, env)
+
         with open(script_name, 'w') as script:
             if sys.platform == 'win32':  # pragma no cover
                 script.write('@echo off\n')
             else:
                 script.write('#!/bin/sh\n')
 
-            # PBS (at least at NAS) requires 'group_list' be set.
-            if 'accounting_id' in resource_desc:
-                accounting_id = resource_desc['accounting_id']
-            else:
-                accounting_id = self.accounting_id
-            script.write('%s -W group_list=%s\n'
-                         % (prefix, accounting_id.strip()))
-
-            # Process description in fixed, repeatable order.
-            keys = ('submit_as_hold',
-                    'rerunnable',
-                    'job_environment',
-                    'min_cpus',
-                    'email',
-                    'email_on_started',
-                    'email_on_terminated',
-                    'job_name',
-                    'input_path',
-                    'output_path',
-                    'error_path',
-                    'join_files',
-                    'queue_name',
-                    'priority',
-                    'start_time')
-
-            email_events = ''
-            for key in keys:
-                try:
-                    value = resource_desc[key]
-                except KeyError:
-                    continue
-
-                if key == 'submit_as_hold':
-                    if value:
-                        script.write('%s -h\n' % prefix)
-                elif key == 'rerunnable':
-                    script.write('%s -r %s\n' % (prefix, 'y' if value else 'n'))
-                elif key == 'job_environment':
-                    env = value
-                elif key == 'min_cpus':
-                    # Only write select clause if not in 'native_specification'.
-                    for arg in native_specification:
-                        if 'select' in arg:
-                            break
-                    else:
-                        script.write('%s -l select=%d:ncpus=1\n' % (prefix, value))
-                elif key == 'email':
-                    script.write('%s -M %s\n' % (prefix, ','.join(value)))
-                elif key == 'email_on_started':
-                    email_events += 'b'
-                elif key == 'email_on_terminated':
-                    email_events += 'e'
-                elif key == 'job_name':
-                    value = value or base
-                    script.write('%s -N %s\n' % (prefix, self._jobname(value)))
-                elif key == 'input_path':
-                    inp = value
-                elif key == 'output_path':
-                    out = value
-                elif key == 'error_path':
-                    err = value
-                elif key == 'join_files':
-                    join_files = value
-                elif key == 'queue_name':
-                    script.write('%s -q %s\n' % (prefix, value))
-                elif key == 'priority':
-                    script.write('%s -p %d\n' % (prefix, value))
-                elif key == 'start_time':
-                    script.write('%s -a %s\n'
-                                 % (prefix, value.strftime('%Y%m%d%H%M.%S')))
-
-            if email_events:
-                script.write('%s -m %s\n' % (prefix, email_events))
-
-            # Set resource limits.
-            if 'resource_limits' in resource_desc:
-                limits = resource_desc['resource_limits']
-                if 'wallclock_time' in limits:
-                    wall_time = limits['wallclock_time']
-                    script.write('%s -l walltime=%s\n'
-                                 % (prefix, self._timelimit(wall_time)))
+            for directive in directives:
+                script.write('%s %s\n' % (prefix, directive))
 
             # Have script move to work directory.
             home = os.path.realpath(os.path.expanduser('~'))
@@ -432,23 +480,7 @@ class PBS_Server(ObjServer):
             if ' ' in work:
                 work = '"%s"' % work
             script.write('cd %s\n' % work)
-
-            script.write(self._fix_path(resource_desc['remote_command']))
-
-            if 'args' in resource_desc:
-                for arg in resource_desc['args']:
-                    arg = self._fix_path(arg)
-                    if ' ' in arg and arg[0] not in ('"', "'"):
-                        arg = '"%s"' % arg
-                    script.write(' %s' % arg)
-
-            script.write(' <%s' % (inp or DEV_NULL))
-            script.write(' >%s' % (out or '%s.stdout' % base))
-            if join_files or err is None:
-                script.write(' 2>&1')
-            else:
-                script.write(' 2>%s' % err)
-            script.write('\n')
+            script.write('%s\n' % command)
 
         if sys.platform != 'win32':
             os.chmod(script_name, 0700)
@@ -495,6 +527,33 @@ class PBS_Server(ObjServer):
                         out.write(line)
         return (return_code, error_msg)
 
+    def _submit_array(self, options, env, count, script):
+        """
+        Submit `script` as an array of `count` tasks.
+        Returns ``(return_code, error_msg, job_id)``.
+        """
+        cmd = list(self._QSUB)
+        cmd.extend(('-V', '-j', 'oe', '-o', DEV_NULL, '-S', '/bin/sh'))
+        cmd.extend(options)
+        if count > 1:  # PBS rejects single-task arrays.
+            cmd.extend(('-J', '1-%d' % count))
+        cmd.append(script)
+        self._logger.info('%r', ' '.join(cmd))
+        process = ShellProc(cmd, DEV_NULL, 'qsub.out', STDOUT, env)
+        return_code, error_msg = process.wait(1)
+        job_id = None
+        if return_code == 0:
+            with open('qsub.out', 'rU') as inp:
+                job_id = inp.read().split()[-1]  # '<id>[].<server>'
+        return (return_code, error_msg, job_id)
+
+    def _array_active(self, job_id):
+        """ Return True if array `job_id` is still known to PBS. """
+        cmd = list(self._QSTAT)
+        cmd.append(job_id)
+        process = ShellProc(cmd, DEV_NULL, DEV_NULL, STDOUT)
+        return process.wait()[0] == 0
+
     def _fix_path(self, path):
         """ Translates special prefixes. """
         if path.startswith(HOME_DIRECTORY):
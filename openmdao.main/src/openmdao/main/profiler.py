@@ -0,0 +1,34 @@
+"""
+Base class of the profilers in :mod:`openmdao.main.exec_profiler` and
+:mod:`openmdao.main.setup_profiler`.
+"""
+
+
+class Profiler(object):
+    """Base class of a profiler that is active while it's the value of the
+    ``_profiler`` global of the module whose ``globals()`` are `_scope`.
+    Profiled methods are decorated by a wrapper that tests that global, so
+    that when no profiler is active the decorator costs a single global
+    lookup per call. Use it as a context manager, or call :meth:`start` and
+    :meth:`stop`.
+    """
+
+    _scope = None
+    _prev = None
+
+    def start(self):
+        """Make this the active profiler."""
+        self._prev = self._scope['_profiler']
+        self._scope['_profiler'] = self
+
+    def stop(self):
+        """Restore the previously active profiler, if any."""
+        self._scope['_profiler'] = self._prev
+        self._prev = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
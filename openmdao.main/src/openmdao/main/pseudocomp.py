@@ -20,9 +20,14 @@ from openmdao.util.typegroups import int_types, complex_or_real_types
 
 
 
-def _remove_spaces(s):
+def remove_spaces(s):
+    """Return expression string `s` with all whitespace removed, which is
+    how expressions are keyed by drivers and assemblies.
+    """
     return s.translate(None, ' \n\t\r')
 
+_remove_spaces = remove_spaces
+
 def _get_new_name(parent):
     while not has_interface(parent, IAssembly):
         parent = parent.parent
@@ -395,6 +400,9 @@ class PseudoComponent(object):
     def get_req_cpus(self):
         return (1, 1)
 
+    def get_cost(self):
+        return (0.0, 1.0)
+
     def setup_init(self):
         self.Jsize = None
         self._provideJ_bounds = None
@@ -457,6 +465,9 @@ class PseudoComponent(object):
         return []
 
     def _input_updated(self, name, fullpath=None):
+        # PseudoComponents have no skip_unchanged option and are run
+        # whenever their System runs, so changes needn't be recorded as
+        # they are by Component._input_updated.
         pass
 
     def get_full_nodeset(self):
@@ -585,6 +596,14 @@ class UnitConversionPComp(PseudoComponent):
         src.convert_to_unit(target)
         self.grad = src.get_value()
 
+    def get_affine(self):
+        """Return a tuple of the form (scale, offset) such that
+        out0 = scale*in0 + offset.
+        """
+        target = PhysicalQuantity(1.0, self._meta['out0'].get('units'))
+        scaler, adder = self._srcunits.conversion_tuple_to(target.unit)
+        return (scaler, scaler*adder)
+
     def provideJ(self):
         """No need to pre-calculate."""
         pass
@@ -0,0 +1,201 @@
+"""
+Hierarchical timing of the setup phases of an Assembly.
+
+Methods that make up the setup of an Assembly and of its systems are
+decorated with :func:`setup_phase`. While a :class:`SetupProfiler` is
+active, each call of a decorated method is recorded in a tree of phases,
+keyed by method name and by the object (assembly, component or system)
+that ran it, with the wall time, number of calls and change in resident
+memory of each phase.
+
+For example::
+
+    from openmdao.main.setup_profiler import profile_setup
+
+    prof = profile_setup(top)
+    prof.report(depth=2)
+    data = prof.to_dict()
+
+"""
+
+import os
+import sys
+import json
+import time
+from functools import wraps
+
+try:
+    import resource
+except ImportError:  # pragma no cover
+    resource = None
+
+from openmdao.main.profiler import Profiler
+
+# The active profiler, if any.
+_profiler = None
+
+
+def _memory_usage():
+    """Returns the resident memory of this process in bytes. Where the
+    current value isn't available, the peak value is returned instead.
+    """
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (IOError, OSError, ValueError, IndexError):
+        if resource is None:
+            return 0
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        if sys.platform == 'darwin':
+            return rss
+        return rss * 1024
+
+
+def _target_name(obj):
+    """Returns the name used to identify `obj` in the profile."""
+    if hasattr(obj, 'get_pathname'):
+        return obj.get_pathname() or obj.__class__.__name__
+    name = getattr(obj, 'name', None)
+    if name is None:
+        return obj.__class__.__name__
+    return '%s %s' % (obj.__class__.__name__, name)
+
+
+def setup_phase(func):
+    """Decorator that records calls of a setup method in the active
+    :class:`SetupProfiler`, if there is one.
+    """
+    name = func.__name__
+
+    @wraps(func)
+    def wrapper(self, *args, **kwargs):
+        if _profiler is None:
+            return func(self, *args, **kwargs)
+        return _profiler.call(name, self, func, self, *args, **kwargs)
+
+    return wrapper
+
+
+class SetupPhase(object):
+    """Timing data for one phase of setup, as run by one object."""
+
+    def __init__(self, name, target, parent=None):
+        self.name = name
+        self.target = target
+        self.parent = parent
+        self.calls = 0
+        self.time = 0.0
+        self.memory = 0
+        self.children = []
+        self._index = {}
+
+    def child(self, name, target):
+        """Returns the child phase for `name` and `target`, creating it if
+        needed.
+        """
+        try:
+            return self._index[(name, target)]
+        except KeyError:
+            phase = SetupPhase(name, target, self)
+            self._index[(name, target)] = phase
+            self.children.append(phase)
+            return phase
+
+    def to_dict(self):
+        """Returns the data for this phase and its children as nested
+        dicts.
+        """
+        return {
+            'name': self.name,
+            'target': self.target,
+            'calls': self.calls,
+            'time': self.time,
+            'memory': self.memory,
+            'children': [child.to_dict() for child in self.children],
+        }
+
+
+class SetupProfiler(Profiler):
+    """Records the setup phases run while it's active. Use it as a context
+    manager, or call :meth:`start` and :meth:`stop`.
+    """
+
+    _scope = globals()
+
+    def __init__(self):
+        self.root = SetupPhase('setup', '')
+        self._current = self.root
+        self._running = []  # (name, target id) of running phases
+
+    def call(self, name, obj, func, *args, **kwargs):
+        """Call `func` with the given args, recording it as phase `name`
+        run by `obj`.
+        """
+        key = (name, id(obj))
+        if self._running and self._running[-1] == key:
+            # an override calling the base class version of the method
+            return func(*args, **kwargs)
+
+        parent = self._current
+        phase = parent.child(name, _target_name(obj))
+        self._current = phase
+        self._running.append(key)
+        mem = _memory_usage()
+        start = time.time()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            phase.time += time.time() - start
+            phase.memory += _memory_usage() - mem
+            phase.calls += 1
+            self._running.pop()
+            self._current = parent
+
+    @property
+    def total_time(self):
+        """Total wall time of the top level phases."""
+        return sum([child.time for child in self.root.children])
+
+    def to_dict(self):
+        """Returns the recorded phases as a list of nested dicts, each
+        having keys 'name', 'target', 'calls', 'time' (seconds), 'memory'
+        (bytes) and 'children'.
+        """
+        return [child.to_dict() for child in self.root.children]
+
+    def save(self, filename):
+        """Save the recorded phases as JSON."""
+        with open(filename, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    def report(self, stream=sys.stdout, depth=None, min_time=0.0):
+        """Write a table of the recorded phases to `stream`, indented by
+        depth. Phases deeper than `depth` or taking less than `min_time`
+        seconds are left out.
+        """
+        stream.write('%-60s %6s %10s %10s\n'
+                     % ('phase [target]', 'calls', 'time (s)', 'mem (MB)'))
+
+        def _report(phase, level):
+            if depth is not None and level >= depth:
+                return
+            for child in phase.children:
+                if child.time < min_time:
+                    continue
+                label = '%s%s [%s]' % ('  '*level, child.name, child.target)
+                stream.write('%-60s %6d %10.4f %10.2f\n'
+                             % (label, child.calls, child.time,
+                                child.memory / 1048576.))
+                _report(child, level+1)
+
+        _report(self.root, 0)
+
+
+def profile_setup(top, inputs=None, outputs=None, drvname=None):
+    """Run the setup of the top level Assembly `top` and return the
+    :class:`SetupProfiler` holding the timing of its phases.
+    """
+    with SetupProfiler() as prof:
+        top._setup(inputs=inputs, outputs=outputs, drvname=drvname)
+    return prof
+
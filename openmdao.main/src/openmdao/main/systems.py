@@ -1,7 +1,11 @@
+import os
 import sys
+import heapq
 from StringIO import StringIO
 from collections import OrderedDict
 from itertools import chain
+from multiprocessing import Pool
+from multiprocessing.pool import ThreadPool
 
 import numpy
 import networkx as nx
@@ -24,7 +28,10 @@ from openmdao.main.depgraph import break_cycles, get_node_boundary, gsort, \
                                    collapse_nodes, simple_node_iter
 from openmdao.main.derivatives import applyJ, applyJT
 from openmdao.util.graph import base_var
-from openmdao.main.pseudocomp import PseudoComponent
+from openmdao.main.pseudocomp import PseudoComponent, UnitConversionPComp
+from openmdao.main.setup_profiler import setup_phase
+from openmdao.main.exec_profiler import exec_phase
+from openmdao.main import exec_profiler
 from openmdao.main.variable import Variable
 
 
@@ -41,6 +48,7 @@ class System(object):
         self.flat_vars = OrderedDict() # all vars used in vectors, whether they add to vector size or not
         self.noflat_vars = OrderedDict() # all vars that are not flattenable to float arrays (so are not part of vectors)
         self.vector_vars = OrderedDict() # all vars that contribute to the size of vectors
+        self.affine_vars = OrderedDict() # inputs set to scale*src+offset by our scatters (fused unit conversions)
 
         self._inputs = None
         self._outputs = None
@@ -270,7 +278,24 @@ class System(object):
 
         # ensure that args are in same order that they appear in
         # variables
-        return [a for a in self.variables.keys() if a in args]
+        return [a for a in self.variables.keys() if a in args] + \
+               self.affine_vars.keys()
+
+    def _get_affine_vars(self):
+        """Return a dict of subsystem input nodes that are fed by a fused
+        unit conversion from one of our variables, mapped to their
+        (src, scale, offset) tuple.
+        """
+        graph = self._reduced_graph
+        affine = OrderedDict()
+        for sub in self.simple_subsystems():
+            for node in sub._in_nodes:
+                if node in affine or node not in graph:
+                    continue
+                info = graph.node[node].get('affine')
+                if info is not None and info[0] in self.variables:
+                    affine[node] = info
+        return affine
 
     def get(self, name):
         return self.vec['u'][name]
@@ -422,6 +447,14 @@ class System(object):
     def get_req_cpus(self):
         return self.mpi.requested_cpus
 
+    def get_cost(self):
+        """Returns the estimated cost of one run of this system (None if
+        unknown) and the fraction of that cost that is divided among the
+        processors it gets.
+        """
+        return (None, 1.0)
+
+    @setup_phase
     def setup_variables(self, resid_state_map=None):
         self.variables = OrderedDict()
         if resid_state_map is None:
@@ -446,6 +479,8 @@ class System(object):
         #print "%s: my vars = %s" % (self.name, [(n,self.variables[n]['size']) for n in self.variables])
 
     def _create_var_dicts(self, resid_state_map):
+        self.affine_vars = self._get_affine_vars()
+
         # now figure out all of the inputs we 'own'
         self._owned_args = self._get_owned_args()
 
@@ -476,6 +511,7 @@ class System(object):
     def get_distrib_idxs(self, name):
         return self.get_src_idxs(name)
 
+    @setup_phase
     def setup_sizes(self):
         """Given a dict of variables, set the sizes for
         those that are local.
@@ -546,6 +582,7 @@ class System(object):
 
         self.input_sizes[rank] = insize[0]
 
+    @setup_phase
     def setup_vectors(self, arrays=None, state_resid_map=None):
         """Creates vector wrapper objects to manage local and
         distributed vectors need to solve the distributed system.
@@ -573,6 +610,9 @@ class System(object):
 
         start, end = 0, 0
         for sub in self.local_subsystems():
+            if isinstance(sub, SimpleSystem):
+                sub.set_input_source(self.vec['p'])
+
             sz = numpy.sum(sub.local_var_sizes[sub.mpi.rank, :])
             end += sz
             if end-start > arrays['u'][start:end].size:
@@ -602,6 +642,7 @@ class System(object):
 
         return self.vec
 
+    @exec_phase('scatter')
     def scatter(self, srcvecname, destvecname, subsystem=None):
         """ Perform data transfer (partial or full scatter or
         send/receive for data that isn't flattenable to a
@@ -801,6 +842,7 @@ class System(object):
             elif solver_choice == 'linear_gs':
                 self.ln_solver = LinearGS(self)
 
+    @exec_phase('linearize')
     def linearize(self):
         """ Linearize local subsystems. """
 
@@ -870,9 +912,12 @@ class System(object):
                                               return_format)
         return self.fd_solver.solve(iterbase=iterbase)
 
-    def calc_newton_direction(self, options=None, iterbase=''):
+    def calc_newton_direction(self, options=None, iterbase='',
+                              linearize=True, rtol=None):
         """ Solves for the new state in Newton's method and leaves it in the
-        df vector.
+        df vector. If linearize is False, the Jacobians from the last
+        linearization are reused. If rtol is given, the linear system is
+        only solved to that tolerance relative to the norm of the residual.
         """
 
         self.set_options('forward', options)
@@ -882,10 +927,12 @@ class System(object):
         self.vec['dp'].array[:] = 0.0
 
         self.initialize_gradient_solver()
-        self.linearize()
+        if linearize:
+            self.linearize()
 
         #print 'Newton Direction', self.vec['f'].array[:]
-        self.vec['df'].array[:] = -self.ln_solver.solve(self.vec['f'].array)
+        self.vec['df'].array[:] = -self.ln_solver.solve(self.vec['f'].array,
+                                                        rtol=rtol)
         #print 'Newton Solution', self.vec['df'].array[:]
 
     def solve_linear(self, options=None):
@@ -993,6 +1040,13 @@ class SimpleSystem(System):
         self._mapped_resids = {}
         self.distrib_idxs = {}
 
+        # used to skip execution when our inputs haven't changed
+        self._pvec = None
+        self._pvec_inputs = []
+        self._pvec_covered = set()
+        self._last_inputs = None
+
+    @setup_phase
     def setup_sizes(self):
         super(SimpleSystem, self).setup_sizes()
         if self.is_active():
@@ -1037,6 +1091,12 @@ class SimpleSystem(System):
     def simple_subsystems(self):
         yield self
 
+    def get_cost(self):
+        if self._comp is None:
+            return (0.0, 1.0)
+        return self._comp.get_cost()
+
+    @setup_phase
     def setup_communicators(self, comm):
         if self._comp:
             cpus, max_cpus = self._comp.get_req_cpus()
@@ -1155,9 +1215,58 @@ class SimpleSystem(System):
 
         super(SimpleSystem, self)._create_var_dicts(resid_state_map)
 
+    @setup_phase
     def setup_scatters(self):
         pass
 
+    def _get_affine_vars(self):
+        return OrderedDict()
+
+    def set_input_source(self, pvec):
+        """Set the p vector of our parent System, into which our flattenable
+        inputs are scattered before we run.
+        """
+        self._pvec = pvec
+        self._pvec_inputs = [n for n in self._in_nodes if n in pvec]
+        self._last_inputs = None
+
+        # names of our component's inputs that are fully set from pvec
+        prefix = self.name + '.'
+        self._pvec_covered = covered = set()
+        for node in self._pvec_inputs:
+            for dest in node[1] if isinstance(node, tuple) else (node,):
+                if dest.startswith(prefix):
+                    name = dest[len(prefix):]
+                    if '.' not in name and '[' not in name:
+                        covered.add(name)
+
+    def _inputs_unchanged(self):
+        """Returns a tuple (unchanged, snapshot), where unchanged is True if
+        our component has `skip_unchanged` set and none of its inputs have
+        changed since it last ran, and snapshot holds the current values of
+        its inputs in our parent's p vector.
+        """
+        comp = self._comp
+        if not getattr(comp, 'skip_unchanged', False) or \
+           self.complex_step is True or comp._new_config:
+            return False, None
+
+        pvec = self._pvec
+        if pvec is not None and self._pvec_inputs:
+            snapshot = numpy.concatenate([pvec[n] for n in self._pvec_inputs])
+        else:
+            snapshot = numpy.zeros(0)
+
+        # inputs set other than from pvec, e.g., unconnected or non-flat
+        # inputs, are tracked by the component.
+        changed = comp._changed_inputs.difference(self._pvec_covered)
+        comp._changed_inputs.clear()
+
+        unchanged = not changed and self._last_inputs is not None and \
+                    numpy.array_equal(snapshot, self._last_inputs)
+        return unchanged, snapshot
+
+    @exec_phase('run')
     def run(self, iterbase, case_label='', case_uuid=None):
 
         if self.is_active():
@@ -1165,7 +1274,14 @@ class SimpleSystem(System):
             graph = self.scope._reduced_graph
 
             self._comp.set_itername('%s-%s' % (iterbase, self.name))
-            self._comp.run(case_uuid=case_uuid)
+
+            unchanged, snapshot = self._inputs_unchanged()
+            if unchanged:
+                exec_profiler.count('skip', self._comp)
+            else:
+                self._last_inputs = None
+                self._comp.run(case_uuid=case_uuid)
+                self._last_inputs = snapshot
 
             # put component outputs in u vector
             vnames = [n for n in graph.successors(self.name)
@@ -1175,6 +1291,7 @@ class SimpleSystem(System):
             if self.complex_step is True:
                 self.vec['du'].set_from_scope_complex(self.scope, vnames)
 
+    @exec_phase('evaluate')
     def evaluate(self, iterbase, case_label='', case_uuid=None):
         """ Evalutes a component's residuals without invoking its
         internal solve (for implicit comps.)
@@ -1204,10 +1321,12 @@ class SimpleSystem(System):
         if 'dp' in self.vec:
             self.vec['dp'].array[:] = 0.0
 
+    @exec_phase('linearize')
     def linearize(self):
         """ Linearize this component. """
         self.J = self._comp.linearize(first=True)
 
+    @exec_phase('applyJ')
     def applyJ(self, variables):
         """ df = du - dGdp * dp or du = df and dp = -dGdp^T * df """
 
@@ -1266,19 +1385,23 @@ class SimpleSystem(System):
 class VarSystem(SimpleSystem):
     """Base class for a System that contains a single variable."""
 
+    @exec_phase('run')
     def run(self, iterbase, case_label='', case_uuid=None):
         #print "    runsys", str(self.name)
         pass
 
+    @exec_phase('evaluate')
     def evaluate(self, iterbase, case_label='', case_uuid=None):
         pass
 
+    @exec_phase('applyJ')
     def applyJ(self, variables):
         pass
 
     def stop(self):
         pass
 
+    @exec_phase('linearize')
     def linearize(self):
         pass
 
@@ -1294,6 +1417,7 @@ class OutVarSystem(VarSystem):
 class ParamSystem(VarSystem):
     """System wrapper for Assembly input variables (internal perspective)."""
 
+    @setup_phase
     def setup_variables(self, parent_vars, resid_state_map=None):
         super(ParamSystem, self).setup_variables(resid_state_map)
         to_remove = [v for v in self.variables if v in parent_vars]
@@ -1307,6 +1431,7 @@ class ParamSystem(VarSystem):
 
         #print "PARAM SYS",str(self.name),self.vector_vars.keys()
 
+    @exec_phase('applyJ')
     def applyJ(self, variables):
         """ Set to zero """
         system = None
@@ -1331,6 +1456,7 @@ class ParamSystem(VarSystem):
 class InVarSystem(VarSystem):
     """System wrapper for Assembly input variables (internal perspective)."""
 
+    @exec_phase('run')
     def run(self, iterbase, case_label='', case_uuid=None):
         if self.is_active():# and self.name in self.vector_vars:
             #print "    runsys", str(self.name)
@@ -1339,12 +1465,14 @@ class InVarSystem(VarSystem):
             if self.complex_step is True:
                 self.vec['du'].set_from_scope_complex(self.scope, self._nodes)
 
+    @exec_phase('evaluate')
     def evaluate(self, iterbase, case_label='', case_uuid=None):
         """ Evalutes a component's residuals without invoking its
         internal solve (for implicit comps.)
         """
         self.run(iterbase, case_label=case_label, case_uuid=case_uuid)
 
+    @exec_phase('applyJ')
     def applyJ(self, variables):
         """ Set to zero """
         # don't do anything if we don't own our output
@@ -1364,6 +1492,7 @@ class EqConstraintSystem(SimpleSystem):
     """A special system to handle mapping of states and
     residuals.
     """
+    @setup_phase
     def setup_variables(self, resid_state_map=None):
         super(EqConstraintSystem, self).setup_variables(resid_state_map)
 
@@ -1380,6 +1509,7 @@ class EqConstraintSystem(SimpleSystem):
             elif state_node == destnode:
                 break
 
+    @exec_phase('run')
     def run(self, iterbase, case_label='', case_uuid=None):
         if self.is_active():
             super(EqConstraintSystem, self).run(iterbase,
@@ -1395,6 +1525,7 @@ class EqConstraintSystem(SimpleSystem):
                 self.vec['f'][state][:] = \
                     -self._comp.get_flattened_value('out0').real
 
+    @exec_phase('evaluate')
     def evaluate(self, iterbase, case_label='', case_uuid=None):
         """ Evalutes a component's residuals without invoking its
         internal solve (for implicit comps.)
@@ -1410,19 +1541,23 @@ class AssemblySystem(SimpleSystem):
         self._provideJ_bounds = None
         self._nest_lin_solve = False
 
+    @setup_phase
     def setup_variables(self, resid_state_map=None):
         super(AssemblySystem, self).setup_variables(resid_state_map)
         self._comp.setup_variables()
 
+    @setup_phase
     def setup_sizes(self):
         super(AssemblySystem, self).setup_sizes()
         self._comp.setup_sizes()
 
+    @setup_phase
     def setup_vectors(self, arrays=None, state_resid_map=None):
         super(AssemblySystem, self).setup_vectors(arrays)
         # internal Assembly will create new vectors
         self._comp.setup_vectors(arrays)
 
+    @setup_phase
     def setup_scatters(self):
         self._comp.setup_scatters()
 
@@ -1455,6 +1590,7 @@ class AssemblySystem(SimpleSystem):
         for system in self.local_subsystems():
             system.clear_dp()
 
+    @exec_phase('linearize')
     def linearize(self):
         """ Calculates and saves the Jacobian for this subassy. """
 
@@ -1476,6 +1612,7 @@ class AssemblySystem(SimpleSystem):
         self.J = inner_system.calc_gradient(inputs=inputs, outputs=outputs,
                                             options=options)
 
+    @exec_phase('applyJ')
     def applyJ(self, variables):
         """ df = du - dGdp * dp or du = df and dp = -dGdp^T * df """
 
@@ -1615,6 +1752,9 @@ class CompoundSystem(System):
             for sub in s.simple_subsystems():
                 yield sub
 
+    def get_cost(self):
+        return _combine_costs([s.get_cost() for s in self.all_subsystems()])
+
     def pre_run(self):
         for s in self.local_subsystems():
             s.pre_run()
@@ -1695,6 +1835,29 @@ class CompoundSystem(System):
 
         return (None, None, None)
 
+    def _get_affine_idxs(self, node, arg_idxs, dest_start):
+        """Return (src_idxs, dest_idxs) for a fused unit conversion
+        into the given input node.
+        """
+        if node not in self.vec['p'] or self.vec['p'][node].size == 0:
+            return (None, None)
+
+        src = self.affine_vars[node][0]
+        varkeys = self.vector_vars.keys()
+        if src in self.vector_vars:
+            isrc = varkeys.index(src)
+            src_idxs = numpy.sum(self.local_var_sizes[:, :isrc]) + arg_idxs
+        else:  # duped subvar
+            base = self.scope.name2collapsed[src[0].split('[', 1)[0]]
+            isrc = varkeys.index(base)
+            src_idxs = numpy.sum(self.local_var_sizes[:, :isrc]) + \
+                          self.scope._var_meta[src]['flat_idx']
+
+        dest_idxs = dest_start + self.vec['p']._info[node].start + \
+                    make_idx_array(0, len(src_idxs))
+        return (src_idxs, dest_idxs)
+
+    @setup_phase
     def setup_scatters(self):
         """ Defines scatters for args at this system's level """
         if not self.is_active():
@@ -1712,6 +1875,7 @@ class CompoundSystem(System):
         dest_rev_full = []
         dest_rev = []
         src_rev = []
+        affine_full = []
         scatter_conns_rev_full = set()
         scatter_conns_full = set()
         noflat_conns_full = set()
@@ -1726,14 +1890,33 @@ class CompoundSystem(System):
             dest_partial = []
             src_rev_partial = []
             dest_rev_partial = []
+            affine_partial = []
             scatter_conns = set()
             scatter_conns_rev = set()
             noflat_conns = set()  # non-flattenable vars
             for sub in subsystem.simple_subsystems():
-                for node in self.variables:
+                for node in chain(self.variables, self.affine_vars):
                     if node not in sub._in_nodes or node in scatter_conns:
                         continue
                     arg_idxs = sub.get_distrib_idxs(node)
+
+                    if node in self.affine_vars:
+                        src_idxs, dest_idxs = self._get_affine_idxs(node,
+                                                                    arg_idxs,
+                                                                    dest_start)
+                        if src_idxs is None:
+                            continue
+                        _, scale, offset = self.affine_vars[node]
+                        affine = (src_idxs, dest_idxs, scale, offset)
+                        affine_partial.append(affine)
+                        scatter_conns_rev.add(node)
+                        if node not in scatter_conns_full:
+                            affine_full.append(affine)
+                            scatter_conns_rev_full.add(node)
+                        scatter_conns.add(node)
+                        scatter_conns_full.add(node)
+                        continue
+
                     src_idxs, dest_idxs, nflat = self._get_scatter_idxs(node, noflats,
                                                                         arg_idxs, dest_start,
                                                                         destsys=subsystem)
@@ -1781,25 +1964,30 @@ class CompoundSystem(System):
             if MPI or scatter_conns or noflat_conns:
                 subsystem.scatter_partial = DataTransfer(self, src_partial,
                                                          dest_partial,
-                                                         scatter_conns, noflat_conns)
+                                                         scatter_conns, noflat_conns,
+                                                         affine_partial)
 
             # special partial reverse scatter for adjoint linearGS
             if scatter_conns_rev:
                 subsystem.scatter_partial_rev = DataTransfer(self, src_rev_partial,
                                                              dest_rev_partial,
-                                                             scatter_conns_rev, set())
+                                                             scatter_conns_rev, set(),
+                                                             affine_partial)
 
         if MPI or scatter_conns_full or noflat_conns_full:
             self.scatter_full = DataTransfer(self, src_full, dest_full,
-                                             scatter_conns_full, noflat_conns_full)
+                                             scatter_conns_full, noflat_conns_full,
+                                             affine_full)
 
         if scatter_conns_rev_full:
             self.scatter_rev_full = DataTransfer(self, src_rev_full, dest_rev_full,
-                                                 scatter_conns_rev_full, [])
+                                                 scatter_conns_rev_full, [],
+                                                 affine_full)
 
         for sub in self.local_subsystems():
             sub.setup_scatters()
 
+    @exec_phase('applyJ')
     def applyJ(self, variables):
         """ Delegate to subsystems """
 
@@ -1929,6 +2117,7 @@ class SerialSystem(CompoundSystem):
 
         return self.mpi.requested_cpus
 
+    @exec_phase('run')
     def run(self, iterbase, case_label='', case_uuid=None):
         if self.is_active():
             #print "    runsys", str(self.name)
@@ -1945,6 +2134,7 @@ class SerialSystem(CompoundSystem):
                 if self._stop:
                     raise RunStopped('Stop requested')
 
+    @exec_phase('evaluate')
     def evaluate(self, iterbase, case_label='', case_uuid=None):
         """ Evalutes a component's residuals without invoking its
         internal solve (for implicit comps.)
@@ -1959,6 +2149,7 @@ class SerialSystem(CompoundSystem):
                 if self._stop:
                     raise RunStopped('Stop requested')
 
+    @setup_phase
     def setup_communicators(self, comm):
         self._local_subsystems = []
 
@@ -1977,8 +2168,35 @@ class SerialSystem(CompoundSystem):
             if sub.is_active():
                 self._local_subsystems.append(sub)
 
+# ParallelSystem whose subsystems are run by the 'processes' backend. It's
+# only set while the worker processes are being forked.
+_forked_system = None
+
+
+def _run_forked(args):
+    """Run a subsystem of `_forked_system` in a forked worker process and
+    return its u vector and the values of its non-flattenable outputs.
+    """
+    idx, iterbase, case_label, case_uuid = args
+    system = _forked_system
+    sub = list(system.local_subsystems())[idx]
+    sub.run(iterbase, case_label=case_label, case_uuid=case_uuid)
+    noflats = [(node[0], system.scope.get_attr_w_copy(node[0]))
+               for node in sub.noflat_vars if node in sub._out_nodes]
+    return sub.vec['u'].array.copy(), noflats
+
+
 class ParallelSystem(CompoundSystem):
 
+    def __init__(self, scope, graph, subg, name=None):
+        super(ParallelSystem, self).__init__(scope, graph, subg, name)
+
+        # how our subsystems are run when not under MPI: 'serial',
+        # 'threads' or 'processes', and the max number of workers to use
+        # (0 means one per subsystem).
+        self.backend = 'serial'
+        self.workers = 0
+
     def get_req_cpus(self):
         cpus = []
         for sub in self.all_subsystems():
@@ -1997,6 +2215,7 @@ class ParallelSystem(CompoundSystem):
 
         return self.mpi.requested_cpus
 
+    @exec_phase('run')
     def run(self, iterbase, case_label='', case_uuid=None):
         # don't scatter unless we contain something that's actually
         # going to run
@@ -2011,9 +2230,19 @@ class ParallelSystem(CompoundSystem):
         #print "POST - scatter for %s" % self.name
         #self.dump_vars()
 
-        for sub in self.local_subsystems():
-            sub.run(iterbase, case_label=case_label, case_uuid=case_uuid)
+        subs = list(self.local_subsystems())
+        if MPI or len(subs) < 2 or self.backend == 'serial':
+            for sub in subs:
+                sub.run(iterbase, case_label=case_label, case_uuid=case_uuid)
+        elif self.backend == 'threads':
+            self._run_threads(subs, 'run', iterbase, case_label, case_uuid)
+        elif self.backend == 'processes':
+            self._run_processes(subs, iterbase, case_label, case_uuid)
+        else:
+            raise ValueError("%s: unknown parallel backend '%s'"
+                             % (self.name, self.backend))
 
+    @exec_phase('evaluate')
     def evaluate(self, iterbase, case_label='', case_uuid=None):
         """ Evalutes a component's residuals without invoking its
         internal solve (for implicit comps.)
@@ -2023,49 +2252,114 @@ class ParallelSystem(CompoundSystem):
 
         self.scatter('u', 'p')
 
-        for sub in self.local_subsystems():
-            sub.evaluate(iterbase, case_label=case_label, case_uuid=case_uuid)
+        subs = list(self.local_subsystems())
+        if not MPI and len(subs) > 1 and self.backend == 'threads':
+            self._run_threads(subs, 'evaluate', iterbase, case_label,
+                              case_uuid)
+        else:
+            for sub in subs:
+                sub.evaluate(iterbase, case_label=case_label,
+                             case_uuid=case_uuid)
+
+    def _num_workers(self, nsubs):
+        if self.workers > 0:
+            return min(self.workers, nsubs)
+        return nsubs
+
+    def _run_threads(self, subs, method, iterbase, case_label, case_uuid):
+        """Call `method` of each of our subsystems in a pool of threads.
+        This only helps when the subsystems release the GIL, for example
+        while waiting on external processes.
+        """
+        pool = ThreadPool(self._num_workers(len(subs)))
+        try:
+            results = [pool.apply_async(getattr(sub, method), (iterbase,),
+                                        dict(case_label=case_label,
+                                             case_uuid=case_uuid))
+                       for sub in subs]
+            for result in results:
+                result.get()
+        finally:
+            pool.close()
+            pool.join()
+
+    def _run_processes(self, subs, iterbase, case_label, case_uuid):
+        """Run each of our subsystems in a forked process. The workers are
+        forked after our scatter, so they see the current inputs of our
+        subsystems, and the u vector and non-flattenable outputs of each
+        subsystem are sent back and set into our scope. Other side effects
+        of running the subsystems, like changes to execution counts or
+        case recording, are lost.
+        """
+        global _forked_system
+        if not hasattr(os, 'fork'):
+            raise RuntimeError("%s: the 'processes' parallel backend requires"
+                               " os.fork" % self.name)
 
+        _forked_system = self
+        try:
+            pool = Pool(self._num_workers(len(subs)))
+        finally:
+            _forked_system = None
+
+        try:
+            results = pool.map(_run_forked,
+                               [(i, iterbase, case_label, case_uuid)
+                                for i in range(len(subs))])
+        except Exception:
+            pool.terminate()
+            raise
+        else:
+            pool.close()
+        finally:
+            pool.join()
+
+        for sub, (u, noflats) in zip(subs, results):
+            uvec = sub.vec['u']
+            uvec.array[:] = u
+            uvec.set_to_scope(self.scope)
+            for name, val in noflats:
+                self.scope.set(name, val)
+
+    @setup_phase
     def setup_communicators(self, comm):
         self.mpi.comm = comm
+
+        if MPI is None:
+            # all of our subsystems are local
+            self._local_subsystems = []
+            for sub in self.all_subsystems():
+                sub._parent_system = self
+                sub.setup_communicators(comm)
+                self._local_subsystems.append(sub)
+            return
+
         size = comm.size
         rank = comm.rank
 
         subsystems = []
         requested_procs = []
         max_req_procs = []
+        costs = []
         for system in self.all_subsystems():
             subsystems.append(system)
             mincpu, maxcpu = system.get_req_cpus()
             assert(mincpu > 0)
             requested_procs.append(mincpu)
             max_req_procs.append(maxcpu)
-
-        assigned_procs = [0]*len(requested_procs)
-
-        assigned = 0
-
-        requested = sum(requested_procs)
+            costs.append(system.get_cost())
 
         mn, mx = self.get_req_cpus()
         if mx is None:
             limit = size
-            max_requested = size
         else:
-            max_requested = sum(max_req_procs)
-            limit = min(size, max_requested)
-
-        # first, just use simple round robin assignment of requested CPUs
-        # until everybody has what they asked for or we run out
-        if requested:
-            while assigned < limit:
-                for i, system in enumerate(subsystems):
-                    if max_req_procs[i] is None or \
-                                   assigned_procs[i] < max_req_procs[i]:
-                        assigned_procs[i] += 1
-                        assigned += 1
-                        if assigned == limit:
-                            break
+            limit = min(size, sum(max_req_procs))
+
+        # assign processors to minimize the predicted time of the
+        # slowest subsystem, based on their costs
+        assigned_procs = assign_procs(limit, requested_procs, max_req_procs,
+                                      costs)
+        assigned = sum(assigned_procs)
 
         self._local_subsystems = []
 
@@ -2096,8 +2390,12 @@ class ParallelSystem(CompoundSystem):
             sub._parent_system = self
             sub.setup_communicators(sub_comm)
 
+    @setup_phase
     def setup_variables(self, resid_state_map=None):
         """ Determine variables from local subsystems """
+        if MPI is None:
+            return super(ParallelSystem, self).setup_variables(resid_state_map)
+
         varmeta = self.scope._var_meta
         self.variables = OrderedDict()
         if not self.is_active():
@@ -2230,18 +2528,22 @@ class OpaqueSystem(SimpleSystem):
     def _all_comp_nodes(self, local=False):
         return self._inner_system._all_comp_nodes(local=local)
 
+    @setup_phase
     def setup_communicators(self, comm):
         self.mpi.comm = comm
         self._inner_system.setup_communicators(comm)
 
+    @setup_phase
     def setup_variables(self, resid_state_map=None):
         super(OpaqueSystem, self).setup_variables(resid_state_map)
         self._inner_system.setup_variables()
 
+    @setup_phase
     def setup_sizes(self):
         super(OpaqueSystem, self).setup_sizes()
         self._inner_system.setup_sizes()
 
+    @setup_phase
     def setup_vectors(self, arrays=None, state_resid_map=None):
         super(OpaqueSystem, self).setup_vectors(arrays)
         # internal system will create new vectors
@@ -2260,6 +2562,7 @@ class OpaqueSystem(SimpleSystem):
         """
         return self._inner_system.get_distrib_idxs(name)
 
+    @setup_phase
     def setup_scatters(self):
         self._inner_system.setup_scatters()
 
@@ -2273,6 +2576,7 @@ class OpaqueSystem(SimpleSystem):
     def pre_run(self):
         self._inner_system.pre_run()
 
+    @exec_phase('run')
     def run(self, iterbase, case_label='', case_uuid=None):
         if not self.is_active() or not self._inner_system.is_active():
             return
@@ -2300,12 +2604,14 @@ class OpaqueSystem(SimpleSystem):
                 if self.complex_step is True:
                     self_du[name][:] = inner_du[name]
 
+    @exec_phase('evaluate')
     def evaluate(self, iterbase, case_label='', case_uuid=None):
         """ Evalutes a component's residuals without invoking its
         internal solve (for implicit comps.)
         """
         self.run(iterbase, case_label=case_label, case_uuid=case_uuid)
 
+    @exec_phase('linearize')
     def linearize(self):
         """Do a finite difference on the inner system to calculate a
         Jacobian.
@@ -2342,6 +2648,9 @@ class OpaqueSystem(SimpleSystem):
     def get_req_cpus(self):
         return self._inner_system.get_req_cpus()
 
+    def get_cost(self):
+        return self._inner_system.get_cost()
+
     def find_system(self, name, recurse_subassy=True):
         """ Return system with given name. """
 
@@ -2378,6 +2687,7 @@ class DriverSystem(SimpleSystem):
         for s in self.local_subsystems():
             s.pre_run()
 
+    @setup_phase
     def setup_variables(self, resid_state_map=None):
         super(DriverSystem, self).setup_variables(resid_state_map)
         # calculate relevant vars for GMRES mult
@@ -2407,6 +2717,7 @@ class DriverSystem(SimpleSystem):
             idx = self._comp.workflow._system.get_distrib_idxs(name)
         return idx
 
+    @setup_phase
     def setup_scatters(self):
         self._comp.setup_scatters()
 
@@ -2447,6 +2758,7 @@ class TransparentDriverSystem(DriverSystem):
         """
         return {}
 
+    @setup_phase
     def setup_variables(self, resid_state_map=None):
         # pass our resid_state_map to our children
         local_resid_map = self._get_resid_state_map()
@@ -2457,6 +2769,7 @@ class TransparentDriverSystem(DriverSystem):
                 resid_state_map[key] = value
         super(TransparentDriverSystem, self).setup_variables(resid_state_map)
 
+    @setup_phase
     def setup_communicators(self, comm):
         """ Special case if Driver is not base driver """
 
@@ -2467,6 +2780,7 @@ class TransparentDriverSystem(DriverSystem):
             self._comp.workflow._system.setup_communicators(comm)
             self._comp.workflow.mpi.comm = comm
 
+    @exec_phase('evaluate')
     def evaluate(self, iterbase, case_label='', case_uuid=None):
         """ Evalutes a component's residuals without invoking its
         internal solve (for implicit comps.)
@@ -2487,6 +2801,7 @@ class TransparentDriverSystem(DriverSystem):
         for system in self.local_subsystems():
             system.clear_dp()
 
+    @exec_phase('applyJ')
     def applyJ(self, variables):
         """ Delegate to subsystems """
 
@@ -2502,6 +2817,7 @@ class TransparentDriverSystem(DriverSystem):
             if self.mode == 'adjoint':
                 self.scatter('du', 'dp')
 
+    @exec_phase('linearize')
     def linearize(self):
         """ Solvers must Linearize all of their subsystems. """
 
@@ -2727,6 +3043,55 @@ def collapse_to_system_node(G, system, name):
     collapse_nodes(G, name, name)
     return G
 
+def fuse_unit_conversions(scope, graph, cgraph):
+    """Remove UnitConversionPComps from the given reduced graph and
+    component graph. The output node of each removed pseudocomp is
+    connected directly to its input node and tagged with the affine
+    (scale, offset) pair for the conversion, which is then applied as
+    part of the scatter rather than by a separate System.
+    """
+    # PETSc scatters can't scale the data they move
+    if MPI:
+        return
+
+    for cname in cgraph.nodes():
+        if not isinstance(cname, basestring):
+            continue
+        comp = getattr(scope, cname, None)
+        if not isinstance(comp, UnitConversionPComp) or \
+           comp._meta['in0'].get('noflat'):
+            continue
+
+        ins = graph.predecessors(cname)
+        outs = graph.successors(cname)
+        if len(ins) != 1 or len(outs) != 1:
+            continue
+        src, dest = ins[0], outs[0]
+
+        dests = graph.successors(dest)
+        if not dests or not all(graph.node[d].get('comp') for d in dests):
+            continue
+
+        scale, offset = comp.get_affine()
+
+        graph.remove_node(cname)
+        graph.add_edge(src, dest)
+        # don't modify metadata shared with the parent graph
+        graph.node[dest] = graph.node[dest].copy()
+        graph.node[dest]['affine'] = (src, scale, offset)
+
+        preds = cgraph.predecessors(cname)
+        succs = cgraph.successors(cname)
+        cgraph.remove_node(cname)
+        for p in preds:
+            for s in succs:
+                if p == s:
+                    continue
+                if cgraph.has_edge(p, s):
+                    cgraph[p][s].setdefault('varconns', []).append(dest)
+                else:
+                    cgraph.add_edge(p, s, varconns=[dest])
+
 def get_branch(g, node, visited=None):
     """Return the full list of nodes that branch *exclusively*
     from the given node.  The starting node is included in
@@ -2744,6 +3109,75 @@ def get_branch(g, node, visited=None):
             branch.extend(get_branch(g, succ, visited))
     return branch
 
+def _combine_costs(costs):
+    """Returns the (cost, parallel_fraction) of running the systems with
+    the given costs one after the other. The cost is None if none of the
+    costs are known.
+    """
+    known = [(cost, frac) for cost, frac in costs if cost is not None]
+    if not known:
+        return (None, 1.0)
+    total = sum([cost for cost, frac in known])
+    if total <= 0.0:
+        return (total, 1.0)
+    return (total, float(sum([cost*frac for cost, frac in known])) / total)
+
+def assign_procs(nprocs, min_procs, max_procs, costs):
+    """Returns the number of processors to give to each of a group of
+    systems that run concurrently, using at most `nprocs` processors.
+
+    Each system gets at least its entry in `min_procs` (while processors
+    last) and no more than its entry in `max_procs` (None for no limit).
+    Remaining processors are handed out one at a time to the system with
+    the longest predicted run time that would get faster, so that the
+    predicted time of the slowest system (the makespan) is minimized.
+    Processors that can't make any system faster go to the slowest
+    systems that can still take them.
+
+    The predicted time of a system with (cost, parallel_fraction) in
+    `costs` on n processors follows Amdahl's law::
+
+        cost * ((1 - parallel_fraction) + parallel_fraction / n)
+
+    Unknown (None) costs are taken to be the mean of the known nonzero
+    costs, so with no costs at all the processors are shared evenly.
+    """
+    known = [cost for cost, frac in costs if cost]
+    default = float(sum(known)) / len(known) if known else 1.0
+    costs = [(default if cost is None else cost, frac)
+             for cost, frac in costs]
+
+    def predicted(i, n):
+        cost, frac = costs[i]
+        return cost * ((1.0 - frac) + float(frac) / n)
+
+    assigned = []
+    avail = nprocs
+    for mincpu in min_procs:
+        n = min(mincpu, avail)
+        assigned.append(n)
+        avail -= n
+
+    if avail <= 0 or 0 in assigned:
+        return assigned
+
+    def key(i):
+        n = assigned[i]
+        time = predicted(i, n)
+        return (predicted(i, n+1) >= time, -time, i)
+
+    heap = [key(i) for i in range(len(assigned))
+            if max_procs[i] is None or assigned[i] < max_procs[i]]
+    heapq.heapify(heap)
+    while avail > 0 and heap:
+        i = heapq.heappop(heap)[2]
+        assigned[i] += 1
+        avail -= 1
+        if max_procs[i] is None or assigned[i] < max_procs[i]:
+            heapq.heappush(heap, key(i))
+
+    return assigned
+
 def get_comm_if_active(obj, comm):
     if comm is None or comm == MPI.COMM_NULL:
         return comm
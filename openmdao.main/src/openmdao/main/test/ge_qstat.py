@@ -0,0 +1,16 @@
+"""
+Fake 'qstat' for testing.
+"""
+
+import sys
+
+
+def main():
+    # Fake 'qsub' runs jobs to completion, so no job exists.
+    print 'Following jobs do not exist:'
+    print sys.argv[-1]
+    sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -2,6 +2,7 @@
 Fake 'qsub' for testing.
 """
 
+import os
 import subprocess
 import sys
 
@@ -13,6 +14,7 @@ def main():
     stdout = 'qsub.stdout'
     stderr = 'qsub.stderr'
     join_eo = False
+    tasks = None
 
     print ' '.join(sys.argv[1:])
 
@@ -20,8 +22,12 @@ def main():
     while i < len(sys.argv):
         opt = sys.argv[i]
         i += 1
-        if opt in ('-V', '-cwd', '-h'):
+        if opt in ('-V', '-cwd', '-h', '-terse'):
             print opt
+        elif opt == '-t':
+            tasks = sys.argv[i]
+            i += 1
+            print opt, 'tasks', tasks
         elif opt in ('-sync', '-b', '-N', '-wd', '-M', '-m', '-a', '-dl',
                      '-r', '-ar', '-q', '-p', '-A', '-ac'):
             arg = sys.argv[i]
@@ -71,9 +77,18 @@ def main():
     else:
         err = open(stderr, 'w')
 
-    retcode = subprocess.call(cmdlist, stdin=inp, stdout=out, stderr=err,
-                              shell=sys.platform=='win32')
-    sys.exit(retcode)
+    if tasks is None:
+        retcode = subprocess.call(cmdlist, stdin=inp, stdout=out, stderr=err,
+                                  shell=sys.platform=='win32')
+        sys.exit(retcode)
+
+    # Run array tasks in sequence and report job id.
+    first, last = [int(index) for index in tasks.split('-')]
+    env = os.environ.copy()
+    for index in range(first, last+1):
+        env['SGE_TASK_ID'] = str(index)
+        subprocess.call(cmdlist, stdin=inp, stdout=out, stderr=err, env=env)
+    print '%d.%s:1' % (os.getpid(), tasks)
 
 
 if __name__ == '__main__':
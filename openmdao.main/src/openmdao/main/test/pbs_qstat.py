@@ -0,0 +1,15 @@
+"""
+Fake 'qstat' for testing.
+"""
+
+import sys
+
+
+def main():
+    # Fake 'qsub' runs jobs to completion, so no job exists.
+    print 'qstat: Unknown Job Id %s' % sys.argv[-1]
+    sys.exit(153)
+
+
+if __name__ == '__main__':
+    main()
@@ -2,6 +2,7 @@
 Fake 'qsub' for testing.
 """
 
+import os
 import subprocess
 import sys
 
@@ -9,18 +10,24 @@ import sys
 def main():
     cmd = 'no-cmd-set'
     args = []
+    tasks = None
     print ' '.join(sys.argv[1:])
 
     i = 1
     while i < len(sys.argv):
         opt = sys.argv[i]
         i += 1
-        if opt in ('-V',):
+        if opt in ('-V', '-h'):
             print opt
-        elif opt in ('-j', '-C', '-S', '-W'):
+        elif opt in ('-j', '-C', '-S', '-W', '-o', '-r', '-l', '-M',
+                     '-m', '-q', '-p', '-a'):
             arg = sys.argv[i]
             i += 1
             print opt, 'arg', arg
+        elif opt == '-J':
+            tasks = sys.argv[i]
+            i += 1
+            print opt, 'tasks', tasks
         else:
             cmd = opt
             args = sys.argv[i:]
@@ -30,8 +37,20 @@ def main():
     cmdlist.extend(args)
     print ' '.join(cmdlist)
 
-    retcode = subprocess.call(cmdlist, shell=True)
-    sys.exit(retcode)
+    if '-W' in sys.argv and 'block=true' in sys.argv:
+        retcode = subprocess.call(cmdlist, shell=True)
+        sys.exit(retcode)
+
+    # Run job (or array tasks) in sequence and report job id.
+    first, last = [int(index) for index in (tasks or '1-1').split('-')]
+    env = os.environ.copy()
+    with open(os.devnull, 'w') as out:
+        for index in range(first, last+1):
+            if tasks is not None:
+                env['PBS_ARRAY_INDEX'] = str(index)
+            subprocess.call(cmdlist, stdout=out, stderr=subprocess.STDOUT,
+                            env=env)
+    print '%d[].fake' % os.getpid()
 
 
 if __name__ == '__main__':
@@ -0,0 +1,43 @@
+"""
+Model shared by the tests of the execution and setup profilers.
+"""
+
+import numpy
+
+from openmdao.main.api import Assembly, Component, set_as_top
+from openmdao.main.datatypes.api import Float
+
+
+class Simple(Component):
+    x = Float(iotype='in')
+    y = Float(iotype='out')
+
+    def execute(self):
+        self.y = 2.0 * self.x
+
+    def provideJ(self):
+        return numpy.array([[2.0]])
+
+    def list_deriv_vars(self):
+        return ('x',), ('y',)
+
+
+class Sub(Assembly):
+
+    def configure(self):
+        self.add('c1', Simple())
+        self.driver.workflow.add('c1')
+        self.create_passthrough('c1.x')
+        self.create_passthrough('c1.y')
+
+
+def build():
+    """Returns a top Assembly running a subassembly 'sub' holding 'c1',
+    followed by 'c2', with c2.x = 2*sub.x.
+    """
+    top = set_as_top(Assembly())
+    top.add('sub', Sub())
+    top.add('c2', Simple())
+    top.connect('sub.y', 'c2.x')
+    top.driver.workflow.add(['sub', 'c2'])
+    return top
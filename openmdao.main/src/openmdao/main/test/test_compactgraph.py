@@ -0,0 +1,69 @@
+import unittest
+
+from openmdao.main.compactgraph import COMP, VAR, SUBVAR, INPUT, OUTPUT, \
+                                       BOUNDARY, CONN
+from openmdao.main.depgraph import list_data_connections
+from openmdao.main.test.test_depgraph import _make_graph
+
+
+class CompactGraphTestCase(unittest.TestCase):
+
+    def setUp(self):
+        conns = [
+            ('A.c[2]', 'B.a'),
+            ('A.d', 'B.b'),
+            ('a', 'A.a'),
+            ('B.c', 'c'),
+        ]
+        self.dep, self.scope = _make_graph(['A', 'B', 'C'],
+                                           [('a', 'in'), ('c', 'out')],
+                                           conns)
+
+    def test_kinds(self):
+        cg = self.dep.compact()
+        ids = cg.ids
+
+        self.assertEqual(set(cg.to_names(cg.nodes_of_kind(COMP))),
+                         set(['A', 'B', 'C']))
+        self.assertEqual(set(cg.to_names(cg.nodes_of_kind(BOUNDARY))),
+                         set(['a', 'c']))
+        self.assertTrue(cg.kinds[ids['A.c[2]']] & SUBVAR)
+        self.assertTrue(cg.kinds[ids['B.a']] & VAR)
+        self.assertTrue(cg.kinds[ids['B.a']] & INPUT)
+        self.assertTrue(cg.kinds[ids['B.c']] & OUTPUT)
+
+        self.assertEqual(cg.base[ids['A.c[2]']], ids['A.c'])
+        self.assertEqual(cg.base[ids['A.c']], ids['A.c'])
+        self.assertEqual(cg.base[ids['A']], -1)
+        self.assertEqual(cg.owner[ids['A.c[2]']], ids['A'])
+        self.assertEqual(cg.owner[ids['a']], ids['a'])
+
+    def test_adjacency(self):
+        cg = self.dep.compact()
+        for i, name in enumerate(cg.names):
+            self.assertEqual(sorted(cg.to_names(cg.successors(i))),
+                             sorted(self.dep.successors(name)))
+            self.assertEqual(sorted(cg.to_names(cg.predecessors(i))),
+                             sorted(self.dep.predecessors(name)))
+
+        srcs, dests = cg.edges_of_kind(CONN)
+        self.assertEqual(sorted(zip(cg.to_names(srcs), cg.to_names(dests))),
+                         sorted(list_data_connections(self.dep)))
+
+    def test_cache(self):
+        cg = self.dep.compact()
+        self.assertTrue(self.dep.compact() is cg)
+        self.dep.connect(self.scope, 'A.d', 'C.a')
+        self.assertFalse(self.dep.compact() is cg)
+        self.assertEqual(sorted(self.dep.component_graph().edges()),
+                         [('A', 'B'), ('A', 'C')])
+
+    def test_prune_unconnected_vars(self):
+        self.dep.prune_unconnected_vars()
+        self.assertEqual(set(self.dep.nodes()),
+                         set(['A', 'B', 'C', 'a', 'c', 'A.a', 'A.c',
+                              'A.c[2]', 'A.d', 'B.a', 'B.b', 'B.c']))
+
+
+if __name__ == "__main__":
+    unittest.main()
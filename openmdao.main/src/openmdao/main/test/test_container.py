@@ -7,6 +7,8 @@ import StringIO
 import nose
 import copy
 
+import numpy
+
 from traits.api import HasTraits
 
 from openmdao.util import eggsaver as constants
@@ -16,7 +18,8 @@ from openmdao.main.container import Container, \
                                     create_io_traits
 from openmdao.main.uncertain_distributions import NormalDistribution
 from openmdao.main.variable import Variable
-from openmdao.main.datatypes.api import Instance, Float, Int, Bool, List, Dict
+from openmdao.main.datatypes.api import Array, Instance, Float, Int, Bool, \
+                                          List, Dict
 from openmdao.util.testutil import make_protected_dir, assert_raises
 
 # Various Pickle issues arise only when this test runs as the main module.
@@ -236,6 +239,28 @@ class ContainerTestCase(unittest.TestCase):
         num = self.root.get('c2.c22.c221.number')
         self.assertEqual(num, 3.14)
 
+    def test_get_set_many(self):
+        self.root.c2.c21.add('arr', Array(numpy.zeros((2, 2)), iotype='in'))
+        self.root.set_many([('c2.c22.c221.number', 2.5),
+                            ('c2.c21.arr', numpy.ones((2, 2)))])
+        self.assertEqual(self.root.get_many(['c2.c22.c221.number',
+                                             'c2.c21.arr[1][0]']),
+                         [2.5, 1.0])
+
+        paths = ['c2.c21.arr', 'c2.c22.c221.number']
+        self.assertEqual(list(self.root.get_flattened_values(paths)),
+                         [1.0, 1.0, 1.0, 1.0, 2.5])
+        self.assertEqual(self.root.get_flattened_values([]).size, 0)
+        self.root.set_flattened_values(paths, numpy.arange(5.0))
+        self.assertEqual(self.root.c2.c22.c221.number, 4.0)
+        self.assertEqual(self.root.c2.c21.arr.tolist(),
+                         [[0.0, 1.0], [2.0, 3.0]])
+
+        assert_raises(self, "self.root.set_flattened_values(paths,"
+                            " numpy.arange(4.0))",
+                      globals(), locals(), ValueError,
+                      ": size mismatch: 4 values for paths of total size 5")
+
     def test_add_trait_w_subtrait(self):
         obj = Container()
         obj.add('lst', List([1, 2, 3], iotype='in'))
@@ -143,6 +143,27 @@ class DepGraphTestCase(unittest.TestCase):
         neworder = gsort(cgraph, order)
         self.assertEqual(neworder, ['A','B','C','D'])
 
+    def test_sorting_cycle(self):
+        g = nx.DiGraph([('A','B'), ('B','C'), ('C','B'), ('C','D')])
+        self.assertEqual(gsort(g, ['D','C','A','B']), ['A','C','B','D'])
+        self.assertEqual(gsort(g, ['B','C']), ['B','C'])
+
+        # sorting results cached on the graph are thrown away when the
+        # graph changes
+        self.assertEqual(gsort(self.dep, ['C','A']), ['A','C'])
+        self.dep.add_edge('C', 'A')
+        self.assertEqual(gsort(self.dep, ['C','A']), ['C','A'])
+
+    def test_relevant_subgraph(self):
+        nodes = set(self.dep.nodes())
+        edges = set(self.dep.edges())
+        sub = self.dep.relevant_subgraph(['a'], ['c', 'A.c[1]'])
+        for node in ('a', 'A', 'B', 'C', 'c', 'A.c[1]'):
+            self.assertTrue(node in sub)
+        self.assertTrue(sub.has_edge('A', 'A.c[1]'))
+        self.assertEqual(set(self.dep.nodes()), nodes)
+        self.assertEqual(set(self.dep.edges()), edges)
+
 
     def test_add(self):
         for name in self.comps:
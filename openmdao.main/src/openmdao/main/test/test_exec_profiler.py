@@ -0,0 +1,82 @@
+import json
+import os
+import tempfile
+import unittest
+from StringIO import StringIO
+
+from openmdao.main.exec_profiler import ExecProfiler
+from openmdao.main.test.profmodel import build
+
+
+class _Comm(object):
+    """Stands in for an MPI communicator of two identical processes."""
+
+    def allgather(self, data):
+        return [data, data]
+
+
+class ExecProfilerTestCase(unittest.TestCase):
+
+    def test_counters(self):
+        top = build()
+        top.sub.x = 1.0
+        with ExecProfiler(size=2) as prof:
+            top.run()
+            top.run()
+            top.driver.calc_gradient(['sub.x'], ['c2.y'])
+        top.run()
+
+        data = prof.to_dict()
+        self.assertEqual(data['c2']['execute']['calls'], 2)
+        self.assertEqual(data['sub.c1']['execute']['calls'], 2)
+        self.assertEqual(data['sub']['execute']['calls'], 2)
+        self.assertEqual(data['Assembly']['execute']['calls'], 2)
+        self.assertTrue('c2 (SimpleSystem)' in data)
+        self.assertTrue('linearize' in data['c2 (SimpleSystem)'])
+        self.assertTrue('applyJ' in data['c2 (SimpleSystem)'])
+        self.assertTrue(any('scatter' in cats for cats in data.values()))
+
+        for cats in data.values():
+            for cat in cats.values():
+                self.assertTrue(0.0 <= cat['self'] <= cat['time'] + 1e-12)
+
+        stream = StringIO()
+        prof.report(stream, sort='calls', categories=['execute'], limit=3)
+        lines = stream.getvalue().splitlines()
+        self.assertEqual(len(lines), 4)
+        self.assertTrue(all('execute' in line for line in lines[1:]))
+
+        self.assertRaises(ValueError, prof.report, stream, sort='foo')
+
+        fd, fname = tempfile.mkstemp()
+        os.close(fd)
+        try:
+            prof.save(fname)
+            with open(fname) as f:
+                self.assertEqual(json.load(f), data)
+        finally:
+            os.remove(fname)
+
+    def test_merge(self):
+        top = build()
+        with ExecProfiler() as prof:
+            top.run()
+
+        merged = prof.merge()
+        self.assertEqual(merged.to_dict(), prof.to_dict())
+
+        merged = prof.merge(_Comm()).to_dict()
+        self.assertEqual(merged['c2']['execute']['calls'], 2)
+        self.assertEqual(merged['c2']['execute']['time'],
+                         2*prof.to_dict()['c2']['execute']['time'])
+
+    def test_inactive(self):
+        top = build()
+        with ExecProfiler() as prof:
+            pass
+        top.run()
+        self.assertEqual(prof.to_dict(), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -6,8 +6,12 @@ import nose
 import os.path
 import pkg_resources
 import shutil
+import socket
+import subprocess
 import sys
 import tempfile
+import threading
+import time
 import unittest
 
 from openmdao.main.api import SimulationRoot
@@ -16,6 +20,7 @@ from openmdao.main.grid_engine import GridEngineAllocator, GridEngineServer
 from openmdao.main.mp_support import is_instance
 from openmdao.util.testutil import assert_raises
 from openmdao.util.fileutil import onerror
+from openmdao.util.shellproc import DEV_NULL
 
 
 class TestCase(unittest.TestCase):
@@ -34,6 +39,11 @@ class TestCase(unittest.TestCase):
         GridEngineServer._QSUB[:] = \
             ['python', os.path.join(TestCase.directory, 'ge_qsub.py')]
 
+        # Force use of fake 'qstat'.
+        self.orig_qstat = list(GridEngineServer._QSTAT)
+        GridEngineServer._QSTAT[:] = \
+            ['python', os.path.join(TestCase.directory, 'ge_qstat.py')]
+
         # Force use of fake 'qhost'.
         self.orig_qhost = list(GridEngineAllocator._QHOST)
         GridEngineAllocator._QHOST[:] = \
@@ -41,6 +51,7 @@ class TestCase(unittest.TestCase):
 
     def tearDown(self):
         GridEngineServer._QSUB[:] = self.orig_qsub
+        GridEngineServer._QSTAT[:] = self.orig_qstat
         GridEngineAllocator._QHOST[:] = self.orig_qhost
         os.chdir(self.startdir)
         SimulationRoot.chroot(self.startdir)
@@ -232,6 +243,90 @@ echo hello world
         code = "server.execute_command(dict(remote_command='echo'))"
         assert_raises(self, code, globals(), locals(), OSError, '')
 
+    def test_batch(self):
+        logging.debug('')
+        logging.debug('test_batch')
+
+        if sys.platform == 'win32':
+            raise nose.SkipTest('Batching not supported on Windows.')
+
+        # Concurrent commands are submitted as a single array.
+        batch = dict(path='spool', window=0.5, poll_delay=0.1)
+        servers = []
+        for i in range(4):
+            server = GridEngineServer()
+            server.configure({}, batch)
+            servers.append(server)
+        results = {}
+        def execute(index, command):
+            results[index] = servers[index].execute_command(
+                dict(remote_command=command, args=['hello', str(index)],
+                     output_path='echo%d.out' % index))
+
+        commands = ('echo', 'echo', 'echo', 'false')
+        threads = [threading.Thread(target=execute, args=(i, command))
+                   for i, command in enumerate(commands)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results, {0: (0, ''), 1: (0, ''), 2: (0, ''),
+                                   3: (1, ': Operation not permitted')})
+        for i in range(3):
+            with open('echo%d.out' % i, 'r') as inp:
+                self.assertEqual(inp.readlines(), ['hello %d\n' % i])
+        with open('qsub.out', 'r') as inp:
+            lines = inp.readlines()
+        self.assertTrue(lines[0].startswith('-V -cwd -terse -t 1-4 -o %s '
+                                            '-j yes ' % DEV_NULL))
+        self.assertEqual(os.listdir(os.path.join('spool', 'batches')), [])
+
+        # Array submission failure.
+        GridEngineServer._QSUB[:] = [os.path.join('bogus-qsub')]
+        execute(0, 'echo')
+        self.assertEqual(results[0][0], -1)
+
+    def test_batch_lock(self):
+        logging.debug('')
+        logging.debug('test_batch_lock')
+
+        if sys.platform == 'win32':
+            raise nose.SkipTest('Batching not supported on Windows.')
+
+        server = GridEngineServer()
+        server.configure({}, dict(path='spool', window=0.1, poll_delay=0.1,
+                                  timeout=1, lock_timeout=60))
+        command = dict(remote_command='echo', args=['hello'])
+        lock = os.path.join('spool', 'lock')
+
+        # Lock left by a server on another host, recently.
+        os.mkdir(lock)
+        with open(os.path.join(lock, 'owner'), 'w') as out:
+            out.write('otherhost 1 %f x\n' % time.time())
+        code, msg = server.execute_command(command)
+        self.assertEqual(code, -1)
+        self.assertTrue(msg.startswith('Task not submitted within 1 seconds;'
+                                       ' spool lock held by otherhost:1 for'))
+        self.assertEqual(os.listdir(os.path.join('spool', 'pending')), [])
+        self.assertEqual(os.listdir(os.path.join('spool', 'tasks')), [])
+
+        # Lock left long ago.
+        with open(os.path.join(lock, 'owner'), 'w') as out:
+            out.write('otherhost 1 %f x\n' % (time.time() - 100))
+        self.assertEqual(server.execute_command(command), (0, ''))
+        self.assertFalse(os.path.exists(lock))
+
+        # Lock left by a process on this host which no longer exists.
+        proc = subprocess.Popen(['true'])
+        proc.wait()
+        os.mkdir(lock)
+        with open(os.path.join(lock, 'owner'), 'w') as out:
+            out.write('%s %d %f x\n'
+                      % (socket.gethostname(), proc.pid, time.time()))
+        self.assertEqual(server.execute_command(command), (0, ''))
+        self.assertFalse(os.path.exists(lock))
+
 
 if __name__ == '__main__':
     sys.argv.append('--cover-package=grid_engine.')
@@ -126,6 +126,39 @@ class HasParametersTestCase(unittest.TestCase):
         #except ValueError as err:
             #self.assertEqual(str(err), "parameter value (-1.0) is outside of allowed range [0.0 to 1e+99]")
 
+    def test_eval_cache(self):
+        driver = self.top.driver
+        driver.add_parameter('comp.x', 0., 1.e99)
+        driver.add_parameter('comp.y', 0., 1.e99)
+        self.top.run()
+
+        self.assertEqual(driver.get_cached_evaluation([1., 2.]), None)
+        driver.cache_evaluation([1., 2.], (3., [-1.]))
+        driver.cache_evaluation(array([1., 2.]), 'jac', 'grad')
+        self.assertEqual(driver.get_cached_evaluation(array([1., 2.])),
+                         (3., [-1.]))
+        self.assertEqual(driver.get_cached_evaluation([1., 2.], 'grad'), 'jac')
+        self.assertEqual(driver.get_cached_evaluation([1., 2.1]), None)
+
+        driver.set_parameters([5., 6.])
+        self.assertTrue(driver.is_current_point(array([5., 6.])))
+        self.assertFalse(driver.is_current_point([1., 2.]))
+        driver.set_parameter_by_name('comp.x', 7.)
+        self.assertFalse(driver.is_current_point([5., 6.]))
+
+        # least recently used entries are dropped first
+        driver.set_eval_cache_size(2)
+        driver.cache_evaluation([3., 4.], 'f34')
+        self.assertEqual(driver.get_cached_evaluation([1., 2.]), None)
+        self.assertEqual(driver.get_cached_evaluation([1., 2.], 'grad'), 'jac')
+
+        driver.clear_eval_cache()
+        self.assertEqual(driver.get_cached_evaluation([3., 4.]), None)
+
+        driver.set_eval_cache_size(0)
+        driver.cache_evaluation([3., 4.], 'f34')
+        self.assertEqual(driver.get_cached_evaluation([3., 4.]), None)
+
     def test_add_connected_param(self):
         self.top.create_passthrough('comp.x')
         self.top.driver.add_parameter('comp.x', 0., 1.e99)
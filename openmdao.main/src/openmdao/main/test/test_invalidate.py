@@ -2,6 +2,7 @@ import unittest
 
 from openmdao.main.api import Assembly, Component, set_as_top
 from openmdao.main.datatypes.api import Float
+from openmdao.main.exec_profiler import ExecProfiler
 
 class MyComp(Component):
 
@@ -52,3 +53,51 @@ class InvalidationTestCase(unittest.TestCase):
         self.assertEqual(top.comp.y, 8.0)
         self.assertEqual(top.sub.y, 8.0)
 
+    def test_skip_unchanged(self):
+        top = set_as_top(Top())
+        top.add('comp2', MyComp())
+        top.add('comp3', MyComp())
+        top.driver.workflow.add(['comp2', 'comp3'])
+        top.connect('comp.y', 'comp2.x')
+        for name in ('sub', 'comp', 'comp2', 'comp3'):
+            top.get(name).skip_unchanged = True
+
+        def counts():
+            return [top.sub.c.exec_count, top.comp.exec_count,
+                    top.comp2.exec_count, top.comp3.exec_count]
+
+        top.set('sub.x', 3.0)
+        top.run()
+        self.assertEqual(counts(), [1, 1, 1, 1])
+        self.assertEqual(top.comp2.y, 12.0)
+
+        # nothing changed
+        with ExecProfiler() as prof:
+            top.run()
+        self.assertEqual(counts(), [1, 1, 1, 1])
+        data = prof.to_dict()
+        self.assertEqual(data['comp']['skip']['calls'], 1)
+        self.assertFalse('execute' in data['comp'])
+
+        # an unconnected input
+        top.comp3.x = 5.0
+        top.run()
+        self.assertEqual(counts(), [1, 1, 1, 2])
+        self.assertEqual(top.comp3.y, 10.0)
+
+        # a connected input is reset by the scatter, so nothing changed
+        top.comp2.x = 5.0
+        top.run()
+        self.assertEqual(counts(), [1, 1, 1, 2])
+        self.assertEqual(top.comp2.x, 6.0)
+
+        # connected inputs downstream of a change
+        top.set('sub.x', 4.0)
+        top.run()
+        self.assertEqual(counts(), [2, 2, 2, 2])
+        self.assertEqual(top.comp2.y, 16.0)
+
+        # components without skip_unchanged always run
+        top.comp.skip_unchanged = False
+        top.run()
+        self.assertEqual(counts(), [2, 3, 2, 2])
@@ -9,8 +9,12 @@ import sys
 import unittest
 import nose
 
+from multiprocessing import Pipe
+
+import numpy
+
 from openmdao.main.mp_util import read_server_config, read_allowed_hosts, \
-                                  is_legal_connection
+                                  is_legal_connection, Transport
 
 from openmdao.util.publickey import make_private, HAVE_PYWIN32
 from openmdao.util.testutil import assert_raises
@@ -28,6 +32,60 @@ class TestCase(unittest.TestCase):
                       globals(), locals(), IOError,
                       "No such file 'no-such-file'")
 
+    def test_transport(self):
+        logging.debug('')
+        logging.debug('test_transport')
+
+        # Kept small enough to fit in the pipe's buffer.
+        big = numpy.arange(4000.)
+        obj = {'big': big, 'same': big, 'small': numpy.arange(3),
+               'text': 'x' * 70000, 'strided': big[::2]}
+
+        for key, mode in (('', 'cipher'), ('k' * 40, 'hmac'),
+                          ('k' * 40, 'cipher')):
+            client_conn, server_conn = Pipe()
+            client = Transport(key, mode)
+            server = Transport(key, mode, server=True)
+
+            client.send(client_conn, obj)
+            result = server.recv(server_conn)
+            self.assertEqual(sorted(result.keys()), sorted(obj.keys()))
+            self.assertTrue((result['big'] == big).all())
+            self.assertTrue(result['same'] is result['big'])
+            self.assertEqual(list(result['small']), [0, 1, 2])
+            self.assertEqual(result['text'], obj['text'])
+            self.assertTrue((result['strided'] == big[::2]).all())
+
+            server.send(server_conn, ('#RETURN', big))
+            self.assertTrue((client.recv(client_conn)[1] == big).all())
+
+        # A message replayed, or sent back to its sender, is rejected.
+        client_conn, server_conn = Pipe()
+        server = Transport('k' * 40, 'hmac', server=True)
+        Transport('k' * 40, 'hmac').send(client_conn, 'first')
+        self.assertEqual(server.recv(server_conn), 'first')
+        Transport('k' * 40, 'hmac').send(client_conn, 'replay')
+        assert_raises(self, 'server.recv(server_conn)', globals(), locals(),
+                      RuntimeError, 'Message authentication failed')
+
+        client_conn, server_conn = Pipe()
+        client = Transport('k' * 40, 'cipher')
+        client.send(client_conn, 'reflected')
+        assert_raises(self, 'client.recv(server_conn)', globals(), locals(),
+                      RuntimeError, 'Message authentication failed')
+
+        # A forged header is rejected before its arrays are allocated.
+        client_conn, server_conn = Pipe()
+        server = Transport('k' * 40, 'hmac', server=True)
+        client_conn.send_bytes('["", 1, true, [["<f8", [1099511627776]]]]\n.')
+        client_conn.send_bytes('x' * 32)
+        assert_raises(self, 'server.recv(server_conn)', globals(), locals(),
+                      RuntimeError, 'Message authentication failed')
+
+        assert_raises(self, "Transport('k', 'xyzzy')", globals(), locals(),
+                      ValueError, "mode must be one of ('cipher', 'hmac'),"
+                                  " not 'xyzzy'")
+
     def test_allowed_hosts(self):
         logging.debug('')
         logging.debug('test_allowed_hosts')
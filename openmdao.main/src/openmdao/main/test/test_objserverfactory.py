@@ -13,10 +13,15 @@ import time
 import unittest
 import nose
 
+from multiprocessing.managers import RemoteError
+
+import numpy
+
 from openmdao.main.component import SimulationRoot
 from openmdao.main.objserverfactory import ObjServerFactory, ObjServer, \
                                            start_server, stop_server, \
                                            connect_to_server, _PROXIES
+from openmdao.main.mp_support import call_async, wait_any
 from openmdao.main.resource import ResourceAllocationManager as RAM
 from openmdao.util.testutil import assert_raises
 from openmdao.util.fileutil import onerror
@@ -105,6 +110,72 @@ class TestCase(unittest.TestCase):
             if not keep_dirs:
                 shutil.rmtree(testdir, onerror=onerror)
 
+    def test_async(self):
+        logging.debug('')
+        logging.debug('test_async')
+
+        testdir = 'test_async'
+        if os.path.exists(testdir):
+            shutil.rmtree(testdir, onerror=onerror)
+        os.mkdir(testdir)
+        os.chdir(testdir)
+
+        factory = None
+        try:
+            factory = ObjServerFactory()
+            typname = 'openmdao.test.execcomp.ExecComp'
+            comps = [factory.create(typname, exprs=['y = 2 * x'])
+                     for i in range(2)]
+
+            # Several requests outstanding on each connection.
+            futures = []
+            for i, comp in enumerate(comps):
+                futures.append(call_async(comp, 'set', 'x', i + 1.))
+                futures.append(call_async(comp, 'run'))
+                futures.append(call_async(comp, 'get', 'y'))
+                futures.append(call_async(comp, 'get', 'no_such_var'))
+
+            pending = list(futures)
+            while pending:
+                done = wait_any(pending, timeout=60)
+                self.assertTrue(done)
+                pending = [future for future in pending
+                                  if future not in done]
+
+            self.assertEqual(futures[2].result(), 2.)
+            self.assertEqual(futures[6].result(), 4.)
+            for future in (futures[3], futures[7]):
+                try:
+                    future.result()
+                except RemoteError as exc:
+                    self.assertTrue("no_such_var" in str(exc))
+                else:
+                    self.fail('Expected RemoteError')
+
+            # Synchronous calls wait for outstanding ones.
+            future = call_async(comps[0], 'get', 'x')
+            self.assertEqual(comps[0].get('y'), 2.)
+            self.assertTrue(future.done())
+            self.assertEqual(future.result(), 1.)
+
+            # Large arguments and results, which would fill the connection's
+            # buffers in both directions if sent without waiting.
+            server = factory.create('')
+            futures = [call_async(server, 'echo', numpy.arange(1 << 20) + i)
+                       for i in range(8)]
+            for i, future in enumerate(futures):
+                result = future.result()[0]
+                self.assertTrue(numpy.all(result == numpy.arange(1 << 20) + i))
+        finally:
+            if factory is not None:
+                factory.cleanup()
+            os.chdir('..')
+            if sys.platform == 'win32':
+                time.sleep(2)  # Wait for process shutdown.
+            keep_dirs = int(os.environ.get('OPENMDAO_KEEPDIRS', '0'))
+            if not keep_dirs:
+                shutil.rmtree(testdir, onerror=onerror)
+
     def test_server(self):
         logging.debug('')
         logging.debug('test_server')
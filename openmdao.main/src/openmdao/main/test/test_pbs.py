@@ -8,6 +8,7 @@ import pkg_resources
 import shutil
 import sys
 import tempfile
+import threading
 import unittest
 
 from openmdao.main.api import SimulationRoot
@@ -35,8 +36,14 @@ class TestCase(unittest.TestCase):
         PBS_Server._QSUB[:] = \
             ['python', os.path.join(TestCase.directory, 'pbs_qsub.py')]
 
+        # Force use of fake 'qstat'.
+        self.orig_qstat = list(PBS_Server._QSTAT)
+        PBS_Server._QSTAT[:] = \
+            ['python', os.path.join(TestCase.directory, 'pbs_qstat.py')]
+
     def tearDown(self):
         PBS_Server._QSUB[:] = self.orig_qsub
+        PBS_Server._QSTAT[:] = self.orig_qstat
         os.chdir(self.startdir)
         SimulationRoot.chroot(self.startdir)
         if not os.environ.get('OPENMDAO_KEEPDIRS', False):
@@ -222,6 +229,50 @@ python %s hello world <%s >echo.out 2>echo.err
         code = "server.execute_command(dict(remote_command='echo'))"
         assert_raises(self, code, globals(), locals(), OSError, '')
 
+    def test_batch(self):
+        logging.debug('')
+        logging.debug('test_batch')
+
+        if sys.platform == 'win32':
+            raise nose.SkipTest('Batching not supported on Windows.')
+
+        # Concurrent commands are submitted as a single array.
+        batch = dict(path='spool', window=0.5, poll_delay=0.1)
+        echo = os.path.join(TestCase.directory, 'pbs_echo.py')
+        servers = []
+        for i in range(4):
+            server = PBS_Server()
+            server.configure('test-account', batch)
+            servers.append(server)
+        results = {}
+        def execute(index, job_name):
+            results[index] = servers[index].execute_command(
+                dict(remote_command='python', args=[echo, 'hello', str(index)],
+                     job_name=job_name, queue_name='debug_q',
+                     output_path='echo%d.out' % index))
+
+        threads = [threading.Thread(target=execute, args=(i, 'Job%d' % i))
+                   for i in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results, {0: (0, ''), 1: (0, ''), 2: (0, '')})
+        for i in range(3):
+            with open('echo%d.out' % i, 'r') as inp:
+                self.assertEqual(inp.readlines(), ['hello %d\n' % i])
+        with open('qsub.out', 'r') as inp:
+            lines = inp.readlines()
+        self.assertTrue(lines[0].startswith(
+            '-V -j oe -o %s -S /bin/sh -W group_list=test-account '
+            '-q debug_q -J 1-3 ' % DEV_NULL))
+        self.assertEqual(os.listdir(os.path.join('spool', 'batches')), [])
+
+        # Single task, submitted as a plain job.
+        execute(0, 'Job0')
+        self.assertEqual(results[0], (0, ''))
+
 
 if __name__ == '__main__':
     sys.argv.append('--cover-package=pbs.')
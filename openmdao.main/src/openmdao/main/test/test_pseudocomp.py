@@ -3,6 +3,8 @@ import unittest
 
 import ast
 
+from numpy import array
+
 from openmdao.main.api import Assembly, Component, set_as_top
 from openmdao.main.datatypes.api import Float, Array
 from openmdao.main.pseudocomp import unit_xform
@@ -106,6 +108,19 @@ class PseudoCompTestCase(unittest.TestCase):
         self.assertAlmostEqual(top.comp1.c, 3.)
         self.assertAlmostEqual(top.comp2.a, 36.)
 
+    def test_fused_units(self):
+        top = _simple_model()
+        top.comp1.a = 12.
+        top.comp1.b = 24.
+        top.run()
+
+        # the conversion is done by the scatter, so there's no system
+        # for the pseudocomp
+        names = [s.name for s in top.driver.workflow._system.all_subsystems()]
+        self.assertEqual(names, ['comp1', 'comp2'])
+        self.assertAlmostEqual(top.comp2.a, 36.)
+        self.assertAlmostEqual(top._pseudo_0.out0, 36.)
+
     def test_multi_src(self):
         top = _simple_model()  # comp1.c --> comp2.a
         top.connect('comp1.dist/comp1.time', 'comp2.speed')
@@ -263,8 +278,52 @@ class SubAsmb(Assembly):
         self.connect('comp.b', 'z')
         self.driver.workflow.add('comp')
 
+class TempComp(Component):
+
+    x = Float(1.0, iotype="in")
+    temp = Float(iotype="out", units='degC')
+
+    def execute(self):
+        self.temp = 3.0*self.x**2
+
+    def provideJ(self):
+        return array([[6.0*self.x]])
+
+    def list_deriv_vars(self):
+        return ('x',), ('temp',)
+
+class FahrComp(Component):
+
+    temp = Float(iotype="in", units='degF')
+    y = Float(iotype="out")
+
+    def execute(self):
+        self.y = 2.0*self.temp
+
+    def provideJ(self):
+        return array([[2.0]])
+
+    def list_deriv_vars(self):
+        return ('temp',), ('y',)
+
 class Test_Pseudo_Deriv(unittest.TestCase):
 
+    def test_offset_units(self):
+
+        model = set_as_top(Assembly())
+        model.add('c1', TempComp())
+        model.add('c2', FahrComp())
+        model.connect('c1.temp', 'c2.temp')
+        model.driver.workflow.add(['c1', 'c2'])
+        model.c1.x = 2.0
+        model.run()
+
+        assert_rel_error(self, model.c2.temp, 12.0*1.8+32.0, 1e-6)
+        for mode in ('forward', 'adjoint'):
+            J = model.driver.calc_gradient(inputs=['c1.x'],
+                                           outputs=['c2.y'], mode=mode)
+            assert_rel_error(self, J[0, 0], 2.0*1.8*12.0, 1e-6)
+
     def test_scaler_array_expression(self):
 
         model = Assembly()
@@ -0,0 +1,81 @@
+import json
+import os
+import tempfile
+import unittest
+from StringIO import StringIO
+
+from openmdao.main.setup_profiler import SetupProfiler, profile_setup
+from openmdao.main.test.profmodel import build
+
+
+def _find(phases, name, target=None):
+    for phase in phases:
+        if phase['name'] == name and \
+           (target is None or phase['target'] == target):
+            return phase
+        found = _find(phase['children'], name, target)
+        if found is not None:
+            return found
+
+
+class SetupProfilerTestCase(unittest.TestCase):
+
+    def test_phases(self):
+        top = build()
+        prof = profile_setup(top)
+        data = prof.to_dict()
+
+        self.assertEqual(len(data), 1)
+        setup = data[0]
+        self.assertEqual(setup['name'], '_setup')
+        self.assertEqual(setup['calls'], 1)
+
+        names = [child['name'] for child in setup['children']]
+        for name in ('setup_depgraph', 'compute_itersets',
+                     'setup_reduced_graph', 'setup_systems', 'setup_sizes',
+                     'setup_vectors', 'setup_scatters'):
+            self.assertTrue(name in names)
+
+        # phases of the subassembly and of systems are nested
+        self.assertTrue(_find(setup['children'], 'setup_depgraph', 'sub'))
+        sizes = _find(setup['children'], 'setup_sizes')
+        self.assertTrue(sizes['children'])
+        self.assertTrue(setup['time'] >= sum([child['time'] for child in
+                                                 setup['children']]))
+        self.assertAlmostEqual(prof.total_time, setup['time'])
+
+        # the model still runs normally
+        top.sub.x = 3.0
+        top.run()
+        self.assertEqual(top.c2.y, 12.0)
+
+    def test_inactive(self):
+        top = build()
+        with SetupProfiler() as prof:
+            pass
+        top._setup()
+        self.assertEqual(prof.to_dict(), [])
+
+    def test_report(self):
+        top = build()
+        with SetupProfiler() as prof:
+            top.run()
+
+        stream = StringIO()
+        prof.report(stream, depth=1)
+        lines = stream.getvalue().splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertTrue(lines[1].startswith('_setup [Assembly]'))
+
+        fd, fname = tempfile.mkstemp()
+        os.close(fd)
+        try:
+            prof.save(fname)
+            with open(fname) as f:
+                self.assertEqual(json.load(f)[0]['name'], '_setup')
+        finally:
+            os.remove(fname)
+
+
+if __name__ == '__main__':
+    unittest.main()
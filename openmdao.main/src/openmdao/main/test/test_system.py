@@ -1,8 +1,11 @@
 
+import os
 import unittest
 
 import time
 import numpy as np
+from numpy import array
+from nose import SkipTest
 
 from openmdao.main.api import Component, Driver, Assembly, set_as_top
 from openmdao.main.datatypes.api import Float, Array
@@ -10,6 +13,8 @@ from openmdao.main.hasparameters import HasParameters
 from openmdao.main.hasobjective import HasObjective
 from openmdao.main.hasconstraints import HasConstraints
 from openmdao.main.interfaces import IHasParameters, implements
+from openmdao.main.exec_profiler import ExecProfiler
+from openmdao.main.systems import ParallelSystem, assign_procs
 from openmdao.util.decorators import add_delegate
 from openmdao.util.testutil import assert_rel_error
 
@@ -428,5 +433,137 @@ class TestArrayConnectErrors(unittest.TestCase):
 
         t.run() # should run without error
 
+class Summer(Component):
+
+    a = Float(iotype='in')
+    b = Float(iotype='in')
+    total = Float(iotype='out')
+
+    def execute(self):
+        self.total = self.a + 2.0*self.b
+
+    def provideJ(self):
+        return array([[1.0, 2.0]])
+
+    def list_deriv_vars(self):
+        return ('a', 'b'), ('total',)
+
+
+class TestParallelBackend(unittest.TestCase):
+
+    def _build(self, backend):
+        top = set_as_top(Assembly())
+        top.add('driver', SimpleDriver())
+        top.add('p1', Paraboloid())
+        top.add('p2', Paraboloid())
+        top.add('sum', Summer())
+        top.connect('p1.f_xy', 'sum.a')
+        top.connect('p2.f_xy', 'sum.b')
+        top.driver.workflow.add(['p1', 'p2', 'sum'])
+        top.driver.add_parameter('p1.x', low=-100, high=100)
+        top.driver.add_parameter('p2.y', low=-100, high=100)
+        top.driver.add_objective('sum.total')
+        top.driver.parallel_backend = backend
+        top.p1.x = 3.0
+        top.p1.y = 5.0
+        top.p2.x = 1.0
+        top.p2.y = 2.0
+        return top
+
+    def _check(self, backend):
+        top = self._build(backend)
+        top.run()
+
+        systems = list(top.driver.workflow._system.local_subsystems(True))
+        par = [s for s in systems if isinstance(s, ParallelSystem)]
+        self.assertEqual(len(par), 1)
+        self.assertEqual(par[0].backend, backend)
+
+        self.assertEqual(top.p1.f_xy, 93.0)
+        self.assertEqual(top.p2.f_xy, 39.0)
+        self.assertEqual(top.sum.total, 171.0)
+
+        J = top.driver.calc_gradient(mode='forward')
+        assert_rel_error(self, J[0, 0], 5.0, 1e-6)
+        assert_rel_error(self, J[0, 1], 2.0*13.0, 1e-6)
+        J = top.driver.calc_gradient(mode='adjoint')
+        assert_rel_error(self, J[0, 0], 5.0, 1e-6)
+        assert_rel_error(self, J[0, 1], 2.0*13.0, 1e-6)
+
+        # new parameter values reach the parallel subsystems
+        top.p1.x = 4.0
+        top.p2.y = 3.0
+        top.run()
+        self.assertEqual(top.p1.f_xy, 1.0 + 20.0 + 81.0 - 3.0)
+        self.assertEqual(top.p2.f_xy, 4.0 + 3.0 + 49.0 - 3.0)
+        self.assertEqual(top.sum.total, 99.0 + 2.0*53.0)
+
+    def test_serial(self):
+        top = self._build('serial')
+        top.run()
+        systems = list(top.driver.workflow._system.local_subsystems(True))
+        self.assertFalse([s for s in systems
+                          if isinstance(s, ParallelSystem)])
+        self.assertEqual(top.sum.total, 171.0)
+
+    def test_threads(self):
+        self._check('threads')
+
+    def test_processes(self):
+        if not hasattr(os, 'fork'):
+            raise SkipTest('requires os.fork')
+        self._check('processes')
+
+
+class TestAssignProcs(unittest.TestCase):
+
+    def test_no_costs(self):
+        self.assertEqual(assign_procs(5, [1, 1], [None, None],
+                                      [(None, 1.0), (None, 1.0)]), [3, 2])
+        self.assertEqual(assign_procs(5, [2, 1], [None, None],
+                                      [(None, 1.0), (None, 1.0)]), [3, 2])
+
+    def test_costs(self):
+        self.assertEqual(assign_procs(4, [1, 1], [None, None],
+                                      [(3.0, 1.0), (1.0, 1.0)]), [3, 1])
+        # unknown costs are the mean of the known ones
+        self.assertEqual(assign_procs(6, [1, 1, 1], [None, None, None],
+                                      [(4.0, 1.0), (None, 1.0), (2.0, 1.0)]),
+                         [3, 2, 1])
+
+    def test_limits(self):
+        self.assertEqual(assign_procs(4, [1, 1], [2, None],
+                                      [(9.0, 1.0), (1.0, 1.0)]), [2, 2])
+        self.assertEqual(assign_procs(8, [1, 1], [2, 3],
+                                      [(9.0, 1.0), (1.0, 1.0)]), [2, 3])
+        self.assertEqual(assign_procs(3, [2, 2], [None, None],
+                                      [(1.0, 1.0), (1.0, 1.0)]), [2, 1])
+
+    def test_parallel_fraction(self):
+        # a serial subsystem can't use more processors
+        self.assertEqual(assign_procs(4, [1, 1], [None, None],
+                                      [(10.0, 0.0), (1.0, 1.0)]), [1, 3])
+        self.assertEqual(assign_procs(5, [1, 1], [None, None],
+                                      [(10.0, 0.5), (4.0, 1.0)]), [4, 1])
+
+    def test_system_costs(self):
+        top = TestParallelBackend('test_serial')._build('threads')
+        top.run()
+        par = [s for s in top.driver.workflow._system.local_subsystems(True)
+               if isinstance(s, ParallelSystem)][0]
+        self.assertEqual(par.get_cost(), (None, 1.0))
+
+        with ExecProfiler() as prof:
+            top.run()
+        prof.set_costs(top)
+        self.assertTrue(top.p1.mpi.cost > 0.0)
+        self.assertTrue(top.sum.mpi.cost > 0.0)
+
+        top.p1.mpi.cost = 3.0
+        top.p2.mpi.cost = 1.0
+        top.p2.mpi.parallel_fraction = 0.5
+        self.assertEqual(par.get_cost(), (4.0, 0.875))
+
+
 if __name__ == "__main__":
     unittest.main()
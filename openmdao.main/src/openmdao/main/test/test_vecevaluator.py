@@ -0,0 +1,137 @@
+import unittest
+
+import numpy
+
+from openmdao.main.api import Assembly, Component, Driver, set_as_top
+from openmdao.main.datatypes.api import Array, Float
+from openmdao.main.hasconstraints import HasConstraints
+from openmdao.main.hasobjective import HasObjectives
+from openmdao.main.hasresponses import HasResponses
+from openmdao.main.test.test_workflow import DumbRecorder
+from openmdao.util.decorators import add_delegate
+
+
+class Comp(Component):
+    x = Float(1.0, iotype='in')
+    y = Float(iotype='out')
+    z = Array(numpy.zeros(3), iotype='out')
+
+    def execute(self):
+        self.y = 2.0 * self.x
+        self.z = self.x * numpy.arange(3.0)
+
+
+@add_delegate(HasConstraints, HasObjectives, HasResponses)
+class EvalDriver(Driver):
+    """Runs its workflow once and then evaluates everything, as an
+    optimizer would.
+    """
+
+    def execute(self):
+        self.run_iteration()
+        self.cons = self.eval_constraints()
+        self.objs = self.eval_objectives()
+        self.resps = self.eval_responses()
+
+
+def _build():
+    top = set_as_top(Assembly())
+    top.add('comp', Comp())
+    top.add('driver', EvalDriver())
+    top.driver.workflow.add('comp')
+    drv = top.driver
+    drv.add_constraint('comp.y = 3.0')
+    drv.add_constraint('comp.y < 5.0')
+    drv.add_constraint('comp.z > 1.0')
+    drv.add_objective('comp.y + comp.x', name='f')
+    drv.add_objective('comp.z', name='g')
+    drv.add_response('comp.y * 3.0')
+    return top
+
+
+class VecEvaluatorTestCase(unittest.TestCase):
+
+    def test_values(self):
+        top = _build()
+        top.comp.x = 2.0
+        top.run()
+        drv = top.driver
+
+        cons = [con.evaluate(top) for con in drv.get_constraints().values()]
+        expected = numpy.concatenate([numpy.ravel(c) for c in cons])
+        array = drv.eval_constraints_array()
+        self.assertEqual(list(array), list(expected))
+        self.assertEqual(drv.cons, list(expected))
+        self.assertEqual(list(drv.eval_eq_constraints_array()), [1.0])
+        self.assertEqual(drv.eval_ineq_constraints(), list(expected[1:]))
+        self.assertEqual(list(drv.eval_named_constraint('comp.z>1.0')),
+                         list(expected[2:]))
+
+        self.assertEqual(drv.objs[0], 6.0)
+        self.assertEqual(list(drv.objs[1]), [0.0, 2.0, 4.0])
+        self.assertEqual(drv.eval_named_objective('f'), 6.0)
+        self.assertEqual(list(drv.eval_objectives_array()),
+                         [6.0, 0.0, 2.0, 4.0])
+        self.assertEqual(drv.eval_responses(), [12.0])
+        self.assertEqual(drv.eval_response('comp.y*3.0'), 12.0)
+
+    def test_reuse(self):
+        top = _build()
+        top.run()
+        drv = top.driver
+        array = drv.eval_constraints_array()
+        before = array.copy()
+
+        # values aren't gathered again until the workflow runs again
+        uvec = drv.workflow._system.vec['u']
+        uvec.array[:] = -1.0
+        self.assertTrue(drv.eval_constraints_array() is array)
+        self.assertEqual(list(array), list(before))
+
+        top.comp.x = 3.0
+        top.run()
+        self.assertTrue(drv.eval_constraints_array() is array)
+        self.assertEqual(list(array), [3.0, 1.0, 1.0, -2.0, -5.0])
+
+        # changes to the constraints are picked up
+        drv.remove_constraint('comp.y<5.0')
+        top.run()
+        self.assertEqual(drv.eval_constraints(), [3.0, 1.0, -2.0, -5.0])
+
+    def test_recording(self):
+        top = _build()
+        top.recorders = [DumbRecorder()]
+        evaluator = top.driver._hasconstraints._evaluator
+        fills = []
+        fill = evaluator._fill
+
+        def _fill(system, scope):
+            fills.append(1)
+            fill(system, scope)
+
+        evaluator._fill = _fill
+        top.comp.x = 2.0
+        top.run()
+
+        # recording and the driver share one evaluation
+        self.assertEqual(len(fills), 1)
+        case = top.recorders[0].cases[-1]
+        self.assertEqual(case['_pseudo_0.out0'], 1.0)
+        self.assertEqual(list(case['_pseudo_2.out0']), [1.0, -1.0, -3.0])
+        self.assertEqual(case['f'], 6.0)
+        self.assertEqual(case['_pseudo_5.out0'], 12.0)
+
+    def test_no_system(self):
+        top = _build()
+        drv = top.driver
+        top.comp.x = 2.0
+        top.run()
+        values = drv.eval_constraints()
+
+        # entries not in the vectors are evaluated one at a time
+        drv.workflow._system = None
+        self.assertEqual(drv.eval_constraints(), values)
+
+
+if __name__ == "__main__":
+    unittest.main()
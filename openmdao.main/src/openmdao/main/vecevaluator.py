@@ -0,0 +1,165 @@
+"""
+Evaluation of the objectives, responses or constraints of a driver by a
+single gather from the vectors of its workflow system.
+
+The value of each of these expressions is computed during the run of the
+model by a pseudocomponent, whose output ``out0`` has a place in the ``u``
+vector of the system of the driver's workflow (or, for an equality
+constraint that is solved as a residual, in the ``f`` vector). Rather than
+evaluating each expression separately, a :class:`VecEvaluator` builds index
+arrays into those vectors once and then fills one preallocated array per
+call. Entries that have no place in the vectors, for example because the
+model hasn't been set up or the pseudocomponent is on another process,
+are evaluated one by one as before.
+
+The result is kept until the workflow runs again, so the optimizer and the
+case recorders share a single evaluation per iteration.
+"""
+
+import numpy
+
+
+class VecEvaluator(object):
+    """Evaluates a sequence of ``(name, expr)`` pairs, where each `expr` is
+    an objective, response or constraint having a `pcomp_name` and an
+    ``evaluate(scope)`` method, into one flat array. The array is reused
+    by later evaluations, so callers that keep it must copy it.
+    """
+
+    def __init__(self):
+        self.array = numpy.zeros(0)
+        self._key = None     # (system, scope, pseudocomp names) of the plan
+        self._stamp = None   # workflow stamp of the current values
+        self._slices = {}    # name -> (start, end, scalar)
+        self._objects = {}   # name -> value, of entries not in the vectors
+
+    def __getstate__(self):
+        # the plan refers to the system, so it's rebuilt when needed
+        return {'array': self.array}
+
+    def __setstate__(self, state):
+        self.__init__()
+
+    def evaluate(self, driver, items, scope):
+        """Returns the array of the values of `items` in the workflow of
+        `driver`, evaluated in `scope`, or in the scope of each `expr` if
+        `scope` is None.
+        """
+        wf = getattr(driver, 'workflow', None)
+        system = None if wf is None else wf._system
+        stamp = None if wf is None else wf._vec_stamp
+        pnames = [expr.pcomp_name for _, expr in items]
+        key = self._key
+        if key is None or key[0] is not system or key[1] is not scope or \
+           key[2] != pnames:
+            self._setup(system, items, scope)
+            self._key = (system, scope, pnames)
+        elif stamp is not None and stamp == self._stamp:
+            return self.array
+
+        self._fill(system, scope)
+        self._stamp = stamp
+        return self.array
+
+    def value(self, name, flat=False):
+        """Returns the value of `name` from the last evaluation, as a float
+        if it's a scalar or else as a copy of its part of the array. If
+        `flat` is True, the value is always returned as an array. Values of
+        entries that aren't in the vectors are returned as evaluated.
+        """
+        if name in self._objects:
+            return self._objects[name]
+        start, end, scalar = self._slices[name]
+        if scalar and not flat:
+            return self.array[start]
+        return self.array[start:end].copy()
+
+    def bounds(self, name):
+        """Returns the start and end of the part of the array that holds the
+        value of `name`.
+        """
+        return self._slices[name][:2]
+
+    def _setup(self, system, items, scope):
+        """Build index arrays of the entries found in the vectors of
+        `system`, and size the array to hold all entries.
+        """
+        u_pos, u_idxs, f_pos, f_idxs = [], [], [], []
+        self._fallback = []
+        self._slices = {}
+        self._objects = {}
+        start = 0
+        for name, expr in items:
+            loc = self._locate(system, expr,
+                               expr.scope if scope is None else scope)
+            if loc is None:
+                # evaluated on its own, and only put in the array if numeric
+                val = expr.evaluate(scope)
+                size = _numeric_size(val)
+                scalar = False
+                self._objects[name] = val
+                self._fallback.append((name, expr, start, start+size))
+            else:
+                idxs, hide, scalar = loc
+                size = len(idxs)
+                if hide:
+                    f_pos.extend(range(start, start+size))
+                    f_idxs.extend(idxs)
+                else:
+                    u_pos.extend(range(start, start+size))
+                    u_idxs.extend(idxs)
+            self._slices[name] = (start, start+size, scalar)
+            start += size
+
+        self.array = numpy.zeros(start)
+        self._u_pos = numpy.array(u_pos, dtype=int)
+        self._u_idxs = numpy.array(u_idxs, dtype=int)
+        self._f_pos = numpy.array(f_pos, dtype=int)
+        self._f_idxs = numpy.array(f_idxs, dtype=int)
+        # the usual case, where all entries come straight from u
+        self._all_u = not (f_pos or self._fallback)
+
+    @staticmethod
+    def _locate(system, expr, scope):
+        """Returns the indices of the output of the pseudocomp of `expr` in
+        the vectors of `system`, whether it's a residual and whether it's a
+        scalar, or None if it isn't in the vectors.
+        """
+        if system is None or scope is not system.scope:
+            return None
+        vname = expr.pcomp_name + '.out0'
+        try:
+            node = scope.name2collapsed[vname]
+            psystem = getattr(scope, expr.pcomp_name)._system
+            # a hidden pseudocomp output is really a residual that's
+            # mapped to the corresponding state in the u vector
+            hide = psystem.vec['u']._info[node].hide
+            idxs = system.vec['u'].indices(system, node)
+        except (KeyError, AttributeError):
+            return None
+        return idxs, hide, bool(scope._var_meta[vname].get('scalar'))
+
+    def _fill(self, system, scope):
+        """Fill the array with the current values."""
+        array = self.array
+        if self._all_u:
+            if array.size:
+                system.vec['u'].array.take(self._u_idxs, out=array)
+            return
+
+        if len(self._u_idxs):
+            array[self._u_pos] = system.vec['u'].array.take(self._u_idxs)
+        if len(self._f_idxs):
+            array[self._f_pos] = -system.vec['f'].array.take(self._f_idxs)
+        for name, expr, start, end in self._fallback:
+            val = self._objects[name] = expr.evaluate(scope)
+            if end > start:
+                array[start:end] = numpy.ravel(val)
+
+
+def _numeric_size(val):
+    """Returns the number of entries of `val` if it's numeric, else 0."""
+    try:
+        return numpy.asarray(val, dtype=float).size
+    except (TypeError, ValueError):
+        return 0
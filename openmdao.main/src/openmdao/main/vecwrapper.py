@@ -1,5 +1,6 @@
 import sys
 from collections import OrderedDict, namedtuple
+from itertools import chain
 import numpy
 from numpy import ndarray, zeros
 
@@ -346,12 +347,14 @@ class InputVecWrapper(VecWrapperBase):
         varmeta = scope._var_meta
         name2collapsed = scope.name2collapsed
         flat_ins = _filter_flat(scope, system._owned_args)
+        self._affine = set(system.affine_vars)
         start, end = 0, 0
 
         #print "%s: %s: %s" % (system.name, type(system), flat_ins)
         for sub in system.simple_subsystems():
             #print "SUB %s: %s  _in_nodes = %s" % (sub.name, type(sub),sub._in_nodes)
-            for name in [n for n in system.vector_vars if n in sub._in_nodes]:
+            for name in [n for n in chain(system.vector_vars, system.affine_vars)
+                                  if n in sub._in_nodes]:
                 if name in flat_ins and name not in self._info:
                     arg_idx = sub.get_distrib_idxs(name)
                     if arg_idx is None:
@@ -375,7 +378,8 @@ class InputVecWrapper(VecWrapperBase):
         for name in all_ins:
             var = varmeta[name]
 
-            if name in system.vector_vars or name2collapsed.get(var.get('basevar')) not in self:
+            if name in system.vector_vars or name in system.affine_vars or \
+               name2collapsed.get(var.get('basevar')) not in self:
                 continue
 
             self._add_subview(scope, name)
@@ -417,6 +421,9 @@ class InputVecWrapper(VecWrapperBase):
                 for dest in name[1]:
                     scope.set_flattened_value(dest, array_val)
                     #print "scope set", dest, array_val
+                # keep the output of a fused unit conversion current
+                if name in self._affine:
+                    scope.set_flattened_value(name[0], array_val)
             else:
                 scope.set_flattened_value(name, array_val)
                 #print "scope set", name, array_val
@@ -461,14 +468,20 @@ class InputVecWrapper(VecWrapperBase):
 class DataTransfer(object):
     """A wrapper object that manages data transfer between
     systems via scatters (and possibly send/receive for
-    non-array values)
+    non-array values). Any fused unit conversions, given as a list
+    of (src_idxs, dest_idxs, scale, offset) tuples in *affine*,
+    are transferred as dest = scale*src + offset.
     """
     def __init__(self, system, var_idxs, input_idxs,
-                 scatter_conns, noflat_vars):
+                 scatter_conns, noflat_vars, affine=()):
         self.scatter = None
+        self.affine_scatter = None
         self.scatter_conns = scatter_conns
         self.noflat_vars = sorted(noflat_vars)
 
+        if affine:
+            self.affine_scatter = AffineScatter(affine)
+
         if not (MPI or scatter_conns or noflat_vars):
             return  # no data to xfer
 
@@ -515,7 +528,8 @@ class DataTransfer(object):
         """This performs the data transfer via petsc scatter, local get/set,
         or MPI object send/recv.
         """
-        if self.scatter is None and not self.noflat_vars:
+        if self.scatter is None and self.affine_scatter is None and \
+           not self.noflat_vars:
             return
 
         if MPI:
@@ -535,6 +549,12 @@ class DataTransfer(object):
         if self.scatter:
             self.scatter.scatter(src, dest, addv=addv, mode=mode)
 
+        if self.affine_scatter:
+            # the offset only applies to values, not derivatives
+            self.affine_scatter.scatter(srcvec.array, destvec.array,
+                                        addv=addv, mode=mode,
+                                        offset=destvec.name.endswith('.p'))
+
         if destvec.name.endswith('.p') and self.noflat_vars:
             if MPI:
                 for isrc, node in enumerate(system.noflat_vars):
@@ -613,6 +633,10 @@ class DataTransfer(object):
         if self.noflat_vars:
             stream.write(" "*nest)
             stream.write("no-flats: %s\n" % self.noflat_vars)
+        if self.affine_scatter:
+            stream.write(" "*nest)
+            stream.write("affine: %s --> %s\n" % (self.affine_scatter.src_idxs,
+                                                  self.affine_scatter.dest_idxs))
 
 
 class SerialScatter(object):
@@ -628,6 +652,33 @@ class SerialScatter(object):
         else:
             destvec[self.dest_idxs] = srcvec[self.src_idxs]
 
+class AffineScatter(object):
+    """A serial scatter that sets dest = scale*src + offset. In reverse
+    mode the transposed scaling is added back into the source.
+    """
+    def __init__(self, affine):
+        src_idxs, dest_idxs, scales, offsets = [], [], [], []
+        for sidxs, didxs, scale, offset in affine:
+            src_idxs.append(sidxs)
+            dest_idxs.append(didxs)
+            scales.append(numpy.repeat(float(scale), len(sidxs)))
+            offsets.append(numpy.repeat(float(offset), len(sidxs)))
+        self.src_idxs = numpy.concatenate(src_idxs)
+        self.dest_idxs = numpy.concatenate(dest_idxs)
+        self.scale = numpy.concatenate(scales)
+        self.offset = numpy.concatenate(offsets)
+
+    def scatter(self, srcvec, destvec, addv, mode, offset=False):
+        if addv is True:
+            # a src may feed more than one conversion, so accumulate
+            numpy.add.at(destvec, self.src_idxs,
+                         self.scale*srcvec[self.dest_idxs])
+        elif offset:
+            destvec[self.dest_idxs] = self.scale*srcvec[self.src_idxs] + \
+                                      self.offset
+        else:
+            destvec[self.dest_idxs] = self.scale*srcvec[self.src_idxs]
+
 def merge_idxs(src_idxs, dest_idxs):
     """Return source and destination index arrays, built up from
     smaller index arrays and combined in order of ascending source
@@ -19,7 +19,8 @@ from openmdao.main.mpiwrap import MPI, MPI_info
 from openmdao.main.systems import SerialSystem, ParallelSystem, \
                                   OpaqueSystem, VarSystem, CompoundSystem, \
                                   partition_subsystems, ParamSystem, \
-                                  get_comm_if_active, collapse_to_system_node
+                                  get_comm_if_active, collapse_to_system_node, \
+                                  fuse_unit_conversions
 from openmdao.main.depgraph import _get_inner_connections, get_nondiff_groups, \
                                    collapse_nodes, simple_node_iter, CollapsedGraph
 from openmdao.main.exceptions import RunStopped
@@ -52,6 +53,7 @@ class Workflow(object):
         self._scope = None
         self._exec_count = 0     # Workflow executions since reset.
         self._initial_count = 0  # Value to reset to (typically zero).
+        self._vec_stamp = 0      # Bumped when the vectors may change.
         self._comp_count = 0     # Component index in workflow.
         self._system = None
         self._reduced_graph = None
@@ -141,6 +143,7 @@ class Workflow(object):
     def reset(self):
         """ Reset execution count. """
         self._exec_count = self._initial_count
+        self._vec_stamp += 1
 
     def calc_gradient(self, inputs=None, outputs=None, mode='auto',
                       return_format='array', force_regen=False, options=None):
@@ -247,21 +250,21 @@ class Workflow(object):
         # Constraints
         self._rec_constraints = []
         if hasattr(driver, 'get_eq_constraints'):
-            for con in driver.get_eq_constraints().values():
+            for key, con in driver.get_eq_constraints().items():
                 name = con.pcomp_name
                 path = prefix+name
                 if save_problem_formulation or \
                    self._check_path(path, includes, excludes):
-                    self._rec_constraints.append(con)
+                    self._rec_constraints.append(key)
                     outputs.append(name + '.out0')
 
         if hasattr(driver, 'get_ineq_constraints'):
-            for con in driver.get_ineq_constraints().values():
+            for key, con in driver.get_ineq_constraints().items():
                 name = con.pcomp_name
                 path = prefix+name
                 if save_problem_formulation or \
                    self._check_path(path, includes, excludes):
-                    self._rec_constraints.append(con)
+                    self._rec_constraints.append(key)
                     outputs.append(name + '.out0')
 
         self._rec_outputs = []
@@ -389,13 +392,13 @@ class Workflow(object):
                 driver.raise_exception("Can't evaluate '%s' for recording: %s"
                                        % (key, exc), RuntimeError)
         # Constraints.
-        for con in self._rec_constraints:
+        for key in self._rec_constraints:
             try:
-                value = con.evaluate(scope)
+                value = driver.eval_named_constraint(key)
             except Exception as exc:
                 driver.raise_exception("Can't evaluate '%s' for recording: %s"
-                                       % (con, exc), RuntimeError)
-            if len(value) == 1:  # evaluate() always returns list.
+                                       % (key, exc), RuntimeError)
+            if len(value) == 1:  # always returns an array.
                 value = value[0]
             outputs.append(value)
 
@@ -532,10 +535,14 @@ class Workflow(object):
 
         self._ordering = None
 
-    def setup_systems(self, system_type):
+    def setup_systems(self, system_type, backend='serial', workers=0):
         """Get the subsystem for this workflow. Each
         subsystem contains a subgraph of this workflow's component
         graph, which contains components and/or other subsystems.
+
+        When not running under MPI, parallel subsystems are only created
+        if `backend` is 'threads' or 'processes', and they run their
+        subsystems using that backend with at most `workers` workers.
         """
 
         scope = self.scope
@@ -612,11 +619,16 @@ class Workflow(object):
                         to_remove.append((s, node))
             reduced.remove_edges_from(to_remove)
 
+        # unit conversions become part of the scatters rather than
+        # separate Systems
+        fuse_unit_conversions(scope, reduced, cgraph)
+
         self._reduced_graph = reduced
 
-        if system_type == 'auto' and MPI:
+        parallel = MPI or backend != 'serial'
+        if system_type == 'auto' and parallel:
             self._auto_setup_systems(scope, reduced, cgraph)
-        elif MPI and system_type == 'parallel':
+        elif parallel and system_type == 'parallel':
             self._system = ParallelSystem(scope, reduced, cgraph,
                                           str(tuple(sorted(cgraph.nodes()))))
         else:
@@ -626,6 +638,16 @@ class Workflow(object):
         self._system.set_ordering([p[0] for p in params]+self._ordering,
                                   opaque_map)
 
+        if not MPI:
+            systems = [self._system]
+            while systems:
+                system = systems.pop()
+                if isinstance(system, ParallelSystem):
+                    system.backend = backend
+                    system.workers = workers
+                if isinstance(system, CompoundSystem):
+                    systems.extend(system.all_subsystems())
+
         self._system._parent_system = self.parent._system
 
         for comp in self:
@@ -659,6 +681,14 @@ class Workflow(object):
         else:
             return self._system.get_req_cpus()
 
+    def get_cost(self):
+        """Return the estimated cost of one run of our System and its
+        parallel fraction."""
+        if self._system is None:
+            return (None, 1.0)
+        else:
+            return self._system.get_cost()
+
     def setup_communicators(self, comm):
         """Allocate communicators from here down to all of our
         child Components.
@@ -806,5 +806,28 @@ class test__moduleFunctions(unittest.TestCase):
         else:
             self.fail("Expecting Key Error")            
 
+    def test_get_conversion(self):
+        self.assertEqual(units.get_conversion('m', 'cm'), (100.0, 0.0))
+        factor, offset = units.get_conversion('degC', 'degF')
+        self.assertAlmostEqual((100.0 + offset) * factor, 212.0)
+        self.assertTrue(units.get_conversion('degC', 'degF') is
+                        units.get_conversion('degC', 'degF'))
+
+        try:
+            units.get_conversion('m', 's')
+        except TypeError, err:
+            self.assertEqual(str(err), 'Incompatible units')
+        else:
+            self.fail("Expecting TypeError")
+
+    def test_convert_units_array(self):
+        import numpy
+        vals = numpy.array([0.0, 100.0, -40.0])
+        expected = numpy.array([32.0, 212.0, -40.0])
+        result = units.convert_units(vals, 'degC', 'degF')
+        self.assertTrue(numpy.allclose(result, expected))
+        self.assertTrue(numpy.allclose(vals, [0.0, 100.0, -40.0]))
+        self.assertAlmostEqual(units.convert_units(3.0, 'ft', 'inch'), 36.0)
+
 if __name__ == "__main__":
     unittest.main()
@@ -19,14 +19,9 @@ Justin Gray."""
 import re, ConfigParser
 import os.path
 
+from itertools import count
 from math import sin, cos, tan, floor, pi
 
-# pylint: disable-msg=E0611,F0401, E1101
-try:
-    from pkg_resources import resource_stream
-except ImportError:
-    pass
-
 #Class definitions
 
 class NumberDict(dict):
@@ -577,6 +572,11 @@ class PhysicalUnit(object):
 
 _UNIT_CACHE = {}
 
+# (from_units, to_units) -> [(factor, offset), time of last use]
+_CONVERSION_CACHE = {}
+_CONVERSION_CACHE_SIZE = 1024
+_CONVERSION_CLOCK = count()
+
 def _find_unit(unit):
     """Find unit helper function."""
     if isinstance(unit, str):
@@ -685,6 +685,7 @@ def import_library(libfilepointer):
     global _UNIT_LIB
     global _UNIT_CACHE
     _UNIT_CACHE = {}
+    _CONVERSION_CACHE.clear()
     _UNIT_LIB = ConfigParser.ConfigParser()
     _UNIT_LIB.optionxform = _do_nothing
     _UNIT_LIB.readfp(libfilepointer)
@@ -794,19 +795,61 @@ def _update_library(cfg):
                          ' defined units:%s' % [x[0] for x in retry1])
 
 
+def get_conversion(old_units, new_units):
+    """Return the tuple (factor, offset) that converts a value given in
+    `old_units` to `new_units` via ``(value + offset) * factor``.
+
+    Results are kept in a bounded least-recently-used cache, so repeated
+    conversions between the same units don't have to look up or parse
+    either unit again.
+
+    old_units: str
+        Units of the value being converted.
+
+    new_units: str
+        Units to convert to.
+    """
+    if not (isinstance(old_units, str) and isinstance(new_units, str)):
+        return _find_unit(old_units).conversion_tuple_to(_find_unit(new_units))
+
+    key = (old_units, new_units)
+    try:
+        entry = _CONVERSION_CACHE[key]
+    except KeyError:
+        conv = _find_unit(old_units).conversion_tuple_to(_find_unit(new_units))
+        if len(_CONVERSION_CACHE) >= _CONVERSION_CACHE_SIZE:
+            _trim_conversion_cache()
+        entry = _CONVERSION_CACHE[key] = [conv, 0]
+    entry[1] = next(_CONVERSION_CLOCK)
+    return entry[0]
+
+
+def _trim_conversion_cache():
+    """Drop the least recently used half of the conversion cache."""
+    entries = sorted(_CONVERSION_CACHE.items(), key=lambda item: item[1][1])
+    for key, entry in entries[:len(entries)//2]:
+        del _CONVERSION_CACHE[key]
+
+
 def convert_units(value, units, convunits):
     """Return the given value (given in units) converted
-    to convunits.
+    to convunits. `value` may be a number or a numpy array, in which
+    case the whole array is converted at once.
     """
-    pq = PhysicalQuantity(value, units)
-    pq.convert_to_unit(convunits)
-    return pq.value
+    factor, offset = get_conversion(units, convunits)
+    if offset:
+        return (value + offset) * factor
+    return value * factor
+
 
+def _open_default_library():
+    """Return a file object for the default units library."""
+    try:
+        return open(os.path.join(os.path.dirname(__file__),
+                                 'unitLibdefault.ini'))
+    except IOError:  # we may be in a zipped egg
+        from pkg_resources import resource_stream
+        return resource_stream(__name__, 'unitLibdefault.ini')
 
-try:
-    default_lib = resource_stream(__name__, 'unitLibdefault.ini')
-except NameError: #pck_resources was not imported, try __file__
-    default_lib = open(os.path.join(os.path.dirname(__file__),
-                                   'unitLibDefault.ini'))
-import_library(default_lib)
+import_library(_open_default_library())
 
@@ -229,6 +229,56 @@ class Stream(object):
 
         return data.reshape(shape, order=order) if reshape else data
 
+    def map_floats(self, shape, order='C', full_record=False):
+        """
+        Returns floats as a :class:`numpy.memmap` of `shape`.
+        The data is not read until it is accessed, and the stream is
+        positioned after the data. Modifications to the returned array are
+        not written back to the file. Only meaningful if `binary`.
+
+        shape: tuple(int)
+            Dimensions of returned array.
+
+        order: string
+            If 'C', the data is in row-major order.
+            If 'Fortran', the data is in column-major order.
+
+        full_record: bool
+            If True, then read surrounding recordmarks.
+            Only meaningful if `unformatted`.
+        """
+        if not self.binary:
+            raise RuntimeError('map_floats requires binary data')
+
+        count = 1
+        try:
+            for size in shape:
+                count *= size
+        except TypeError:
+            count = shape
+            shape = (count,)
+
+        if full_record and self.unformatted:
+            reclen = self.read_recordmark()
+            if reclen != self.reclen_floats(count):
+                raise RuntimeError('unexpected recordlength %d' % reclen)
+
+        # Byte order is part of the dtype, so no swap is needed here.
+        dtype = numpy.dtype(numpy.float32 if self.single_precision
+                                          else numpy.float64)
+        dtype = dtype.newbyteorder('>' if self.big_endian else '<')
+        offset = self.file.tell()
+        data = numpy.memmap(self.file, dtype=dtype, mode='c', offset=offset,
+                            shape=shape, order='F' if order == 'Fortran' else 'C')
+        self.file.seek(offset + self.reclen_floats(count))
+
+        if full_record and self.unformatted:
+            reclen2 = self.read_recordmark()
+            if reclen2 != reclen:
+                raise RuntimeError('mismatched recordlength %d vs. %d'
+                                   %  (reclen2, reclen))
+        return data
+
     def read_recordmark(self):
         """ Returns value of next recordmark. """
         fmt = '>' if self.big_endian else '<'
@@ -308,9 +358,9 @@ class Stream(object):
 
             arr = data
             if self.integer_8:
-                if data.itemsize != _SZ_LONG:
+                if data.dtype != numpy.int64:
                     arr = numpy.array(data, dtype=numpy.int64)
-            elif data.itemsize != _SZ_INT:
+            elif data.dtype != numpy.int32:
                 arr = numpy.array(data, dtype=numpy.int32)
 
             if self.need_byteswap:
@@ -394,9 +444,9 @@ class Stream(object):
 
             arr = data
             if self.single_precision:
-                if data.itemsize != _SZ_FLOAT:
+                if data.dtype != numpy.float32:
                     arr = numpy.array(data, dtype=numpy.float32)
-            elif data.itemsize != _SZ_DOUBLE:
+            elif data.dtype != numpy.float64:
                 arr = numpy.array(data, dtype=numpy.float64)
 
             if self.need_byteswap:
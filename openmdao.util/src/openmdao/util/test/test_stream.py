@@ -569,6 +569,42 @@ class TestCase(unittest.TestCase):
             new_data = stream.read_floats((5, 2), order='Fortran')
         numpy.testing.assert_array_equal(new_data, arr2d)
 
+    def test_map_floats(self):
+        logging.debug('')
+        logging.debug('test_map_floats')
+
+        # Unformatted array.
+        data = numpy.arange(1, 9, dtype=numpy.float32)
+        with open(self.filename, 'wb') as out:
+            out.write(UNF_R4A)
+            out.write(UNF_R4)
+        with open(self.filename, 'rb') as inp:
+            stream = Stream(inp, binary=True, single_precision=True,
+                            unformatted=True)
+            new_data = stream.map_floats(data.size, full_record=True)
+            self.assertTrue(isinstance(new_data, numpy.memmap))
+            self.assertEqual(stream.read_float(full_record=True), 1.)
+        numpy.testing.assert_array_equal(new_data, data)
+
+        # Byteswapped, Fortran order.
+        swap_endian = sys.byteorder == 'little'
+        data = numpy.arange(0, 12, dtype=numpy.float64).reshape((3, 4),
+                                                                order='F')
+        with open(self.filename, 'wb') as out:
+            stream = Stream(out, binary=True, big_endian=swap_endian)
+            stream.write_floats(data, order='Fortran')
+        with open(self.filename, 'rb') as inp:
+            stream = Stream(inp, binary=True, big_endian=swap_endian)
+            new_data = stream.map_floats((3, 4), order='Fortran')
+        numpy.testing.assert_array_equal(new_data, data)
+
+        # Text.
+        with open(self.filename, 'r') as inp:
+            stream = Stream(inp)
+            assert_raises(self, 'stream.map_floats(8)',
+                          globals(), locals(), RuntimeError,
+                          'map_floats requires binary data')
+
     def test_misc(self):
         logging.debug('')
         logging.debug('test_misc')